@@ -14,6 +14,12 @@ from ..services.s3_service import upload_file_to_s3
 # 이 함수는 task_payload를 SQS 큐에 발행하는 역할을 합니다.
 from ..services.aws_spot import send_task_to_spot_worker_queue
 
+# 출력 형식 목록 해석/검증 (워커와 같은 규칙 사용)
+from ..services.music_output import parse_output_formats
+
+# 요청 종류/크기에 따른 작업 큐 우선순위 (interactive / standard / bulk)
+from ..services.task_queues import route_priority
+
 # .env 파일에서 환경 변수 로드
 load_dotenv()
 
@@ -35,22 +41,24 @@ STORAGE_CONFIG = {
 
 
 if not STORAGE_CONFIG["bucket_name"]:
-    print(f"경고: 스토리지 버킷 이름이 설정되지 않았습니다 (타입: {STORAGE_CONFIG.get('type', 'unknown')}). 파일 업로드 및 작업 지시 기능이 작동하지 않습니다.")
+    print(f"경고: 스토리지 버킷 이름이 설정되지 않았습니다 (타입: {STORAGE_CONFIG.get('type', 'unknown')}). 파일 업로드 및 작업 지시 기능이 작동하지 않습니다.")
 
 
 @router.post("/upload_sheetmusic/") # 악보 업로드용으로 엔드포인트 이름 변경
 async def upload_sheet_music(
     file: UploadFile = File(...),
-    output_format: str = "midi", # 원하는 음악 파일 출력 형식 (midi, mp3)
-    translate_shakespearean: bool = False # 셰익스피어 문체 번역 필요 여부 (기본값 False)
+    output_format: str = "midi", # 원하는 음악 파일 출력 형식. 여러 개는 쉼표로 구분 (예: midi,mp3,wav)
+    translate_shakespearean: bool = False, # 셰익스피어 문체 번역 필요 여부 (기본값 False)
+    priority: str = None, # 작업 큐 우선순위 직접 지정 (interactive, standard, bulk). 없으면 크기/종류로 결정
+    batch: bool = False # 일괄 작업(백필 등)의 일부인지 여부. True면 bulk 큐 사용
 ):
-    """
-    악보 파일을 업로드하고, 음악 생성 및 처리를 위해 워커에게 작업을 지시합니다.
-    업로드된 파일은 S3에 저장되고, 작업 요청은 SQS 큐로 전송됩니다.
-    """
-    # 스토리지 설정 확인
-    if not STORAGE_CONFIG["bucket_name"]:
-         raise HTTPException(
+    """
+    악보 파일을 업로드하고, 음악 생성 및 처리를 위해 워커에게 작업을 지시합니다.
+    업로드된 파일은 S3에 저장되고, 작업 요청은 SQS 큐로 전송됩니다.
+    """
+    # 스토리지 설정 확인
+    if not STORAGE_CONFIG["bucket_name"]:
+         raise HTTPException(
               status_code=500,
               detail=f"Server configuration error: Storage bucket name is not set for type {STORAGE_CONFIG.get('type', 'unknown')}."
           )
@@ -74,86 +82,106 @@ async def upload_sheet_music(
     # 파일 확장자를 유지하고, task_id를 경로에 포함시켜 관리 용이
     s3_object_name = f"sheetmusic/{task_id}/{os.path.basename(original_filename)}" # S3 버킷 내 경로/이름
 
-    print(f"악보 파일 업로드 요청 수신: {original_filename}")
-    print(f"생성된 작업 ID: {task_id}")
+    # 요청된 출력 형식 목록 검증 (한 번의 작업으로 여러 형식 생성)
+    try:
+        output_formats = parse_output_formats(output_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # 업로드 크기와 요청 종류로 작업 큐 선택 (한 페이지 업로드가 일괄 작업 뒤에서 기다리지 않도록)
+    size_bytes = file.size
+    if size_bytes is None:
+        file.file.seek(0, os.SEEK_END)
+        size_bytes = file.file.tell()
+        file.file.seek(0)
+    try:
+        task_priority = route_priority(file_extension, size_bytes, requested=priority, batch=batch)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    print(f"악보 파일 업로드 요청 수신: {original_filename}")
+    print(f"생성된 작업 ID: {task_id}")
     print(f"S3 객체 이름 (예정): {s3_object_name}")
-    print(f"요청된 출력 형식: {output_format}")
+    print(f"요청된 출력 형식: {', '.join(output_formats)}")
     print(f"셰익스피어 번역 요청: {translate_shakespearean}")
+    print(f"작업 큐 우선순위: {task_priority} ({size_bytes} bytes)")
 
 
-    s3_url = None
-    try:
-        # 1. 악보 파일을 S3에 업로드
+    s3_url = None
+    try:
+        # 1. 악보 파일을 S3에 업로드
         # file.file은 SpooledTemporaryFile 객체이며, boto3 upload_fileobj에 직접 전달 가능
-        print(f"S3에 파일 업로드 시도: 버킷={STORAGE_CONFIG['bucket_name']}, 키={s3_object_name}")
-        s3_url = upload_file_to_s3(file.file, STORAGE_CONFIG["bucket_name"], s3_object_name)
-
-        if not s3_url:
-             raise RuntimeError("S3 파일 업로드 실패")
-        print(f"악보 파일 S3 업로드 성공: {s3_url}")
-
-        # 2. 워커에게 전달할 작업 페이로드 (JSON) 생성
-        task_payload = {
-            "task_id": task_id, # 워커가 이 ID를 사용하여 작업 추적 및 결과 보고
-            "file_location": {
-                "type": STORAGE_CONFIG["type"], # 스토리지 타입 (s3, oci, onprem 등)
-                "bucket": STORAGE_CONFIG["bucket_name"], # 버킷 이름 (S3, OCI 등)
-                "key": s3_object_name # 스토리지 내 객체 키/경로
-                # TODO: On-Premise 파일의 경우, 워커가 접근할 수 있는 다른 식별자나 경로 필요
-            },
+        print(f"S3에 파일 업로드 시도: 버킷={STORAGE_CONFIG['bucket_name']}, 키={s3_object_name}")
+        s3_url = upload_file_to_s3(file.file, STORAGE_CONFIG["bucket_name"], s3_object_name)
+
+        if not s3_url:
+             raise RuntimeError("S3 파일 업로드 실패")
+        print(f"악보 파일 S3 업로드 성공: {s3_url}")
+
+        # 2. 워커에게 전달할 작업 페이로드 (JSON) 생성
+        task_payload = {
+            "task_id": task_id, # 워커가 이 ID를 사용하여 작업 추적 및 결과 보고
+            "priority": task_priority, # 작업을 보낼 큐 (aws_spot에서 큐 URL 선택)
+            "file_location": {
+                "type": STORAGE_CONFIG["type"], # 스토리지 타입 (s3, oci, onprem 등)
+                "bucket": STORAGE_CONFIG["bucket_name"], # 버킷 이름 (S3, OCI 등)
+                "key": s3_object_name # 스토리지 내 객체 키/경로
+                # TODO: On-Premise 파일의 경우, 워커가 접근할 수 있는 다른 식별자나 경로 필요
+            },
             # 워커가 수행할 단계 목록 정의 (순서 고려)
-            "processing_steps": [
-                {"type": "extract_music_data"}, # 악보 데이터 추출 (입력 파일 형식에 따라 OMR 포함)
-                {"type": "extract_text_from_score"}, # 악보 데이터에서 텍스트 추출 (가사, 지시어 등)
-                {"type": "generate_music_file", "output_format": output_format}, # 음악 파일 생성 (MIDI 또는 MP3)
-            ],
-            "analysis_tasks": [], # 텍스트 분석/번역 작업 목록
-            "metadata": {
-                 "original_filename": original_filename,
+            "processing_steps": [
+                {"type": "extract_music_data"}, # 악보 데이터 추출 (입력 파일 형식에 따라 OMR 포함)
+                {"type": "extract_text_from_score"}, # 악보 데이터에서 텍스트 추출 (가사, 지시어 등)
+                {"type": "generate_music_file", "output_formats": output_formats}, # 음악 파일 생성 (MIDI, MP3, WAV 등 여러 형식)
+            ],
+            "analysis_tasks": [], # 텍스트 분석/번역 작업 목록
+            "metadata": {
+                 "original_filename": original_filename,
                  "original_file_extension": file_extension,
-                 "uploaded_at": datetime.utcnow().isoformat(),
-                 "requested_output_format": output_format,
+                 "uploaded_at": datetime.utcnow().isoformat(),
+                 "requested_output_formats": output_formats,
                  "request_shakespearean_translation": translate_shakespearean
-            }
-        }
+            }
+        }
 
-        # 셰익스피어 번역이 필요한 경우 분석 작업 목록에 추가
-        if translate_shakespearean:
-            # 셰익스피어 번역 분석 작업 추가
-            task_payload["analysis_tasks"].append({"type": "translate_to_shakespearean"})
+        # 셰익스피어 번역이 필요한 경우 분석 작업 목록에 추가
+        if translate_shakespearean:
+            # 셰익스피어 번역 분석 작업 추가
+            task_payload["analysis_tasks"].append({"type": "translate_to_shakespearean"})
             # 필요하다면 다른 분석 작업도 여기에 추가 (예: {"type": "analyze_harmony"})
 
-        # 3. 작업 페이로드를 워커 서비스에게 지시 (SQS 메시지 발행)
-        print(f"워커에게 작업 지시 시도 (task_id: {task_id})")
-        # send_task_to_spot_worker_queue 함수는 backend/app/services/aws_spot.py에 구현되어 SQS 메시지를 보냅니다.
-        message_response = send_task_to_spot_worker_queue(task_payload)
+        # 3. 작업 페이로드를 워커 서비스에게 지시 (SQS 메시지 발행)
+        print(f"워커에게 작업 지시 시도 (task_id: {task_id})")
+        # send_task_to_spot_worker_queue 함수는 backend/app/services/aws_spot.py에 구현되어 SQS 메시지를 보냅니다.
+        message_response = send_task_to_spot_worker_queue(task_payload)
 
-        if message_response and message_response.get("status") == "task_sent_to_sqs":
-            print(f"작업 지시 성공: 메시지 ID = {message_response.get('message_id')}. Task ID = {task_id}")
-            # TODO: 데이터베이스에 작업 상태 초기 기록 (task_id, status="queued", upload_url 등)
+        if message_response and message_response.get("status") == "task_sent_to_sqs":
+            print(f"작업 지시 성공: 메시지 ID = {message_response.get('message_id')}. Task ID = {task_id}")
+            # TODO: 데이터베이스에 작업 상태 초기 기록 (task_id, status="queued", upload_url 등)
             # from ..services.db_service import create_task_entry
             # create_task_entry(task_id=task_id, status="queued", file_location=task_payload["file_location"], metadata=task_payload["metadata"])
 
-            # 4. 사용자에게 작업 접수 응답 반환
-            return {
-                "message": "Sheet music uploaded and processing requested.",
-                "task_id": task_id, # 사용자에게 작업 ID 반환하여 상태 조회에 사용하도록 함
-                "uploaded_s3_key": s3_object_name, # 업로드된 파일 위치 정보
-                "status": "processing_queued" # 작업이 큐에 들어갔음을 알림
-            }
-        else:
-            # 메시지 전송 실패 시
-            print("오류: 워커에게 작업 지시 실패")
-            # TODO: S3에 업로드된 파일 롤백하거나, 실패 상태를 데이터베이스에 기록하는 등 후처리 필요
-            raise HTTPException(status_code=500, detail="Failed to queue processing task.")
-
-    except HTTPException as e:
-        # FastAPI HTTPException 재발생
-        raise e
-    except Exception as e:
-        print(f"파일 업로드 및 작업 지시 중 오류 발생: {e}")
-        # TODO: 실패 시 로깅 및 사용자 알림
-        raise HTTPException(status_code=500, detail=f"An internal server error occurred: {e}")
+            # 4. 사용자에게 작업 접수 응답 반환
+            return {
+                "message": "Sheet music uploaded and processing requested.",
+                "task_id": task_id, # 사용자에게 작업 ID 반환하여 상태 조회에 사용하도록 함
+                "uploaded_s3_key": s3_object_name, # 업로드된 파일 위치 정보
+                "priority": task_priority, # 작업이 들어간 큐
+                "status": "processing_queued" # 작업이 큐에 들어갔음을 알림
+            }
+        else:
+            # 메시지 전송 실패 시
+            print("오류: 워커에게 작업 지시 실패")
+            # TODO: S3에 업로드된 파일 롤백하거나, 실패 상태를 데이터베이스에 기록하는 등 후처리 필요
+            raise HTTPException(status_code=500, detail="Failed to queue processing task.")
+
+    except HTTPException as e:
+        # FastAPI HTTPException 재발생
+        raise e
+    except Exception as e:
+        print(f"파일 업로드 및 작업 지시 중 오류 발생: {e}")
+        # TODO: 실패 시 로깅 및 사용자 알림
+        raise HTTPException(status_code=500, detail=f"An internal server error occurred: {e}")
 
 
 # TODO: 작업 상태 조회 엔드포인트 추가 (/music/status/{task_id})
@@ -0,0 +1,18 @@
+# backend/app/lambda_entry.py
+
+import os
+
+from .services.lambda_runtime import make_handler # SQS 부분 배치 실패, 콜드/웜 호출 기록
+from .services.lazy_imports import WORKER_PREWARM, prewarm
+from .task_pipeline import process_task
+
+# --- Lambda 실행 방식 ---
+# 핸들러: app.lambda_entry.lambda_handler (패키지 루트는 backend/, SQS 이벤트 소스 매핑은 ReportBatchItemFailures 설정,
+# 또는 LambdaService.invoke_processing_lambda의 작업 페이로드로 직접 호출)
+# s3_client, llm_pool, 번역/악보 캐시는 모듈 수준에 있어 같은 실행 환경의 웜 호출에서 재사용되고,
+# 무거운 라이브러리는 단계를 처음 실행할 때 임포트됩니다. 자주 쓰는 단계는 WORKER_PREWARM으로 초기화 단계에서 임포트.
+# (Spot 회수 감시와 큐 폴링은 워커 루프에서만 시작)
+if os.getenv("AWS_LAMBDA_FUNCTION_NAME") and WORKER_PREWARM:
+    prewarm(WORKER_PREWARM)
+
+lambda_handler = make_handler(process_task)
@@ -0,0 +1,330 @@
+# backend/app/services/autoscaler.py
+
+import math
+import os
+import threading
+import time
+from collections import deque
+
+# 작업 큐 적체량에 따라 Spot 워커 수를 정하는 자동 확장 컨트롤러.
+# 주기마다 큐 길이(대기 + 처리 중), 가장 오래된 메시지의 나이, 완료 수를 샘플링해
+#  - 워커당 처리량(작업/초)과 도착률을 지수 이동 평균(EWMA)으로 추정하고
+#  - 목표 워커 수 = 도착률 / 워커당 처리량 + 적체량을 AUTOSCALE_DRAIN_SECONDS 안에 비우는 데 필요한 수
+#  - 가장 오래된 메시지가 AUTOSCALE_MAX_AGE_SECONDS를 넘으면 최소 한 대 추가
+# 로 계산합니다. 확장은 바로(확장 쿨다운만 적용), 축소는 평활된 목표로 천천히(축소 쿨다운) 합니다.
+# 실제 용량 변경은 교체 가능한 CapacityProvider가 담당하며, 오프라인 테스트용 시뮬레이션 구현을 함께 제공합니다.
+
+AUTOSCALE_MIN_WORKERS = int(os.getenv("AUTOSCALE_MIN_WORKERS", "0"))
+AUTOSCALE_MAX_WORKERS = int(os.getenv("AUTOSCALE_MAX_WORKERS", "20"))
+AUTOSCALE_INTERVAL_SECONDS = float(os.getenv("AUTOSCALE_INTERVAL_SECONDS", "30"))
+AUTOSCALE_DRAIN_SECONDS = float(os.getenv("AUTOSCALE_DRAIN_SECONDS", "300")) # 적체를 이 시간 안에 비우는 것이 목표
+AUTOSCALE_MAX_AGE_SECONDS = float(os.getenv("AUTOSCALE_MAX_AGE_SECONDS", "600"))
+AUTOSCALE_SCALE_UP_COOLDOWN = float(os.getenv("AUTOSCALE_SCALE_UP_COOLDOWN", "60"))
+AUTOSCALE_SCALE_DOWN_COOLDOWN = float(os.getenv("AUTOSCALE_SCALE_DOWN_COOLDOWN", "300"))
+AUTOSCALE_EWMA_ALPHA = float(os.getenv("AUTOSCALE_EWMA_ALPHA", "0.3"))
+# 아직 측정값이 없을 때 쓰는 워커당 처리량 (작업/초)
+AUTOSCALE_INITIAL_THROUGHPUT = float(os.getenv("AUTOSCALE_INITIAL_THROUGHPUT", str(1 / 60)))
+# SQS 지표는 1분 단위로, 몇 분 늦게 CloudWatch에 들어옵니다. 샘플마다 (현재 분 - LAG)에서 끝나는
+# LOOKBACK 길이의 구간을 조회하고, 분별 값이 늦게 들어오거나 늘어난 만큼만 완료 수에 더합니다.
+AUTOSCALE_METRIC_LAG_SECONDS = float(os.getenv("AUTOSCALE_METRIC_LAG_SECONDS", "60"))
+AUTOSCALE_METRIC_LOOKBACK_SECONDS = float(os.getenv("AUTOSCALE_METRIC_LOOKBACK_SECONDS", "360"))
+AUTOSCALE_DECISION_HISTORY = 500
+DEMAND_DEADBAND = 0.05 # 워커 수로 올림할 때 무시하는 소수 부분 (측정 잡음으로 한 대씩 늘지 않도록)
+
+
+def _ewma(previous, value, alpha):
+    return value if previous is None else alpha * value + (1 - alpha) * previous
+
+
+def _workers_for(demand: float) -> int:
+    return max(0, math.ceil(demand - DEMAND_DEADBAND))
+
+
+class CapacityProvider:
+    """워커 용량을 바꾸는 인터페이스. desired: 요청한 수, active: 작업을 처리 중인 수."""
+    def capacity(self) -> dict:
+        raise NotImplementedError
+
+    def set_desired(self, count: int):
+        raise NotImplementedError
+
+
+class AutoScalingGroupProvider(CapacityProvider):
+    """Spot 워커 Auto Scaling 그룹 (혼합 인스턴스 정책으로 Spot 사용)의 DesiredCapacity를 조정합니다."""
+    def __init__(self, group_name: str, client=None):
+        import boto3
+        self.group_name = group_name
+        self.client = client or boto3.client("autoscaling")
+
+    def capacity(self) -> dict:
+        group = self.client.describe_auto_scaling_groups(AutoScalingGroupNames=[self.group_name])["AutoScalingGroups"][0]
+        active = sum(1 for instance in group.get("Instances", []) if instance.get("LifecycleState") == "InService")
+        return {"desired": group["DesiredCapacity"], "active": active}
+
+    def set_desired(self, count: int):
+        self.client.set_desired_capacity(AutoScalingGroupName=self.group_name, DesiredCapacity=count,
+                                         HonorCooldown=False) # 쿨다운은 컨트롤러가 관리
+
+
+class SimulatedCapacityProvider(CapacityProvider):
+    """로컬 시뮬레이션용: 요청한 워커는 boot_seconds 뒤에 활성화되고, 줄일 때는 바로 사라집니다."""
+    def __init__(self, initial: int = 0, boot_seconds: float = 90, clock=time.time):
+        self.clock = clock
+        self.boot_seconds = boot_seconds
+        self._ready_at = [clock() - boot_seconds] * initial # 워커별 활성화 시각
+        self.changes = []
+
+    def capacity(self) -> dict:
+        now = self.clock()
+        return {"desired": len(self._ready_at), "active": sum(1 for ready in self._ready_at if ready <= now)}
+
+    def set_desired(self, count: int):
+        now = self.clock()
+        self.changes.append((now, len(self._ready_at), count))
+        if count > len(self._ready_at):
+            self._ready_at.extend([now + self.boot_seconds] * (count - len(self._ready_at)))
+        else: # 부팅 중인 워커부터 정리
+            self._ready_at = sorted(self._ready_at)[:count]
+
+
+class SqsBacklogSource:
+    """
+    SQS 큐 속성과 CloudWatch 지표로 적체량을 샘플링합니다 (여러 우선순위 큐 합산).
+    큐 길이는 큐 속성(실시간)에서, 완료 수와 가장 오래된 메시지 나이는 지연되어 들어오는 1분 단위
+    CloudWatch 지표에서 얻습니다. 완료 수는 지표의 분(Timestamp)별로 이미 센 값을 기억해 두고,
+    이번 샘플에서 새로 보이거나 늘어난 만큼만 더합니다 (늦게 들어온 값도 빠짐없이 한 번만 셈).
+    """
+    def __init__(self, queue_urls, sqs_client=None, cloudwatch_client=None, clock=time.time,
+                 metric_lag: float = AUTOSCALE_METRIC_LAG_SECONDS,
+                 metric_lookback: float = AUTOSCALE_METRIC_LOOKBACK_SECONDS):
+        import boto3
+        self.queue_urls = sorted(set(queue_urls))
+        self.sqs = sqs_client or boto3.client("sqs")
+        self.cloudwatch = cloudwatch_client or boto3.client("cloudwatch")
+        self.clock = clock
+        self.metric_lag = metric_lag
+        self.metric_lookback = metric_lookback
+        self._counted_deleted = {} # (큐 URL, 분 시작 시각) -> 완료 수에 이미 더한 값
+
+    def _queue_metric(self, url: str, name: str, statistic: str, start, end) -> dict:
+        """:return: {분 시작 시각(epoch 초): 값}"""
+        datapoints = self.cloudwatch.get_metric_statistics(
+            Namespace="AWS/SQS", MetricName=name, Dimensions=[{"Name": "QueueName", "Value": url.rsplit("/", 1)[-1]}],
+            StartTime=start, EndTime=end, Period=60, Statistics=[statistic])["Datapoints"]
+        return {point["Timestamp"].timestamp(): point[statistic] for point in datapoints}
+
+    def metric_window(self, now: float) -> tuple:
+        """조회 구간 (시작, 끝) epoch 초. 분 경계에 맞추고 지표 지연(metric_lag)만큼 앞당깁니다."""
+        end = math.floor(now / 60) * 60 - self.metric_lag
+        return end - self.metric_lookback, end
+
+    def sample(self) -> dict:
+        from datetime import datetime, timezone
+        now = self.clock()
+        window_start, window_end = self.metric_window(now)
+        start, end = datetime.fromtimestamp(window_start, timezone.utc), datetime.fromtimestamp(window_end, timezone.utc)
+        visible = in_flight = 0
+        completed = oldest = 0.0
+        for url in self.queue_urls:
+            attributes = self.sqs.get_queue_attributes(
+                QueueUrl=url, AttributeNames=["ApproximateNumberOfMessages", "ApproximateNumberOfMessagesNotVisible"]
+            )["Attributes"]
+            visible += int(attributes["ApproximateNumberOfMessages"])
+            in_flight += int(attributes["ApproximateNumberOfMessagesNotVisible"])
+            for minute, value in self._queue_metric(url, "NumberOfMessagesDeleted", "Sum", start, end).items():
+                counted = self._counted_deleted.get((url, minute), 0.0)
+                if value > counted: # 새로 들어왔거나, 같은 분의 값이 늦게 더 들어옴
+                    completed += value - counted
+                    self._counted_deleted[(url, minute)] = value
+            ages = self._queue_metric(url, "ApproximateAgeOfOldestMessage", "Maximum", start, end)
+            if ages:
+                oldest = max(oldest, ages[max(ages)]) # 가장 최근 분의 값
+        # 조회 구간을 벗어난 분은 다시 조회하지 않으므로 기록도 정리
+        self._counted_deleted = {key: value for key, value in self._counted_deleted.items() if key[1] >= window_start}
+        return {"time": now, "visible": visible, "in_flight": in_flight, "oldest_age_seconds": oldest,
+                "completed": int(round(completed))}
+
+
+class AutoscalingController:
+    """적체량 샘플로 목표 워커 수를 계산해 CapacityProvider에 반영합니다. 결정 기록과 지표를 보관합니다."""
+    def __init__(self, provider: CapacityProvider, source, min_workers: int = AUTOSCALE_MIN_WORKERS,
+                 max_workers: int = AUTOSCALE_MAX_WORKERS, drain_seconds: float = AUTOSCALE_DRAIN_SECONDS,
+                 max_age_seconds: float = AUTOSCALE_MAX_AGE_SECONDS,
+                 scale_up_cooldown: float = AUTOSCALE_SCALE_UP_COOLDOWN,
+                 scale_down_cooldown: float = AUTOSCALE_SCALE_DOWN_COOLDOWN, alpha: float = AUTOSCALE_EWMA_ALPHA,
+                 initial_throughput: float = AUTOSCALE_INITIAL_THROUGHPUT):
+        self.provider = provider
+        self.source = source
+        self.min_workers, self.max_workers = min_workers, max_workers
+        self.drain_seconds = drain_seconds
+        self.max_age_seconds = max_age_seconds
+        self.scale_up_cooldown, self.scale_down_cooldown = scale_up_cooldown, scale_down_cooldown
+        self.alpha = alpha
+        self.throughput = None # 워커당 작업/초 (EWMA)
+        self.initial_throughput = initial_throughput
+        self.arrival_rate = None # 작업/초 (EWMA)
+        self.smoothed_target = None
+        self._previous = None
+        self._last_up = self._last_down = float("-inf")
+        self.decisions = deque(maxlen=AUTOSCALE_DECISION_HISTORY)
+        self.stats = {"samples": 0, "scale_ups": 0, "scale_downs": 0, "holds": 0}
+        self._lock = threading.Lock()
+
+    def _update_rates(self, sample: dict, active: int):
+        previous = self._previous
+        self._previous = dict(sample, active=active)
+        if previous is None:
+            return
+        elapsed = sample["time"] - previous["time"]
+        if elapsed <= 0:
+            return
+        backlog_change = (sample["visible"] + sample["in_flight"]) - (previous["visible"] + previous["in_flight"])
+        self.arrival_rate = _ewma(self.arrival_rate, max(0.0, (sample["completed"] + backlog_change) / elapsed),
+                                  self.alpha)
+        busy = min(previous["active"], active) # 구간 내내 일한 워커 수 (부팅 중인 워커 제외)
+        if busy > 0 and sample["completed"] > 0 and previous["visible"] > 0:
+            # 대기 작업이 있었던 구간만 처리량 측정 (일이 없어 놀던 워커로 과소평가하지 않도록)
+            self.throughput = _ewma(self.throughput, sample["completed"] / (busy * elapsed), self.alpha)
+
+    def target_workers(self, sample: dict, current: int):
+        """
+        :return: (즉시 목표, 평활된 목표, 이유 문자열)
+        """
+        throughput = self.throughput or self.initial_throughput
+        backlog = sample["visible"] + sample["in_flight"]
+        steady = (self.arrival_rate or 0.0) / throughput
+        drain = sample["visible"] / (throughput * self.drain_seconds)
+        raw = _workers_for(steady + drain)
+        reason = f"steady {steady:.2f} + drain {drain:.2f}"
+        if sample["oldest_age_seconds"] > self.max_age_seconds and sample["visible"] > 0:
+            raw = max(raw, current + 1)
+            reason += f", oldest message {sample['oldest_age_seconds']:.0f}s"
+        if backlog > 0:
+            raw = max(raw, 1) # 남은 작업이 있으면 최소 한 대
+        # 처음에는 현재 용량에서 출발 (컨트롤러 재시작 직후 한 번에 모두 줄이지 않도록)
+        self.smoothed_target = _ewma(current if self.smoothed_target is None else self.smoothed_target, raw,
+                                     self.alpha)
+        return raw, self.smoothed_target, reason
+
+    def step(self) -> dict:
+        """샘플링 -> 목표 계산 -> 쿨다운 확인 -> 용량 변경. 이번 결정을 반환합니다."""
+        with self._lock:
+            sample = self.source.sample()
+            capacity = self.provider.capacity()
+            current, now = capacity["desired"], sample["time"]
+            self._update_rates(sample, capacity["active"])
+            raw, smoothed, reason = self.target_workers(sample, current)
+
+            if raw > current and sample["visible"] > 0: # 확장은 기다리는 작업이 있을 때 즉시 목표로
+                desired, action = raw, "scale_up"
+                if now - self._last_up < self.scale_up_cooldown:
+                    desired, action, reason = current, "hold", reason + ", scale-up cooldown"
+            else: # 축소는 평활된 목표로, 축소 쿨다운 후에만 (최근 확장 후에도 대기)
+                desired = min(current, max(raw, _workers_for(smoothed)))
+                action = "scale_down" if desired < current else "hold"
+                if action == "scale_down" and now - max(self._last_up, self._last_down) < self.scale_down_cooldown:
+                    desired, action, reason = current, "hold", reason + ", scale-down cooldown"
+            desired = min(self.max_workers, max(self.min_workers, desired))
+            if desired == current:
+                action = "hold"
+            elif action == "scale_up":
+                self._last_up = now
+            else:
+                self._last_down = now
+            if desired != current:
+                self.provider.set_desired(desired)
+
+            self.stats["samples"] += 1
+            self.stats[{"scale_up": "scale_ups", "scale_down": "scale_downs", "hold": "holds"}[action]] += 1
+            decision = {"time": now, "action": action, "current": current, "desired": desired,
+                        "active": capacity["active"], "raw_target": raw, "smoothed_target": round(smoothed, 2),
+                        "visible": sample["visible"], "in_flight": sample["in_flight"],
+                        "oldest_age_seconds": round(sample["oldest_age_seconds"], 1),
+                        "arrival_rate": round(self.arrival_rate or 0.0, 4),
+                        "worker_throughput": round(self.throughput or self.initial_throughput, 4), "reason": reason}
+            self.decisions.append(decision)
+            return decision
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.stats, last_decision=self.decisions[-1] if self.decisions else None,
+                        worker_throughput=self.throughput, arrival_rate=self.arrival_rate)
+
+    def run_forever(self, interval: float = AUTOSCALE_INTERVAL_SECONDS, stop: threading.Event = None):
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            try:
+                decision = self.step()
+                if decision["action"] != "hold":
+                    print(f"자동 확장: {decision['action']} {decision['current']} -> {decision['desired']} "
+                          f"({decision['reason']})")
+            except Exception as e:
+                print(f"자동 확장: 샘플링/용량 변경 오류: {e}")
+            stop.wait(interval)
+
+
+class SimulatedQueue:
+    """
+    오프라인 시뮬레이션용 작업 큐 + 워커. 샘플 소스로 사용하며, advance()로 시간을 진행합니다.
+    작업은 도착 순서대로 처리되고, 활성 워커 하나가 service_seconds마다 작업 하나를 끝냅니다.
+    """
+    def __init__(self, arrivals, provider: SimulatedCapacityProvider, service_seconds: float, clock):
+        self.pending = deque(sorted(arrivals)) # 아직 도착하지 않은 작업의 도착 시각
+        self.queue = deque() # 도착했지만 끝나지 않은 작업의 도착 시각
+        self.provider = provider
+        self.service_seconds = service_seconds
+        self.clock = clock
+        self.latencies = []
+        self._completed = 0
+        self._carry = 0.0
+
+    def advance(self, until: float, step: float = 1.0):
+        now = self.clock.now
+        while now < until:
+            now = min(until, now + step)
+            self.clock.now = now
+            while self.pending and self.pending[0] <= now:
+                self.queue.append(self.pending.popleft())
+            self._carry += self.provider.capacity()["active"] * step / self.service_seconds
+            while self._carry >= 1 and self.queue:
+                self._carry -= 1
+                self.latencies.append(now - self.queue.popleft())
+                self._completed += 1
+            if not self.queue:
+                self._carry = min(self._carry, 1.0) # 놀던 시간의 처리 능력은 쌓이지 않음
+
+    def sample(self) -> dict:
+        now = self.clock.now
+        active = self.provider.capacity()["active"]
+        completed, self._completed = self._completed, 0
+        return {"time": now, "visible": max(0, len(self.queue) - active), "in_flight": min(active, len(self.queue)),
+                "oldest_age_seconds": now - self.queue[0] if self.queue else 0.0, "completed": completed}
+
+
+class SimulatedClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def simulate(arrivals, service_seconds: float, duration: float, interval: float = AUTOSCALE_INTERVAL_SECONDS,
+             boot_seconds: float = 90, initial_workers: int = 0, **controller_options) -> dict:
+    """
+    도착 시각 목록에 대해 컨트롤러를 오프라인으로 실행합니다 (simulate_load.py --offline-autoscale, 테스트용).
+
+    :return: {"decisions", "latencies", "worker_seconds", "remaining", "controller"}
+    """
+    clock = SimulatedClock()
+    provider = SimulatedCapacityProvider(initial_workers, boot_seconds, clock)
+    queue = SimulatedQueue(arrivals, provider, service_seconds, clock)
+    controller = AutoscalingController(provider, queue, **controller_options)
+    worker_seconds = 0.0
+    while clock.now < duration:
+        desired = provider.capacity()["desired"]
+        queue.advance(clock.now + interval)
+        worker_seconds += desired * interval # 부팅 중인 워커도 비용 발생
+        controller.step()
+    return {"decisions": list(controller.decisions), "latencies": queue.latencies, "worker_seconds": worker_seconds,
+            "remaining": len(queue.queue) + len(queue.pending), "controller": controller.snapshot()}
@@ -72,16 +72,20 @@ import json
 from botocore.exceptions import ClientError
 # .env 파일에서 환경 변수 로드
 from dotenv import load_dotenv
+
+from .task_queues import DEFAULT_PRIORITY, normalize_priority, task_queue_urls
+
 load_dotenv()
 
 # AWS SQS 클라이언트 생성
 # 자격 증명 및 리전은 환경 변수, ~/.aws/credentials 등에서 자동으로 로드됩니다.
 sqs_client = boto3.client("sqs")
 
-# 워커에게 작업을 전달할 SQS 큐 URL (환경 변수에서 로드)
-WORKER_SQS_QUEUE_URL = os.getenv("SQS_QUEUE_URL")
+# 워커에게 작업을 전달할 우선순위별 SQS 큐 URL (환경 변수에서 로드)
+# SQS_QUEUE_URL_INTERACTIVE / SQS_QUEUE_URL_STANDARD / SQS_QUEUE_URL_BULK, 없으면 SQS_QUEUE_URL 하나를 함께 사용
+WORKER_TASK_QUEUE_URLS = task_queue_urls()
 
-if not WORKER_SQS_QUEUE_URL:
+if not WORKER_TASK_QUEUE_URLS:
      print("경고: SQS_QUEUE_URL 환경 변수가 설정되지 않았습니다. 워커에게 작업 지시 기능이 작동하지 않습니다.")
 
 
@@ -93,23 +97,29 @@ class AwsSpotService:
     def send_task_to_spot_worker_queue(self, task_payload: dict):
         """
         Spot 인스턴스 기반 워커가 읽는 SQS 큐에 처리 작업을 지시하는 메시지를 발행합니다.
-        task_payload는 워커가 받을 JSON 데이터입니다.
+        task_payload는 워커가 받을 JSON 데이터이며, task_payload["priority"]
+        (interactive / standard / bulk, 없으면 standard)에 해당하는 큐로 보냅니다.
         """
-        if not WORKER_SQS_QUEUE_URL:
+        try:
+            priority = normalize_priority(task_payload.get("priority") or DEFAULT_PRIORITY)
+        except ValueError as e:
+            return {"status": "failed", "error": str(e)}
+        queue_url = WORKER_TASK_QUEUE_URLS.get(priority)
+        if not queue_url:
              print("오류: SQS 큐 URL이 설정되지 않아 메시지를 보낼 수 없습니다.")
              return {"status": "failed", "error": "SQS_QUEUE_URL not configured"}
 
-        print(f"Spot 워커 SQS 큐 ({WORKER_SQS_QUEUE_URL})에 작업 전송 시도 (JSON 메시지)...")
-        # task_payload 예시: {"task_id": "...", "file_location": {...}, "processing_steps": [...], ...}
+        print(f"Spot 워커 SQS 큐 ({priority}: {queue_url})에 작업 전송 시도 (JSON 메시지)...")
+        # task_payload 예시: {"task_id": "...", "priority": "interactive", "file_location": {...}, ...}
         try:
             # MessageBody는 문자열이어야 하므로 JSON.dumps()로 직렬화
             response = sqs_client.send_message(
-                QueueUrl=WORKER_SQS_QUEUE_URL,
+                QueueUrl=queue_url,
                 MessageBody=json.dumps(task_payload)
             )
             message_id = response.get('MessageId')
             print(f"SQS 메시지 전송 성공: 메시지 ID = {message_id}")
-            return {"status": "task_sent_to_sqs", "message_id": message_id}
+            return {"status": "task_sent_to_sqs", "message_id": message_id, "priority": priority}
         except ClientError as e:
             print(f"SQS 메시지 전송 오류: {e}")
             return {"status": "failed", "error": str(e)}
@@ -117,11 +127,24 @@ class AwsSpotService:
             print(f"메시지 전송 중 예기치 않은 오류 발생: {e}")
             return {"status": "failed", "error": str(e)}
 
-    # TODO: Spot 인스턴스 요청/관리 코드는 AWS EC2 API를 사용하며, 여기에 추가될 수 있습니다.
-    # def request_spot_instance(...): ...
-    # def cancel_spot_request(...): ...
+    def create_autoscaler(self, group_name: str = None, provider=None):
+        """
+        작업 큐 적체량으로 Spot 워커 Auto Scaling 그룹 크기를 조정하는 컨트롤러를 만듭니다.
+        개별 Spot 인스턴스를 요청하는 대신 그룹의 DesiredCapacity만 바꾸고, 인스턴스 요청/교체는 그룹이 담당합니다.
+
+        :param group_name: Auto Scaling 그룹 이름 (없으면 SPOT_WORKER_ASG_NAME 환경 변수)
+        :param provider: CapacityProvider (테스트/시뮬레이션용, 지정하면 group_name 무시)
+        """
+        from .autoscaler import AutoScalingGroupProvider, AutoscalingController, SqsBacklogSource
+        if provider is None:
+            group_name = group_name or os.getenv("SPOT_WORKER_ASG_NAME")
+            if not group_name:
+                raise ValueError("SPOT_WORKER_ASG_NAME not configured")
+            provider = AutoScalingGroupProvider(group_name)
+        return AutoscalingController(provider, SqsBacklogSource(WORKER_TASK_QUEUE_URLS.values(), sqs_client=sqs_client))
 
 # 서비스 인스턴스 생성
 aws_spot_service = AwsSpotService()
+send_task_to_spot_worker_queue = aws_spot_service.send_task_to_spot_worker_queue # API 모듈에서 함수로 사용
 
 # backend/app/api/files.py 에서 이 서비스의 send_task_to_spot_worker_queue 함수를 호출합니다.
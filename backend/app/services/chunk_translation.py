@@ -0,0 +1,47 @@
+# backend/app/services/chunk_translation.py
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# 분할된 텍스트 청크를 동시에 번역합니다.
+# LLM 호출은 대부분 응답 대기 시간이므로 스레드로 겹쳐 실행하고,
+# 호출 속도는 translate_fn 안에서 공유 속도 제한기(rate_limiter.llm_rate_limiter)로 제어합니다.
+# 결과 목록은 완료 순서와 관계없이 원래 청크 순서를 유지합니다.
+
+TRANSLATION_MAX_CONCURRENCY = int(os.getenv("TRANSLATION_MAX_CONCURRENCY", "4"))
+
+
+def _translate_one(index: int, chunk: str, translate_fn) -> dict:
+    print(f"워커: 청크 {index + 1} 처리 시작...")
+    try:
+        translated = translate_fn(chunk)
+        print(f"워커: 청크 {index + 1} 처리 완료.")
+        return {"chunk_index": index, "original_chunk": chunk, "translated_chunk": translated.strip(),
+                "status": "success"}
+    except Exception as e:
+        if getattr(e, "deferred", False):
+            # 제공자 차단/재시도 예산 소진: 실패가 아니라 나중에 다시 처리할 청크
+            print(f"워커: 청크 {index + 1} 처리 보류 (나중에 재시도): {e}")
+            return {"chunk_index": index, "original_chunk": chunk, "translated_chunk": None,
+                    "status": "deferred", "error": str(e), "retry_at": getattr(e, "retry_at", None)}
+        print(f"워커: 청크 {index + 1} 처리 중 오류 발생: {e}")
+        return {"chunk_index": index, "original_chunk": chunk, "translated_chunk": None,
+                "status": "failed", "error": str(e)}
+
+
+def translate_chunks(chunks, translate_fn, max_concurrency: int = TRANSLATION_MAX_CONCURRENCY) -> list:
+    """
+    청크 목록을 최대 max_concurrency개씩 동시에 번역합니다.
+
+    :param chunks: 번역할 문자열 목록
+    :param translate_fn: 청크 하나를 받아 번역 문자열을 반환하는 함수 (재시도/속도 제한 포함)
+    :return: 청크 순서대로 [{"chunk_index", "original_chunk", "translated_chunk", "status", ("error")}, ...]
+             status: "success" | "failed" | "deferred" (제공자 차단으로 보류, "retry_at" 포함)
+    """
+    chunks = list(chunks)
+    workers = max(1, min(max_concurrency, len(chunks)))
+    if workers == 1:
+        return [_translate_one(i, chunk, translate_fn) for i, chunk in enumerate(chunks)]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="translate") as pool:
+        # map은 제출 순서대로 결과를 돌려주므로 청크 순서가 유지됨
+        return list(pool.map(_translate_one, range(len(chunks)), chunks, [translate_fn] * len(chunks)))
@@ -0,0 +1,170 @@
+# backend/app/services/form_analysis.py
+
+import numpy as np
+
+from .score_ir import assign_measures
+
+# 자기 유사도 행렬(Self-Similarity Matrix) 기반 형식 분석.
+# 1) 마디별 특징 벡터 (음이름 히스토그램 + 마디 내 리듬 위치 히스토그램)를 NumPy로 계산
+# 2) 대각선 주변 band 안에서만 마디 x 마디 코사인 유사도를 계산 (메모리 O(마디 수 x band))
+# 3) 체커보드 커널로 대각선을 따라 novelty 곡선을 구해 구간 경계를 찾고
+# 4) 구간 평균 특징끼리 비교하여 비슷한 구간에 같은 라벨(A, B, ...)을 붙입니다.
+
+RHYTHM_BINS = 16          # 마디 내 리듬 위치 해상도
+PITCH_WEIGHT = 1.0        # 특징 벡터에서 음이름 히스토그램 가중치
+RHYTHM_WEIGHT = 0.5       # 특징 벡터에서 리듬 히스토그램 가중치
+KERNEL_HALF_WIDTH = 4     # 체커보드 커널 반폭 (마디)
+MIN_SECTION_MEASURES = 4  # 최소 구간 길이 (마디)
+DEFAULT_BAND = 32         # 유사도 계산 band 반폭 (마디). 커널 폭 이상이어야 함
+LABEL_SIMILARITY = 0.85   # 구간 평균 특징의 코사인 유사도가 이 값 이상이면 같은 라벨
+
+
+def measure_features(score_ir):
+    """
+    마디별 특징 벡터를 계산합니다.
+
+    :return: (마디 번호 배열, L2 정규화된 특징 행렬 [마디 수 x (12 + RHYTHM_BINS)])
+    """
+    notes = score_ir.notes
+    if len(notes) == 0:
+        return np.zeros(0, dtype=np.int32), np.zeros((0, 12 + RHYTHM_BINS))
+
+    onsets = notes["onset"]
+    measures = notes["measure"]
+    if (measures < 0).any(): # 마디 정보가 없으면 박자표로 계산
+        measures = assign_measures(onsets, score_ir.time_signatures)
+    measure_numbers, measure_idx = np.unique(measures, return_inverse=True)
+    num_measures = len(measure_numbers)
+
+    # 음이름 히스토그램 (음 길이 가중)
+    pitch_hist = np.zeros((num_measures, 12))
+    np.add.at(pitch_hist, (measure_idx, notes["pitch"] % 12), notes["duration"])
+
+    # 리듬 프로필: 박자표 기준 마디 길이 안에서 음 시작 위치 분포
+    ts = score_ir.time_signatures
+    if len(ts):
+        ts_idx = np.clip(np.searchsorted(ts["onset"], onsets, side="right") - 1, 0, None)
+        measure_len = ts["numerator"][ts_idx] * 4.0 / ts["denominator"][ts_idx]
+        ts_onset = ts["onset"][ts_idx]
+    else:
+        measure_len = np.full(len(onsets), 4.0)
+        ts_onset = np.zeros(len(onsets))
+    position = np.mod(onsets - ts_onset, measure_len) / measure_len
+    rhythm_bin = np.minimum((position * RHYTHM_BINS).astype(np.intp), RHYTHM_BINS - 1)
+    rhythm_hist = np.zeros((num_measures, RHYTHM_BINS))
+    np.add.at(rhythm_hist, (measure_idx, rhythm_bin), 1.0)
+
+    features = np.hstack([PITCH_WEIGHT * _normalize_rows(pitch_hist), RHYTHM_WEIGHT * _normalize_rows(rhythm_hist)])
+    return measure_numbers.astype(np.int32), _normalize_rows(features)
+
+
+def banded_self_similarity(features, band: int = DEFAULT_BAND):
+    """
+    대각선에서 band 이내의 코사인 유사도만 계산합니다.
+
+    :return: [마디 수 x (2 * band + 1)] 배열. result[i, band + d] = sim(i, i + d), 범위 밖은 0
+    """
+    n = len(features)
+    result = np.zeros((n, 2 * band + 1))
+    for d in range(-band, band + 1):
+        lo, hi = max(0, -d), min(n, n - d)
+        if lo >= hi:
+            continue
+        result[lo:hi, band + d] = np.einsum("ij,ij->i", features[lo:hi], features[lo + d:hi + d])
+    return result
+
+
+def novelty_curve(banded_ssm, band: int, half_width: int = KERNEL_HALF_WIDTH):
+    """가우시안 테이퍼 체커보드 커널을 대각선을 따라 적용하여 novelty 곡선을 구합니다."""
+    n = len(banded_ssm)
+    half_width = min(half_width, band // 2)
+    offsets = np.arange(-half_width, half_width) + 0.5
+    taper = np.exp(-0.5 * (offsets / (0.5 * half_width)) ** 2)
+
+    novelty = np.zeros(n)
+    for a_i, a in enumerate(range(-half_width, half_width)):
+        for b_i, b in enumerate(range(-half_width, half_width)):
+            sign = 1.0 if (a < 0) == (b < 0) else -1.0 # 같은 쪽 블록 +, 교차 블록 -
+            weight = sign * taper[a_i] * taper[b_i]
+            # S[i + a, i + b] = banded[i + a, band + (b - a)]
+            rows = np.arange(n) + a
+            valid = (rows >= 0) & (rows < n) & (rows + (b - a) >= 0) & (rows + (b - a) < n)
+            novelty[valid] += weight * banded_ssm[rows[valid], band + (b - a)]
+    return np.maximum(novelty, 0.0)
+
+
+def pick_boundaries(novelty, min_length: int = MIN_SECTION_MEASURES):
+    """novelty 곡선의 국소 최대값 중 충분히 큰 값을 구간 경계(마디 인덱스)로 선택합니다."""
+    n = len(novelty)
+    if n < 2 * min_length:
+        return [0, n]
+    threshold = novelty.mean() + 0.5 * novelty.std()
+    is_peak = np.zeros(n, dtype=bool)
+    is_peak[1:-1] = (novelty[1:-1] >= novelty[:-2]) & (novelty[1:-1] > novelty[2:]) & (novelty[1:-1] > threshold)
+
+    boundaries = [0]
+    # 강한 peak부터 선택하되 최소 구간 길이를 지킴
+    for idx in sorted(np.flatnonzero(is_peak), key=lambda i: -novelty[i]):
+        if idx < min_length or n - idx < min_length:
+            continue
+        if all(abs(idx - b) >= min_length for b in boundaries[1:]):
+            boundaries.append(int(idx))
+    return sorted(boundaries) + [n]
+
+
+def label_sections(features, boundaries, threshold: float = LABEL_SIMILARITY):
+    """구간 평균 특징이 앞선 구간과 비슷하면 같은 라벨을, 아니면 새 라벨을 붙입니다."""
+    means = _normalize_rows(np.array([features[s:e].mean(axis=0) for s, e in zip(boundaries[:-1], boundaries[1:])]))
+    labels = []
+    representatives = [] # (라벨, 평균 특징)
+    for mean in means:
+        best_label, best_sim = None, threshold
+        for label, rep in representatives:
+            sim = float(mean @ rep)
+            if sim >= best_sim:
+                best_label, best_sim = label, sim
+        if best_label is None:
+            best_label = _label_name(len(representatives))
+            representatives.append((best_label, mean))
+        labels.append(best_label)
+    return labels
+
+
+def analyze_form(score_ir, band: int = DEFAULT_BAND) -> list:
+    """
+    악보의 형식 구간 목록을 반환합니다.
+
+    :return: [{"label": "A", "start": 시작 마디 번호, "end": 끝 마디 번호(미포함)}, ...]
+    """
+    measure_numbers, features = measure_features(score_ir)
+    if len(measure_numbers) == 0:
+        return []
+
+    band = max(band, 2 * KERNEL_HALF_WIDTH)
+    ssm = banded_self_similarity(features, band)
+    boundaries = pick_boundaries(novelty_curve(ssm, band))
+    labels = label_sections(features, boundaries)
+
+    sections = []
+    for label, start, end in zip(labels, boundaries[:-1], boundaries[1:]):
+        if sections and sections[-1]["label"] == label:
+            # 같은 라벨이 연속되면 하나의 구간으로 합침
+            sections[-1]["end"] = int(measure_numbers[end - 1]) + 1
+            continue
+        sections.append({
+            "label": label,
+            "start": int(measure_numbers[start]),
+            "end": int(measure_numbers[end - 1]) + 1,
+        })
+    return sections
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix, dtype=np.float64), where=norms > 0)
+
+
+def _label_name(index: int) -> str:
+    # A..Z 이후에는 A1, B1 ... 형식
+    letter = chr(ord("A") + index % 26)
+    return letter if index < 26 else f"{letter}{index // 26}"
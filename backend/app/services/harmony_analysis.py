@@ -0,0 +1,199 @@
+# backend/app/services/harmony_analysis.py
+
+import functools
+
+import numpy as np
+
+# 벡터화된 화성 분석 엔진.
+# 기존 analyze_harmony 단계는 화음마다 ch.root(), ch.quality(), pitchedCommonNames를 호출하여
+# 화음이 많은 악보에서 느렸습니다. 여기서는 경량 악보 표현(ScoreIR)의 음표 테이블에서
+# 각 동시 발음 구간(simultaneity)을 12비트 음이름 집합(pitch-class mask)으로 만들고,
+# 미리 계산해 둔 4096칸 룩업 테이블로 근음과 화음 형태를 한 번에 구합니다.
+#
+# 룩업 테이블은 music21 Chord의 근음 탐색(_findRoot)과 quality 규칙을 그대로 재현하여 만듭니다.
+# music21의 규칙은 음이름 표기(C#/D- 등)에 따라 결과가 달라지므로, 조표별로 5도권 창
+# [조표-3, 조표+8] 안의 표기를 사용하는 테이블을 따로 만들어 적용합니다.
+# (조표 0이면 music21 기본 표기 C# E- F# G# B-와 같습니다.)
+
+QUALITY_NAMES = ["major", "minor", "diminished", "augmented", "other"]
+_QUALITY_INDEX = {name: i for i, name in enumerate(QUALITY_NAMES)}
+
+NO_ROOT = -1
+
+
+def spell_pitch_class(pc: int, sharps: int = 0):
+    """
+    조표(sharps)에 맞게 음이름을 표기합니다.
+
+    :return: (5도권 위치, 음이름 단계 C=0..B=6, music21 형식 음이름 예: 'B-')
+    """
+    # 5도권 위치 q의 음높이는 7q mod 12 이므로 q = 7 * pc (mod 12)
+    fifths = sharps - 3 + (7 * pc - (sharps - 3)) % 12
+    letter = "FCGDAEB"[(fifths + 1) % 7]
+    alter = (fifths + 1) // 7
+    name = letter + ("#" * alter if alter > 0 else "-" * -alter)
+    return fifths, (4 * fifths) % 7, name
+
+
+def _mask_pitch_classes(mask: int):
+    return [pc for pc in range(12) if mask & (1 << pc)]
+
+
+def _find_root(pcs, steps):
+    """music21 Chord._findRoot()를 음이름 단계(steps) 기준으로 재현합니다."""
+    # 같은 단계(step)의 음은 먼저 나온 것만 사용 (music21 common.misc.unique와 동일)
+    non_duplicating = []
+    seen_steps = set()
+    for pc in pcs:
+        step = steps[pc]
+        if step not in seen_steps:
+            seen_steps.add(step)
+            non_duplicating.append(pc)
+
+    count = len(non_duplicating)
+    if count == 1:
+        return pcs[0]
+    if count == 7: # 13화음은 베이스가 근음
+        return pcs[0]
+
+    steps_to_pc = {steps[pc]: pc for pc in non_duplicating}
+    step_nums = sorted(steps_to_pc)
+
+    # 3도로 완전히 쌓인 경우 바로 결정
+    for start in range(count):
+        last = step_nums[start]
+        stacked = True
+        for end in range(start + 1, start + count):
+            step = step_nums[end % count]
+            if step - last not in (2, -5):
+                stacked = False
+                break
+            last = step
+        if stacked:
+            return steps_to_pc[step_nums[start]]
+
+    # 위로 3, 5, 7, 9, 11, 13도가 있는 정도로 점수를 매겨 최고점을 근음으로 선택
+    best_pc = non_duplicating[0]
+    best_score = -1.0
+    for pc in non_duplicating:
+        step = steps[pc]
+        score = 0.0
+        for rank, chord_step in enumerate((3, 5, 7, 2, 4, 6)):
+            if (step + chord_step - 1) % 7 in steps_to_pc:
+                score += 1 / (rank + 6)
+        if score > best_score:
+            best_pc, best_score = pc, score
+    return best_pc
+
+
+def _quality(pcs, steps, root_pc):
+    """music21 Chord.quality 규칙을 재현합니다."""
+    root_step = steps[root_pc]
+
+    def chord_step_semitones(chord_step):
+        # 해당 화음 단계에 속하는 음들의 근음으로부터의 반음 수 (등장 순서)
+        return [(pc - root_pc) % 12 for pc in pcs
+                if (steps[pc] - root_step) % 7 + 1 == chord_step]
+
+    def repeated(chord_step):
+        found = chord_step_semitones(chord_step)
+        return any(s != found[0] for s in found[1:]) if found else False
+
+    thirds = chord_step_semitones(3)
+    fifths = chord_step_semitones(5)
+    if not thirds:
+        return "other"
+    third = thirds[0]
+    if repeated(1) or repeated(3):
+        return "other"
+    if not fifths:
+        return {4: "major", 3: "minor"}.get(third, "other")
+    if repeated(5):
+        return "other"
+    return {(4, 7): "major", (3, 7): "minor", (4, 8): "augmented", (3, 6): "diminished"}.get((third, fifths[0]), "other")
+
+
+@functools.lru_cache(maxsize=None)
+def lookup_tables(sharps: int = 0):
+    """
+    조표별 4096칸 룩업 테이블을 만듭니다 (조표당 한 번, 약 0.1초).
+
+    :return: (근음 음높이 테이블 int8, quality 인덱스 테이블 uint8, 근음 이름 리스트)
+    """
+    spellings = [spell_pitch_class(pc, sharps) for pc in range(12)]
+    steps = [step for _, step, _ in spellings]
+    roots = np.full(4096, NO_ROOT, dtype=np.int8)
+    qualities = np.full(4096, _QUALITY_INDEX["other"], dtype=np.uint8)
+    for mask in range(1, 4096):
+        pcs = _mask_pitch_classes(mask)
+        root = _find_root(pcs, steps)
+        roots[mask] = root
+        qualities[mask] = _QUALITY_INDEX[_quality(pcs, steps, root)]
+    return roots, qualities, [name for _, _, name in spellings]
+
+
+def simultaneity_masks(notes):
+    """
+    음표 테이블에서 동시 발음 구간과 각 구간의 12비트 음이름 집합을 계산합니다.
+    구간 경계는 모든 음의 시작/끝 위치이며 (music21 chordify와 같은 분할), 쉼표 구간은 제외합니다.
+
+    :param notes: score_ir.NOTE_DTYPE 구조화 배열
+    :return: (구간 시작 위치 배열, 구간 길이 배열, uint16 마스크 배열)
+    """
+    if len(notes) == 0:
+        return np.zeros(0), np.zeros(0), np.zeros(0, dtype=np.uint16)
+
+    onsets = notes["onset"]
+    ends = onsets + notes["duration"]
+    boundaries = np.unique(np.concatenate([onsets, ends]))
+
+    start_idx = np.searchsorted(boundaries, onsets, side="left")
+    end_idx = np.searchsorted(boundaries, ends, side="left")
+    sounding = end_idx > start_idx # 길이 0인 음(꾸밈음 등)은 제외
+    pcs = (notes["pitch"][sounding] % 12).astype(np.intp)
+
+    # 음이름별 차분 배열 -> 누적합으로 각 구간에서 울리는 음 개수 계산
+    counts = np.zeros((12, len(boundaries)), dtype=np.int32)
+    np.add.at(counts, (pcs, start_idx[sounding]), 1)
+    np.add.at(counts, (pcs, end_idx[sounding]), -1)
+    active = np.cumsum(counts, axis=1)[:, :-1] > 0
+
+    weights = (1 << np.arange(12, dtype=np.uint16))[:, None]
+    masks = (active * weights).sum(axis=0).astype(np.uint16)
+
+    keep = masks != 0
+    return boundaries[:-1][keep], np.diff(boundaries)[keep], masks[keep]
+
+
+def analyze_harmony(score_ir) -> dict:
+    """
+    악보 전체의 화성을 분석하여 열(column) 단위 결과를 반환합니다.
+    화음마다 dict를 만드는 대신 같은 길이의 리스트들로 결과를 표현합니다.
+    """
+    offsets, durations, masks = simultaneity_masks(score_ir.notes)
+
+    # 각 구간에 적용되는 조표 (조표가 없으면 C장조/a단조로 간주)
+    key_sigs = score_ir.key_signatures
+    if len(key_sigs):
+        key_idx = np.clip(np.searchsorted(key_sigs["onset"], offsets, side="right") - 1, 0, None)
+        sharps = key_sigs["sharps"][key_idx]
+    else:
+        sharps = np.zeros(len(masks), dtype=np.int8)
+
+    root_names = np.empty(len(masks), dtype=object)
+    quality_names = np.empty(len(masks), dtype=object)
+    quality_lookup = np.array(QUALITY_NAMES, dtype=object)
+    for key in np.unique(sharps):
+        selected = sharps == key
+        roots, qualities, names = lookup_tables(int(key))
+        root_names[selected] = np.array(names, dtype=object)[roots[masks[selected]]]
+        quality_names[selected] = quality_lookup[qualities[masks[selected]]]
+
+    return {
+        "count": int(len(masks)),
+        "offsets": offsets.tolist(),
+        "durations": durations.tolist(),
+        "pitch_class_masks": masks.tolist(),
+        "roots": root_names.tolist(),
+        "qualities": quality_names.tolist(),
+    }
@@ -14,16 +14,31 @@ class LambdaService:
     """
     AWS Lambda 함수와 연동하는 클래스 예시
     """
-    def invoke_processing_lambda(self, payload: dict):
+    def invoke_processing_lambda(self, payload: dict, wait: bool = False):
         """
-        PDF 처리 Lambda 함수를 비동기적으로 호출합니다.
+        처리 Lambda 함수(app.lambda_entry.lambda_handler)를 호출합니다.
+
+        :param payload: process_task 작업 페이로드
+        :param wait: True이면 동기 호출 (RequestResponse)로 처리 결과를 기다려 반환, False이면 비동기 호출 (Event)
         """
         if not PROCESSING_LAMBDA_NAME:
             print("경고: PROCESSING_LAMBDA_NAME 환경 변수가 설정되지 않았습니다.")
             return None
 
-        print(f"Lambda 함수 ({PROCESSING_LAMBDA_NAME}) 호출 시도 (비동기)...")
+        print(f"Lambda 함수 ({PROCESSING_LAMBDA_NAME}) 호출 시도 ({'동기' if wait else '비동기'})...")
         try:
+            if wait:
+                response = lambda_client.invoke(
+                    FunctionName=PROCESSING_LAMBDA_NAME,
+                    InvocationType='RequestResponse',
+                    Payload=json.dumps(payload)
+                )
+                result = json.loads(response['Payload'].read() or b"null")
+                if response.get('FunctionError'): # 핸들러 예외: 결과는 errorMessage/errorType
+                    print(f"Lambda 함수 오류: {result}")
+                    return {"status": "failed", "response_code": response['StatusCode'], "error": result}
+                return {"status": "completed", "response_code": response['StatusCode'], "result": result}
+
             # InvocationType='Event'는 비동기 호출 (응답 기다리지 않음)
             # InvocationType='RequestResponse'는 동기 호출 (응답 기다림)
             response = lambda_client.invoke(
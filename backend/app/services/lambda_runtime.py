@@ -0,0 +1,119 @@
+# backend/app/services/lambda_runtime.py
+
+import json
+import os
+import threading
+import time
+
+# process_task를 함수형(Lambda) 방식으로 실행하는 진입점 도우미.
+# Lambda 실행 환경은 호출 사이에 재사용되므로 클라이언트/LLM 풀/캐시는 모듈 수준에 두고(웜 호출에서 재사용)
+# 무거운 라이브러리는 필요한 단계에서만 임포트합니다(lazy_imports) - 콜드 스타트에는 임포트 비용만 남습니다.
+# SQS 이벤트 소스의 배치는 메시지별로 처리하고, 실패한 메시지만 batchItemFailures로 돌려줍니다
+# (ReportBatchItemFailures 설정 필요 - 성공한 메시지는 삭제되고 실패한 메시지만 다시 보입니다).
+
+# 남은 실행 시간이 이보다 적으면 다음 메시지를 시작하지 않고 실패로 돌려줌 (다른 호출에서 재처리)
+LAMBDA_MIN_REMAINING_MS = int(os.getenv("LAMBDA_MIN_REMAINING_MS", "30000"))
+# 메시지를 실패로 돌려줄 작업 결과 상태 (보류/중단된 작업은 다시 처리해야 함)
+RETRY_STATUSES = {"failed", "deferred", "interrupted"}
+
+_MODULE_LOADED_AT = time.perf_counter()
+
+
+class InvocationStats:
+    """실행 환경별 호출 통계. 첫 호출이 콜드 스타트입니다."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {"invocations": 0, "cold_starts": 0, "records": 0, "failed_records": 0,
+                      "last_duration_ms": None, "init_ms": None}
+
+    def begin(self) -> bool:
+        """:return: 이번 호출이 콜드 스타트인지"""
+        with self._lock:
+            cold = self.stats["invocations"] == 0
+            self.stats["invocations"] += 1
+            if cold:
+                self.stats["cold_starts"] += 1
+                # 모듈 로드부터 첫 호출까지 (핸들러 모듈 임포트/초기화 시간의 근사값)
+                self.stats["init_ms"] = round((time.perf_counter() - _MODULE_LOADED_AT) * 1000, 1)
+            return cold
+
+    def end(self, duration_ms: float, records: int = 0, failed: int = 0):
+        with self._lock:
+            self.stats["last_duration_ms"] = round(duration_ms, 1)
+            self.stats["records"] += records
+            self.stats["failed_records"] += failed
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.stats)
+
+
+def is_sqs_event(event) -> bool:
+    records = event.get("Records") if isinstance(event, dict) else None
+    return bool(records) and all(record.get("eventSource") == "aws:sqs" for record in records)
+
+
+def _remaining_ms(context):
+    get_remaining = getattr(context, "get_remaining_time_in_millis", None)
+    return get_remaining() if get_remaining else None
+
+
+def process_sqs_batch(records: list, process, context=None, min_remaining_ms: int = LAMBDA_MIN_REMAINING_MS) -> dict:
+    """
+    SQS 레코드를 순서대로 처리하고 부분 배치 실패 응답을 만듭니다.
+
+    :param process: 작업 페이로드 dict -> 결과 dict (process_task)
+    :return: {"batchItemFailures": [{"itemIdentifier": messageId}, ...]}
+    """
+    failures = []
+    for index, record in enumerate(records):
+        remaining = _remaining_ms(context)
+        if remaining is not None and remaining < min_remaining_ms:
+            # 시간 안에 끝내지 못할 수 있으므로 남은 메시지는 모두 다시 보이게 함
+            print(f"Lambda: 남은 시간 {remaining}ms, 메시지 {len(records) - index}개를 다음 호출로 넘깁니다.")
+            failures.extend({"itemIdentifier": r["messageId"]} for r in records[index:])
+            break
+        try:
+            result = process(json.loads(record["body"]))
+            status = result.get("status") if isinstance(result, dict) else None
+            if status in RETRY_STATUSES:
+                print(f"Lambda: 메시지 {record['messageId']} 작업 상태 {status}, 다시 처리하도록 반환합니다.")
+                failures.append({"itemIdentifier": record["messageId"]})
+        except json.JSONDecodeError:
+            # 워커 루프와 같이 삭제하지 않음 (재시도 후 DLQ로 이동하도록 큐의 재처리 정책 설정)
+            print(f"Lambda: 오류: 유효하지 않은 JSON 메시지 본문: {record['body'][:100]}")
+            failures.append({"itemIdentifier": record["messageId"]})
+        except Exception as e:
+            print(f"Lambda: 메시지 {record['messageId']} 처리 중 오류: {e}")
+            failures.append({"itemIdentifier": record["messageId"]})
+    return {"batchItemFailures": failures}
+
+
+def make_handler(process, stats: InvocationStats = None):
+    """
+    process_task를 감싼 Lambda 핸들러를 만듭니다.
+     - SQS 이벤트: 부분 배치 실패 응답 ({"batchItemFailures": [...]})
+     - 직접 호출 (LambdaService.invoke_processing_lambda의 작업 페이로드): process 결과를 그대로 반환
+    """
+    stats = stats or InvocationStats()
+
+    def handler(event, context=None):
+        cold = stats.begin()
+        start = time.perf_counter()
+        records, failed = 0, 0
+        try:
+            if is_sqs_event(event):
+                records = len(event["Records"])
+                response = process_sqs_batch(event["Records"], process, context)
+                failed = len(response["batchItemFailures"])
+                return response
+            return process(event)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            stats.end(duration_ms, records, failed)
+            print(f"Lambda: {'콜드' if cold else '웜'} 호출 {duration_ms:.0f}ms"
+                  + (f" (초기화 {stats.snapshot()['init_ms']}ms)" if cold else "")
+                  + (f", 메시지 {records}개 중 실패 {failed}개" if records else ""))
+
+    handler.stats = stats
+    return handler
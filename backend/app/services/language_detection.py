@@ -0,0 +1,110 @@
+# backend/app/services/language_detection.py
+
+import collections
+import hashlib
+import os
+import threading
+import time
+
+# 번역 전 원본 언어 감지 (langdetect).
+# langdetect.detect()는 첫 호출 때 언어 프로필(약 55개 JSON)을 읽어 첫 작업이 느려지고,
+# 매번 무작위 시드로 결과가 달라질 수 있으며, 긴 텍스트 전체를 정리/분석합니다.
+# 여기서는 프로필을 워커 시작 시 한 번 읽은 전용 DetectorFactory를 사용하고(시드 0 고정),
+# 텍스트 곳곳에서 뽑은 제한된 길이의 표본만 분석하며, 텍스트 해시별 결과를 캐시합니다.
+
+LANGDETECT_SAMPLE_CHARS = int(os.getenv("LANGDETECT_SAMPLE_CHARS", "2000")) # 분석할 최대 글자 수
+LANGDETECT_SAMPLE_WINDOWS = 4  # 긴 텍스트에서 표본을 뽑는 구간 수 (앞부분만 보지 않도록 고르게)
+LANGDETECT_CACHE_ITEMS = int(os.getenv("LANGDETECT_CACHE_ITEMS", "1024"))
+LANGDETECT_SEED = 0
+MIN_TEXT_LENGTH = 10 # 이보다 짧으면 감지하지 않음 ("unknown")
+
+
+def sample_text(text: str, max_chars: int = LANGDETECT_SAMPLE_CHARS, windows: int = LANGDETECT_SAMPLE_WINDOWS) -> str:
+    """텍스트 전체에 고르게 걸친 구간들을 공백 경계에서 잘라 max_chars 이하의 표본으로 만듭니다."""
+    if len(text) <= max_chars:
+        return text
+    width = max_chars // windows
+    step = (len(text) - width) / max(windows - 1, 1)
+    pieces = []
+    for i in range(windows):
+        start = int(i * step)
+        piece = text[start:start + width]
+        if start > 0 and " " in piece: # 잘린 첫 단어 제거
+            piece = piece[piece.index(" ") + 1:]
+        if start + width < len(text) and " " in piece: # 잘린 마지막 단어 제거
+            piece = piece[:piece.rindex(" ")]
+        pieces.append(piece)
+    return "\n".join(pieces)
+
+
+class LanguageDetector:
+    """프로필을 미리 읽어 둔 결정적(시드 고정) 언어 감지기. 스레드 안전합니다."""
+    def __init__(self, sample_chars: int = LANGDETECT_SAMPLE_CHARS, cache_items: int = LANGDETECT_CACHE_ITEMS,
+                 seed: int = LANGDETECT_SEED):
+        self.sample_chars = sample_chars
+        self.cache_items = cache_items
+        self.seed = seed
+        self._factory = None
+        self._cache = collections.OrderedDict() # 텍스트 해시 -> 언어 코드
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "cache_hits": 0, "detections": 0, "detect_seconds": 0.0, "warm_seconds": 0.0}
+
+    def warm(self):
+        """언어 프로필을 읽어 둡니다 (워커 시작 시 호출). 이미 읽었으면 아무것도 하지 않습니다."""
+        if self._factory is not None:
+            return self._factory
+        with self._lock:
+            if self._factory is None:
+                start = time.perf_counter()
+                from langdetect.detector_factory import PROFILES_DIRECTORY, DetectorFactory
+                factory = DetectorFactory()
+                factory.load_profile(PROFILES_DIRECTORY)
+                factory.seed = self.seed # 같은 텍스트는 항상 같은 결과
+                self._factory = factory
+                self.stats["warm_seconds"] = time.perf_counter() - start
+                print(f"워커: 언어 감지 프로필 {len(factory.langlist)}개 로드 ({self.stats['warm_seconds']:.2f}초)")
+        return self._factory
+
+    def detect(self, text: str) -> str:
+        """
+        텍스트의 원본 언어 코드(예: "ko", "en")를 반환합니다. 감지할 수 없으면 "unknown".
+        """
+        self.stats["calls"] += 1
+        if not text or len(text.strip()) < MIN_TEXT_LENGTH: # 텍스트가 너무 짧으면 감지 오류 발생 가능성 높음
+            return "unknown"
+        key = hashlib.sha256(text.encode("utf-8")).digest()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                return cached
+
+        start = time.perf_counter()
+        try:
+            detector = self.warm().create()
+            detector.append(sample_text(text, self.sample_chars))
+            language = detector.detect()
+        except ImportError:
+            print("워커: langdetect가 설치되어 있지 않아 언어를 감지할 수 없습니다.")
+            return "unknown"
+        except Exception as e: # LangDetectException (특징 없음 등)
+            print(f"워커: 언어 감지 오류 발생: {e}")
+            language = "unknown"
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.stats["detections"] += 1
+            self.stats["detect_seconds"] += elapsed
+            self._cache[key] = language
+            while len(self._cache) > self.cache_items:
+                self._cache.popitem(last=False)
+        return language
+
+
+# 워커 프로세스에서 공유하는 언어 감지기
+language_detector = LanguageDetector()
+
+
+def detect_language(text: str) -> str:
+    return language_detector.detect(text)
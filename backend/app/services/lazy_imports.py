@@ -0,0 +1,122 @@
+# backend/app/services/lazy_imports.py
+
+import importlib
+import os
+import sys
+import threading
+import time
+
+# 워커의 무거운 라이브러리 지연 로드.
+# 기존 worker.py는 langchain/langchain_openai/music21/mido/pdfminer를 모듈 맨 위에서 임포트해서
+# MIDI만 다루는 워커도 시작할 때마다 수 초의 임포트 시간과 수백 MB의 메모리를 썼습니다.
+# 여기서는 모듈을 처음 속성에 접근할 때 임포트하고(lazy_import), 단계 타입별로 필요한 모듈을 정리해
+# 워커 시작 시 미리 임포트할 목록(WORKER_PREWARM)을 선택할 수 있게 합니다.
+# 빠른 확장(새 Spot 워커)과 Lambda 실행 방식에서 시작 시간이 줄어듭니다.
+
+# 시작 시 미리 임포트할 단계 타입/모듈 (쉼표 구분), 예: "translate_to_shakespearean,music21" 또는 "all"
+WORKER_PREWARM = os.getenv("WORKER_PREWARM", "")
+
+# 단계 타입별로 처음 실행할 때 임포트되는 무거운 모듈
+STEP_MODULES = {
+    "extract_music_data": ("music21.converter", "music21.stream", "mido", "pdfminer.high_level"),
+    "extract_text_from_score": ("music21.stream", "mido"),
+    "translate_to_shakespearean": ("langchain.prompts", "langchain.chains", "langchain_openai", "langdetect"),
+    "generate_music_file": ("music21.stream", "mido"),
+}
+
+
+class LazyModule:
+    """처음 속성에 접근할 때 모듈을 임포트하는 대리 객체."""
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """이미 (어디서든) 임포트되었는지. 임포트를 일으키지 않습니다."""
+        return self._module is not None or self._name in sys.modules
+
+    def load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = _import(self._name)
+        return self._module
+
+    def __getattr__(self, attribute: str):
+        return getattr(self.load(), attribute)
+
+    def __repr__(self) -> str:
+        return f"<LazyModule {self._name} ({'loaded' if self.loaded else 'not loaded'})>"
+
+
+_modules = {}
+_stats_lock = threading.Lock()
+import_seconds = {} # 모듈 이름 -> 이 모듈이 임포트한 시간 (초)
+
+
+def _import(name: str):
+    already = name in sys.modules
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    if not already:
+        with _stats_lock:
+            import_seconds[name] = time.perf_counter() - start
+    return module
+
+
+def lazy_import(name: str) -> LazyModule:
+    """모듈 이름별로 하나의 LazyModule을 반환합니다."""
+    with _stats_lock:
+        if name not in _modules:
+            _modules[name] = LazyModule(name)
+        return _modules[name]
+
+
+def instance_of(obj, module: LazyModule, class_name: str) -> bool:
+    """
+    isinstance(obj, module.<class_name>). 모듈이 아직 임포트되지 않았다면 obj가 그 클래스의 인스턴스일 수 없으므로
+    임포트하지 않고 False를 반환합니다 (MIDI 작업이 music21 Stream 확인만으로 music21을 임포트하지 않도록).
+    """
+    return module.loaded and isinstance(obj, getattr(module, class_name))
+
+
+def prewarm_modules(spec) -> list:
+    """
+    "translate_to_shakespearean,music21" 또는 ["all"] -> 임포트할 모듈 이름 목록 (순서 유지, 중복 제거)
+    단계 타입은 STEP_MODULES로 펼치고, 그 외 이름은 모듈 이름으로 취급합니다.
+    """
+    names = [item.strip() for item in spec.split(",")] if isinstance(spec, str) else list(spec)
+    modules = []
+    for name in filter(None, names):
+        if name == "all":
+            expanded = [module for step_modules in STEP_MODULES.values() for module in step_modules]
+        else:
+            expanded = STEP_MODULES.get(name, (name,))
+        modules.extend(module for module in expanded if module not in modules)
+    return modules
+
+
+def prewarm(spec=WORKER_PREWARM) -> dict:
+    """
+    목록의 모듈을 미리 임포트합니다. 설치되지 않은 모듈은 건너뜁니다 (해당 단계를 실행할 때 오류).
+
+    :return: {"modules": {이름: 임포트 시간(초)}, "missing": [이름, ...]}
+    """
+    result = {"modules": {}, "missing": []}
+    for name in prewarm_modules(spec):
+        start = time.perf_counter()
+        try:
+            lazy_import(name).load()
+        except ImportError:
+            result["missing"].append(name)
+            continue
+        result["modules"][name] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def snapshot() -> dict:
+    with _stats_lock:
+        return {"loaded": sorted(name for name, module in _modules.items() if module.loaded),
+                "import_seconds": {name: round(seconds, 4) for name, seconds in import_seconds.items()}}
@@ -0,0 +1,143 @@
+# backend/app/services/llm_pool.py
+
+import os
+import threading
+
+# 워커 프로세스에서 공유하는 LLM 클라이언트 풀.
+# 작업마다 ChatOpenAI/LLMChain을 새로 만들면 내부 HTTP 클라이언트도 새로 만들어져
+# keep-alive 연결을 잃고 매번 TCP/TLS 연결부터 다시 맺습니다.
+# 여기서는 (모델, temperature)별 LLM 인스턴스와 (프롬프트, 모델, temperature)별 체인을 한 번만 만들고,
+# 모든 인스턴스가 하나의 httpx.Client(스레드 안전, 연결 풀)를 함께 사용합니다.
+
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "20"))
+LLM_HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "10"))
+LLM_HTTP_KEEPALIVE_SECONDS = float(os.getenv("LLM_HTTP_KEEPALIVE_SECONDS", "60"))
+LLM_HTTP_TIMEOUT_SECONDS = float(os.getenv("LLM_HTTP_TIMEOUT_SECONDS", "120"))
+# 워커 시작 시 미리 만들 클라이언트 목록, 예: "gpt-3.5-turbo:0.7,gpt-4o:0.2"
+LLM_POOL_WARM = os.getenv("LLM_POOL_WARM", "")
+LLM_POOL_WARM_CONNECT = os.getenv("LLM_POOL_WARM_CONNECT", "true").lower() == "true" # 시작 시 연결까지 맺어 둘지
+# 워커 시작 시 클라이언트를 미리 만들지 (langchain 임포트 포함, 번역을 하지 않는 워커는 false로 시작 시간 단축)
+LLM_POOL_WARM_ON_START = os.getenv("LLM_POOL_WARM_ON_START", "true").lower() == "true"
+
+
+def create_http_client():
+    """LLM 호출이 공유할 httpx 연결 풀."""
+    import httpx
+    return httpx.Client(
+        limits=httpx.Limits(max_connections=LLM_HTTP_MAX_CONNECTIONS,
+                            max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE,
+                            keepalive_expiry=LLM_HTTP_KEEPALIVE_SECONDS),
+        timeout=LLM_HTTP_TIMEOUT_SECONDS,
+    )
+
+
+def create_chat_openai(model: str, temperature: float, http_client):
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model=model, temperature=temperature, http_client=http_client)
+
+
+def parse_warm_spec(spec: str) -> list:
+    """ "gpt-3.5-turbo:0.7,gpt-4o" -> [("gpt-3.5-turbo", 0.7), ("gpt-4o", 0.7)] """
+    result = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        model, _, temperature = item.partition(":")
+        result.append((model.strip(), float(temperature) if temperature else 0.7))
+    return result
+
+
+class LLMClientPool:
+    """
+    (모델, temperature)별 LLM 인스턴스와 프롬프트별 체인을 재사용합니다.
+    생성은 잠금으로 한 번만 일어나고, 만들어진 인스턴스는 여러 스레드가 동시에 사용합니다.
+    """
+    def __init__(self, factory=create_chat_openai, http_client_factory=create_http_client):
+        self._factory = factory
+        self._http_client_factory = http_client_factory
+        self._http_client = None
+        self._clients = {}
+        self._chains = {}
+        self._lock = threading.Lock()
+        self.stats = {"clients_created": 0, "chains_created": 0, "hits": 0, "warm_connections": 0}
+
+    @property
+    def http_client(self):
+        if self._http_client is None:
+            with self._lock:
+                if self._http_client is None:
+                    self._http_client = self._http_client_factory()
+        return self._http_client
+
+    def get(self, model: str, temperature: float = 0.7):
+        """공유 LLM 인스턴스를 반환합니다 (없으면 생성)."""
+        key = (model, float(temperature))
+        client = self._clients.get(key)
+        if client is not None:
+            self.stats["hits"] += 1
+            return client
+        http_client = self.http_client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._factory(model, float(temperature), http_client)
+                self._clients[key] = client
+                self.stats["clients_created"] += 1
+        return client
+
+    def get_chain(self, template: str, model: str, temperature: float = 0.7,
+                  input_variables: tuple = ("original_text",)):
+        """프롬프트 템플릿 문자열로 공유 LLMChain을 반환합니다 (없으면 생성)."""
+        key = (template, tuple(input_variables), model, float(temperature))
+        chain = self._chains.get(key)
+        if chain is not None:
+            self.stats["hits"] += 1
+            return chain
+        llm = self.get(model, temperature)
+        from langchain.chains import LLMChain
+        from langchain.prompts import PromptTemplate
+        with self._lock:
+            chain = self._chains.get(key)
+            if chain is None:
+                prompt = PromptTemplate(input_variables=list(input_variables), template=template)
+                chain = LLMChain(llm=llm, prompt=prompt)
+                self._chains[key] = chain
+                self.stats["chains_created"] += 1
+        return chain
+
+    def warm(self, specs=None, connect: bool = LLM_POOL_WARM_CONNECT, base_url: str = None):
+        """
+        워커 시작 시 클라이언트를 미리 만들고, connect이면 제공자에 연결을 하나 맺어 둡니다.
+        실패해도 워커 시작은 계속합니다 (첫 요청에서 다시 연결).
+
+        :param specs: [(모델, temperature), ...] (기본: LLM_POOL_WARM)
+        """
+        specs = parse_warm_spec(LLM_POOL_WARM) if specs is None else specs
+        for model, temperature in specs:
+            try:
+                self.get(model, temperature)
+                print(f"워커: LLM 클라이언트 준비 완료 ({model}, temperature={temperature})")
+            except Exception as e:
+                print(f"워커: LLM 클라이언트 준비 실패 ({model}): {e}")
+        if connect and specs:
+            base_url = base_url or os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+            try:
+                # 가벼운 모델 목록 요청으로 TCP/TLS 연결을 열어 keep-alive 풀에 남겨 둠
+                self.http_client.get(f"{base_url.rstrip('/')}/models",
+                                     headers={"Authorization": f"Bearer {os.getenv('OPENAI_API_KEY', '')}"})
+                self.stats["warm_connections"] += 1
+            except Exception as e:
+                print(f"워커: LLM 연결 예열 실패 (첫 요청에서 연결): {e}")
+
+    def close(self):
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+                self._http_client = None
+            self._clients.clear()
+            self._chains.clear()
+
+
+# 워커 프로세스에서 공유하는 LLM 클라이언트 풀
+llm_pool = LLMClientPool()
@@ -0,0 +1,249 @@
+# backend/app/services/llm_resilience.py
+
+import collections
+import email.utils
+import os
+import random
+import threading
+import time
+
+# 워커 프로세스 전체에서 공유하는 LLM 호출 재시도/차단 계층.
+# 스레드마다 고정 지수 대기로 재시도하면 제공자 장애(brownout) 시 재시도가 부하를 몇 배로 키웁니다.
+# - Retry-After(retry-after-ms) 헤더가 있으면 그 시간만큼 기다림
+# - 전역 재시도 예산: 최근 호출 수의 일정 비율까지만 재시도 허용
+# - 서킷 브레이커: 연속 실패가 쌓이면 일정 시간 호출을 즉시 거절(CircuitOpenError)하고,
+#   호출한 쪽은 해당 청크를 나중에 다시 처리하도록 "deferred"로 표시합니다.
+
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "3"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "10"))
+LLM_MAX_RETRY_AFTER_SECONDS = float(os.getenv("LLM_MAX_RETRY_AFTER_SECONDS", "30")) # 더 길면 기다리지 않고 차단
+LLM_RETRY_BUDGET_RATIO = float(os.getenv("LLM_RETRY_BUDGET_RATIO", "0.2"))        # 최근 호출 수 대비 재시도 비율
+LLM_RETRY_BUDGET_MIN = int(os.getenv("LLM_RETRY_BUDGET_MIN", "5"))                 # 호출이 적을 때 최소 허용 재시도 수
+LLM_RETRY_BUDGET_WINDOW_SECONDS = float(os.getenv("LLM_RETRY_BUDGET_WINDOW_SECONDS", "60"))
+LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5")) # 연속 실패 수
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))       # 차단 유지 시간
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+_TRANSIENT_ERROR_NAMES = ("Timeout", "Connection", "RateLimit", "InternalServer", "ServiceUnavailable")
+
+
+class CircuitOpenError(Exception):
+    """제공자가 불안정하여 호출하지 않았음. deferred=True: 호출한 쪽이 나중에 다시 시도해야 함."""
+    deferred = True
+
+    def __init__(self, retry_at: float, message: str = None):
+        self.retry_at = retry_at
+        super().__init__(message or f"LLM 제공자 차단 중 ({max(0.0, retry_at - time.time()):.0f}초 후 재시도 가능)")
+
+
+class RetryBudgetExhausted(Exception):
+    """전역 재시도 예산을 모두 사용하여 더 재시도하지 않음."""
+    deferred = True
+
+    def __init__(self, cause: Exception):
+        self.cause = cause
+        self.retry_at = time.time() + LLM_BACKOFF_MAX_SECONDS
+        super().__init__(f"LLM 재시도 예산 소진: {cause}")
+
+
+def status_code_of(exc: Exception):
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def retry_after_seconds(exc: Exception):
+    """예외에 붙은 HTTP 응답의 retry-after-ms / Retry-After(초 또는 HTTP 날짜) 값. 없으면 None."""
+    headers = getattr(getattr(exc, "response", None), "headers", None) or getattr(exc, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000.0)
+        except ValueError:
+            pass
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(exc: Exception) -> bool:
+    """일시적 오류(429, 5xx, 시간 초과, 연결 오류)만 재시도합니다. 400 등 요청 오류는 재시도하지 않습니다."""
+    status = status_code_of(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    return any(name in type(exc).__name__ for name in _TRANSIENT_ERROR_NAMES) or isinstance(exc, (TimeoutError, ConnectionError))
+
+
+class RetryBudget:
+    """최근 window초 동안의 재시도 수를 max(minimum, ratio x 호출 수) 이하로 제한합니다."""
+    def __init__(self, ratio: float = LLM_RETRY_BUDGET_RATIO, minimum: int = LLM_RETRY_BUDGET_MIN,
+                 window_seconds: float = LLM_RETRY_BUDGET_WINDOW_SECONDS):
+        self.ratio = ratio
+        self.minimum = minimum
+        self.window = window_seconds
+        self._calls = collections.deque()
+        self._retries = collections.deque()
+        self._lock = threading.Lock()
+
+    def _trim(self, now):
+        for events in (self._calls, self._retries):
+            while events and now - events[0] > self.window:
+                events.popleft()
+
+    def record_call(self):
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            self._calls.append(now)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            if len(self._retries) >= max(self.minimum, self.ratio * len(self._calls)):
+                return False
+            self._retries.append(now)
+            return True
+
+
+class CircuitBreaker:
+    """
+    closed: 정상 / open: 즉시 거절 / half_open: 차단 시간이 지나 시험 호출 하나만 허용.
+    시험 호출이 성공하면 closed, 실패하면 다시 open.
+    """
+    def __init__(self, failure_threshold: int = LLM_BREAKER_FAILURE_THRESHOLD,
+                 reset_seconds: float = LLM_BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.open_until = 0.0 # time.time() 기준
+        self.opened_count = 0
+        self._failures = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """호출해도 되는지 확인합니다. :raises CircuitOpenError: 차단 중"""
+        with self._lock:
+            if self.state == "closed":
+                return
+            if self.state == "open" and time.time() >= self.open_until:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            raise CircuitOpenError(max(self.open_until, time.time() + 1.0))
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                self._open(self.reset_seconds)
+
+    def trip(self, seconds: float):
+        """Retry-After가 너무 길 때 등 즉시 차단합니다."""
+        with self._lock:
+            self._open(seconds)
+
+    def _open(self, seconds):
+        if self.state != "open":
+            self.opened_count += 1
+        self.state = "open"
+        self.open_until = max(self.open_until, time.time() + seconds)
+        self._probe_in_flight = False
+
+
+class LLMResilience:
+    """재시도 예산 + 서킷 브레이커 + Retry-After를 적용하여 LLM 호출 함수를 실행합니다."""
+    def __init__(self, max_attempts: int = LLM_MAX_ATTEMPTS, budget: RetryBudget = None,
+                 breaker: CircuitBreaker = None, sleep=time.sleep):
+        self.max_attempts = max_attempts
+        self.budget = budget or RetryBudget()
+        self.breaker = breaker or CircuitBreaker()
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "successes": 0, "failures": 0, "retries": 0, "retry_after_honored": 0,
+                      "budget_exhausted": 0, "circuit_rejections": 0}
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def backoff_seconds(self, attempt: int) -> float:
+        # 전체 지터(full jitter): 여러 스레드가 같은 시각에 다시 몰리지 않도록
+        return random.uniform(0, min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1)))
+
+    def call(self, fn, *args, **kwargs):
+        """
+        fn(*args, **kwargs)를 실행합니다.
+
+        :raises CircuitOpenError: 차단 중이거나 Retry-After가 LLM_MAX_RETRY_AFTER_SECONDS보다 긴 경우 (deferred)
+        :raises RetryBudgetExhausted: 재시도 예산이 없어 포기한 경우 (deferred)
+        :raises Exception: 재시도할 수 없는 오류 또는 마지막 시도의 오류
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                self._count("circuit_rejections")
+                raise
+            self.budget.record_call()
+            self._count("calls")
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self._count("failures")
+                if not is_retryable(e):
+                    self.breaker.record_success() # 요청 자체의 오류는 제공자 상태와 무관
+                    raise
+                self.breaker.record_failure()
+                retry_after = retry_after_seconds(e)
+                if retry_after is not None and retry_after > LLM_MAX_RETRY_AFTER_SECONDS:
+                    self.breaker.trip(retry_after)
+                    raise CircuitOpenError(time.time() + retry_after) from e
+                if attempt == self.max_attempts:
+                    raise
+                if not self.budget.try_spend():
+                    self._count("budget_exhausted")
+                    raise RetryBudgetExhausted(e) from e
+                if retry_after is not None:
+                    self._count("retry_after_honored")
+                    wait = retry_after
+                else:
+                    wait = self.backoff_seconds(attempt)
+                self._count("retries")
+                print(f"워커: LLM 호출 실패 ({e}), {wait:.1f}초 후 재시도 ({attempt}/{self.max_attempts})")
+                self._sleep(wait)
+                continue
+            self.breaker.record_success()
+            self._count("successes")
+            return result
+
+    def snapshot(self) -> dict:
+        """내보내기용 카운터 (브레이커 상태 포함)."""
+        with self._lock:
+            counters = dict(self.stats)
+        counters.update({"circuit_state": self.breaker.state, "circuit_opened": self.breaker.opened_count})
+        return counters
+
+
+# 워커 프로세스에서 공유하는 LLM 재시도/차단 계층
+llm_resilience = LLMResilience()
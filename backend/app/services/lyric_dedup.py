@@ -0,0 +1,128 @@
+# backend/app/services/lyric_dedup.py
+
+import os
+
+from .translation_cache import normalize_text
+
+# 번역 전 반복 가사 제거.
+# 가사는 후렴/반복 구절이 많아 전체 텍스트를 그대로 청크로 나누면 같은 구절을 여러 번 번역합니다.
+# 여기서는 텍스트를 줄 단위로 보고 두 줄 이상 반복되는 구간의 경계에서 텍스트를 세그먼트로 자른 뒤,
+# 같은 세그먼트는 한 번만 남기고 원래 순서를 세그먼트 번호 목록(layout, 역참조 맵)으로 기록합니다.
+# 고유 세그먼트만 번역한 뒤 layout 순서대로 이어 붙이면 전체 번역문이 복원됩니다.
+
+DEDUP_MIN_BLOCK_LINES = int(os.getenv("DEDUP_MIN_BLOCK_LINES", "2"))       # 반복으로 볼 최소 줄 수
+DEDUP_MIN_SAVED_RATIO = float(os.getenv("DEDUP_MIN_SAVED_RATIO", "0.1"))   # 이보다 적게 줄면 원문 그대로 번역
+
+
+class DedupedText:
+    """고유 세그먼트 목록과 원래 순서(layout: 세그먼트 번호 목록)."""
+    def __init__(self, segments: list, layout: list, original_chars: int):
+        self.segments = segments
+        self.layout = layout
+        self.original_chars = original_chars
+
+    @property
+    def unique_chars(self) -> int:
+        return sum(len(segment) for segment in self.segments)
+
+    @property
+    def saved_ratio(self) -> float:
+        """번역할 글자 수가 원문 대비 줄어든 비율 (0이면 반복 없음)."""
+        if not self.original_chars:
+            return 0.0
+        return max(0.0, 1.0 - self.unique_chars / self.original_chars)
+
+    def expand(self, translated_segments: list) -> str:
+        """세그먼트별 번역 결과를 원래 순서대로 이어 붙입니다."""
+        if len(translated_segments) != len(self.segments):
+            raise ValueError("번역 결과 수가 고유 세그먼트 수와 다릅니다.")
+        return "\n".join(translated_segments[index].strip("\n") for index in self.layout)
+
+    def summary(self) -> dict:
+        return {"unique_segments": len(self.segments), "segments_in_text": len(self.layout),
+                "original_chars": self.original_chars, "unique_chars": self.unique_chars,
+                "saved_ratio": round(self.saved_ratio, 3)}
+
+
+def _find_repeats(keys: list, min_lines: int) -> list:
+    """
+    앞에서부터 훑으며 이전에 나온 구간과 같은 가장 긴 구간을 찾습니다 (겹치지 않는 구간만).
+
+    :return: [(이전 시작, 반복 시작, 줄 수), ...]
+    """
+    positions = {} # 줄 키 -> 그 줄이 나온 위치 목록
+    repeats = []
+    i = 0
+    while i < len(keys):
+        best_start, best_length = -1, 0
+        for j in positions.get(keys[i], ()):
+            length = 0
+            while i + length < len(keys) and j + length < i and keys[j + length] == keys[i + length]:
+                length += 1
+            if length > best_length:
+                best_start, best_length = j, length
+        if best_length >= min_lines:
+            repeats.append((best_start, i, best_length))
+            step = best_length
+        else:
+            step = 1
+        for position in range(i, i + step):
+            positions.setdefault(keys[position], []).append(position)
+        i += step
+    return repeats
+
+
+def dedupe_lines(text: str, min_block_lines: int = DEDUP_MIN_BLOCK_LINES) -> DedupedText:
+    """
+    반복되는 줄 구간을 고유 세그먼트로 모읍니다.
+
+    :return: DedupedText (segments: 고유 세그먼트 문자열 목록, layout: 원래 순서의 세그먼트 번호 목록)
+    """
+    lines = text.splitlines()
+    keys = [normalize_text(line) for line in lines]
+    repeats = _find_repeats(keys, max(1, min_block_lines))
+
+    # 반복 구간의 시작/끝에서 자르고, 한쪽에 생긴 경계는 짝이 되는 구간에도 똑같이 반영
+    cuts = {0, len(lines)}
+    for source, target, length in repeats:
+        cuts.update((source, source + length, target, target + length))
+    changed = True
+    while changed:
+        changed = False
+        for source, target, length in repeats:
+            for cut in list(cuts):
+                for start, other in ((source, target), (target, source)):
+                    if start < cut < start + length and other + (cut - start) not in cuts:
+                        cuts.add(other + (cut - start))
+                        changed = True
+
+    boundaries = sorted(cuts)
+    segments, layout, index_by_key = [], [], {}
+    for start, end in zip(boundaries, boundaries[1:]):
+        key = "\n".join(keys[start:end])
+        if key not in index_by_key:
+            index_by_key[key] = len(segments)
+            segments.append("\n".join(lines[start:end]))
+        layout.append(index_by_key[key])
+    return _merge_single_use(segments, layout, len(text))
+
+
+def _merge_single_use(segments: list, layout: list, original_chars: int) -> DedupedText:
+    # 한 번만 쓰이는 세그먼트가 연달아 있으면 하나로 합쳐 번역 단위가 잘게 쪼개지지 않도록 함
+    uses = [0] * len(segments)
+    for index in layout:
+        uses[index] += 1
+    merged_segments, merged_layout, remap = [], [], {}
+    previous_single = False
+    for index in layout:
+        single = uses[index] == 1
+        if single and previous_single:
+            merged_segments[-1] += "\n" + segments[index]
+        elif index in remap:
+            merged_layout.append(remap[index])
+        else:
+            remap[index] = len(merged_segments)
+            merged_segments.append(segments[index])
+            merged_layout.append(remap[index])
+        previous_single = single
+    return DedupedText(merged_segments, merged_layout, original_chars)
@@ -0,0 +1,124 @@
+# backend/app/services/midi_text_scan.py
+
+import struct
+
+# MIDI 파일에서 텍스트 메타 이벤트(가사, 마커 등)만 골라내는 스트리밍 스캐너.
+# mido.MidiFile은 모든 트랙의 모든 메시지를 객체로 만들기 때문에 음표가 대부분인
+# 큰 MIDI 파일에서는 텍스트만 필요한 작업에도 파싱 비용이 큽니다.
+# 여기서는 MTrk 청크를 하나씩 읽으며 채널 메시지는 길이만큼 건너뛰고
+# (running status 포함) 메타 이벤트만 디코딩합니다.
+
+# 추출 대상 메타 이벤트 타입 -> mido 메시지 타입 이름
+TEXT_META_TYPES = {
+    0x01: "text",
+    0x02: "copyright",
+    0x05: "lyrics",
+    0x06: "marker",
+    0x07: "cue_marker",
+}
+
+DEFAULT_CHARSET = "latin1" # mido 기본 메타 문자셋과 동일
+
+# 상태 바이트 상위 4비트별 채널 메시지 데이터 길이
+_CHANNEL_DATA_LENGTH = {0x80: 2, 0x90: 2, 0xA0: 2, 0xB0: 2, 0xC0: 1, 0xD0: 1, 0xE0: 2}
+# 시스템 공통/실시간 메시지 데이터 길이 (0xF0, 0xF7, 0xFF는 별도 처리)
+_SYSTEM_DATA_LENGTH = {0xF1: 1, 0xF2: 2, 0xF3: 1}
+
+
+def _read_varlen(data, pos: int):
+    value = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value = (value << 7) | (byte & 0x7F)
+        if byte < 0x80:
+            return value, pos
+
+
+def scan_track(data, track_index: int, meta_types=TEXT_META_TYPES, charset: str = DEFAULT_CHARSET) -> list:
+    """
+    MTrk 청크 본문에서 텍스트 메타 이벤트를 찾습니다.
+
+    :param data: MTrk 청크 본문 (bytes)
+    :return: [{"track": 트랙 번호, "time": delta tick, "type": mido 타입 이름, "text": 텍스트}, ...]
+    """
+    events = []
+    pos = 0
+    size = len(data)
+    last_status = None
+    while pos < size:
+        delta, pos = _read_varlen(data, pos)
+        status = data[pos]
+        pos += 1
+
+        if status == 0xFF: # 메타 이벤트 (running status를 바꾸지 않음)
+            meta_type = data[pos]
+            length, pos = _read_varlen(data, pos + 1)
+            name = meta_types.get(meta_type)
+            if name is not None:
+                events.append({
+                    "track": track_index,
+                    "time": delta,
+                    "type": name,
+                    "text": bytes(data[pos:pos + length]).decode(charset),
+                })
+            pos += length
+            continue
+
+        if status < 0x80: # running status: 이 바이트는 첫 데이터 바이트
+            if last_status is None:
+                raise ValueError(f"트랙 {track_index}: 이전 상태 바이트 없이 running status 사용")
+            status = last_status
+            pos -= 1
+        else:
+            last_status = status
+
+        if status in (0xF0, 0xF7): # SysEx: 가변 길이
+            length, pos = _read_varlen(data, pos)
+            pos += length
+        elif status < 0xF0:
+            pos += _CHANNEL_DATA_LENGTH[status & 0xF0]
+        else:
+            pos += _SYSTEM_DATA_LENGTH.get(status, 0)
+    return events
+
+
+def scan_midi_text(file_path: str, meta_types=TEXT_META_TYPES, charset: str = DEFAULT_CHARSET) -> list:
+    """
+    MIDI 파일을 트랙 청크 단위로 읽으며 텍스트 메타 이벤트만 추출합니다.
+    한 번에 메모리에 올리는 것은 트랙 하나 분량입니다.
+
+    :param file_path: .mid 파일 경로
+    :return: scan_track 결과를 트랙 순서대로 이어붙인 목록
+    """
+    events = []
+    with open(file_path, "rb") as f:
+        name, length = _read_chunk_header(f)
+        if name != b"MThd":
+            raise ValueError(f"MIDI 헤더(MThd)가 아닙니다: {name!r}")
+        header = f.read(length)
+        _, num_tracks, _ = struct.unpack(">HHH", header[:6])
+
+        track_index = 0
+        while track_index < num_tracks:
+            name, length = _read_chunk_header(f)
+            if name is None:
+                break # 헤더보다 트랙 수가 적은 파일
+            if name != b"MTrk":
+                f.seek(length, 1) # 알 수 없는 청크는 건너뜀
+                continue
+            events.extend(scan_track(f.read(length), track_index, meta_types, charset))
+            track_index += 1
+    return events
+
+
+def format_text_events(events) -> str:
+    """워커의 기존 mido 기반 출력과 같은 'Track {i}: [{delta}] {text}' 형식 문자열을 만듭니다."""
+    return "\n".join(f"Track {e['track']}: [{e['time']}] {e['text']}" for e in events)
+
+
+def _read_chunk_header(f):
+    header = f.read(8)
+    if len(header) < 8:
+        return None, 0
+    return header[:4], struct.unpack(">I", header[4:])[0]
@@ -0,0 +1,200 @@
+# backend/app/services/midi_writer.py
+
+import numpy as np
+
+from .score_ir import ScoreIR, build_score_ir
+
+# 경량 악보 표현(ScoreIR)을 Standard MIDI File(타입 1) 바이트로 바로 직렬화합니다.
+# music21의 write('midi')는 악보 전체를 MIDI 객체 모델(MidiFile/MidiTrack/MidiEvent)로
+# 다시 만든 뒤 쓰기 때문에 큰 악보에서 느립니다.
+# 여기서는 트랙별 이벤트 테이블을 NumPy로 정렬하고, delta time(가변 길이)과
+# running status를 반영한 각 이벤트의 바이트 길이를 먼저 계산하여
+# 미리 할당한 버퍼에 벡터 연산으로 채워 넣습니다.
+#
+# 트랙 구성: 0번 트랙은 빠르기/박자표/조표(conductor), 이후 파트마다 한 트랙.
+# 음 끝은 running status가 유지되도록 velocity 0인 note_on으로 씁니다.
+# 메타 이벤트 뒤에는 running status를 끊습니다 (mido 쓰기 규칙과 동일).
+
+DEFAULT_TICKS_PER_BEAT = 960
+DEFAULT_LYRIC_CHARSET = "utf-8"
+
+NOTE_ON = 0x90
+META = 0xFF
+
+# 같은 tick 안의 이벤트 순서: 메타 -> 음 끝 -> 음 시작
+_ORDER_META, _ORDER_OFF, _ORDER_ON = 0, 1, 2
+
+# 파트 -> MIDI 채널 (10번 채널(인덱스 9)은 타악기용이므로 건너뜀)
+_PART_CHANNELS = np.array([c for c in range(16) if c != 9], dtype=np.uint8)
+
+# 상태 바이트 상위 4비트별 채널 메시지 데이터 길이
+_DATA_LENGTH = np.zeros(16, dtype=np.int64)
+_DATA_LENGTH[[0x8, 0x9, 0xA, 0xB, 0xE]] = 2
+_DATA_LENGTH[[0xC, 0xD]] = 1
+
+_END_OF_TRACK = b"\x2f\x00"
+
+
+def encode_varlen(value: int) -> bytes:
+    """MIDI 가변 길이 정수 인코딩."""
+    out = [value & 0x7F]
+    value >>= 7
+    while value:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    return bytes(reversed(out))
+
+
+def _meta(meta_type: int, data: bytes) -> bytes:
+    # 0xFF 다음에 오는 부분: 타입, 길이(가변), 데이터
+    return bytes([meta_type]) + encode_varlen(len(data)) + data
+
+
+def _varlen_sizes(values):
+    sizes = np.ones(len(values), dtype=np.int64)
+    for threshold in (1 << 7, 1 << 14, 1 << 21):
+        sizes += values >= threshold
+    return sizes
+
+
+def encode_track(ticks, orders, statuses, data1, data2, meta_payloads, meta_index) -> bytes:
+    """
+    이벤트 테이블을 MTrk 청크 바이트로 직렬화합니다.
+
+    :param ticks: 이벤트 절대 tick (정렬 전이어도 됨)
+    :param orders: 같은 tick 안에서의 정렬 순서
+    :param statuses: 채널 메시지 상태 바이트 (메타 이벤트는 0xFF)
+    :param data1, data2: 채널 메시지 데이터 바이트
+    :param meta_payloads: 메타 이벤트 본문 목록 (_meta() 결과)
+    :param meta_index: 각 이벤트의 meta_payloads 인덱스 (채널 메시지는 -1)
+    """
+    # 끝에 End of Track 메타 이벤트 추가
+    last_tick = int(ticks.max()) if len(ticks) else 0
+    meta_payloads = list(meta_payloads) + [_END_OF_TRACK]
+    ticks = np.append(np.asarray(ticks, dtype=np.int64), last_tick)
+    orders = np.append(orders, 3)
+    statuses = np.append(statuses, META).astype(np.int64)
+    data1 = np.append(data1, 0).astype(np.uint8)
+    data2 = np.append(data2, 0).astype(np.uint8)
+    meta_index = np.append(meta_index, len(meta_payloads) - 1).astype(np.int64)
+
+    order = np.lexsort((orders, ticks))
+    ticks, statuses, data1, data2, meta_index = (ticks[order], statuses[order], data1[order],
+                                                 data2[order], meta_index[order])
+
+    deltas = np.diff(ticks, prepend=0)
+    is_meta = statuses == META
+    # running status: 직전 이벤트가 같은 상태 바이트의 채널 메시지이면 상태 바이트 생략
+    previous = np.concatenate([[-1], np.where(is_meta, -1, statuses)[:-1]])
+    need_status = ~is_meta & (statuses != previous)
+
+    meta_sizes = np.array([1 + len(p) for p in meta_payloads], dtype=np.int64)
+    delta_sizes = _varlen_sizes(deltas)
+    data_sizes = np.where(is_meta, 0, _DATA_LENGTH[statuses >> 4])
+    body_sizes = np.where(is_meta, meta_sizes[meta_index], need_status + data_sizes)
+    sizes = delta_sizes + body_sizes
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    total = int(sizes.sum())
+
+    buffer = np.zeros(8 + total, dtype=np.uint8) # 청크 헤더 + 본문을 한 번에 할당
+    buffer[:4] = np.frombuffer(b"MTrk", dtype=np.uint8)
+    buffer[4:8] = np.frombuffer(total.to_bytes(4, "big"), dtype=np.uint8)
+    body = buffer[8:]
+
+    # delta time (가변 길이, 상위 바이트부터)
+    for j in range(int(delta_sizes.max())):
+        mask = delta_sizes > j
+        shift = 7 * (delta_sizes[mask] - 1 - j)
+        continuation = np.where(j < delta_sizes[mask] - 1, 0x80, 0)
+        body[starts[mask] + j] = ((deltas[mask] >> shift) & 0x7F) | continuation
+
+    cursor = starts + delta_sizes
+    channel = ~is_meta
+    body[cursor[need_status]] = statuses[need_status]
+    cursor = cursor + need_status
+    body[cursor[channel]] = data1[channel]
+    two_bytes = channel & (data_sizes == 2)
+    body[cursor[two_bytes] + 1] = data2[two_bytes]
+
+    # 메타 이벤트는 수가 적으므로 개별 복사
+    for position, index in zip(cursor[is_meta], meta_index[is_meta]):
+        payload = meta_payloads[index]
+        body[position] = META
+        body[position + 1:position + 1 + len(payload)] = np.frombuffer(payload, dtype=np.uint8)
+    return buffer.tobytes()
+
+
+def _conductor_track(score_ir: ScoreIR, ticks_per_beat: int) -> bytes:
+    payloads = []
+    ticks = []
+    for ts in score_ir.time_signatures:
+        denominator_power = int(ts["denominator"]).bit_length() - 1
+        payloads.append(_meta(0x58, bytes([int(ts["numerator"]), denominator_power, 24, 8])))
+        ticks.append(ts["onset"])
+    for ks in score_ir.key_signatures:
+        sharps = int(np.clip(ks["sharps"], -7, 7))
+        payloads.append(_meta(0x59, bytes([sharps & 0xFF, 0]))) # 장조로 기록
+        ticks.append(ks["onset"])
+    for tempo in score_ir.tempos:
+        microseconds = int(round(60_000_000 / tempo["qpm"]))
+        payloads.append(_meta(0x51, microseconds.to_bytes(3, "big")))
+        ticks.append(tempo["onset"])
+
+    count = len(payloads)
+    return encode_track(
+        np.rint(np.array(ticks, dtype=np.float64) * ticks_per_beat).astype(np.int64),
+        np.full(count, _ORDER_META), np.full(count, META), np.zeros(count), np.zeros(count),
+        payloads, np.arange(count),
+    )
+
+
+def _part_track(score_ir: ScoreIR, part: int, ticks_per_beat: int, charset: str) -> bytes:
+    notes = score_ir.notes[score_ir.notes["part"] == part]
+    start = np.rint(notes["onset"] * ticks_per_beat).astype(np.int64)
+    end = np.rint((notes["onset"] + notes["duration"]) * ticks_per_beat).astype(np.int64)
+    keep = end > start # 길이 0인 음(꾸밈음 등)은 MIDI로 표현할 수 없으므로 제외
+    start, end, notes = start[keep], end[keep], notes[keep]
+    count = len(notes)
+
+    status = NOTE_ON | int(_PART_CHANNELS[part % len(_PART_CHANNELS)])
+    velocity = np.clip(notes["velocity"], 1, 127)
+
+    lyric_mask = score_ir.lyrics["part"] == part
+    lyric_ticks = np.rint(score_ir.lyrics["onset"][lyric_mask] * ticks_per_beat).astype(np.int64)
+    payloads = [_meta(0x05, score_ir.lyric_texts[i].encode(charset)) for i in np.flatnonzero(lyric_mask)]
+    num_lyrics = len(payloads)
+
+    return encode_track(
+        np.concatenate([start, end, lyric_ticks]),
+        np.concatenate([np.full(count, _ORDER_ON), np.full(count, _ORDER_OFF), np.full(num_lyrics, _ORDER_META)]),
+        np.concatenate([np.full(2 * count, status), np.full(num_lyrics, META)]),
+        np.concatenate([notes["pitch"], notes["pitch"], np.zeros(num_lyrics)]),
+        np.concatenate([velocity, np.zeros(count), np.zeros(num_lyrics)]),
+        payloads,
+        np.concatenate([np.full(2 * count, -1), np.arange(num_lyrics)]),
+    )
+
+
+def write_midi(source, fp: str = None, ticks_per_beat: int = DEFAULT_TICKS_PER_BEAT,
+               lyric_charset: str = DEFAULT_LYRIC_CHARSET) -> bytes:
+    """
+    악보를 Standard MIDI File 바이트로 변환합니다.
+
+    :param source: ScoreIR 또는 build_score_ir()가 지원하는 객체 (music21 Stream, mido MidiFile)
+    :param fp: 지정하면 이 경로에 파일로도 저장
+    :return: MIDI 파일 바이트
+    """
+    score_ir = source if isinstance(source, ScoreIR) else build_score_ir(source)
+    if score_ir is None:
+        raise TypeError(f"MIDI로 변환할 수 없는 악보 데이터 형식입니다: {type(source).__name__}")
+
+    tracks = [_conductor_track(score_ir, ticks_per_beat)]
+    tracks += [_part_track(score_ir, part, ticks_per_beat, lyric_charset) for part in range(score_ir.num_parts)]
+    header = b"MThd" + (6).to_bytes(4, "big") + b"".join(
+        v.to_bytes(2, "big") for v in (1, len(tracks), ticks_per_beat))
+    data = header + b"".join(tracks)
+
+    if fp:
+        with open(fp, "wb") as f:
+            f.write(data)
+    return data
@@ -0,0 +1,146 @@
+# backend/app/services/music_output.py
+
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .midi_writer import write_midi
+from .s3_multipart import S3MultipartWriter
+from .synth import AUDIO_FORMATS, BLOCK_FRAMES, CONTENT_TYPES, SAMPLE_RATE, NoteEvents, open_encoder, render_blocks
+
+# 한 번 파싱한 악보(ScoreIR)로 여러 출력 형식(midi, mp3, wav, ...)을 함께 생성합니다.
+# - MIDI는 IR에서 바로 직렬화하여 업로드
+# - 오디오 형식들은 음표 이벤트 테이블(NoteEvents)과 합성 PCM 블록을 공유합니다.
+#   합성은 한 번만 하고, 각 블록을 형식별 인코더 스레드에 나눠 주어
+#   인코딩과 S3 multipart 업로드가 형식별로 병렬 진행됩니다.
+
+OUTPUT_FORMATS = ("midi",) + AUDIO_FORMATS
+MIDI_CONTENT_TYPE = "audio/midi"
+ENCODER_QUEUE_BLOCKS = 4 # 형식별 인코더 대기열 길이 (블록 수). 메모리 상한 = 형식 수 x 이 값 x 블록 크기
+_END = None       # 대기열 종료 표시: 정상 완료
+_ABORT = object() # 대기열 종료 표시: 합성 실패 (업로드 취소)
+
+
+def parse_output_formats(value) -> list:
+    """
+    "midi", "midi,mp3", ["midi", "wav"] 형태를 중복 없는 소문자 목록으로 바꿉니다.
+
+    :raises ValueError: 지원하지 않는 형식이 있는 경우
+    """
+    if value is None:
+        return ["midi"]
+    items = value.split(",") if isinstance(value, str) else list(value)
+    formats = []
+    for item in items:
+        fmt = item.strip().lower()
+        if fmt == "mid":
+            fmt = "midi"
+        if fmt and fmt not in formats:
+            formats.append(fmt)
+    unsupported = [fmt for fmt in formats if fmt not in OUTPUT_FORMATS]
+    if unsupported:
+        raise ValueError(f"지원하지 않는 음악 출력 형식: {', '.join(unsupported)} (지원: {', '.join(OUTPUT_FORMATS)})")
+    return formats or ["midi"]
+
+
+def step_output_formats(step: dict) -> list:
+    """generate_music_file 단계의 output_formats(목록) 또는 기존 output_format(문자열)을 읽습니다."""
+    return parse_output_formats(step.get("output_formats") or step.get("output_format", "midi"))
+
+
+def _result(output_format, bucket_name, s3_key, **extra):
+    return {"status": "success", "format": output_format, "s3_key": s3_key,
+            "s3_url": f"s3://{bucket_name}/{s3_key}", **extra}
+
+
+def _upload_midi(score_ir, bucket_name, s3_key, client, midi_bytes=None):
+    data = midi_bytes if midi_bytes is not None else write_midi(score_ir)
+    client.put_object(Bucket=bucket_name, Key=s3_key, Body=data, ContentType=MIDI_CONTENT_TYPE)
+    return _result("midi", bucket_name, s3_key, bytes=len(data))
+
+
+def _encode_stream(output_format, blocks, bucket_name, s3_key, client, sample_rate, total_frames):
+    # 합성 스레드가 넣어 주는 블록을 인코딩하며 S3로 스트리밍
+    with S3MultipartWriter(bucket_name, s3_key, client=client, content_type=CONTENT_TYPES[output_format]) as sink:
+        encoder = open_encoder(output_format, sink, sample_rate, total_frames)
+        while True:
+            block = blocks.get()
+            if block is _END:
+                break
+            if block is _ABORT:
+                raise RuntimeError("합성 중 오류로 출력 생성을 중단했습니다.")
+            encoder.write(block)
+        encoder.close()
+    return _result(output_format, bucket_name, s3_key, bytes=sink.bytes_uploaded)
+
+
+def generate_outputs(score_ir, output_formats, bucket_name: str, key_prefix: str, client, midi_bytes: bytes = None,
+                     sample_rate: int = SAMPLE_RATE, block_frames: int = BLOCK_FRAMES) -> dict:
+    """
+    요청된 모든 형식을 생성하여 병렬로 업로드합니다.
+
+    :param key_prefix: 결과 S3 키 접두어 (예: "results/{task_id}/{task_id}") - 뒤에 ".확장자"가 붙음
+    :param client: boto3 S3 클라이언트
+    :param midi_bytes: 원본 MIDI를 그대로 내보낼 때 사용할 바이트 (없으면 IR에서 생성)
+    :return: {"status": "success" | "partial" | "failed", "formats": {형식: 결과}, "render": 합성 통계}
+    """
+    output_formats = parse_output_formats(output_formats)
+    audio_formats = [fmt for fmt in output_formats if fmt in AUDIO_FORMATS]
+    results = {}
+    render_stats = None
+    extension = {"midi": "mid"}
+
+    with ThreadPoolExecutor(max_workers=len(output_formats), thread_name_prefix="music-output") as pool:
+        futures = {}
+        if "midi" in output_formats:
+            futures["midi"] = pool.submit(_upload_midi, score_ir, bucket_name, f"{key_prefix}.mid", client, midi_bytes)
+
+        if audio_formats:
+            events = NoteEvents(score_ir, sample_rate) # 모든 오디오 형식이 공유
+            queues = {fmt: queue.Queue(maxsize=ENCODER_QUEUE_BLOCKS) for fmt in audio_formats}
+            for fmt in audio_formats:
+                futures[fmt] = pool.submit(_encode_stream, fmt, queues[fmt], bucket_name,
+                                           f"{key_prefix}.{extension.get(fmt, fmt)}", client,
+                                           sample_rate, events.total_frames)
+
+            start = time.perf_counter()
+            frames = 0
+            terminator = _END
+            try:
+                for block in render_blocks(events, block_frames):
+                    frames += len(block)
+                    for fmt, blocks in queues.items():
+                        _put_unless_done(blocks, block, futures[fmt])
+            except Exception as e:
+                print(f"워커: 오디오 합성 오류: {e}")
+                terminator = _ABORT
+            for fmt, blocks in queues.items():
+                _put_unless_done(blocks, terminator, futures[fmt])
+            render_seconds = time.perf_counter() - start
+            render_stats = {
+                "frames": frames,
+                "duration_seconds": frames / sample_rate,
+                "render_seconds": render_seconds, # 합성 + 인코더로 전달 (인코딩/업로드 병렬)
+                "realtime_factor": (frames / sample_rate) / render_seconds if render_seconds > 0 else float("inf"),
+            }
+
+        for fmt in output_formats:
+            try:
+                results[fmt] = futures[fmt].result()
+            except Exception as e:
+                print(f"워커: {fmt} 출력 생성/업로드 오류: {e}")
+                results[fmt] = {"status": "failed", "format": fmt, "error": str(e)}
+
+    succeeded = sum(r["status"] == "success" for r in results.values())
+    status = "success" if succeeded == len(results) else ("partial" if succeeded else "failed")
+    return {"status": status, "formats": results, "render": render_stats}
+
+
+def _put_unless_done(blocks: queue.Queue, item, future):
+    # 인코더 스레드가 오류로 먼저 끝났으면 블록을 더 넣지 않음 (대기열이 차서 멈추는 것 방지)
+    while not future.done():
+        try:
+            blocks.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
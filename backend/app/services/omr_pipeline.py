@@ -0,0 +1,227 @@
+# backend/app/services/omr_pipeline.py
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .omr_preprocess import preprocess_stage
+
+# PDF/이미지 악보(OMR 입력)를 페이지 단위로 병렬 처리합니다.
+# 기존에는 문서 전체를 한 번에 처리(pdfminer extract_text)하거나 mock 결과를 썼기 때문에
+# 100페이지 스캔 악보는 코어 하나에서 순서대로 처리되고, 마지막 페이지가 끝나야 결과가 나왔습니다.
+# 여기서는 페이지마다 별도 프로세스에서 페이지를 읽고(텍스트 레이어 추출 / 래스터화)
+# 페이지 인식 단계(PAGE_STAGES)를 실행한 뒤, 결과를 페이지 순서대로 스트리밍합니다.
+# 앞 페이지는 뒤 페이지가 끝나기 전에 다음 단계(악보 조립)로 넘어가고, PageTextStream을 on_page로 주면
+# 그 페이지의 텍스트 후속 처리(번역 등)도 뒤 페이지를 인식하는 동안 시작됩니다.
+
+OMR_MAX_WORKERS = int(os.getenv("OMR_MAX_WORKERS", "0")) or (os.cpu_count() or 1) # 0이면 CPU 코어 수
+OMR_RASTER_DPI = int(os.getenv("OMR_RASTER_DPI", "300"))
+OMR_PREFETCH_PAGES = int(os.getenv("OMR_PREFETCH_PAGES", "2")) # 작업자당 미리 제출할 페이지 수 (메모리 상한)
+# 워커 프로세스에는 boto3/httpx 스레드가 있으므로 fork 대신 spawn으로 페이지 프로세스를 만듭니다.
+OMR_MP_START_METHOD = os.getenv("OMR_MP_START_METHOD", "spawn")
+# 페이지 텍스트 후속 처리(번역 등)를 동시에 실행할 페이지 수 (번역 자체도 청크 단위로 동시 실행됨)
+OMR_PAGE_TEXT_WORKERS = int(os.getenv("OMR_PAGE_TEXT_WORKERS", "2"))
+
+PDF_EXTENSIONS = {".pdf"}
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".tif", ".tiff"}
+
+
+def count_pages(path: str) -> int:
+    """PDF 페이지 수 또는 이미지 프레임 수(다중 페이지 TIFF)를 반환합니다."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in PDF_EXTENSIONS:
+        from pdfminer.pdfpage import PDFPage
+        with open(path, "rb") as fp:
+            return sum(1 for _ in PDFPage.get_pages(fp))
+    if extension in IMAGE_EXTENSIONS:
+        from PIL import Image
+        with Image.open(path) as image:
+            return getattr(image, "n_frames", 1)
+    raise ValueError(f"OMR 입력으로 지원하지 않는 파일 확장자 ({extension})")
+
+
+def _rasterize_pdf_page(path: str, index: int, dpi: int):
+    """pypdfium2가 있으면 PDF 페이지를 회색조 배열로 래스터화합니다. 없으면 None."""
+    try:
+        import pypdfium2
+    except ImportError:
+        return None
+    import numpy as np
+    document = pypdfium2.PdfDocument(path)
+    try:
+        bitmap = document[index].render(scale=dpi / 72, grayscale=True)
+        return np.array(bitmap.to_pil().convert("L"))
+    finally:
+        document.close()
+
+
+def load_page(path: str, index: int, dpi: int = OMR_RASTER_DPI) -> dict:
+    """
+    페이지 하나를 읽습니다 (페이지 프로세스 안에서 실행).
+
+    :return: {"page_index", "text" (PDF 텍스트 레이어, 이미지는 ""), "image" (회색조 uint8 배열 또는 None)}
+    """
+    extension = os.path.splitext(path)[1].lower()
+    page = {"page_index": index, "text": "", "image": None}
+    if extension in PDF_EXTENSIONS:
+        from pdfminer.high_level import extract_text as pdf_extract_text
+        page["text"] = pdf_extract_text(path, page_numbers=[index])
+        page["image"] = _rasterize_pdf_page(path, index, dpi)
+    else:
+        import numpy as np
+        from PIL import Image
+        with Image.open(path) as image:
+            image.seek(index)
+            page["image"] = np.array(image.convert("L"))
+    return page
+
+
+def text_layer_stage(page: dict) -> dict:
+    """PDF 텍스트 레이어의 줄을 텍스트 요소로 만듭니다 (가사, 지시어 등)."""
+    page["text_elements"] = [{"type": "PDF Text", "content": line.strip(), "page": page["page_index"] + 1}
+                             for line in page["text"].splitlines() if line.strip()]
+    return page
+
+
+# 페이지마다 순서대로 실행할 인식 단계 (page dict -> page dict, 페이지 프로세스로 전달되므로 모듈 수준 함수)
+# preprocess_stage: 이진화/기울기 보정/오선·보표 단 검출 (page["omr_layout"], 단별 이미지는 iter_system_crops)
+PAGE_STAGES = (text_layer_stage, preprocess_stage)
+
+
+def process_page(path: str, index: int, stages=PAGE_STAGES, dpi: int = OMR_RASTER_DPI) -> dict:
+    """
+    페이지 하나를 읽고 인식 단계들을 실행합니다. 예외는 페이지 결과의 status로 돌려줍니다.
+    큰 페이지 이미지는 부모 프로세스로 보내지 않고 크기만 남깁니다.
+    """
+    start = time.perf_counter()
+    try:
+        page = load_page(path, index, dpi)
+        for stage in stages:
+            page = stage(page)
+        image = page.pop("image", None)
+        page.pop("text", None)
+        page["size"] = tuple(image.shape) if image is not None else None
+        page["status"] = "success"
+    except Exception as e:
+        page = {"page_index": index, "status": "failed", "error": f"{type(e).__name__}: {e}"}
+    page["seconds"] = time.perf_counter() - start
+    return page
+
+
+def iter_pages(path: str, max_workers: int = OMR_MAX_WORKERS, stages=PAGE_STAGES, dpi: int = OMR_RASTER_DPI,
+               prefetch: int = OMR_PREFETCH_PAGES):
+    """
+    페이지 결과를 페이지 순서대로 생성합니다. 다음 순서의 페이지가 끝나는 즉시 내보내므로
+    앞 페이지는 뒤 페이지 처리 중에 사용할 수 있습니다.
+    동시에 제출하는 페이지는 max_workers * prefetch개로 제한합니다 (처리를 기다리는 결과의 메모리 상한).
+    생성기를 중간에 닫으면 아직 시작하지 않은 페이지는 취소됩니다.
+    """
+    total = count_pages(path)
+    workers = max(1, min(max_workers, total))
+    if workers == 1: # 한 페이지짜리 이미지 등: 프로세스 생성 비용 없이 바로 처리
+        for index in range(total):
+            yield process_page(path, index, stages, dpi)
+        return
+
+    window = workers * max(1, prefetch)
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(OMR_MP_START_METHOD))
+    try:
+        futures, submitted = {}, 0
+        for index in range(total):
+            while submitted < total and submitted < index + window:
+                futures[submitted] = pool.submit(process_page, path, submitted, stages, dpi)
+                submitted += 1
+            yield futures.pop(index).result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def assemble_omr_score(pages, on_page=None) -> dict:
+    """
+    순서대로 들어오는 페이지 결과를 악보 데이터(music_data_representation)로 조립합니다.
+
+    :param pages: iter_pages의 페이지 결과 (페이지 순서)
+    :param on_page: 페이지가 조립될 때마다 호출 (페이지 결과) - 진행 상황 보고/후속 단계 선행 실행용
+    :return: {"format": "omr_pages", "page_count", "pages", "text_elements", "notes_data", "failed_pages"}
+    """
+    score = {"format": "omr_pages", "page_count": 0, "pages": [], "text_elements": [], "notes_data": [],
+             "failed_pages": []}
+    for page in pages:
+        score["page_count"] += 1
+        if page["status"] == "success":
+            score["text_elements"].extend(page.get("text_elements", []))
+            score["notes_data"].extend(page.get("notes_data", []))
+        else:
+            score["failed_pages"].append(page["page_index"] + 1)
+        score["pages"].append({key: value for key, value in page.items()
+                               if key not in ("text_elements", "notes_data")})
+        if on_page:
+            on_page(page)
+    return score
+
+
+def page_text(page: dict) -> str:
+    """페이지 결과의 텍스트 요소를 줄 단위로 합칩니다 (실패한 페이지는 "")."""
+    if page.get("status") != "success":
+        return ""
+    return "\n".join(element["content"] for element in page.get("text_elements", []) if element.get("content"))
+
+
+class PageTextStream:
+    """
+    assemble_omr_score의 on_page로 사용합니다. 조립되는 페이지의 텍스트를 페이지 순서대로 모으고,
+    process_text를 주면 텍스트가 있는 페이지마다 바로 스레드에서 실행합니다 (예: 번역).
+    뒤 페이지를 인식하는 동안 앞 페이지의 후속 처리가 진행되므로, 후속 단계는 results()로 결과만 모읍니다.
+    """
+    def __init__(self, process_text=None, max_workers: int = OMR_PAGE_TEXT_WORKERS):
+        self.process_text = process_text
+        self.page_texts = [] # [(page_index, 텍스트), ...] 텍스트가 있는 페이지만
+        self._futures = []
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="omr-page-text") \
+            if process_text else None
+        self._lock = threading.Lock()
+        self.stats = {"pages": 0, "text_pages": 0, "started": 0}
+
+    def __call__(self, page: dict):
+        print(f"워커: 악보 페이지 {page['page_index'] + 1} 처리 완료 ({page['status']}, {page['seconds']:.2f}초)")
+        text = page_text(page)
+        with self._lock:
+            self.stats["pages"] += 1
+            if not text.strip():
+                return
+            self.stats["text_pages"] += 1
+            self.page_texts.append((page["page_index"], text))
+            if self._executor is not None:
+                self._futures.append((page["page_index"], text, self._executor.submit(self.process_text, text)))
+                self.stats["started"] += 1
+
+    @property
+    def text(self) -> str:
+        """지금까지 조립된 페이지의 텍스트 (페이지 순서)."""
+        return "\n".join(text for _, text in self.page_texts)
+
+    def results(self) -> list:
+        """
+        모든 페이지의 후속 처리가 끝날 때까지 기다립니다.
+
+        :return: 페이지 순서대로 [{"page_index", "text", "result"}, ...] (예외가 난 페이지는 "result" 대신 "error")
+        """
+        results = []
+        for page_index, text, future in self._futures:
+            try:
+                results.append({"page_index": page_index, "text": text, "result": future.result()})
+            except Exception as e:
+                print(f"워커: 악보 페이지 {page_index + 1} 텍스트 처리 오류: {e}")
+                results.append({"page_index": page_index, "text": text, "error": f"{type(e).__name__}: {e}"})
+        return results
+
+    def close(self):
+        """후속 처리 스레드를 정리합니다 (실행 중인 페이지는 끝까지 처리)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.stats)
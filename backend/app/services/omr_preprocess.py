@@ -0,0 +1,197 @@
+# backend/app/services/omr_preprocess.py
+
+import os
+
+import numpy as np
+
+# 스캔 악보 페이지의 OMR 전처리 (이진화, 기울기 보정, 오선/보표 단 검출) - NumPy 벡터화, 오프라인.
+# 600 DPI A4 한 장은 회색조만 약 35MB이므로, 페이지 전체 크기의 임시 배열(float 변환, 이진 이미지,
+# 회전된 이미지)을 만들지 않고 행 단위 타일(OMR_TILE_ROWS)로 나눠 처리합니다.
+#  1. 이진화: 타일별 히스토그램을 합쳐 Otsu 임계값을 구함 (이진 이미지는 저장하지 않고 필요할 때 타일별로 계산)
+#  2. 기울기 보정: 페이지를 세로 띠(strip)로 나눠 띠별 가로 투영(행별 잉크 수)을 구하고,
+#     각도 후보마다 띠를 세로로 밀어 합친 투영이 가장 뾰족한(제곱합 최대) 각도를 고름
+#  3. 오선 검출: 보정된 투영에서 긴 가로줄 행을 찾고, 같은 간격의 5줄을 오선(staff)으로 묶음
+#  4. 보표 단(system) 검출: 오선 사이를 세로로 가로지르는 마디선이 있으면 같은 단으로 묶음
+#  5. 단별 잘라내기: 기울기를 보정한 단 이미지를 하나씩 생성 (iter_system_crops)
+
+OMR_TILE_ROWS = int(os.getenv("OMR_TILE_ROWS", "512")) # 한 번에 처리할 행 수 (메모리 상한)
+OMR_DESKEW_MAX_DEGREES = float(os.getenv("OMR_DESKEW_MAX_DEGREES", "3"))
+OMR_DESKEW_STEP_DEGREES = 0.1
+OMR_DESKEW_STRIPS = 32 # 기울기 추정용 세로 띠 수
+STAFF_LINE_FRACTION = 0.5 # 가장 긴 줄 대비 이 비율 이상 잉크가 있는 행을 오선 후보로 봄
+STAFF_GAP_TOLERANCE = 0.25 # 오선 간격 허용 오차 (간격 대비)
+BARLINE_INK_FRACTION = 0.9 # 오선 사이를 이 비율 이상 채운 열을 단을 잇는 마디선으로 봄
+SYSTEM_MARGIN_SPACES = 4 # 단 위아래로 포함할 여백 (오선 간격 배수, 덧줄/가사용)
+
+
+def _bands(height: int, tile_rows: int):
+    for start in range(0, height, max(1, tile_rows)):
+        yield start, min(height, start + tile_rows)
+
+
+def otsu_threshold(gray: np.ndarray, tile_rows: int = OMR_TILE_ROWS) -> int:
+    """회색조(uint8) 페이지의 Otsu 임계값. 이 값 이하의 픽셀을 잉크로 봅니다."""
+    histogram = np.zeros(256, dtype=np.int64)
+    for start, stop in _bands(gray.shape[0], tile_rows):
+        histogram += np.bincount(gray[start:stop].ravel(), minlength=256)
+    p = histogram / max(1, histogram.sum())
+    omega = np.cumsum(p)
+    mu = np.cumsum(p * np.arange(256))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = (mu[-1] * omega - mu) ** 2 / (omega * (1 - omega))
+    return int(np.argmax(np.nan_to_num(between)))
+
+
+def strip_bounds(width: int, strips: int = OMR_DESKEW_STRIPS) -> np.ndarray:
+    """세로 띠 경계 [x0, x1, ..., width] (띠 수는 폭을 넘지 않음)."""
+    return np.linspace(0, width, min(strips, width) + 1).astype(int)
+
+
+def strip_profiles(gray: np.ndarray, threshold: int, bounds: np.ndarray,
+                   tile_rows: int = OMR_TILE_ROWS) -> np.ndarray:
+    """띠별 가로 투영 (띠 수 x 높이): 각 행에서 띠 안의 잉크 픽셀 수."""
+    profiles = np.empty((len(bounds) - 1, gray.shape[0]), dtype=np.int32)
+    for start, stop in _bands(gray.shape[0], tile_rows):
+        ink = gray[start:stop] <= threshold
+        profiles[:, start:stop] = np.add.reduceat(ink, bounds[:-1], axis=1, dtype=np.int32).T
+    return profiles
+
+
+def strip_offsets(bounds: np.ndarray, angle_degrees: float) -> np.ndarray:
+    """각도만큼 기울어진 가로줄이 띠마다 페이지 가운데보다 몇 행 아래에 있는지 (띠별 정수)."""
+    centers = (bounds[:-1] + bounds[1:]) / 2 - bounds[-1] / 2
+    return np.rint(centers * np.tan(np.radians(angle_degrees))).astype(int)
+
+
+def _shifted_profile(profiles: np.ndarray, offsets: np.ndarray, pad: int) -> np.ndarray:
+    """띠별 투영을 offsets만큼 위로 밀어 합친 투영 (길이 높이 + 2*pad, 인덱스 = 보정된 행 + pad)."""
+    height = profiles.shape[1]
+    rows = np.arange(height)[None, :] - offsets[:, None] + pad
+    return np.bincount(rows.ravel(), weights=profiles.ravel(), minlength=height + 2 * pad)
+
+
+def estimate_skew(profiles: np.ndarray, bounds: np.ndarray, max_degrees: float = OMR_DESKEW_MAX_DEGREES,
+                  step_degrees: float = OMR_DESKEW_STEP_DEGREES) -> float:
+    """투영이 가장 뾰족해지는 기울기(도, 오른쪽이 아래로 기울면 양수)를 찾습니다."""
+    angles = np.arange(-max_degrees, max_degrees + step_degrees / 2, step_degrees)
+    pad = int(np.abs(strip_offsets(bounds, max_degrees)).max())
+    scores = [np.square(_shifted_profile(profiles, strip_offsets(bounds, angle), pad)).sum() for angle in angles]
+    return round(float(angles[int(np.argmax(scores))]), 3)
+
+
+def find_staff_lines(profile: np.ndarray, fraction: float = STAFF_LINE_FRACTION):
+    """
+    보정된 가로 투영에서 오선 후보 줄을 찾습니다.
+
+    :return: (줄 중심 행 배열, 줄 두께 배열)
+    """
+    if profile.size == 0 or profile.max() <= 0:
+        return np.empty(0), np.empty(0, dtype=int)
+    mask = np.concatenate(([0], (profile >= fraction * profile.max()).astype(np.int8), [0]))
+    edges = np.diff(mask)
+    starts, stops = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    return (starts + stops - 1) / 2, stops - starts
+
+
+def group_staves(centers: np.ndarray, thickness: np.ndarray, tolerance: float = STAFF_GAP_TOLERANCE) -> list:
+    """같은 간격으로 이어지는 줄들을 5줄씩 오선으로 묶습니다."""
+    if len(centers) < 5:
+        return []
+    gaps = np.diff(centers)
+    spacing = float(np.median(gaps)) # 오선 안의 간격이 단 사이 간격보다 4배 많음
+    regular = np.abs(gaps - spacing) <= tolerance * spacing + 1
+    staves, run = [], [0]
+    for index, is_regular in enumerate(regular, start=1):
+        if is_regular:
+            run.append(index)
+            continue
+        staves.extend(run[k:k + 5] for k in range(0, len(run) - 4, 5))
+        run = [index]
+    staves.extend(run[k:k + 5] for k in range(0, len(run) - 4, 5))
+    return [{"lines": [float(centers[i]) for i in staff],
+             "spacing": float(np.mean(np.diff(centers[staff]))),
+             "line_thickness": int(np.median(thickness[staff])),
+             "top": float(centers[staff[0]] - thickness[staff[0]] / 2),
+             "bottom": float(centers[staff[-1]] + thickness[staff[-1]] / 2)} for staff in staves]
+
+
+def deskewed_rows(gray: np.ndarray, threshold: int, top: int, bottom: int, layout: dict) -> np.ndarray:
+    """
+    보정된 좌표의 행 범위 [top, bottom)를 기울기를 보정한 잉크(bool) 이미지로 만듭니다.
+    띠마다 원본에서 offset만큼 아래의 행을 읽으며, 페이지 밖은 잉크 없음으로 채웁니다.
+    """
+    bounds, offsets = layout["strip_bounds"], layout["strip_offsets"]
+    rows = np.zeros((max(0, bottom - top), gray.shape[1]), dtype=bool)
+    for (x0, x1), offset in zip(zip(bounds[:-1], bounds[1:]), offsets):
+        src_top, src_bottom = top + offset, bottom + offset
+        lo, hi = max(0, src_top), min(gray.shape[0], src_bottom)
+        if lo < hi:
+            rows[lo - src_top:hi - src_top, x0:x1] = gray[lo:hi, x0:x1] <= threshold
+    return rows
+
+
+def _connected_by_barline(gray, threshold, upper: dict, lower: dict, layout: dict) -> bool:
+    top, bottom = int(np.ceil(upper["bottom"])) + 1, int(np.floor(lower["top"]))
+    if bottom - top < 1:
+        return True
+    gap = deskewed_rows(gray, threshold, top, bottom, layout)
+    # 띠 단위 보정은 세로선의 가로 기울기를 고치지 않으므로 그만큼 좌우로 넓혀서 확인
+    reach = int(np.ceil((bottom - top) * abs(np.tan(np.radians(layout["skew_degrees"]))))) + 1
+    widened = gap.copy()
+    for shift in range(1, reach + 1):
+        widened[:, shift:] |= gap[:, :-shift]
+        widened[:, :-shift] |= gap[:, shift:]
+    return bool((widened.mean(axis=0) >= BARLINE_INK_FRACTION).any())
+
+
+def analyze_page(gray: np.ndarray, tile_rows: int = OMR_TILE_ROWS) -> dict:
+    """
+    페이지의 이진화 임계값, 기울기, 오선, 보표 단을 찾습니다.
+
+    :param gray: 회색조 페이지 (높이 x 폭, uint8, 잉크가 어두움)
+    :return: {"threshold", "skew_degrees", "staff_spacing", "systems": [{"top", "bottom", "staves"}],
+              "strip_bounds", "strip_offsets"} - 좌표는 기울기를 보정한 행 기준
+    """
+    if gray.dtype != np.uint8:
+        raise TypeError(f"회색조 uint8 페이지가 필요합니다 ({gray.dtype})")
+    threshold = otsu_threshold(gray, tile_rows)
+    bounds = strip_bounds(gray.shape[1])
+    profiles = strip_profiles(gray, threshold, bounds, tile_rows)
+    skew = estimate_skew(profiles, bounds)
+    offsets = strip_offsets(bounds, skew)
+    pad = int(np.abs(offsets).max())
+    centers, thickness = find_staff_lines(_shifted_profile(profiles, offsets, pad))
+    staves = group_staves(centers - pad, thickness)
+    layout = {"threshold": threshold, "skew_degrees": skew, "strip_bounds": bounds.tolist(),
+              "strip_offsets": offsets.tolist(), "systems": []}
+    layout["staff_spacing"] = float(np.median([s["spacing"] for s in staves])) if staves else None
+
+    systems = []
+    for staff in staves:
+        if systems and _connected_by_barline(gray, threshold, systems[-1][-1], staff, layout):
+            systems[-1].append(staff)
+        else:
+            systems.append([staff])
+    for index, system in enumerate(systems):
+        margin = SYSTEM_MARGIN_SPACES * layout["staff_spacing"]
+        top, bottom = system[0]["top"] - margin, system[-1]["bottom"] + margin
+        if index > 0: # 이웃 단과 겹치지 않도록 사이의 가운데에서 자름
+            top = max(top, (systems[index - 1][-1]["bottom"] + system[0]["top"]) / 2)
+        if index + 1 < len(systems):
+            bottom = min(bottom, (system[-1]["bottom"] + systems[index + 1][0]["top"]) / 2)
+        layout["systems"].append({"top": max(0, int(top)), "bottom": min(gray.shape[0], int(np.ceil(bottom))),
+                                  "staves": system})
+    return layout
+
+
+def iter_system_crops(gray: np.ndarray, layout: dict):
+    """보표 단마다 기울기를 보정한 잉크(bool) 이미지를 하나씩 생성합니다 (후속 인식 단계 입력)."""
+    for system in layout["systems"]:
+        yield deskewed_rows(gray, layout["threshold"], system["top"], system["bottom"], layout)
+
+
+def preprocess_stage(page: dict) -> dict:
+    """OMR 페이지 단계: 페이지 이미지를 분석해 page["omr_layout"]에 저장합니다 (래스터 이미지가 없으면 건너뜀)."""
+    if page.get("image") is not None:
+        page["omr_layout"] = analyze_page(page["image"])
+    return page
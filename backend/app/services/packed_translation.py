@@ -0,0 +1,148 @@
+# backend/app/services/packed_translation.py
+
+import os
+import re
+
+from .chunk_translation import TRANSLATION_MAX_CONCURRENCY, translate_chunks
+
+# 짧은 번역 단위 여러 개를 LLM 요청 하나로 묶어 번역합니다.
+# 악보에서는 한 단어 가사, "rit.", "dolce" 같은 지시어, 반복 제거 후의 짧은 세그먼트가 많이 나와
+# 단위마다 요청하면 왕복 횟수와 프롬프트 오버헤드가 커집니다.
+# 단위마다 번호 구분자 줄(<<<1>>>, <<<2>>>, ...)을 붙여 토큰 예산까지 묶어 보내고,
+# 응답을 같은 구분자로 다시 나눕니다. 구분자가 빠지거나 비어 있는 단위만 따로 다시 번역합니다.
+
+TRANSLATION_PACKING = os.getenv("TRANSLATION_PACKING", "true").lower() == "true"
+TRANSLATION_PACK_MAX_SEGMENTS = int(os.getenv("TRANSLATION_PACK_MAX_SEGMENTS", "40")) # 요청 하나당 최대 단위 수
+MARKER_TOKENS = 6 # 구분자 줄 하나의 대략적인 토큰 수
+
+_MARKER = re.compile(r"^[ \t]*<<<[ \t]*(\d+)[ \t]*>>>[ \t]*$", re.MULTILINE)
+
+
+def marker(number: int) -> str:
+    return f"<<<{number}>>>"
+
+
+def pack_segments(segments: list, max_tokens: int, count, max_segments: int = TRANSLATION_PACK_MAX_SEGMENTS) -> list:
+    """
+    순서를 유지하며 토큰 예산(max_tokens) 안에서 단위들을 묶습니다.
+
+    :return: [[단위 인덱스, ...], ...] (예산보다 큰 단위는 혼자 한 묶음)
+    """
+    packs, current, current_tokens = [], [], 0
+    for index, segment in enumerate(segments):
+        tokens = count(segment) + MARKER_TOKENS
+        if current and (current_tokens + tokens > max_tokens or len(current) >= max_segments):
+            packs.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += tokens
+    if current:
+        packs.append(current)
+    return packs
+
+
+def build_packed_text(segments: list) -> str:
+    return "\n".join(f"{marker(number)}\n{segment.strip()}" for number, segment in enumerate(segments, start=1))
+
+
+def parse_packed_response(response: str, expected: int) -> dict:
+    """
+    구분자로 응답을 나눕니다. 구분자 앞의 머리말, 범위 밖 번호, 중복 번호, 빈 번역은 버립니다.
+
+    :return: {단위 번호(1부터): 번역문} - 파싱된 단위만 포함
+    """
+    matches = list(_MARKER.finditer(response))
+    parsed, seen = {}, set()
+    for position, match in enumerate(matches):
+        number = int(match.group(1))
+        end = matches[position + 1].start() if position + 1 < len(matches) else len(response)
+        text = response[match.end():end].strip()
+        if not 1 <= number <= expected or number in seen:
+            parsed.pop(number, None) # 중복 번호는 어느 쪽이 맞는지 알 수 없으므로 모두 버림
+            seen.add(number)
+            continue
+        seen.add(number)
+        if text:
+            parsed[number] = text
+    return parsed
+
+
+def _result(index, segment, translated=None, source=None, error=None, deferred_from=None):
+    if translated is not None:
+        return {"chunk_index": index, "original_chunk": segment, "translated_chunk": translated.strip(),
+                "status": "success", "source": source}
+    if deferred_from is not None: # 제공자 차단으로 보류된 요청의 단위
+        return {"chunk_index": index, "original_chunk": segment, "translated_chunk": None,
+                "status": "deferred", "error": deferred_from.get("error"), "retry_at": deferred_from.get("retry_at")}
+    return {"chunk_index": index, "original_chunk": segment, "translated_chunk": None,
+            "status": "failed", "error": error}
+
+
+def translate_packed(segments, translate_pack, translate_one, max_tokens: int, count, lookup=None, store=None,
+                     max_concurrency: int = TRANSLATION_MAX_CONCURRENCY):
+    """
+    단위들을 묶어서 번역하고 단위별 결과로 되돌립니다.
+
+    :param translate_pack: 구분자로 묶은 텍스트 -> 응답 문자열 (묶음용 프롬프트 사용)
+    :param translate_one: 단위 하나 -> 번역 문자열 (단일 프롬프트, 파싱 실패 시 대체 경로)
+    :param lookup: 단위 -> 캐시된 번역 또는 None (선택)
+    :param store: (단위, 번역) 저장 함수 (선택)
+    :return: (translate_chunks와 같은 형식의 단위별 결과 목록 + "source", 통계 dict)
+             source: "cache" | "packed" | "single", status "deferred"는 제공자 차단으로 보류된 단위
+    """
+    segments = list(segments)
+    results = [None] * len(segments)
+    stats = {"units": len(segments), "cache_hits": 0, "packed_calls": 0, "single_calls": 0, "fallback_units": 0}
+
+    pending = []
+    for index, segment in enumerate(segments):
+        cached = lookup(segment) if lookup else None
+        if cached is not None:
+            results[index] = _result(index, segment, cached, "cache")
+            stats["cache_hits"] += 1
+        else:
+            pending.append(index)
+
+    packs = [[pending[i] for i in pack]
+             for pack in pack_segments([segments[i] for i in pending], max_tokens, count)]
+    singles = [pack[0] for pack in packs if len(pack) == 1]
+    multi = [pack for pack in packs if len(pack) > 1]
+
+    # 1. 묶음 요청 (동시 실행, 순서 유지)
+    retry = []
+    if multi:
+        packed_texts = [build_packed_text([segments[i] for i in pack]) for pack in multi]
+        stats["packed_calls"] = len(multi)
+        for pack, response in zip(multi, translate_chunks(packed_texts, translate_pack, max_concurrency)):
+            parsed = parse_packed_response(response["translated_chunk"] or "", len(pack)) \
+                if response["status"] == "success" else {}
+            for number, index in enumerate(pack, start=1):
+                if number in parsed:
+                    results[index] = _result(index, segments[index], parsed[number], "packed")
+                elif response["status"] == "deferred":
+                    results[index] = _result(index, segments[index], deferred_from=response) # 따로 보내도 거절됨
+                else:
+                    retry.append(index)
+        if retry:
+            print(f"워커: 묶음 응답에서 {len(retry)}개 단위를 찾지 못해 따로 번역합니다.")
+        stats["fallback_units"] = len(retry)
+
+    # 2. 혼자인 단위와 파싱에 실패한 단위는 단일 프롬프트로 번역
+    single_indices = sorted(singles + retry)
+    if single_indices:
+        stats["single_calls"] = len(single_indices)
+        for index, response in zip(single_indices,
+                                   translate_chunks([segments[i] for i in single_indices], translate_one,
+                                                    max_concurrency)):
+            if response["status"] == "success":
+                results[index] = _result(index, segments[index], response["translated_chunk"], "single")
+            elif response["status"] == "deferred":
+                results[index] = _result(index, segments[index], deferred_from=response)
+            else:
+                results[index] = _result(index, segments[index], error=response.get("error"))
+
+    if store:
+        for result in results:
+            if result["status"] == "success" and result["source"] != "cache" and result["translated_chunk"]:
+                store(result["original_chunk"], result["translated_chunk"])
+    return results, stats
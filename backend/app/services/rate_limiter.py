@@ -0,0 +1,98 @@
+# backend/app/services/rate_limiter.py
+
+import os
+import threading
+import time
+
+# 워커 프로세스 전체에서 공유하는 LLM 호출 속도 제한기 (토큰 버킷).
+# 여러 작업/스레드가 동시에 LLM을 호출해도 분당 요청 수와 분당 토큰 수가
+# 제공자 한도를 넘지 않도록 호출 전에 acquire()로 용량을 확보합니다.
+# 버킷 용량(burst)은 1분 한도의 일부로 두어 한 번에 몰리는 요청을 막습니다.
+
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "90000"))
+LLM_BURST_SECONDS = float(os.getenv("LLM_BURST_SECONDS", "10")) # 버킷 용량 = 이 시간 동안의 허용량
+
+
+class TokenBucket:
+    """초당 rate만큼 채워지고 capacity까지 쌓이는 토큰 버킷. 스레드 안전합니다."""
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate = rate_per_second
+        self.capacity = max(capacity, 1.0)
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._condition = threading.Condition()
+
+    def _refill(self, now: float):
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0, timeout: float = None) -> float:
+        """
+        amount만큼 확보될 때까지 기다립니다. 용량보다 큰 요청은 용량만큼으로 제한합니다.
+
+        :return: 기다린 시간(초)
+        :raises TimeoutError: timeout 안에 확보하지 못한 경우
+        """
+        amount = min(amount, self.capacity)
+        start = time.monotonic()
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._level >= amount:
+                    self._level -= amount
+                    return now - start
+                wait = (amount - self._level) / self.rate
+                if timeout is not None:
+                    remaining = timeout - (now - start)
+                    if remaining <= 0:
+                        raise TimeoutError("속도 제한 대기 시간 초과")
+                    wait = min(wait, remaining)
+                self._condition.wait(wait)
+
+    def adjust(self, delta: float):
+        """실제 사용량이 추정치와 다를 때 보정합니다 (양수: 더 사용함). 잔량은 음수가 될 수 있습니다."""
+        with self._condition:
+            self._refill(time.monotonic())
+            self._level = min(self.capacity, self._level - delta)
+            self._condition.notify_all()
+
+
+class RateLimiter:
+    """분당 요청 수와 분당 토큰 수를 함께 제한합니다."""
+    def __init__(self, requests_per_minute: float = LLM_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = LLM_TOKENS_PER_MINUTE, burst_seconds: float = LLM_BURST_SECONDS):
+        self.requests = TokenBucket(requests_per_minute / 60.0, requests_per_minute / 60.0 * burst_seconds)
+        self.tokens = TokenBucket(tokens_per_minute / 60.0, tokens_per_minute / 60.0 * burst_seconds)
+        self._lock = threading.Lock()
+        self.stats = {"acquired": 0, "waited_seconds": 0.0}
+
+    def acquire(self, tokens: float = 0.0, timeout: float = None) -> float:
+        """요청 1건과 tokens개의 토큰을 확보합니다. :return: 기다린 시간(초)"""
+        waited = self.requests.acquire(1.0, timeout)
+        if tokens > 0:
+            waited += self.tokens.acquire(tokens, None if timeout is None else max(timeout - waited, 0.0))
+        with self._lock:
+            self.stats["acquired"] += 1
+            self.stats["waited_seconds"] += waited
+        return waited
+
+    def record_usage(self, estimated_tokens: float, actual_tokens: float):
+        """응답의 실제 토큰 사용량으로 토큰 버킷을 보정합니다."""
+        if actual_tokens is not None:
+            self.tokens.adjust(actual_tokens - estimated_tokens)
+
+
+def estimate_tokens(text: str, completion_ratio: float = 1.5) -> int:
+    """
+    프롬프트 + 응답 토큰 수를 대략 추정합니다.
+    한글/한자 등은 글자당 약 1토큰, 그 외는 4글자당 약 1토큰으로 계산합니다.
+    """
+    wide = sum(1 for ch in text if ord(ch) >= 0x1100)
+    prompt_tokens = wide + (len(text) - wide) / 4
+    return int(prompt_tokens * (1 + completion_ratio)) + 1
+
+
+# 워커 프로세스에서 공유하는 LLM 속도 제한기
+llm_rate_limiter = RateLimiter()
@@ -0,0 +1,145 @@
+# backend/app/services/s3_multipart.py
+
+import io
+import os
+
+# 생성 중인 결과 파일(오디오 등)을 로컬 디스크나 메모리에 전부 만들지 않고
+# part 크기만큼 찰 때마다 S3 multipart 업로드로 내보내는 파일형 객체.
+# S3는 part 번호로 순서를 정하므로 업로드 순서는 자유롭습니다.
+# 그래서 첫 part는 close() 때까지 메모리에 보관하고, 인코더가 끝에서 헤더를 다시 쓰기 위해
+# 파일 앞부분으로 seek하는 경우(FLAC STREAMINFO 등)를 허용합니다.
+
+MIN_PART_SIZE = 5 * 1024 * 1024 # S3 제한: 마지막 part를 제외한 최소 크기
+DEFAULT_PART_SIZE = max(int(os.getenv("S3_MULTIPART_PART_SIZE", str(8 * 1024 * 1024))), MIN_PART_SIZE)
+
+
+class S3MultipartWriter(io.RawIOBase):
+    """
+    write()/seek()/tell()을 지원하는 S3 업로드 스트림.
+    메모리 사용량은 최대 part 2개 분량(보관 중인 첫 part + 채우는 중인 part)입니다.
+    """
+    def __init__(self, bucket_name: str, object_name: str, client=None, part_size: int = DEFAULT_PART_SIZE,
+                 content_type: str = None):
+        super().__init__()
+        if client is None:
+            import boto3
+            client = boto3.client("s3")
+        self.client = client
+        self.bucket_name = bucket_name
+        self.object_name = object_name
+        self.part_size = part_size
+        self.content_type = content_type
+
+        self._head = bytearray()  # part 1 (close 때 업로드)
+        self._tail = bytearray()  # 채우는 중인 part
+        self._tail_start = part_size # _tail의 파일 내 시작 위치
+        self._position = 0
+        self._size = 0
+        self._upload_id = None
+        self._parts = []          # [{"PartNumber": n, "ETag": ...}, ...]
+        self.bytes_uploaded = 0
+
+    # --- 파일형 인터페이스 ---
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: self._size}[whence]
+        target = base + offset
+        if target < 0:
+            raise ValueError("음수 위치로 seek할 수 없습니다.")
+        if self.part_size <= target < self._tail_start:
+            raise io.UnsupportedOperation("이미 업로드된 part 영역으로는 seek할 수 없습니다.")
+        self._position = target
+        return target
+
+    def write(self, data) -> int:
+        data = memoryview(data).cast("B")
+        written = 0
+        while written < len(data):
+            chunk = data[written:]
+            if self._position < self.part_size:
+                chunk = chunk[:self.part_size - self._position]
+                _write_into(self._head, self._position, chunk)
+            else:
+                _write_into(self._tail, self._position - self._tail_start, chunk)
+            self._position += len(chunk)
+            self._size = max(self._size, self._position)
+            written += len(chunk)
+        # 현재 위치가 채우는 중인 part를 벗어났으면 완성된 part를 업로드
+        while len(self._tail) >= self.part_size and self._position >= self._tail_start + self.part_size:
+            self._upload_part(bytes(self._tail[:self.part_size]))
+            del self._tail[:self.part_size]
+            self._tail_start += self.part_size
+        return len(data)
+
+    def close(self):
+        """남은 데이터를 업로드하고 multipart 업로드를 완료합니다."""
+        if self.closed:
+            return
+        try:
+            if self._upload_id is None and not self._tail:
+                # part 하나 분량 이하는 단일 put_object로 충분
+                extra = {"ContentType": self.content_type} if self.content_type else {}
+                self.client.put_object(Bucket=self.bucket_name, Key=self.object_name, Body=bytes(self._head), **extra)
+                self.bytes_uploaded += len(self._head)
+            else:
+                if self._tail:
+                    self._upload_part(bytes(self._tail))
+                self._upload_part(bytes(self._head), part_number=1)
+                self.client.complete_multipart_upload(
+                    Bucket=self.bucket_name, Key=self.object_name, UploadId=self._upload_id,
+                    MultipartUpload={"Parts": sorted(self._parts, key=lambda p: p["PartNumber"])},
+                )
+            print(f"S3 multipart 업로드 완료: s3://{self.bucket_name}/{self.object_name} ({self.bytes_uploaded} bytes)")
+        except Exception:
+            self.abort()
+            raise
+        finally:
+            super().close()
+
+    def abort(self):
+        """진행 중인 multipart 업로드를 취소합니다 (업로드된 part 삭제)."""
+        if self._upload_id is not None:
+            try:
+                self.client.abort_multipart_upload(Bucket=self.bucket_name, Key=self.object_name,
+                                                   UploadId=self._upload_id)
+            except Exception as e:
+                print(f"S3 multipart 업로드 취소 중 오류: {e}")
+            self._upload_id = None
+        if not self.closed:
+            super().close()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+        return False
+
+    # --- 내부 ---
+
+    def _upload_part(self, body: bytes, part_number: int = None):
+        if self._upload_id is None:
+            extra = {"ContentType": self.content_type} if self.content_type else {}
+            response = self.client.create_multipart_upload(Bucket=self.bucket_name, Key=self.object_name, **extra)
+            self._upload_id = response["UploadId"]
+        if part_number is None:
+            part_number = len([p for p in self._parts if p["PartNumber"] != 1]) + 2 # part 1은 첫 part용으로 예약
+        response = self.client.upload_part(Bucket=self.bucket_name, Key=self.object_name, UploadId=self._upload_id,
+                                           PartNumber=part_number, Body=body)
+        self._parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+        self.bytes_uploaded += len(body)
+
+
+def _write_into(buffer: bytearray, offset: int, chunk):
+    if offset > len(buffer):
+        buffer.extend(b"\x00" * (offset - len(buffer)))
+    buffer[offset:offset + len(chunk)] = chunk
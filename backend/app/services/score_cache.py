@@ -0,0 +1,192 @@
+# backend/app/services/score_cache.py
+
+import hashlib
+import os
+import threading
+import time
+
+# 워커 레벨의 파싱된 악보 캐시.
+# converter.parse()는 MusicXML 처리에서 가장 느린 CPU 단계이므로,
+# 같은 파일(재시도/재제출)을 다시 파싱하지 않도록 파싱 결과를 디스크에 저장해 둡니다.
+# 캐시 키는 파일 내용 해시 + music21 버전이므로 파일 경로/이름이 달라도 재사용되고,
+# music21 업그레이드 시에는 자동으로 무효화됩니다.
+
+SCORE_CACHE_DIR = os.getenv("SCORE_CACHE_DIR", "/tmp/score_cache")
+SCORE_CACHE_MAX_BYTES = int(os.getenv("SCORE_CACHE_MAX_BYTES", str(2 * 1024 * 1024 * 1024))) # 기본 2GB
+SCORE_CACHE_ENABLED = os.getenv("SCORE_CACHE_ENABLED", "true").lower() == "true"
+
+# 캐시 파일 형식이 바뀌면 이 값을 올려 기존 항목을 무효화합니다.
+CACHE_FORMAT_VERSION = "1"
+CACHE_FILE_SUFFIX = ".m21p"
+
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def _music21_version() -> str:
+    import music21
+    return music21.__version__
+
+
+class ScoreCache:
+    """
+    music21 파싱 결과(Stream)를 pickle 바이너리로 저장/로드하는 디스크 캐시.
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다.
+    """
+    def __init__(self, cache_dir: str = SCORE_CACHE_DIR, max_bytes: int = SCORE_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "errors": 0, "evictions": 0}
+
+    def key_for(self, file_path: str) -> str:
+        """파일 내용 해시와 music21 버전으로 캐시 키를 만듭니다."""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        digest.update(f"|music21={_music21_version()}|fmt={CACHE_FORMAT_VERSION}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + CACHE_FILE_SUFFIX)
+
+    def load(self, key: str):
+        """
+        캐시에서 Stream을 로드합니다. 항목이 없거나 역직렬화에 실패하면 None을 반환합니다.
+        손상된 항목은 삭제하여 다음 파싱 결과로 다시 채워지도록 합니다.
+        """
+        from music21 import freezeThaw
+
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            thawer = freezeThaw.StreamThawer()
+            thawer.openStr(data)
+            score = thawer.stream
+            if score is None:
+                raise ValueError("빈 캐시 항목")
+        except Exception as e:
+            print(f"워커: 악보 캐시 항목 역직렬화 실패, 새로 파싱합니다: {e}")
+            self.stats["errors"] += 1
+            self._remove(entry_path)
+            return None
+
+        # LRU 판단을 위해 접근 시각 갱신
+        try:
+            os.utime(entry_path, None)
+        except OSError:
+            pass
+        return score
+
+    def store(self, key: str, score):
+        """Stream을 직렬화하여 캐시에 저장합니다. 실패해도 작업에는 영향을 주지 않습니다."""
+        from music21 import freezeThaw
+
+        try:
+            # fastButUnsafe=False: 원본 Stream을 변경하지 않도록 복사본을 직렬화
+            data = freezeThaw.StreamFreezer(score).writeStr(fmt="pickle")
+        except Exception as e:
+            print(f"워커: 악보 캐시 직렬화 실패 (캐시 저장 건너뜀): {e}")
+            return False
+
+        if len(data) > self.max_bytes:
+            return False
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry_path = self._entry_path(key)
+        # 다른 워커 프로세스가 반쯤 쓰인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            print(f"워커: 악보 캐시 저장 실패: {e}")
+            self._remove(tmp_path)
+            return False
+
+        self._evict()
+        return True
+
+    def parse(self, file_path: str):
+        """
+        캐시를 우선 사용하여 악보를 파싱합니다.
+
+        :param file_path: 파싱할 악보 파일 경로 (MusicXML 등)
+        :return: (music21 Stream, 캐시 적중 여부) 튜플
+        """
+        from music21 import converter
+
+        if not SCORE_CACHE_ENABLED:
+            return converter.parse(file_path), False
+
+        key = self.key_for(file_path)
+        score = self.load(key)
+        if score is not None:
+            self.stats["hits"] += 1
+            return score, True
+
+        self.stats["misses"] += 1
+        score = converter.parse(file_path)
+        self.store(key, score)
+        return score, False
+
+    def total_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _entries(self):
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return []
+        entries = []
+        for name in names:
+            if not name.endswith(CACHE_FILE_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue # 다른 프로세스가 방금 삭제한 경우
+            entries.append((path, st.st_size, st.st_mtime))
+        return entries
+
+    def _evict(self):
+        """전체 캐시 크기가 max_bytes 이하가 될 때까지 오래된 항목부터 삭제합니다."""
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            if total <= self.max_bytes:
+                return
+            for path, size, _ in sorted(entries, key=lambda e: e[2]):
+                if total <= self.max_bytes:
+                    break
+                if self._remove(path):
+                    total -= size
+                    self.stats["evictions"] += 1
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+
+# 워커 프로세스 전체에서 공유하는 캐시 인스턴스
+score_cache = ScoreCache()
+
+
+def parse_score_cached(file_path: str):
+    """converter.parse()의 캐시 적용 버전. (Stream, 캐시 적중 여부)를 반환합니다."""
+    start = time.perf_counter()
+    score, hit = score_cache.parse(file_path)
+    elapsed = time.perf_counter() - start
+    print(f"워커: 악보 파싱 {'(캐시 적중)' if hit else '(캐시 미스)'} - {elapsed:.3f}초")
+    return score, hit
@@ -0,0 +1,266 @@
+# backend/app/services/score_ir.py
+
+import numpy as np
+
+# 분석 단계용 경량 악보 표현 (Compact Score IR).
+# music21 Stream(.flat.getElementsByClass(...))이나 mido 메시지 객체를 매번 순회하는 대신,
+# 악보를 한 번만 읽어 NumPy 구조화 배열로 변환해 두고 분석 단계는 이 배열을 벡터 연산으로 처리합니다.
+# 음표 하나당 music21 Note 객체(수 KB) 대신 24바이트만 사용합니다.
+
+DEFAULT_VELOCITY = 64
+
+# 음표 이벤트 테이블. 시간 단위는 사분음표 길이(quarterLength)입니다.
+NOTE_DTYPE = np.dtype([
+    ("onset", np.float64),    # 악보 시작부터의 위치
+    ("duration", np.float64), # 길이
+    ("pitch", np.uint8),      # MIDI 음높이 (0-127)
+    ("velocity", np.uint8),   # 셈여림 (0-127)
+    ("part", np.uint16),      # 파트(트랙) 번호
+    ("measure", np.int32),    # 마디 번호 (알 수 없으면 -1)
+])
+
+# 가사 테이블. 가사 문자열 자체는 lyric_texts 리스트에 같은 순서로 저장됩니다.
+LYRIC_DTYPE = np.dtype([
+    ("onset", np.float64),
+    ("part", np.uint16),
+    ("measure", np.int32),
+    ("verse", np.uint8),
+])
+
+TEMPO_DTYPE = np.dtype([
+    ("onset", np.float64),
+    ("qpm", np.float64), # 분당 사분음표 수
+])
+
+TIME_SIGNATURE_DTYPE = np.dtype([
+    ("onset", np.float64),
+    ("numerator", np.uint8),
+    ("denominator", np.uint8),
+    ("measure", np.int32),
+])
+
+KEY_SIGNATURE_DTYPE = np.dtype([
+    ("onset", np.float64),
+    ("sharps", np.int8), # 양수는 샤프 개수, 음수는 플랫 개수
+])
+
+# mido key_signature 메시지의 조 이름 -> 조표 (5도권 위치)
+_LETTER_FIFTHS = {"F": -1, "C": 0, "G": 1, "D": 2, "A": 3, "E": 4, "B": 5}
+
+
+def key_name_to_sharps(key_name: str) -> int:
+    """'Bb', 'F#m' 같은 조 이름을 조표의 샤프(+)/플랫(-) 개수로 변환합니다."""
+    minor = key_name.endswith("m")
+    tonic = key_name[:-1] if minor else key_name
+    sharps = _LETTER_FIFTHS[tonic[0].upper()] + 7 * tonic.count("#") - 7 * tonic.count("b")
+    return sharps - 3 if minor else sharps
+
+
+class ScoreIR:
+    """
+    음표 이벤트 구조화 배열과 가사/빠르기/박자표 보조 테이블을 담는 악보 표현.
+    from_music21() 또는 from_mido()로 생성합니다.
+    """
+    def __init__(self, notes, lyrics=None, lyric_texts=None, tempos=None, time_signatures=None,
+                 key_signatures=None, source: str = "unknown"):
+        self.notes = notes
+        self.lyrics = lyrics if lyrics is not None else np.zeros(0, dtype=LYRIC_DTYPE)
+        self.lyric_texts = lyric_texts if lyric_texts is not None else []
+        self.tempos = tempos if tempos is not None else np.zeros(0, dtype=TEMPO_DTYPE)
+        self.time_signatures = time_signatures if time_signatures is not None else np.zeros(0, dtype=TIME_SIGNATURE_DTYPE)
+        self.key_signatures = key_signatures if key_signatures is not None else np.zeros(0, dtype=KEY_SIGNATURE_DTYPE)
+        self.source = source
+
+    def __len__(self):
+        return len(self.notes)
+
+    @property
+    def num_parts(self) -> int:
+        return int(self.notes["part"].max()) + 1 if len(self.notes) else 0
+
+    @property
+    def end_time(self) -> float:
+        """마지막 음이 끝나는 위치 (사분음표 길이)."""
+        if not len(self.notes):
+            return 0.0
+        return float((self.notes["onset"] + self.notes["duration"]).max())
+
+    @property
+    def nbytes(self) -> int:
+        return (self.notes.nbytes + self.lyrics.nbytes + self.tempos.nbytes + self.time_signatures.nbytes
+                + self.key_signatures.nbytes + sum(len(t) for t in self.lyric_texts))
+
+    def summary(self) -> dict:
+        """결과 페이로드에 넣기 위한 요약 정보."""
+        return {
+            "source": self.source,
+            "note_count": len(self.notes),
+            "part_count": self.num_parts,
+            "lyric_count": len(self.lyric_texts),
+            "tempo_count": len(self.tempos),
+            "time_signature_count": len(self.time_signatures),
+            "duration_quarters": self.end_time,
+        }
+
+    # --- 생성 함수 ---
+
+    @classmethod
+    def from_music21(cls, score) -> "ScoreIR":
+        """
+        music21 Score/Part/Stream에서 한 번의 순회로 IR을 만듭니다.
+        붙임줄(tie)로 이어진 음은 첫 음의 길이를 늘려 하나의 음으로 합칩니다 (마디를 넘는 지속음 포함).
+        """
+        parts = list(score.parts) if hasattr(score, "parts") and len(score.parts) else [score]
+
+        note_rows = []
+        lyric_rows = []
+        lyric_texts = []
+        for part_index, part in enumerate(parts):
+            open_ties = {} # 음높이 -> 붙임줄이 이어지는 note_rows 인덱스
+            measures = part.getElementsByClass("Measure")
+            if len(measures):
+                containers = [(m, m.offset, m.number if m.number is not None else -1) for m in measures]
+            else:
+                containers = [(part, 0.0, -1)]
+
+            for container, container_offset, measure_number in containers:
+                for element in container.recurse().notes:
+                    onset = container_offset + float(element.getOffsetInHierarchy(container))
+                    duration = float(element.duration.quarterLength)
+                    velocity = element.volume.velocity if element.volume.velocity is not None else DEFAULT_VELOCITY
+                    for member in (element.notes if element.isChord else (element,)): # Note는 1개, Chord는 여러 개
+                        pitch = member.pitch.midi
+                        tie_type = member.tie.type if member.tie is not None else None
+                        index = open_ties.get(pitch)
+                        if index is not None and tie_type in ("stop", "continue"):
+                            row = note_rows[index]
+                            note_rows[index] = (row[0], onset + duration - row[0]) + row[2:]
+                            if tie_type == "stop":
+                                del open_ties[pitch]
+                            continue
+                        note_rows.append((onset, duration, pitch, velocity, part_index, measure_number))
+                        if tie_type in ("start", "continue"):
+                            open_ties[pitch] = len(note_rows) - 1
+                    for lyric in element.lyrics:
+                        if lyric.text:
+                            lyric_rows.append((onset, part_index, measure_number, lyric.number or 1))
+                            lyric_texts.append(lyric.text)
+
+        # 파트마다 같은 빠르기표가 반복되는 경우가 많으므로 위치별로 첫 빠르기표만 사용
+        tempos_by_onset = {}
+        for mm in score.flatten().getElementsByClass("MetronomeMark"):
+            if mm.number is not None:
+                tempos_by_onset.setdefault(float(mm.offset), float(mm.getQuarterBPM()))
+        tempo_rows = sorted(tempos_by_onset.items())
+        ts_rows = []
+        for ts in parts[0].flatten().getElementsByClass("TimeSignature"):
+            measure_number = ts.measureNumber if ts.measureNumber is not None else -1
+            ts_rows.append((float(ts.offset), ts.numerator, ts.denominator, measure_number))
+        ks_rows = [(float(ks.offset), ks.sharps) for ks in parts[0].flatten().getElementsByClass("KeySignature")]
+
+        notes = np.array(note_rows, dtype=NOTE_DTYPE)
+        notes.sort(order=["onset", "part", "pitch"], kind="stable")
+        return cls(
+            notes=notes,
+            lyrics=np.array(lyric_rows, dtype=LYRIC_DTYPE),
+            lyric_texts=lyric_texts,
+            tempos=np.array(tempo_rows, dtype=TEMPO_DTYPE),
+            time_signatures=np.array(ts_rows, dtype=TIME_SIGNATURE_DTYPE),
+            key_signatures=np.array(ks_rows, dtype=KEY_SIGNATURE_DTYPE),
+            source="music21",
+        )
+
+    @classmethod
+    def from_mido(cls, midi_file) -> "ScoreIR":
+        """
+        mido MidiFile에서 IR을 만듭니다. 파트 번호는 트랙 번호(타입 0 파일은 채널 번호)입니다.
+        마디 번호는 박자표 테이블로부터 계산합니다.
+        """
+        tpb = float(midi_file.ticks_per_beat)
+        split_by_channel = midi_file.type == 0
+
+        note_rows = []
+        lyric_rows = []
+        lyric_texts = []
+        tempo_rows = []
+        ts_rows = []
+        ks_rows = []
+        for track_index, track in enumerate(midi_file.tracks):
+            tick = 0
+            active = {} # (channel, pitch) -> [(start_tick, velocity), ...]
+            for msg in track:
+                tick += msg.time
+                msg_type = msg.type
+                if msg_type == "note_on" and msg.velocity > 0:
+                    active.setdefault((msg.channel, msg.note), []).append((tick, msg.velocity))
+                elif msg_type == "note_off" or msg_type == "note_on":
+                    started = active.get((msg.channel, msg.note))
+                    if started:
+                        start_tick, velocity = started.pop(0)
+                        part_index = msg.channel if split_by_channel else track_index
+                        note_rows.append((start_tick / tpb, (tick - start_tick) / tpb, msg.note, velocity, part_index, -1))
+                elif msg_type == "lyrics":
+                    lyric_rows.append((tick / tpb, track_index, -1, 1))
+                    lyric_texts.append(msg.text)
+                elif msg_type == "set_tempo":
+                    tempo_rows.append((tick / tpb, 60_000_000.0 / msg.tempo))
+                elif msg_type == "time_signature":
+                    ts_rows.append((tick / tpb, msg.numerator, msg.denominator, -1))
+                elif msg_type == "key_signature":
+                    ks_rows.append((tick / tpb, key_name_to_sharps(msg.key)))
+
+        notes = np.array(note_rows, dtype=NOTE_DTYPE)
+        notes.sort(order=["onset", "part", "pitch"], kind="stable")
+        lyrics = np.array(lyric_rows, dtype=LYRIC_DTYPE)
+        time_signatures = np.array(ts_rows, dtype=TIME_SIGNATURE_DTYPE)
+        time_signatures.sort(order="onset", kind="stable")
+
+        time_signatures["measure"] = assign_measures(time_signatures["onset"], time_signatures)
+        notes["measure"] = assign_measures(notes["onset"], time_signatures)
+        lyrics["measure"] = assign_measures(lyrics["onset"], time_signatures)
+
+        return cls(
+            notes=notes,
+            lyrics=lyrics,
+            lyric_texts=lyric_texts,
+            tempos=np.array(tempo_rows, dtype=TEMPO_DTYPE),
+            time_signatures=time_signatures,
+            key_signatures=np.sort(np.array(ks_rows, dtype=KEY_SIGNATURE_DTYPE), order="onset", kind="stable"),
+            source="mido",
+        )
+
+
+def assign_measures(onsets, time_signatures):
+    """
+    박자표 테이블을 기준으로 각 위치가 속한 마디 번호(1부터 시작)를 벡터 연산으로 계산합니다.
+    박자표가 없으면 4/4로 간주합니다.
+    """
+    onsets = np.asarray(onsets, dtype=np.float64)
+    if len(time_signatures) == 0 or time_signatures["onset"][0] > 0:
+        ts_onsets = np.concatenate([[0.0], time_signatures["onset"]])
+        ts_lengths = np.concatenate([[4.0], time_signatures["numerator"] * 4.0 / time_signatures["denominator"]])
+    else:
+        ts_onsets = time_signatures["onset"].astype(np.float64)
+        ts_lengths = time_signatures["numerator"] * 4.0 / time_signatures["denominator"]
+
+    # 각 박자표 구간이 시작되는 마디 번호 (이전 구간의 마디 수 누적)
+    segment_measures = np.ceil(np.diff(ts_onsets) / ts_lengths[:-1] - 1e-9)
+    first_measure = np.concatenate([[1.0], 1.0 + np.cumsum(segment_measures)])
+
+    segment = np.searchsorted(ts_onsets, onsets, side="right") - 1
+    segment = np.clip(segment, 0, len(ts_onsets) - 1)
+    within = np.floor((onsets - ts_onsets[segment]) / ts_lengths[segment] + 1e-9)
+    return (first_measure[segment] + within).astype(np.int32)
+
+
+def build_score_ir(music_data_representation):
+    """
+    워커의 music_data_representation (music21 Stream 또는 mido MidiFile)에서 IR을 만듭니다.
+    지원하지 않는 형식(OMR mock 결과 등)이면 None을 반환합니다.
+    """
+    module_name = type(music_data_representation).__module__ or ""
+    if module_name.startswith("music21."):
+        return ScoreIR.from_music21(music_data_representation)
+    if module_name.startswith("mido."):
+        return ScoreIR.from_mido(music_data_representation)
+    return None
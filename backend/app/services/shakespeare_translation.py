@@ -0,0 +1,279 @@
+# backend/app/services/shakespeare_translation.py
+
+import functools
+import os
+
+from .chunk_translation import translate_chunks # 청크 동시 번역 (순서 유지)
+from .language_detection import detect_language # 제한된 표본 + 캐시 언어 감지
+from .llm_pool import llm_pool # 워커 공유 LLM 클라이언트/체인 (HTTP 연결 재사용)
+from .llm_resilience import llm_resilience # 재시도/차단 (Retry-After, 재시도 예산, 서킷 브레이커)
+from .lyric_dedup import DEDUP_MIN_SAVED_RATIO, dedupe_lines # 반복 가사 구간 제거/복원
+from .packed_translation import TRANSLATION_PACKING, translate_packed # 짧은 단위 묶음 번역
+from .rate_limiter import estimate_tokens, llm_rate_limiter # 프로세스 공유 LLM 속도 제한
+from .token_chunker import TRANSLATION_CHUNKING, chunk_token_budget, split_by_tokens, token_counter
+from .translation_cache import translation_cache # 청크 번역 결과 캐시 (메모리 + SQLite/Redis)
+
+# 셰익스피어 문체 번역 단계 (translate_to_shakespearean).
+# worker.py의 번역 단계 본문을 옮긴 것으로, 워커 루프와 Lambda 진입점(task_pipeline),
+# 그리고 OMR 페이지별 선행 번역(omr_pipeline.PageTextStream)이 같은 함수를 사용합니다.
+# 언어 감지 -> 청크 분할 -> 반복 구간 제거 -> (묶음) 동시 번역 + 캐시 -> 반복 구간 복원 순서로 처리합니다.
+# LangChain은 번역을 처음 실행할 때 임포트됩니다 (llm_pool.get/get_chain, 글자 수 분할기).
+
+# 온도(temperature)는 창의성 조절. 0.7 정도면 스타일 변환에 적합
+SHAKESPEARE_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo") # 번역 캐시 키에도 사용
+SHAKESPEARE_TEMPERATURE = 0.7
+
+# 프롬프트 템플릿 정의 (셰익스피어 문체 가이드라인 강화)
+# {original_text} 변수에 번역할 텍스트가 들어갑니다.
+# 원본 언어 지정, 결과 형식 지정 등 추가 가이드라인 포함.
+SHAKESPEARE_PROMPT_TEMPLATE = """Translate the following text into English,
+and then rewrite the translated text in the style of William Shakespeare.
+Focus on using vocabulary, phrasing, and sentence structures common in the Elizabethan era.
+Maintain the original meaning and context as accurately as possible.
+
+Original Text (Language: {original_language}):
+"{original_text}"
+
+Shakespearean Style Translation:"""
+
+# 프롬프트 변수 (PromptTemplate/LLMChain은 llm_pool.get_chain이 템플릿별로 한 번 생성)
+SHAKESPEARE_PROMPT_VARIABLES = ["original_text", "original_language"] # 원본 언어 변수 추가
+
+# 여러 짧은 단위를 한 요청으로 묶을 때의 프롬프트 (TRANSLATION_PACKING=true)
+# {original_text}에는 <<<1>>>, <<<2>>> ... 구분자 줄과 각 단위 텍스트가 들어갑니다.
+SHAKESPEARE_PACKED_PROMPT_TEMPLATE = """Translate each numbered segment below into English,
+and then rewrite it in the style of William Shakespeare.
+Focus on using vocabulary, phrasing, and sentence structures common in the Elizabethan era.
+Maintain the original meaning and context of each segment as accurately as possible.
+Copy every marker line (such as <<<1>>>) exactly as given and put that segment's translation directly below it.
+Do not merge, drop, reorder or add segments, and do not write anything before the first marker.
+
+Original Segments (Language: {original_language}):
+{original_text}
+
+Shakespearean Style Translation:"""
+
+# 번역 캐시 키에 쓰는 프롬프트: 두 프롬프트 중 하나라도 바뀌면 이전 번역은 사용하지 않음
+TRANSLATION_CACHE_PROMPT = SHAKESPEARE_PROMPT_TEMPLATE + SHAKESPEARE_PACKED_PROMPT_TEMPLATE
+
+
+def shakespeare_llm():
+    """
+    워커 공유 풀의 인스턴스 (모든 작업/스레드가 같은 HTTP 연결 풀 사용). 번역 단계에서 처음 호출될 때 생성됩니다.
+
+    :return: LLM 인스턴스, 생성할 수 없으면 None (LLM 사용 불가 상태)
+    """
+    try:
+        return llm_pool.get(SHAKESPEARE_MODEL, SHAKESPEARE_TEMPERATURE)
+    except Exception as e:
+        print(f"워커: OpenAI LLM 인스턴스 생성 오류: {e}")
+        return None
+
+
+# 긴 텍스트 분할 설정 (TRANSLATION_CHUNKING=chars일 때만 사용하므로 처음 필요할 때 생성)
+# 재귀적으로 분할 시도. chunk_size와 chunk_overlap 조정
+@functools.lru_cache(maxsize=1)
+def char_text_splitter():
+    from langchain.text_splitter import RecursiveCharacterTextSplitter # 긴 텍스트 분할에 더 유연
+    return RecursiveCharacterTextSplitter(
+        chunk_size=1500, # GPT-3.5-turbo 토큰 제한(약 4000)보다 작게 설정
+        chunk_overlap=100, # 청크 간 겹치는 부분 (문맥 유지를 도움)
+        length_function=len,
+        add_start_index=True, # 분할된 청크의 원본 텍스트 시작 위치 추가
+    )
+
+# 토큰 기준 분할 (TRANSLATION_CHUNKING=tokens, 기본값)
+# 모델 컨텍스트의 일정 비율(TRANSLATION_CHUNK_CONTEXT_FRACTION)까지 연/줄 경계에서 채움
+shakespeare_token_counter = token_counter(SHAKESPEARE_MODEL)
+SHAKESPEARE_CHUNK_TOKENS = chunk_token_budget(SHAKESPEARE_MODEL, SHAKESPEARE_PROMPT_TEMPLATE)
+
+
+def split_for_translation(text: str) -> list:
+    """번역할 텍스트를 청크 목록으로 나눕니다 (TRANSLATION_CHUNKING=chars이면 기존 글자 수 분할)."""
+    if TRANSLATION_CHUNKING == "chars":
+        return char_text_splitter().split_text(text)
+    return split_by_tokens(text, SHAKESPEARE_CHUNK_TOKENS, shakespeare_token_counter)
+
+
+def _call_llm_once(prompt_text: str, llm_chain: "LLMChain", original_language: str):
+    # 재시도를 포함한 모든 호출이 프로세스 공유 속도 제한기를 거침 (요청 수 + 추정 토큰 수)
+    from langchain_community.callbacks import get_openai_callback # 응답의 실제 토큰 사용량 집계
+    estimated_tokens = estimate_tokens(prompt_text)
+    waited = llm_rate_limiter.acquire(estimated_tokens)
+    if waited > 0.5:
+        print(f"워커: LLM 속도 제한으로 {waited:.1f}초 대기")
+    print(f"워커: LLM 호출 시도 (프롬프트 시작: {prompt_text[:100]}...)")
+    with get_openai_callback() as usage:
+        response = llm_chain.run(original_text=prompt_text, original_language=original_language) # 체인 실행
+    # 글자 수 기반 추정치를 실제 사용량(프롬프트 + 응답 토큰)으로 보정 (사용량을 보고하지 않는 모델은 추정치 유지)
+    llm_rate_limiter.record_usage(estimated_tokens, usage.total_tokens or None)
+    print(f"워커: LLM 호출 성공. (토큰 {usage.total_tokens}, 추정 {estimated_tokens})")
+    return response
+
+
+def call_llm_with_retry(prompt_text: str, llm_chain: "LLMChain", original_language: str = "unknown"):
+    """
+    LLM 체인을 호출하고 재시도 로직을 적용합니다.
+    일시적 오류만 재시도하며, 제공자가 불안정하면 CircuitOpenError/RetryBudgetExhausted(deferred)를 발생시킵니다.
+    """
+    return llm_resilience.call(_call_llm_once, prompt_text, llm_chain, original_language)
+
+
+def _step_status(translation_results: list) -> str:
+    if all(res['status'] == 'success' for res in translation_results):
+        return "success"
+    if any(res['status'] == 'deferred' for res in translation_results):
+        return "deferred" # 제공자 차단으로 보류 (작업 전체를 나중에 다시 처리, 성공한 청크는 캐시에서)
+    return "completed_with_errors" # 일부 청크 실패
+
+
+def _mark_deferred(result: dict, translation_results: list):
+    deferred = [res for res in translation_results if res['status'] == 'deferred']
+    result["deferred_chunks"] = [res['chunk_index'] for res in deferred]
+    result["retry_at"] = max(res.get('retry_at') or 0 for res in deferred)
+
+
+def translate_text(text: str, original_language: str = None, translate_one=None, translate_pack=None) -> dict:
+    """
+    텍스트를 셰익스피어 문체로 번역합니다.
+
+    :param original_language: 이미 감지한 원본 언어 (없으면 감지)
+    :param translate_one: 청크 하나 -> 번역 문자열 (없으면 공유 LLM 체인 + 재시도)
+    :param translate_pack: 구분자로 묶은 텍스트 -> 응답 문자열 (없으면 묶음용 공유 LLM 체인 + 재시도)
+    :return: shakespearean_translation 결과. status: "success" | "completed_with_errors" | "deferred"
+             ("deferred"이면 deferred_chunks, retry_at 포함)
+    """
+    # 1. 원본 텍스트 언어 감지
+    original_language = original_language or detect_language(text)
+    print(f"워커: 감지된 원본 언어: {original_language}")
+
+    # 2. 긴 텍스트를 청크로 분할 (청크마다 어느 세그먼트에 속하는지 기록)
+    segments = [text]
+    texts = split_for_translation(text) # 문자열 리스트 반환
+    chunk_segments = [0] * len(texts)
+
+    # 3. 반복되는 가사 구간(후렴 등)은 한 번만 번역하도록 고유 세그먼트로 모음
+    # 묶음 번역을 끄면 세그먼트마다 따로 번역하므로 LLM 호출 수가 늘어나지 않을 때만 사용
+    deduped = dedupe_lines(text)
+    if deduped.saved_ratio >= DEDUP_MIN_SAVED_RATIO:
+        dedup_texts, dedup_chunk_segments = [], []
+        for segment_index, segment in enumerate(deduped.segments):
+            for chunk in split_for_translation(segment):
+                dedup_texts.append(chunk)
+                dedup_chunk_segments.append(segment_index)
+        if TRANSLATION_PACKING or len(dedup_texts) <= len(texts):
+            segments, texts, chunk_segments = deduped.segments, dedup_texts, dedup_chunk_segments
+            print(f"워커: 반복 구간 제거로 번역할 텍스트가 {deduped.saved_ratio:.0%} 줄었습니다 "
+                  f"(고유 세그먼트 {len(segments)}개 / 전체 {len(deduped.layout)}개).")
+        else:
+            deduped = None
+    else:
+        deduped = None
+    print(f"워커: 원본 텍스트가 {len(texts)}개의 청크로 분할되었습니다.")
+
+    # 4. 각 청크별로 LLM 호출 및 번역/변환 수행
+    if translate_one is None:
+        llm_chain = llm_pool.get_chain(SHAKESPEARE_PROMPT_TEMPLATE, SHAKESPEARE_MODEL, SHAKESPEARE_TEMPERATURE,
+                                       SHAKESPEARE_PROMPT_VARIABLES)
+        translate_one = lambda chunk: call_llm_with_retry(prompt_text=chunk, llm_chain=llm_chain,
+                                                          original_language=original_language)
+
+    # 청크들을 동시에 번역 (동시 실행 수 상한: TRANSLATION_MAX_CONCURRENCY)
+    # 결과 목록은 청크 순서를 유지하며, 실패한 청크는 status "failed"로 기록됩니다.
+    # 같은 청크/언어/모델/프롬프트로 이미 번역한 결과가 캐시에 있으면 LLM을 호출하지 않습니다.
+    cache_before = translation_cache.snapshot()
+    packing_stats = None
+    if TRANSLATION_PACKING:
+        # 짧은 청크들은 구분자를 붙여 한 요청으로 묶고, 응답에서 못 찾은 청크만 따로 번역
+        if translate_pack is None:
+            packed_chain = llm_pool.get_chain(SHAKESPEARE_PACKED_PROMPT_TEMPLATE, SHAKESPEARE_MODEL,
+                                              SHAKESPEARE_TEMPERATURE, SHAKESPEARE_PROMPT_VARIABLES)
+            translate_pack = lambda packed: call_llm_with_retry(prompt_text=packed, llm_chain=packed_chain,
+                                                                original_language=original_language)
+        translation_results, packing_stats = translate_packed(
+            texts,
+            translate_pack=translate_pack,
+            translate_one=translate_one,
+            max_tokens=SHAKESPEARE_CHUNK_TOKENS,
+            count=shakespeare_token_counter,
+            lookup=lambda chunk: translation_cache.lookup(
+                chunk, original_language, SHAKESPEARE_MODEL, TRANSLATION_CACHE_PROMPT),
+            store=lambda chunk, translated: translation_cache.store(
+                chunk, original_language, SHAKESPEARE_MODEL, TRANSLATION_CACHE_PROMPT, translated),
+        )
+        print(f"워커: 청크 {len(texts)}개를 LLM 요청 "
+              f"{packing_stats['packed_calls'] + packing_stats['single_calls']}회로 번역했습니다.")
+    else:
+        translation_results = translate_chunks(
+            texts,
+            lambda chunk: translation_cache.get_or_translate(
+                chunk, original_language, SHAKESPEARE_MODEL, TRANSLATION_CACHE_PROMPT, translate_one),
+        )
+    cache_after = translation_cache.snapshot()
+
+    # 5. 번역된 청크를 세그먼트별로 합친 뒤 반복 구간을 원래 순서대로 복원
+    # 한 청크라도 실패하면 전체 번역문은 만들지 않고 청크별 결과만 남김
+    status = _step_status(translation_results)
+    full_translated_text = None
+    if status == "success":
+        translated_segments = [[] for _ in segments]
+        for segment_index, res in zip(chunk_segments, translation_results):
+            translated_segments[segment_index].append(res['translated_chunk'])
+        translated_segments = ["\n".join(parts) for parts in translated_segments]
+        full_translated_text = deduped.expand(translated_segments) if deduped else translated_segments[0]
+    result = {
+        "status": status,
+        "original_language": original_language,
+        "chunks_processed": len(texts),
+        "translation_results_per_chunk": translation_results, # 각 청크별 결과 목록
+        # 이번 작업의 번역 캐시 적중/미스 (다른 작업과 동시에 실행되면 근사값)
+        "cache": {name: cache_after[name] - cache_before[name] for name in cache_after},
+        "dedup": deduped.summary() if deduped else None,
+        "packing": packing_stats, # 묶음/단일 요청 수, 캐시 적중, 대체 번역 단위 수
+        "llm_resilience": llm_resilience.snapshot(), # 재시도/차단 카운터 (프로세스 누적)
+        "full_translated_text": full_translated_text, # 반복 구간까지 복원한 전체 번역문
+    }
+    if status == "deferred":
+        _mark_deferred(result, translation_results)
+    return result
+
+
+def merge_page_translations(page_results: list) -> dict:
+    """
+    페이지별 translate_text 결과(omr_pipeline.PageTextStream.results())를 페이지 순서대로 하나의 결과로 합칩니다.
+    번역 중 예외가 난 페이지는 실패한 청크 하나로 기록합니다.
+
+    :param page_results: [{"page_index", "text", "result" 또는 "error"}, ...]
+    :return: translate_text와 같은 형식 + "pages" (페이지별 상태)
+    """
+    translation_results, pages, translated_pages = [], [], []
+    cache, languages = {}, []
+    for page in page_results:
+        result = page.get("result")
+        if result is None:
+            result = {"status": "failed", "translation_results_per_chunk": [
+                {"original_chunk": page["text"], "translated_chunk": None, "status": "failed", "error": page["error"]}]}
+        for res in result["translation_results_per_chunk"]:
+            translation_results.append(dict(res, chunk_index=len(translation_results), page=page["page_index"] + 1))
+        for name, value in (result.get("cache") or {}).items():
+            cache[name] = cache.get(name, 0) + value
+        if result.get("original_language"):
+            languages.append(result["original_language"])
+        translated_pages.append(result.get("full_translated_text"))
+        pages.append({"page": page["page_index"] + 1, "status": result["status"],
+                      "chunks_processed": result.get("chunks_processed", 1)})
+
+    status = _step_status(translation_results)
+    merged = {
+        "status": status,
+        "original_language": max(set(languages), key=languages.count) if languages else "unknown",
+        "chunks_processed": len(translation_results),
+        "translation_results_per_chunk": translation_results,
+        "cache": cache,
+        "pages": pages,
+        "llm_resilience": llm_resilience.snapshot(),
+        "full_translated_text": "\n".join(translated_pages) if status == "success" else None,
+    }
+    if status == "deferred":
+        _mark_deferred(merged, translation_results)
+    return merged
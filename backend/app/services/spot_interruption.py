@@ -0,0 +1,295 @@
+# backend/app/services/spot_interruption.py
+
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+# Spot 인스턴스 회수(중단) 알림 처리.
+# Spot 인스턴스는 2분 전에 인스턴스 메타데이터(IMDS)의 spot/instance-action으로 회수를 알립니다.
+# 기존 워커는 알림을 무시해서 처리 중이던 메시지가 가시성 제한 시간(300초)이 지나야 다른 워커에게 보였습니다.
+# 여기서는
+#  - 감시 스레드가 IMDS(로컬 테스트는 파일)를 주기적으로 확인하고, 알림이 오면 interrupted를 설정합니다.
+#  - 워커는 새 메시지 수신을 멈추고, 처리 중인 작업의 완료된 단계 출력을 체크포인트로 저장한 뒤
+#    처리 중/미리 받은 메시지의 가시성을 바로 0으로 돌려 다른 워커가 수 초 안에 이어서 처리하게 합니다.
+#  - 다른 워커는 체크포인트에 있는 단계(RESUMABLE_STEP_TYPES)를 다시 실행하지 않고 결과를 복원합니다.
+
+SPOT_IMDS_URL = os.getenv("SPOT_IMDS_URL", "http://169.254.169.254")
+SPOT_INTERRUPTION_POLL_SECONDS = float(os.getenv("SPOT_INTERRUPTION_POLL_SECONDS", "5")) # AWS 권장 5초
+SPOT_INTERRUPTION_FILE = os.getenv("SPOT_INTERRUPTION_FILE") # 설정하면 IMDS 대신 이 파일로 알림 (로컬 테스트)
+SPOT_CHECKPOINT_DIR = os.getenv("SPOT_CHECKPOINT_DIR") # 설정하면 S3 대신 로컬 디렉터리에 체크포인트 저장
+SPOT_CHECKPOINT_PREFIX = os.getenv("SPOT_CHECKPOINT_PREFIX", "checkpoints/")
+IMDS_TIMEOUT_SECONDS = 1.0
+IMDS_TOKEN_TTL_SECONDS = 21600
+
+# 출력이 processed_results에 모두 들어 있어 다른 노드에서 다시 실행하지 않고 복원할 수 있는 단계
+# (extract_music_data는 메모리 객체를 만들므로 다시 실행 - 악보 캐시로 빠름)
+RESUMABLE_STEP_TYPES = {"extract_text_from_score", "translate_to_shakespearean", "generate_music_file"}
+
+
+class ImdsNoticeSource:
+    """EC2 인스턴스 메타데이터(IMDSv2)의 spot/instance-action을 확인합니다."""
+    def __init__(self, base_url: str = SPOT_IMDS_URL, timeout: float = IMDS_TIMEOUT_SECONDS):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._token, self._token_expires = None, 0.0
+
+    def _get_token(self) -> str:
+        if self._token is None or time.time() >= self._token_expires:
+            request = urllib.request.Request(f"{self.base_url}/latest/api/token", method="PUT", headers={
+                "X-aws-ec2-metadata-token-ttl-seconds": str(IMDS_TOKEN_TTL_SECONDS)})
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                self._token = response.read().decode()
+            self._token_expires = time.time() + IMDS_TOKEN_TTL_SECONDS - 60
+        return self._token
+
+    def fetch(self):
+        """
+        :return: 알림 dict (예: {"action": "terminate", "time": "2026-10-19T08:22:00Z"}) 또는 None (알림 없음)
+        :raises OSError: 메타데이터 서비스에 연결할 수 없을 때 (EC2가 아닌 환경 등)
+        """
+        request = urllib.request.Request(f"{self.base_url}/latest/meta-data/spot/instance-action",
+                                         headers={"X-aws-ec2-metadata-token": self._get_token()})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read().decode())
+        except urllib.error.HTTPError as e:
+            if e.code == 404: # 예정된 회수 없음
+                return None
+            if e.code == 401: # 토큰 만료
+                self._token = None
+            raise
+
+
+class FileNoticeSource:
+    """로컬 대체 알림: 파일이 있으면 회수 알림 (내용이 JSON이면 그대로, 아니면 terminate)."""
+    def __init__(self, path: str):
+        self.path = path
+
+    def fetch(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                content = f.read().strip()
+        except FileNotFoundError:
+            return None
+        try:
+            return json.loads(content)
+        except ValueError:
+            return {"action": "terminate", "time": None}
+
+
+def default_notice_source():
+    return FileNoticeSource(SPOT_INTERRUPTION_FILE) if SPOT_INTERRUPTION_FILE else ImdsNoticeSource()
+
+
+class SpotInterruptionWatcher:
+    """회수 알림을 주기적으로 확인하는 감시 스레드. 알림을 받으면 interrupted를 설정하고 콜백을 호출합니다."""
+    def __init__(self, source=None, poll_seconds: float = SPOT_INTERRUPTION_POLL_SECONDS):
+        self.source = source or default_notice_source()
+        self.poll_seconds = poll_seconds
+        self.interrupted = threading.Event()
+        self.notice = None
+        self.noticed_at = None
+        self._callbacks = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {"polls": 0, "errors": 0}
+
+    def on_notice(self, callback):
+        """알림을 받으면 호출할 함수 (알림 dict)를 등록합니다 (감시 스레드에서 호출)."""
+        self._callbacks.append(callback)
+
+    def check(self) -> bool:
+        """알림을 한 번 확인합니다. 처음 알림을 받으면 콜백을 호출하고 True를 반환합니다."""
+        if self.interrupted.is_set():
+            return True
+        with self._lock:
+            self.stats["polls"] += 1
+        notice = self.source.fetch()
+        if not notice:
+            return False
+        self.notice, self.noticed_at = notice, time.time()
+        self.interrupted.set()
+        print(f"워커: Spot 회수 알림 수신 {notice}, 새 메시지 수신을 멈추고 처리 중인 작업을 반환합니다.")
+        for callback in self._callbacks:
+            try:
+                callback(notice)
+            except Exception as e:
+                print(f"워커: 회수 알림 처리 중 오류: {e}")
+        return True
+
+    def _run(self):
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                if self.check():
+                    return
+                failures = 0
+            except OSError as e:
+                with self._lock:
+                    self.stats["errors"] += 1
+                failures += 1
+                if failures == 3 and isinstance(self.source, ImdsNoticeSource):
+                    # EC2가 아닌 환경 (로컬 개발 등): 메타데이터 서비스가 없으므로 감시 중단
+                    print(f"워커: 인스턴스 메타데이터에 연결할 수 없어 Spot 회수 감시를 중단합니다: {e}")
+                    return
+            self._stop.wait(self.poll_seconds)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="spot-interruption-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.stats, interrupted=self.interrupted.is_set(), notice=self.notice,
+                        noticed_at=self.noticed_at)
+
+
+class LocalCheckpointStore:
+    """작업별 완료 단계 출력을 로컬 디렉터리에 JSON으로 저장합니다 (테스트/단일 호스트용)."""
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, task_id: str) -> str:
+        return os.path.join(self.directory, f"{task_id}.json")
+
+    def save(self, task_id: str, completed_steps: dict):
+        tmp_path = self._path(task_id) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(completed_steps, f, default=str)
+        os.replace(tmp_path, self._path(task_id))
+
+    def load(self, task_id: str) -> dict:
+        try:
+            with open(self._path(task_id), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def delete(self, task_id: str):
+        try:
+            os.remove(self._path(task_id))
+        except FileNotFoundError:
+            pass
+
+
+class S3CheckpointStore:
+    """작업별 완료 단계 출력을 S3 (s3://bucket/checkpoints/<task_id>.json)에 저장합니다 (노드 간 공유)."""
+    def __init__(self, bucket_name: str, client, prefix: str = SPOT_CHECKPOINT_PREFIX):
+        self.bucket_name = bucket_name
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, task_id: str) -> str:
+        return f"{self.prefix}{task_id}.json"
+
+    def save(self, task_id: str, completed_steps: dict):
+        self.client.put_object(Bucket=self.bucket_name, Key=self._key(task_id),
+                               Body=json.dumps(completed_steps, default=str).encode("utf-8"),
+                               ContentType="application/json")
+
+    def load(self, task_id: str) -> dict:
+        try:
+            response = self.client.get_object(Bucket=self.bucket_name, Key=self._key(task_id))
+        except self.client.exceptions.NoSuchKey:
+            return {}
+        return json.loads(response["Body"].read())
+
+    def delete(self, task_id: str):
+        self.client.delete_object(Bucket=self.bucket_name, Key=self._key(task_id))
+
+
+def default_checkpoint_store(bucket_name: str = None, s3_client=None):
+    """SPOT_CHECKPOINT_DIR이 있으면 로컬 디렉터리, 아니면 S3 버킷 (버킷이 없으면 None - 체크포인트 없음)."""
+    if SPOT_CHECKPOINT_DIR:
+        return LocalCheckpointStore(SPOT_CHECKPOINT_DIR)
+    if bucket_name and s3_client is not None:
+        return S3CheckpointStore(bucket_name, s3_client)
+    return None
+
+
+def step_succeeded(outputs: dict) -> bool:
+    """단계가 새로 기록한 processed_results 항목으로 성공 여부를 판단합니다 (실패/보류/건너뜀은 체크포인트 제외)."""
+    for key, value in outputs.items():
+        if key.endswith("_error"):
+            return False
+        status = value.get("status") if isinstance(value, dict) else value if key.endswith("_status") else None
+        if isinstance(status, str) and status.startswith(("failed", "deferred", "skipped")):
+            return False
+    return True
+
+
+class InFlightTasks:
+    """
+    처리 중인 메시지 목록. 회수 알림을 받으면 완료된 단계 출력을 체크포인트로 저장하고
+    메시지 가시성을 0으로 바꿔 다른 워커가 바로 가져가게 합니다.
+    """
+    def __init__(self):
+        self._records = {}
+        self._lock = threading.Lock()
+        self.stats = {"requeued": 0, "checkpoints_saved": 0, "requeue_errors": 0}
+
+    def begin(self, queue_url: str, receipt_handle: str, task_id: str) -> dict:
+        """
+        :return: 기록 dict - process_task(progress=...)에 넘기면 completed_steps가 채워집니다.
+        """
+        record = {"queue_url": queue_url, "receipt_handle": receipt_handle, "task_id": task_id,
+                  "completed_steps": {}, "requeued": False, "started_at": time.time()}
+        with self._lock:
+            self._records[receipt_handle] = record
+        return record
+
+    def end(self, record: dict):
+        with self._lock:
+            self._records.pop(record["receipt_handle"], None)
+
+    def requeue(self, record: dict, sqs_client, checkpoints=None):
+        """완료된 단계를 저장하고 메시지를 바로 다시 보이게 합니다 (한 번만)."""
+        with self._lock:
+            if record["requeued"]:
+                return
+            record["requeued"] = True
+        if checkpoints is not None and record["completed_steps"]:
+            try:
+                checkpoints.save(record["task_id"], dict(record["completed_steps"]))
+                with self._lock:
+                    self.stats["checkpoints_saved"] += 1
+            except Exception as e:
+                print(f"워커: 작업 {record['task_id']} 체크포인트 저장 실패: {e}")
+        try:
+            sqs_client.change_message_visibility(QueueUrl=record["queue_url"],
+                                                 ReceiptHandle=record["receipt_handle"], VisibilityTimeout=0)
+            with self._lock:
+                self.stats["requeued"] += 1
+            print(f"워커: 작업 {record['task_id']} 메시지를 큐에 반환했습니다.")
+        except Exception as e: # 반환하지 못해도 가시성 제한 시간이 지나면 다시 보임
+            with self._lock:
+                self.stats["requeue_errors"] += 1
+            print(f"워커: 작업 {record['task_id']} 메시지 반환 실패: {e}")
+
+    def requeue_all(self, sqs_client, checkpoints=None):
+        with self._lock:
+            records = list(self._records.values())
+        for record in records:
+            self.requeue(record, sqs_client, checkpoints)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.stats, in_flight=len(self._records))
+
+
+# 워커 프로세스에서 공유하는 회수 감시기와 처리 중 메시지 목록
+spot_watcher = SpotInterruptionWatcher()
+in_flight_tasks = InFlightTasks()
@@ -0,0 +1,226 @@
+# backend/app/services/subprocess_runner.py
+
+import asyncio
+import os
+import signal
+import subprocess
+import threading
+import time
+
+# 외부 도구(OMR 엔진, 오디오 인코더 등) 실행기.
+# 기존 run_command는 subprocess.run(capture_output=True)을 타임아웃 없이 사용해서
+# 멈춘 도구가 워커 슬롯을 영원히 붙잡고, 출력이 많은 도구는 stdout 전체를 메모리에 쌓았습니다.
+# 여기서는
+#  - 자식을 새 세션(프로세스 그룹)으로 시작하고, 타임아웃/취소 시 그룹 전체에 SIGTERM -> SIGKILL을 보냅니다.
+#  - stdout/stderr는 읽기 스레드가 조금씩 읽어 줄 단위로 흘려보내고(on_output), 마지막 N바이트만 보관합니다.
+#  - os.wait4로 자식을 회수해 호출별 CPU 시간과 최대 RSS를 기록합니다.
+#  - 동시에 실행하는 외부 도구 수를 프로세스 전체에서 제한합니다 (동기/asyncio 호출 공통).
+
+SUBPROCESS_TIMEOUT_SECONDS = float(os.getenv("SUBPROCESS_TIMEOUT_SECONDS", "600")) # 0이면 제한 없음
+SUBPROCESS_MAX_CONCURRENCY = int(os.getenv("SUBPROCESS_MAX_CONCURRENCY", "0")) or (os.cpu_count() or 1)
+SUBPROCESS_OUTPUT_BYTES = int(os.getenv("SUBPROCESS_OUTPUT_BYTES", str(64 * 1024))) # 스트림별 보관 바이트
+SUBPROCESS_KILL_GRACE_SECONDS = float(os.getenv("SUBPROCESS_KILL_GRACE_SECONDS", "5")) # SIGTERM 후 SIGKILL까지
+READ_CHUNK_BYTES = 64 * 1024
+WATCHDOG_INTERVAL_SECONDS = 0.05
+
+
+class CommandTimeoutError(RuntimeError):
+    """타임아웃으로 종료된 외부 명령어. result에 실행 결과(출력 끝부분, 자원 사용량)가 들어 있습니다."""
+    def __init__(self, result: dict):
+        super().__init__(f"External command timed out after {result['timeout']}s: {result['command']}")
+        self.result = result
+
+
+class RingBuffer:
+    """마지막 capacity 바이트만 보관하는 출력 버퍼."""
+    def __init__(self, capacity: int = SUBPROCESS_OUTPUT_BYTES):
+        self.capacity = capacity
+        self.total_bytes = 0
+        self._data = bytearray()
+
+    def write(self, chunk: bytes):
+        self.total_bytes += len(chunk)
+        self._data += chunk[-self.capacity:] if self.capacity else b""
+        if len(self._data) > self.capacity:
+            del self._data[:len(self._data) - self.capacity]
+
+    @property
+    def truncated(self) -> bool:
+        return self.total_bytes > len(self._data)
+
+    def getvalue(self) -> str:
+        return self._data.decode("utf-8", errors="replace")
+
+
+def _pump(stream, name: str, buffer: RingBuffer, on_output):
+    """파이프를 조금씩 읽어 버퍼에 넣고, on_output이 있으면 완성된 줄을 전달합니다."""
+    partial = b""
+    while True:
+        chunk = stream.read1(READ_CHUNK_BYTES)
+        if not chunk:
+            break
+        buffer.write(chunk)
+        if on_output:
+            *lines, partial = (partial + chunk).split(b"\n")
+            for line in lines:
+                on_output(name, line.decode("utf-8", errors="replace").rstrip("\r"))
+            if len(partial) > buffer.capacity: # 줄바꿈 없는 출력도 메모리를 제한
+                on_output(name, partial.decode("utf-8", errors="replace"))
+                partial = b""
+    if on_output and partial:
+        on_output(name, partial.decode("utf-8", errors="replace"))
+    stream.close()
+
+
+class SubprocessRunner:
+    """타임아웃, 프로세스 그룹 종료, 제한된 출력 보관, 자원 사용량 기록을 갖춘 외부 명령어 실행기."""
+    def __init__(self, max_concurrency: int = SUBPROCESS_MAX_CONCURRENCY,
+                 timeout: float = SUBPROCESS_TIMEOUT_SECONDS, output_bytes: int = SUBPROCESS_OUTPUT_BYTES,
+                 kill_grace: float = SUBPROCESS_KILL_GRACE_SECONDS):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.output_bytes = output_bytes
+        self.kill_grace = kill_grace
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self.stats = {"runs": 0, "running": 0, "timeouts": 0, "cancelled": 0, "nonzero_exits": 0,
+                      "queue_seconds": 0.0}
+
+    def _count(self, name: str, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def _kill_group(self, process, finished: threading.Event):
+        """프로세스 그룹에 SIGTERM을 보내고, kill_grace 안에 끝나지 않으면 SIGKILL을 보냅니다."""
+        for sig, wait in ((signal.SIGTERM, self.kill_grace), (signal.SIGKILL, 0)):
+            try:
+                os.killpg(process.pid, sig)
+            except (ProcessLookupError, PermissionError):
+                return
+            if wait and finished.wait(wait):
+                return
+
+    def _watch(self, process, finished: threading.Event, cancel: threading.Event, timeout: float, outcome: dict):
+        deadline = time.monotonic() + timeout if timeout else None
+        while not finished.wait(WATCHDOG_INTERVAL_SECONDS):
+            if cancel.is_set():
+                outcome["reason"] = "cancelled"
+            elif deadline is not None and time.monotonic() >= deadline:
+                outcome["reason"] = "timeout"
+            else:
+                continue
+            self._kill_group(process, finished)
+            return
+
+    @staticmethod
+    def _reap(process) -> dict:
+        """자식을 회수하고 자원 사용량을 돌려줍니다 (os.wait4가 없는 플랫폼은 사용량 없이 대기)."""
+        if not hasattr(os, "wait4"):
+            process.wait()
+            return {}
+        _, status, rusage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        return {"cpu_user_seconds": round(rusage.ru_utime, 3), "cpu_system_seconds": round(rusage.ru_stime, 3),
+                "max_rss_kb": rusage.ru_maxrss} # Linux: KB 단위
+
+    def run(self, command, cwd: str = None, env: dict = None, shell: bool = False, timeout: float = None,
+            on_output=None, cancel: threading.Event = None) -> dict:
+        """
+        외부 명령어를 실행하고 끝날 때까지 기다립니다. 종료 코드로 예외를 발생시키지 않습니다.
+
+        :param timeout: 초 (None이면 기본값, 0이면 제한 없음). 넘으면 프로세스 그룹 전체를 종료
+        :param on_output: (스트림 이름 "stdout"/"stderr", 줄) 콜백 - 출력이 나오는 대로 호출 (읽기 스레드에서)
+        :param cancel: 설정되면 실행 중인 프로세스 그룹을 종료하는 threading.Event (선택)
+        :return: {"command", "exit_code", "stdout", "stderr" (마지막 output_bytes), "stdout_bytes", "stderr_bytes",
+                  "output_truncated", "timed_out", "cancelled", "timeout", "wall_seconds", "queue_seconds",
+                  "cpu_user_seconds", "cpu_system_seconds", "max_rss_kb"}
+        :raises FileNotFoundError: 실행 파일을 찾을 수 없을 때
+        """
+        timeout = self.timeout if timeout is None else timeout
+        queued = time.perf_counter()
+        with self._slots:
+            queue_seconds = time.perf_counter() - queued
+            self._count("queue_seconds", queue_seconds)
+            self._count("runs")
+            self._count("running")
+            try:
+                result = self._run(command, cwd, env, shell, timeout, on_output, cancel or threading.Event())
+            finally:
+                self._count("running", -1)
+        result["queue_seconds"] = round(queue_seconds, 3)
+        if result["timed_out"]:
+            self._count("timeouts")
+        elif result["cancelled"]:
+            self._count("cancelled")
+        elif result["exit_code"] != 0:
+            self._count("nonzero_exits")
+        return result
+
+    def _run(self, command, cwd, env, shell, timeout, on_output, cancel) -> dict:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=cwd, env=env, shell=shell, stdin=subprocess.DEVNULL,
+                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE, start_new_session=True)
+        buffers = {"stdout": RingBuffer(self.output_bytes), "stderr": RingBuffer(self.output_bytes)}
+        readers = [threading.Thread(target=_pump, args=(getattr(process, name), name, buffers[name], on_output),
+                                    name=f"subprocess-{name}", daemon=True) for name in buffers]
+        for reader in readers:
+            reader.start()
+        finished, outcome = threading.Event(), {}
+        watchdog = threading.Thread(target=self._watch, args=(process, finished, cancel, timeout, outcome),
+                                    name="subprocess-watchdog", daemon=True)
+        watchdog.start()
+        try:
+            usage = self._reap(process)
+        finally:
+            finished.set()
+            watchdog.join()
+        for reader in readers:
+            reader.join(timeout=1.0)
+        if any(reader.is_alive() for reader in readers):
+            # 자식이 남긴 프로세스(그룹 구성원)가 파이프를 잡고 있으면 그룹을 정리
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+            for reader in readers:
+                reader.join()
+
+        return {"command": command if isinstance(command, str) else " ".join(map(str, command)),
+                "exit_code": process.returncode,
+                "stdout": buffers["stdout"].getvalue(), "stderr": buffers["stderr"].getvalue(),
+                "stdout_bytes": buffers["stdout"].total_bytes, "stderr_bytes": buffers["stderr"].total_bytes,
+                "output_truncated": buffers["stdout"].truncated or buffers["stderr"].truncated,
+                "timed_out": outcome.get("reason") == "timeout", "cancelled": outcome.get("reason") == "cancelled",
+                "timeout": timeout, "wall_seconds": round(time.perf_counter() - start, 3), **usage}
+
+    async def run_async(self, command, cwd: str = None, env: dict = None, shell: bool = False,
+                        timeout: float = None, on_output=None) -> dict:
+        """
+        run의 asyncio 버전. 실행은 스레드에서 하고(동시 실행 제한 공유), on_output은 이벤트 루프에서 호출됩니다.
+        작업이 취소되면 프로세스 그룹을 종료한 뒤 CancelledError를 다시 발생시킵니다.
+        """
+        loop = asyncio.get_running_loop()
+        cancel = threading.Event()
+        forward = (lambda name, line: loop.call_soon_threadsafe(on_output, name, line)) if on_output else None
+        future = loop.run_in_executor(None, lambda: self.run(command, cwd, env, shell, timeout, forward, cancel))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancel.set()
+            await asyncio.wait([future]) # 프로세스 그룹이 정리될 때까지 대기
+            raise
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.stats, max_concurrency=self.max_concurrency)
+
+
+def resource_usage(result: dict) -> dict:
+    """단계 결과에 기록할 실행 요약 (출력 본문 제외)."""
+    keys = ("exit_code", "timed_out", "wall_seconds", "queue_seconds", "cpu_user_seconds", "cpu_system_seconds",
+            "max_rss_kb", "stdout_bytes", "stderr_bytes", "output_truncated")
+    return {key: result[key] for key in keys if key in result}
+
+
+# 워커 프로세스에서 공유하는 외부 명령어 실행기
+subprocess_runner = SubprocessRunner()
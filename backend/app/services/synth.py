@@ -0,0 +1,243 @@
+# backend/app/services/synth.py
+
+import os
+import struct
+import time
+
+import numpy as np
+
+# 외부 신디사이저나 GPU 없이 동작하는 NumPy 웨이브테이블 신디사이저.
+# 경량 악보 표현(ScoreIR)의 음표를 초 단위 이벤트로 바꾼 뒤 고정 크기 블록 단위로 PCM을 만들고,
+# 블록마다 바로 인코더(WAV/FLAC/OGG/MP3)에 넘겨 씁니다.
+# 한 번에 메모리에 있는 오디오는 블록 하나 분량이며, 블록 안에서는
+# 동시에 울리는 음표들을 [음표 x 샘플] 배열로 한꺼번에 계산합니다.
+
+SAMPLE_RATE = int(os.getenv("SYNTH_SAMPLE_RATE", "44100"))
+BLOCK_FRAMES = 8192          # 블록당 샘플 수
+MAX_VOICES_PER_PASS = 64     # 한 번에 계산하는 음표 수 (블록 메모리 상한: 이 값 x BLOCK_FRAMES)
+WAVETABLE_SIZE = 2048
+HARMONICS = (1.0, 0.5, 0.3, 0.2, 0.12, 0.08, 0.05, 0.03) # 배음별 진폭 (가산 합성으로 웨이브테이블 생성)
+MASTER_GAIN = 0.2
+DEFAULT_QPM = 120.0
+
+# ADSR 엔벨로프 (초, 서스테인은 레벨)
+ATTACK = 0.01
+DECAY = 0.15
+SUSTAIN = 0.6
+RELEASE = 0.25
+
+# 출력 형식 -> (soundfile 형식, subtype) / MIME 타입
+SOUNDFILE_FORMATS = {"flac": ("FLAC", "PCM_16"), "ogg": ("OGG", "VORBIS")}
+CONTENT_TYPES = {"wav": "audio/wav", "flac": "audio/flac", "ogg": "audio/ogg", "mp3": "audio/mpeg"}
+AUDIO_FORMATS = tuple(CONTENT_TYPES)
+MP3_BITRATE = 192
+
+
+def make_wavetable(harmonics=HARMONICS, size: int = WAVETABLE_SIZE):
+    """배음 진폭으로 한 주기 파형을 만듭니다. 선형 보간을 위해 첫 샘플을 끝에 한 번 더 붙입니다."""
+    phase = np.arange(size) / size
+    table = sum(a * np.sin(2 * np.pi * (k + 1) * phase) for k, a in enumerate(harmonics))
+    table /= np.abs(table).max()
+    return np.append(table, table[0])
+
+
+def quarters_to_seconds(quarters, tempos):
+    """빠르기 테이블(TEMPO_DTYPE)을 반영하여 사분음표 위치를 초로 변환합니다."""
+    quarters = np.asarray(quarters, dtype=np.float64)
+    if len(tempos) == 0 or tempos["onset"][0] > 0:
+        onsets = np.concatenate([[0.0], tempos["onset"]])
+        qpms = np.concatenate([[tempos["qpm"][0] if len(tempos) else DEFAULT_QPM], tempos["qpm"]])
+    else:
+        onsets, qpms = tempos["onset"], tempos["qpm"]
+    seconds_per_quarter = 60.0 / qpms
+    segment_start_seconds = np.concatenate([[0.0], np.cumsum(np.diff(onsets) * seconds_per_quarter[:-1])])
+    segment = np.clip(np.searchsorted(onsets, quarters, side="right") - 1, 0, None)
+    return segment_start_seconds[segment] + (quarters - onsets[segment]) * seconds_per_quarter[segment]
+
+
+class NoteEvents:
+    """합성용 음표 이벤트 (샘플 단위 시작/끝, 주파수, 진폭). 시작 순으로 정렬됩니다."""
+    def __init__(self, score_ir, sample_rate: int = SAMPLE_RATE):
+        notes = score_ir.notes[score_ir.notes["duration"] > 0]
+        start_s = quarters_to_seconds(notes["onset"], score_ir.tempos)
+        end_s = quarters_to_seconds(notes["onset"] + notes["duration"], score_ir.tempos)
+        order = np.argsort(start_s, kind="stable")
+        self.sample_rate = sample_rate
+        self.start = np.rint(start_s[order] * sample_rate).astype(np.int64)
+        self.end = np.maximum(np.rint(end_s[order] * sample_rate).astype(np.int64), self.start + 1)
+        self.freq = 440.0 * 2.0 ** ((notes["pitch"][order].astype(np.float64) - 69) / 12)
+        self.amp = notes["velocity"][order] / 127.0
+        self.release_frames = int(RELEASE * sample_rate)
+
+    def __len__(self):
+        return len(self.start)
+
+    @property
+    def total_frames(self) -> int:
+        """마지막 음의 릴리스까지 포함한 전체 길이 (샘플)."""
+        return int(self.end.max()) + self.release_frames if len(self) else 0
+
+
+def _envelope(local, note_length, sample_rate):
+    # local: [음표 x 샘플] 음 시작부터의 샘플 위치, note_length: [음표 x 1] 음 길이 (샘플)
+    attack, decay = ATTACK * sample_rate, DECAY * sample_rate
+    release = RELEASE * sample_rate
+
+    def held(t):
+        rising = t / attack
+        falling = 1.0 - (1.0 - SUSTAIN) * (t - attack) / decay
+        return np.where(t < attack, rising, np.maximum(falling, SUSTAIN))
+
+    level = held(np.minimum(local, note_length))
+    released = np.clip(1.0 - (local - note_length) / release, 0.0, 1.0)
+    return np.where(local < note_length, level, level * released) * (local >= 0)
+
+
+def render_blocks(events: NoteEvents, block_frames: int = BLOCK_FRAMES, wavetable=None):
+    """
+    블록 단위로 mono float32 PCM을 생성합니다.
+
+    :return: 블록(np.ndarray)을 차례로 내는 generator. 마지막 블록은 짧을 수 있습니다.
+    """
+    table = make_wavetable() if wavetable is None else wavetable
+    table_size = len(table) - 1
+    sample_rate = events.sample_rate
+    release = events.release_frames
+    total = events.total_frames
+
+    active = np.zeros(0, dtype=np.int64) # 현재 울리고 있는 음표 인덱스
+    next_note = 0
+    for block_start in range(0, total, block_frames):
+        block_end = min(block_start + block_frames, total)
+        # 이번 블록에서 시작하는 음표 추가, 릴리스까지 끝난 음표 제거
+        first_after = int(np.searchsorted(events.start, block_end, side="left"))
+        active = np.concatenate([active, np.arange(next_note, first_after)])
+        next_note = first_after
+        active = active[events.end[active] + release > block_start]
+
+        frames = np.arange(block_start, block_end)
+        block = np.zeros(block_end - block_start)
+        for i in range(0, len(active), MAX_VOICES_PER_PASS):
+            voices = active[i:i + MAX_VOICES_PER_PASS]
+            local = frames[None, :] - events.start[voices, None]
+            # 절대 위치로 위상을 계산하므로 블록 경계에서도 위상이 이어짐
+            phase = np.mod(local * (events.freq[voices, None] / sample_rate), 1.0) * table_size
+            index = phase.astype(np.int64)
+            frac = phase - index
+            wave = table[index] + (table[index + 1] - table[index]) * frac
+            envelope = _envelope(local, (events.end[voices] - events.start[voices])[:, None], sample_rate)
+            block += (events.amp[voices, None] * envelope * wave).sum(axis=0)
+        # 동시 발음이 많아도 찌그러지지 않도록 부드럽게 제한
+        yield np.tanh(block * MASTER_GAIN).astype(np.float32)
+
+
+# --- 인코더 (블록 단위로 쓰는 파일형 출력) ---
+
+class WavEncoder:
+    """전체 길이를 알고 있으므로 헤더를 먼저 쓰고 이후 PCM만 이어서 씁니다 (seek 불필요)."""
+    def __init__(self, sink, sample_rate: int, total_frames: int, channels: int = 1):
+        self.sink = sink
+        data_bytes = total_frames * channels * 2
+        sink.write(b"RIFF" + struct.pack("<I", 36 + data_bytes) + b"WAVE")
+        sink.write(b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate,
+                                         sample_rate * channels * 2, channels * 2, 16))
+        sink.write(b"data" + struct.pack("<I", data_bytes))
+
+    def write(self, block):
+        self.sink.write(_to_int16(block).tobytes())
+
+    def close(self):
+        pass
+
+
+class SoundFileEncoder:
+    """soundfile(libsndfile)로 FLAC/OGG를 씁니다. FLAC은 종료 시 파일 앞 헤더로 seek합니다."""
+    def __init__(self, sink, sample_rate: int, output_format: str, channels: int = 1):
+        import soundfile
+        sf_format, subtype = SOUNDFILE_FORMATS[output_format]
+        self.file = soundfile.SoundFile(sink, mode="w", samplerate=sample_rate, channels=channels,
+                                        format=sf_format, subtype=subtype)
+
+    def write(self, block):
+        # 다른 형식과 같은 16비트 PCM 변환을 거쳐 씀
+        self.file.write(_to_int16(block))
+
+    def close(self):
+        self.file.close()
+
+
+class Mp3Encoder:
+    """lameenc으로 블록마다 MP3 프레임을 인코딩하여 씁니다."""
+    def __init__(self, sink, sample_rate: int, channels: int = 1, bitrate: int = MP3_BITRATE):
+        import lameenc
+        self.sink = sink
+        self.encoder = lameenc.Encoder()
+        self.encoder.set_bit_rate(bitrate)
+        self.encoder.set_in_sample_rate(sample_rate)
+        self.encoder.set_channels(channels)
+        self.encoder.set_quality(2)
+
+    def write(self, block):
+        self.sink.write(self.encoder.encode(_to_int16(block).tobytes()))
+
+    def close(self):
+        self.sink.write(self.encoder.flush())
+
+
+def available_formats() -> list:
+    """현재 환경에서 인코딩 가능한 출력 형식 목록."""
+    formats = ["wav"]
+    try:
+        import soundfile # noqa: F401
+        formats += list(SOUNDFILE_FORMATS)
+    except (ImportError, OSError): # OSError: libsndfile 없음
+        pass
+    try:
+        import lameenc # noqa: F401
+        formats.append("mp3")
+    except ImportError:
+        pass
+    return formats
+
+
+def open_encoder(output_format: str, sink, sample_rate: int, total_frames: int):
+    output_format = output_format.lower()
+    if output_format == "wav":
+        return WavEncoder(sink, sample_rate, total_frames)
+    if output_format in SOUNDFILE_FORMATS:
+        return SoundFileEncoder(sink, sample_rate, output_format)
+    if output_format == "mp3":
+        return Mp3Encoder(sink, sample_rate)
+    raise ValueError(f"지원하지 않는 오디오 출력 형식입니다: {output_format}")
+
+
+def render_audio(score_ir, output_format: str, sink, sample_rate: int = SAMPLE_RATE,
+                 block_frames: int = BLOCK_FRAMES) -> dict:
+    """
+    악보를 합성하여 sink(파일 또는 S3MultipartWriter 등 파일형 객체)에 인코딩된 오디오를 씁니다.
+
+    :return: {"format", "frames", "duration_seconds", "render_seconds", "realtime_factor"}
+             realtime_factor = 오디오 길이 / 렌더링 시간 (1보다 크면 실시간보다 빠름)
+    """
+    start = time.perf_counter()
+    events = NoteEvents(score_ir, sample_rate)
+    encoder = open_encoder(output_format, sink, sample_rate, events.total_frames)
+    frames = 0
+    for block in render_blocks(events, block_frames):
+        encoder.write(block)
+        frames += len(block)
+    encoder.close()
+
+    render_seconds = time.perf_counter() - start
+    duration = frames / sample_rate
+    return {
+        "format": output_format.lower(),
+        "frames": frames,
+        "duration_seconds": duration,
+        "render_seconds": render_seconds,
+        "realtime_factor": duration / render_seconds if render_seconds > 0 else float("inf"),
+    }
+
+
+def _to_int16(block):
+    return (np.clip(block, -1.0, 1.0) * 32767).astype("<i2")
@@ -0,0 +1,207 @@
+# backend/app/services/task_queues.py
+
+import os
+import threading
+import time
+from collections import deque
+
+# 우선순위별 작업 큐 (interactive / standard / bulk).
+# 모든 작업이 SQS_QUEUE_URL 하나로 들어오면 한 사용자의 한 페이지 업로드가
+# 500곡 일괄 작업 뒤에서 기다립니다. 업로드 API는 요청 종류/크기로 큐를 고르고(route_priority),
+# 워커는 여러 큐를 가중치 비율로 번갈아 가져오며(WeightedQueuePoller), 높은 우선순위 작업이 들어오면
+# 미리 가져와 둔 낮은 우선순위 메시지를 큐에 돌려놓고(VisibilityTimeout=0) 먼저 처리합니다.
+
+QUEUE_PRIORITIES = ("interactive", "standard", "bulk") # 높은 우선순위부터
+DEFAULT_PRIORITY = "standard"
+# 큐가 모두 밀려 있을 때 가져오는 비율, 예: "interactive:6,standard:3,bulk:1"
+TASK_QUEUE_WEIGHTS = os.getenv("TASK_QUEUE_WEIGHTS", "interactive:6,standard:3,bulk:1")
+TASK_QUEUE_PREFETCH = int(os.getenv("TASK_QUEUE_PREFETCH", "4")) # 한 번에 받아 둘 메시지 수 (1~10)
+TASK_QUEUE_IDLE_WAIT_SECONDS = int(os.getenv("TASK_QUEUE_IDLE_WAIT_SECONDS", "2")) # 모든 큐가 비었을 때 대기
+TASK_QUEUE_VISIBILITY_TIMEOUT = int(os.getenv("TASK_QUEUE_VISIBILITY_TIMEOUT", "300"))
+# 받아 둔 메시지가 VisibilityTimeout의 이 비율 이상 기다렸으면 처리하지 않고 큐에 돌려놓음
+# (앞 작업들이 오래 걸리는 동안 타이머가 끝나 다른 워커가 같은 메시지를 가져가 중복 처리되지 않도록)
+TASK_QUEUE_PREFETCH_MAX_AGE_FRACTION = float(os.getenv("TASK_QUEUE_PREFETCH_MAX_AGE_FRACTION", "0.5"))
+INTERACTIVE_MAX_BYTES = int(os.getenv("INTERACTIVE_MAX_BYTES", str(2 * 1024 * 1024)))
+BULK_MIN_BYTES = int(os.getenv("BULK_MIN_BYTES", str(20 * 1024 * 1024)))
+SINGLE_PAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".mid", ".musicxml", ".mxl"}
+
+
+def task_queue_urls(environ=os.environ) -> dict:
+    """
+    우선순위별 SQS 큐 URL. SQS_QUEUE_URL_<PRIORITY>가 없으면 SQS_QUEUE_URL(standard)을 함께 씁니다.
+
+    :return: {"interactive": url, "standard": url, "bulk": url} (설정된 URL이 없으면 빈 dict)
+    """
+    default = environ.get("SQS_QUEUE_URL_STANDARD") or environ.get("SQS_QUEUE_URL")
+    urls = {priority: environ.get(f"SQS_QUEUE_URL_{priority.upper()}") or default for priority in QUEUE_PRIORITIES}
+    return {priority: url for priority, url in urls.items() if url}
+
+
+def parse_weights(spec: str) -> dict:
+    """ "interactive:6,bulk:1" -> {"interactive": 6, "standard": 1, "bulk": 1} (지정하지 않은 큐는 1) """
+    weights = {priority: 1 for priority in QUEUE_PRIORITIES}
+    for item in spec.split(","):
+        name, _, weight = item.strip().partition(":")
+        if name.strip() in weights and weight:
+            weights[name.strip()] = max(1, int(weight))
+    return weights
+
+
+def normalize_priority(priority: str) -> str:
+    if priority not in QUEUE_PRIORITIES:
+        raise ValueError(f"Unsupported priority: {priority}. Supported priorities are: {', '.join(QUEUE_PRIORITIES)}")
+    return priority
+
+
+def route_priority(file_extension: str, size_bytes: int = None, requested: str = None, batch: bool = False) -> str:
+    """
+    업로드 요청의 큐 우선순위를 정합니다.
+    명시한 우선순위 > 일괄 작업(bulk) > 큰 파일(bulk) > 작은 한 페이지 입력(interactive) > standard
+    """
+    if requested:
+        return normalize_priority(requested)
+    if batch or (size_bytes is not None and size_bytes >= BULK_MIN_BYTES):
+        return "bulk"
+    if file_extension in SINGLE_PAGE_EXTENSIONS and size_bytes is not None and size_bytes <= INTERACTIVE_MAX_BYTES:
+        return "interactive"
+    return DEFAULT_PRIORITY
+
+
+class WeightedQueuePoller:
+    """
+    여러 우선순위 큐에서 메시지를 하나씩 꺼냅니다.
+     - 큐들이 모두 밀려 있으면 가중치 비율(smooth weighted round robin)로 고르고, 고른 큐가 비었으면
+       우선순위 순서로 다음 큐를 확인합니다 (낮은 우선순위도 굶지 않음).
+     - 미리 받아 둔 메시지보다 높은 우선순위 큐를 매번 먼저 확인하고, 메시지가 있으면 받아 둔 메시지를
+       큐에 돌려놓습니다 (다른 워커가 바로 가져갈 수 있도록 VisibilityTimeout=0).
+     - 받아 둔 메시지의 VisibilityTimeout은 받은 시각부터 흐르므로, 꺼낼 때 처리 시간만큼 다시 연장하고
+       이미 max_age_fraction 이상 기다린 메시지는 돌려놓습니다.
+    """
+    def __init__(self, client, queue_urls: dict, weights: dict = None, prefetch: int = TASK_QUEUE_PREFETCH,
+                 idle_wait_seconds: int = TASK_QUEUE_IDLE_WAIT_SECONDS,
+                 visibility_timeout: int = TASK_QUEUE_VISIBILITY_TIMEOUT,
+                 max_age_fraction: float = TASK_QUEUE_PREFETCH_MAX_AGE_FRACTION, clock=time.monotonic):
+        self.client = client
+        self.clock = clock
+        # 같은 URL을 여러 우선순위가 함께 쓰면 가장 높은 우선순위 하나로 취급
+        self.queues, seen = [], set()
+        for priority in QUEUE_PRIORITIES:
+            url = queue_urls.get(priority)
+            if url and url not in seen:
+                seen.add(url)
+                self.queues.append({"priority": priority, "url": url})
+        if not self.queues:
+            raise ValueError("No task queue URL configured (SQS_QUEUE_URL or SQS_QUEUE_URL_<PRIORITY>)")
+        weights = weights or parse_weights(TASK_QUEUE_WEIGHTS)
+        self.weights = {queue["priority"]: weights.get(queue["priority"], 1) for queue in self.queues}
+        self.prefetch = max(1, min(10, prefetch)) # SQS MaxNumberOfMessages 상한 10
+        self.idle_wait_seconds = idle_wait_seconds
+        self.visibility_timeout = visibility_timeout
+        self.max_prefetch_age = visibility_timeout * max_age_fraction
+        self._current = {priority: 0 for priority in self.weights}
+        self._buffer = deque() # (queue, message, 받은 시각) - 한 큐에서 받아 둔 메시지
+        self._lock = threading.RLock() # release_prefetched는 next_message 안과 다른 스레드(회수 알림)에서 호출
+        self.stats = {"received": {q["priority"]: 0 for q in self.queues}, "released": 0, "preemptions": 0,
+                      "empty_receives": 0, "expired_prefetch": 0}
+
+    def _receive(self, queue: dict, max_messages: int, wait_seconds: int = 0) -> list:
+        response = self.client.receive_message(QueueUrl=queue["url"], MaxNumberOfMessages=max_messages,
+                                               WaitTimeSeconds=wait_seconds,
+                                               VisibilityTimeout=self.visibility_timeout)
+        messages = response.get("Messages", [])
+        if messages:
+            self.stats["received"][queue["priority"]] += len(messages)
+        else:
+            self.stats["empty_receives"] += 1
+        return messages
+
+    def _weighted_order(self) -> list:
+        """smooth weighted round robin으로 이번에 먼저 확인할 큐를 고르고, 나머지는 우선순위 순서."""
+        total = sum(self.weights.values())
+        for priority, weight in self.weights.items():
+            self._current[priority] += weight
+        chosen = max(self.queues, key=lambda queue: self._current[queue["priority"]])
+        self._current[chosen["priority"]] -= total
+        return [chosen] + [queue for queue in self.queues if queue is not chosen]
+
+    def release_prefetched(self):
+        """받아 두고 아직 처리하지 않은 메시지를 큐에 돌려놓습니다 (워커 종료/선점/Spot 회수 시)."""
+        with self._lock:
+            while self._buffer:
+                queue, message, _ = self._buffer.popleft()
+                self._release(queue, message)
+
+    def _release(self, queue: dict, message: dict):
+        try:
+            self.client.change_message_visibility(QueueUrl=queue["url"],
+                                                  ReceiptHandle=message["ReceiptHandle"], VisibilityTimeout=0)
+            self.stats["released"] += 1
+        except Exception as e: # 돌려놓지 못해도 VisibilityTimeout이 지나면 다시 보임
+            print(f"워커: 미리 받은 메시지 반환 실패 ({queue['priority']}): {e}")
+
+    def _take_buffered(self):
+        """
+        받아 둔 메시지를 하나 꺼내 VisibilityTimeout을 지금부터 다시 연장합니다.
+        오래 기다린 메시지(max_prefetch_age 이상)나 연장하지 못한 메시지는 돌려놓고 다음 메시지를 확인합니다.
+
+        :return: (queue, message) 또는 None
+        """
+        while self._buffer:
+            queue, message, received_at = self._buffer.popleft()
+            if self.clock() - received_at >= self.max_prefetch_age:
+                self.stats["expired_prefetch"] += 1
+                self._release(queue, message)
+                continue
+            try:
+                self.client.change_message_visibility(QueueUrl=queue["url"], ReceiptHandle=message["ReceiptHandle"],
+                                                      VisibilityTimeout=self.visibility_timeout)
+            except Exception as e: # 이미 다시 보였거나 다른 워커가 가져갔을 수 있으므로 처리하지 않음
+                print(f"워커: 미리 받은 메시지 연장 실패 ({queue['priority']}), 건너뜁니다: {e}")
+                continue
+            return queue, message
+        return None
+
+    def next_message(self):
+        """
+        다음에 처리할 메시지를 반환합니다. 모든 큐가 비어 있으면 idle_wait_seconds 동안 기다린 뒤 None.
+
+        :return: {"priority", "queue_url", "message"} 또는 None
+        """
+        with self._lock:
+            if self._buffer:
+                buffered_rank = QUEUE_PRIORITIES.index(self._buffer[0][0]["priority"])
+                for queue in self.queues: # 받아 둔 메시지보다 높은 우선순위 큐를 먼저 확인 (선점)
+                    if QUEUE_PRIORITIES.index(queue["priority"]) >= buffered_rank:
+                        break
+                    messages = self._receive(queue, 1)
+                    if messages:
+                        self.stats["preemptions"] += 1
+                        self.release_prefetched()
+                        return self._polled(queue, messages[0])
+                buffered = self._take_buffered()
+                if buffered:
+                    return self._polled(*buffered)
+
+            for queue in self._weighted_order():
+                # 가장 높은 우선순위 큐는 한 번에 하나만 받음 (받아 둔 동안 다른 워커가 처리할 수 있도록)
+                count = 1 if queue is self.queues[0] else self.prefetch
+                received_at = self.clock() # VisibilityTimeout은 받는 순간부터 흐름 (보수적으로 요청 전 시각)
+                messages = self._receive(queue, count)
+                if messages:
+                    self._buffer.extend((queue, message, received_at) for message in messages[1:])
+                    return self._polled(queue, messages[0])
+
+            # 모두 비었으면 가장 높은 우선순위 큐에서 잠시 롱 폴링 (대화형 작업이 오면 바로 깨어남)
+            messages = self._receive(self.queues[0], 1, self.idle_wait_seconds)
+            return self._polled(self.queues[0], messages[0]) if messages else None
+
+    @staticmethod
+    def _polled(queue: dict, message: dict) -> dict:
+        return {"priority": queue["priority"], "queue_url": queue["url"], "message": message,
+                "received_at": time.time()}
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"queues": {q["priority"]: q["url"] for q in self.queues}, "weights": dict(self.weights),
+                    "prefetched": len(self._buffer), **{k: (dict(v) if isinstance(v, dict) else v)
+                                                        for k, v in self.stats.items()}}
@@ -0,0 +1,94 @@
+# backend/app/services/text_extraction.py
+
+import functools
+
+# music21 악보에서 텍스트 요소(가사, 지시어 등)를 한 번의 재귀 순회로 추출합니다.
+# 기존 구현은 flat.elements의 요소마다 __import__('music21')과 클래스 이름별 getattr를
+# 반복 호출하여 O(요소 수 x 클래스 수)의 동적 조회 비용이 있었고,
+# 'Lyric' 등은 music21 최상위 모듈에 없어 getattr 자체가 실패했습니다.
+# 여기서는 대상 클래스를 처음 한 번만 찾아 튜플로 만들고 isinstance 한 번으로 걸러냅니다.
+
+# 추출 대상 music21 클래스 이름 (music21에 없는 이름은 무시)
+TEXT_CLASS_NAMES = (
+    "Lyric", "TextExpression", "NoteExpression",
+    "Direction", "PartLyric", "ScoreGroup",
+    "RehearsalMark", "TextBox",
+)
+
+# 클래스 이름을 찾을 music21 하위 모듈
+_SEARCH_MODULES = ("note", "expressions", "text", "tempo", "layout")
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_text_classes(class_names: tuple = TEXT_CLASS_NAMES) -> tuple:
+    """클래스 이름을 실제 music21 클래스 튜플로 한 번만 변환합니다."""
+    import importlib
+
+    resolved = []
+    for name in class_names:
+        for module_name in _SEARCH_MODULES:
+            module = importlib.import_module(f"music21.{module_name}")
+            cls = getattr(module, name, None)
+            if isinstance(cls, type):
+                resolved.append(cls)
+                break
+    return tuple(resolved)
+
+
+def _element_text(element) -> str:
+    # 기존 구현과 같은 우선순위: text -> content -> value.content
+    text_content = getattr(element, "text", None)
+    if not text_content:
+        text_content = getattr(element, "content", None)
+    if not text_content:
+        value = getattr(element, "value", None)
+        text_content = getattr(value, "content", None)
+    return text_content if isinstance(text_content, str) else ""
+
+
+def extract_text_elements(score, class_names: tuple = TEXT_CLASS_NAMES) -> list:
+    """
+    악보를 한 번 재귀 순회하며 텍스트 요소를 수집합니다.
+
+    :param score: music21 Stream (Score, Part 등)
+    :return: [{"type": 클래스 이름, "content": 텍스트, "offset": 악보 내 절대 위치}, ...] (위치 순)
+    """
+    from music21 import note
+
+    text_classes = resolve_text_classes(class_names)
+    # Lyric은 Stream 요소가 아니라 음표에 붙어 있으므로 음표를 만나면 가사를 꺼냅니다.
+    collect_lyrics = any(cls is note.Lyric for cls in text_classes)
+    element_classes = tuple(cls for cls in text_classes if cls is not note.Lyric)
+    general_note = note.GeneralNote
+
+    results = []
+
+    def walk(container, base_offset):
+        for element in container.elements:
+            offset = base_offset + float(container.elementOffset(element))
+            if element.isStream:
+                walk(element, offset)
+            elif collect_lyrics and isinstance(element, general_note):
+                for lyric in element.lyrics:
+                    if lyric.text and lyric.text.strip():
+                        results.append({"type": "Lyric", "content": lyric.text.strip(), "offset": offset})
+            elif isinstance(element, element_classes):
+                text_content = _element_text(element)
+                if text_content.strip():
+                    results.append({"type": type(element).__name__, "content": text_content.strip(), "offset": offset})
+
+    walk(score, 0.0)
+    # flat 순회와 같은 시간 순서로 정렬 (같은 위치는 파트 순서 유지)
+    results.sort(key=lambda item: item["offset"])
+    return results
+
+
+def extract_text(score, class_names: tuple = TEXT_CLASS_NAMES):
+    """
+    텍스트 요소 목록과 번역용 문자열을 함께 반환합니다.
+
+    :return: (extracted_text 문자열, extracted_text_elements 목록)
+    """
+    elements = extract_text_elements(score, class_names)
+    extracted_text = "".join(item["content"] + "\n" for item in elements)
+    return extracted_text, elements
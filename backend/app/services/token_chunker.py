@@ -0,0 +1,155 @@
+# backend/app/services/token_chunker.py
+
+import functools
+import os
+import re
+
+from .rate_limiter import estimate_tokens
+
+# 번역용 텍스트를 모델 토큰 수 기준으로 나눕니다.
+# 글자 수(len) 기준 분할은 한글/일본어처럼 글자당 토큰이 많은 텍스트는 너무 큰 청크를,
+# 영어처럼 글자당 토큰이 적은 텍스트는 너무 작은 청크를 만듭니다.
+# 여기서는 로컬 토크나이저(tiktoken, 없으면 문자 종류별 추정)로 길이를 재고,
+# 연(빈 줄로 구분) -> 줄 -> 단어 순서로 경계를 지키며 모델 컨텍스트의 일정 비율까지 채웁니다
+# (응답이 모델의 최대 출력 토큰 수를 넘지 않는 크기로 제한).
+# 청크끼리 겹치는 부분은 두지 않습니다 (번역문을 이어 붙일 때 같은 줄이 반복되지 않도록).
+
+TRANSLATION_CHUNKING = os.getenv("TRANSLATION_CHUNKING", "tokens").lower() # "tokens" 또는 "chars" (기존 글자 수 분할)
+# 컨텍스트 중 입력 청크에 쓸 비율 (큰 컨텍스트 모델은 아래 응답 길이 상한이 더 작은 값이 됨)
+TRANSLATION_CHUNK_CONTEXT_FRACTION = float(os.getenv("TRANSLATION_CHUNK_CONTEXT_FRACTION", "0.15"))
+TRANSLATION_CHUNK_MAX_TOKENS = int(os.getenv("TRANSLATION_CHUNK_MAX_TOKENS", "0")) # 0이 아니면 비율 대신 이 값 사용
+# 번역/문체 변환 응답이 입력 청크보다 길어지는 비율 (토큰 기준). 응답은 컨텍스트와 별도로 모델의
+# 최대 출력 토큰 수로 잘리므로, 청크는 max_output / 이 비율을 넘지 않아야 응답이 잘리지 않습니다.
+TRANSLATION_OUTPUT_EXPANSION = float(os.getenv("TRANSLATION_OUTPUT_EXPANSION", "1.5"))
+
+# 모델별 컨텍스트 길이 (토큰). 접두어가 일치하는 가장 긴 항목을 사용합니다.
+MODEL_CONTEXT_TOKENS = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-4": 8192,
+    "gpt-4-turbo": 128000,
+    "gpt-4o": 128000,
+    "gpt-4.1": 1047576,
+}
+DEFAULT_CONTEXT_TOKENS = 4096
+
+# 모델별 최대 출력(completion) 토큰 수. 접두어가 일치하는 가장 긴 항목을 사용합니다.
+MODEL_MAX_OUTPUT_TOKENS = {
+    "gpt-3.5-turbo": 4096,
+    "gpt-4": 8192,
+    "gpt-4-turbo": 4096,
+    "gpt-4o": 16384,
+    "gpt-4.1": 32768,
+}
+DEFAULT_MAX_OUTPUT_TOKENS = 4096
+
+_STANZA_BREAK = re.compile(r"\n\s*\n")
+
+
+def _model_limit(table: dict, model: str, default: int) -> int:
+    matches = [name for name in table if model.startswith(name)]
+    return table[max(matches, key=len)] if matches else default
+
+
+def context_tokens(model: str) -> int:
+    return _model_limit(MODEL_CONTEXT_TOKENS, model, DEFAULT_CONTEXT_TOKENS)
+
+
+def max_output_tokens(model: str) -> int:
+    return _model_limit(MODEL_MAX_OUTPUT_TOKENS, model, DEFAULT_MAX_OUTPUT_TOKENS)
+
+
+@functools.lru_cache(maxsize=None)
+def _tiktoken_encoding(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError: # 모르는 모델 이름
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def token_counter(model: str):
+    """
+    모델의 토큰 수를 세는 함수를 반환합니다.
+    tiktoken이 없으면 rate_limiter.estimate_tokens와 같은 문자 종류별 추정을 사용합니다.
+    """
+    encoding = _tiktoken_encoding(model)
+    if encoding is not None:
+        return lambda text: len(encoding.encode(text, disallowed_special=()))
+    return lambda text: estimate_tokens(text, completion_ratio=0.0) - 1
+
+
+def chunk_token_budget(model: str, prompt_template: str = "") -> int:
+    """
+    청크 하나에 담을 최대 토큰 수 (프롬프트 템플릿 토큰은 뺀 값).
+    min(컨텍스트 * 비율, 최대 출력 / 응답 확장 비율) - 프롬프트 - 응답이 최대 출력 토큰 수에서 잘리지 않는 크기.
+    """
+    if TRANSLATION_CHUNK_MAX_TOKENS > 0:
+        budget = TRANSLATION_CHUNK_MAX_TOKENS
+    else:
+        budget = int(context_tokens(model) * TRANSLATION_CHUNK_CONTEXT_FRACTION)
+    budget = min(budget, int(max_output_tokens(model) / TRANSLATION_OUTPUT_EXPANSION))
+    overhead = token_counter(model)(prompt_template) if prompt_template else 0
+    return max(64, budget - overhead)
+
+
+def _split_long_line(line: str, max_tokens: int, count) -> list:
+    # 한 줄이 예산을 넘으면 단어 경계에서, 단어 구분이 없으면(CJK) 글자 단위로 자름
+    words = line.split(" ") if " " in line.strip() else list(line)
+    separator = " " if " " in line.strip() else ""
+    pieces, current, current_tokens = [], [], 0
+    for word in words:
+        tokens = count(word + separator)
+        if current and current_tokens + tokens > max_tokens:
+            pieces.append(separator.join(current))
+            current, current_tokens = [], 0
+        current.append(word)
+        current_tokens += tokens
+    if current:
+        pieces.append(separator.join(current))
+    return pieces
+
+
+def split_by_tokens(text: str, max_tokens: int, count=None) -> list:
+    """
+    연과 줄 경계를 지키며 max_tokens 이하의 청크로 채워 나눕니다.
+
+    :param count: 문자열 -> 토큰 수 함수 (기본: token_counter("gpt-3.5-turbo"))
+    :return: 청크 문자열 목록 (원래 순서, 겹침 없음)
+    """
+    count = count or token_counter("gpt-3.5-turbo")
+    chunks = []
+    current, current_tokens = [], 0 # 현재 청크의 줄 목록 ("" 는 연 구분 빈 줄)
+
+    def flush():
+        nonlocal current, current_tokens
+        if current:
+            chunks.append("\n".join(current).strip("\n"))
+        current, current_tokens = [], 0
+
+    for stanza in _STANZA_BREAK.split(text.strip("\n")):
+        lines = stanza.split("\n")
+        line_tokens = [count(line) + 1 for line in lines] # +1: 줄바꿈
+        stanza_tokens = sum(line_tokens)
+        if current and current_tokens + 1 + stanza_tokens <= max_tokens:
+            current += [""] + lines # 연 전체가 들어가면 빈 줄과 함께 이어 붙임
+            current_tokens += 1 + stanza_tokens
+            continue
+        if current and stanza_tokens <= max_tokens:
+            flush() # 연을 가르지 않도록 새 청크에서 시작
+        elif current:
+            current.append("") # 예산보다 큰 연은 현재 청크에 이어서 줄 단위로 채움
+            current_tokens += 1
+        for line, tokens in zip(lines, line_tokens):
+            if tokens > max_tokens:
+                flush()
+                chunks.extend(_split_long_line(line, max_tokens, count))
+                continue
+            if current_tokens + tokens > max_tokens:
+                flush()
+            current.append(line)
+            current_tokens += tokens
+    flush()
+    return [chunk for chunk in chunks if chunk.strip()]
@@ -0,0 +1,250 @@
+# backend/app/services/translation_cache.py
+
+import collections
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+# LLM 번역 결과 캐시.
+# 같은 가사/지시어("Andante con moto", "Amen", 반복되는 후렴 등)가 작업마다 다시 LLM으로 가지 않도록
+# 정규화한 청크 텍스트 + 감지 언어 + 모델 이름 + 프롬프트 템플릿 해시를 키로 번역 결과를 저장합니다.
+# - 1단계: 프로세스 내 LRU (가장 빠름, 워커 재시작 시 사라짐)
+# - 2단계: 공유 영속 저장소 (Redis URL이 설정되어 있고 redis 패키지가 있으면 Redis, 아니면 로컬 SQLite)
+# 프롬프트나 모델이 바뀌면 키가 달라지므로 이전 결과는 자연히 사용되지 않습니다.
+
+TRANSLATION_CACHE_ENABLED = os.getenv("TRANSLATION_CACHE_ENABLED", "true").lower() == "true"
+TRANSLATION_CACHE_TTL_SECONDS = int(os.getenv("TRANSLATION_CACHE_TTL_SECONDS", str(30 * 24 * 3600))) # 기본 30일
+TRANSLATION_CACHE_MEMORY_ITEMS = int(os.getenv("TRANSLATION_CACHE_MEMORY_ITEMS", "4096"))
+TRANSLATION_CACHE_SQLITE_PATH = os.getenv("TRANSLATION_CACHE_SQLITE_PATH", "/tmp/translation_cache.sqlite3")
+TRANSLATION_CACHE_REDIS_URL = os.getenv("TRANSLATION_CACHE_REDIS_URL") # 예: redis://localhost:6379/0
+
+# 키 형식이 바뀌면 이 값을 올려 기존 항목을 무효화합니다.
+CACHE_KEY_VERSION = "1"
+REDIS_KEY_PREFIX = "translation:"
+
+_INLINE_SPACE = re.compile(r"[ \t 　]+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    캐시 키용 텍스트 정규화: 유니코드 NFC, 줄 단위 앞뒤 공백 제거, 연속 공백 축약, 앞뒤 빈 줄 제거.
+    줄바꿈은 가사 구조를 나타내므로 유지합니다.
+    """
+    text = unicodedata.normalize("NFC", text)
+    lines = [_INLINE_SPACE.sub(" ", line).strip() for line in text.splitlines()]
+    return "\n".join(lines).strip("\n")
+
+
+def prompt_fingerprint(prompt_template: str) -> str:
+    return hashlib.sha256(prompt_template.encode("utf-8")).hexdigest()[:16]
+
+
+class MemoryTier:
+    """TTL이 있는 스레드 안전 LRU."""
+    def __init__(self, max_items: int = TRANSLATION_CACHE_MEMORY_ITEMS):
+        self.max_items = max_items
+        self._items = collections.OrderedDict() # key -> (만료 시각, 값)
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.time():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: int):
+        with self._lock:
+            self._items[key] = (time.time() + ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def __len__(self):
+        return len(self._items)
+
+
+class SQLiteTier:
+    """로컬 SQLite 파일 저장소. 같은 호스트의 워커 프로세스들이 공유합니다."""
+    name = "sqlite"
+
+    def __init__(self, path: str = TRANSLATION_CACHE_SQLITE_PATH):
+        self.path = path
+        self._local = threading.local() # sqlite3 연결은 스레드별로 사용
+        self._writes = 0
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None) # autocommit
+            connection.execute("PRAGMA journal_mode=WAL") # 읽기와 쓰기가 서로 막지 않도록
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str):
+        row = self._connection().execute(
+            "SELECT value FROM translations WHERE key = ? AND expires_at >= ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str, ttl: int):
+        connection = self._connection()
+        connection.execute("INSERT OR REPLACE INTO translations (key, value, expires_at) VALUES (?, ?, ?)",
+                           (key, value, time.time() + ttl))
+        self._writes += 1
+        if self._writes % 1000 == 0: # 가끔 만료 항목 정리
+            connection.execute("DELETE FROM translations WHERE expires_at < ?", (time.time(),))
+
+
+class RedisTier:
+    """Redis 저장소. 여러 호스트의 워커가 공유하며 만료는 Redis TTL로 처리합니다."""
+    name = "redis"
+
+    def __init__(self, url: str = None, client=None):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+        self.client = client
+
+    def get(self, key: str):
+        value = self.client.get(REDIS_KEY_PREFIX + key)
+        if value is None:
+            return None
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def set(self, key: str, value: str, ttl: int):
+        self.client.set(REDIS_KEY_PREFIX + key, value.encode("utf-8"), ex=ttl)
+
+
+def default_persistent_tier():
+    """Redis URL이 설정되어 있고 사용 가능하면 Redis, 아니면 SQLite 저장소를 만듭니다."""
+    if TRANSLATION_CACHE_REDIS_URL:
+        try:
+            tier = RedisTier(TRANSLATION_CACHE_REDIS_URL)
+            tier.client.ping()
+            return tier
+        except Exception as e: # redis 미설치(ImportError) 또는 연결 실패
+            print(f"워커: Redis 번역 캐시 사용 불가, SQLite로 대체합니다: {e}")
+    try:
+        return SQLiteTier()
+    except Exception as e:
+        print(f"워커: SQLite 번역 캐시 사용 불가, 메모리 캐시만 사용합니다: {e}")
+        return None
+
+
+class TranslationCache:
+    """
+    메모리 LRU + 영속 저장소 2단계 번역 캐시.
+    영속 저장소 오류는 캐시 미스로 처리하여 번역 작업에는 영향을 주지 않습니다.
+    persistent_factory를 주면 영속 저장소를 처음 get/set할 때 만듭니다
+    (모듈 임포트만으로 SQLite 파일을 만들거나 Redis에 연결하지 않도록).
+    """
+    def __init__(self, persistent=None, memory: MemoryTier = None, ttl: int = TRANSLATION_CACHE_TTL_SECONDS,
+                 persistent_factory=None):
+        self.memory = memory if memory is not None else MemoryTier()
+        self._persistent = persistent
+        self._persistent_factory = persistent_factory
+        self._persistent_lock = threading.Lock()
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "persistent_hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+    @property
+    def persistent(self):
+        """영속 저장소 (없으면 None). 팩토리가 있으면 처음 접근할 때 한 번만 만듭니다."""
+        if self._persistent_factory is not None:
+            with self._persistent_lock:
+                if self._persistent_factory is not None:
+                    self._persistent = self._persistent_factory()
+                    self._persistent_factory = None
+        return self._persistent
+
+    def key_for(self, text: str, language: str, model: str, prompt_template: str) -> str:
+        digest = hashlib.sha256()
+        for part in (CACHE_KEY_VERSION, normalize_text(text), language or "unknown", model,
+                     prompt_fingerprint(prompt_template)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def get(self, key: str):
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("memory_hits")
+            return value
+        persistent = self.persistent
+        if persistent is not None:
+            try:
+                value = persistent.get(key)
+            except Exception as e:
+                print(f"워커: 번역 캐시 조회 오류 ({persistent.name}): {e}")
+                self._count("errors")
+                value = None
+            if value is not None:
+                self._count("persistent_hits")
+                self.memory.set(key, value, self.ttl) # 다음 조회는 메모리에서
+                return value
+        self._count("misses")
+        return None
+
+    def set(self, key: str, value: str):
+        self.memory.set(key, value, self.ttl)
+        persistent = self.persistent
+        if persistent is not None:
+            try:
+                persistent.set(key, value, self.ttl)
+            except Exception as e:
+                print(f"워커: 번역 캐시 저장 오류 ({persistent.name}): {e}")
+                self._count("errors")
+                return
+        self._count("stores")
+
+    def lookup(self, text: str, language: str, model: str, prompt_template: str):
+        """캐시된 번역 또는 None. 캐시가 꺼져 있으면 항상 None."""
+        if not TRANSLATION_CACHE_ENABLED:
+            return None
+        return self.get(self.key_for(text, language, model, prompt_template))
+
+    def store(self, text: str, language: str, model: str, prompt_template: str, translated: str):
+        """비어 있지 않은 번역만 저장합니다."""
+        if TRANSLATION_CACHE_ENABLED and translated and translated.strip():
+            self.set(self.key_for(text, language, model, prompt_template), translated)
+
+    def get_or_translate(self, text: str, language: str, model: str, prompt_template: str, translate_fn) -> str:
+        """
+        캐시에 있으면 바로 반환하고, 없으면 translate_fn(text)로 번역하여 저장합니다.
+        빈 결과나 예외는 저장하지 않습니다.
+        """
+        cached = self.lookup(text, language, model, prompt_template)
+        if cached is not None:
+            return cached
+        translated = translate_fn(text)
+        self.store(text, language, model, prompt_template, translated)
+        return translated
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.stats)
+
+
+# 워커 프로세스 전체에서 공유하는 번역 캐시 인스턴스 (영속 저장소는 첫 사용 시 연결)
+translation_cache = TranslationCache(persistent_factory=default_persistent_tier)
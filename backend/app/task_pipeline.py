@@ -0,0 +1,304 @@
+# backend/app/task_pipeline.py
+
+import io
+import os
+import shutil
+import tempfile
+import time
+
+import boto3
+
+# 작업 페이로드 처리 (process_task)의 임포트 가능한 구현.
+# backend/worker.py는 단계별 초안을 이어 붙인 파일이라 모듈로 임포트되지 않으므로 (문법 오류, 상대 임포트),
+# Lambda 진입점(app/lambda_entry.py)과 벤치마크/테스트는 이 모듈의 process_task를 사용합니다.
+# 단계 구현은 worker.py의 최신 초안과 같은 서비스 모듈을 그대로 조합합니다.
+# 무거운 라이브러리(music21, mido, langchain 등)는 처음 사용하는 단계에서 임포트 (WORKER_PREWARM으로 미리 임포트)
+from .services.lazy_imports import instance_of, lazy_import
+from .services.score_cache import parse_score_cached # 파싱된 악보 캐시
+from .services.score_ir import build_score_ir # 분석 단계용 경량 악보 표현
+from .services.harmony_analysis import analyze_harmony as analyze_score_harmony # 벡터화 화성 분석
+from .services.form_analysis import analyze_form as analyze_score_form # 자기 유사도 행렬 형식 분석
+from .services.text_extraction import extract_text as extract_score_text # 단일 순회 텍스트 추출
+from .services.midi_text_scan import scan_midi_text, format_text_events # MIDI 텍스트 메타 이벤트 스트리밍 스캔
+from .services.music_output import generate_outputs, step_output_formats # 여러 출력 형식 동시 생성/업로드
+from .services.omr_pipeline import PageTextStream, assemble_omr_score, iter_pages as iter_omr_pages # 페이지 병렬 OMR
+from .services.shakespeare_translation import merge_page_translations, shakespeare_llm, translate_text
+from .services.spot_interruption import ( # Spot 회수 알림, 단계 체크포인트
+    RESUMABLE_STEP_TYPES, default_checkpoint_store, spot_watcher, step_succeeded,
+)
+
+stream = lazy_import("music21.stream")
+mido = lazy_import("mido")
+
+from dotenv import load_dotenv
+load_dotenv()
+
+# S3 클라이언트 (모듈 수준: 같은 실행 환경의 웜 호출에서 연결 재사용)
+s3_client = boto3.client("s3")
+
+STORAGE_CONFIG = {
+    "type": os.getenv("STORAGE_TYPE", "s3"),
+    "bucket_name": os.getenv("S3_BUCKET_NAME"),
+}
+# 다운로드한 입력 파일을 둘 디렉터리 (Lambda에서는 /tmp만 쓰기 가능)
+TASK_TMP_DIR = os.getenv("TASK_TMP_DIR", tempfile.gettempdir())
+
+# Spot 회수로 중단된 작업의 완료 단계 출력 (SPOT_CHECKPOINT_DIR 또는 S3 버킷)
+task_checkpoints = default_checkpoint_store(STORAGE_CONFIG["bucket_name"], s3_client)
+
+# 음표 데이터 없이 텍스트만으로 처리 가능한 단계 (MIDI 입력 시 전체 파싱 생략)
+TEXT_ONLY_STEP_TYPES = {"extract_music_data", "extract_text_from_score", "translate_to_shakespearean"}
+OMR_EXTENSIONS = (".png", ".jpg", ".jpeg", ".pdf")
+MUSICXML_EXTENSIONS = (".musicxml", ".mxl")
+
+
+def download_input(file_location: dict, task_id: str) -> str:
+    """
+    작업 입력 파일을 TASK_TMP_DIR로 가져옵니다.
+
+    :param file_location: {"type": "s3" | "onprem", "key": 객체 키 또는 마운트된 경로, "bucket": (선택)}
+    :return: 로컬 파일 경로
+    """
+    file_type = file_location.get("type")
+    file_key = file_location.get("key")
+    if not file_type or not file_key:
+        raise ValueError("Missing file location")
+    local_path = os.path.join(TASK_TMP_DIR, f"{task_id}_{os.path.basename(file_key)}")
+    if file_type == "s3":
+        bucket_name = file_location.get("bucket") or STORAGE_CONFIG["bucket_name"] # 페이로드에 없으면 기본 설정
+        if not bucket_name:
+            raise ValueError("S3 파일 위치는 버킷 이름이 필요합니다.")
+        s3_client.download_file(bucket_name, file_key, local_path)
+    elif file_type == "onprem":
+        shutil.copyfile(file_key, local_path) # 워커에 마운트된 온프레미스 경로
+    else:
+        raise ValueError(f"지원하지 않는 파일 위치 타입: {file_type}")
+    print(f"워커: 입력 파일 준비 완료: {file_type}:{file_key} -> {local_path}")
+    return local_path
+
+
+class TaskState:
+    """한 작업의 단계 사이에서 공유되는 중간 결과."""
+    def __init__(self, task_id: str, all_tasks: list, processed_results: dict):
+        self.task_id = task_id
+        self.all_tasks = all_tasks
+        self.processed_results = processed_results
+        self.downloaded_file_path = None
+        self.music_data = None # music21 Stream, mido MidiFile, OMR 조립 결과 dict 등
+        self.score_ir = None # 분석/출력 단계용 경량 악보 표현
+        self.page_text = None # OMR 입력의 페이지별 텍스트/선행 번역 (PageTextStream)
+
+    def has_step(self, step_type: str) -> bool:
+        return any(t.get("type") == step_type for t in self.all_tasks)
+
+
+def _extract_music_data(state: TaskState, step: dict) -> str:
+    path = state.downloaded_file_path
+    results = state.processed_results
+    extension = os.path.splitext(path)[1].lower()
+    if extension in OMR_EXTENSIONS:
+        # 번역 단계가 있으면 페이지가 조립되는 즉시 그 페이지 텍스트의 번역을 시작
+        translate_pages = state.has_step("translate_to_shakespearean") and shakespeare_llm() is not None
+        state.page_text = PageTextStream(process_text=translate_text if translate_pages else None)
+        state.music_data = assemble_omr_score(iter_omr_pages(path), on_page=state.page_text)
+        results["omr_pages"] = {"page_count": state.music_data["page_count"],
+                                "failed_pages": state.music_data["failed_pages"],
+                                "text_pages": state.page_text.snapshot()}
+    elif extension in MUSICXML_EXTENSIONS:
+        state.music_data, cache_hit = parse_score_cached(path)
+        results["music_data_cache"] = {"hit": cache_hit}
+    elif extension in (".mid", ".midi"):
+        if any(t.get("type") not in TEXT_ONLY_STEP_TYPES for t in state.all_tasks):
+            state.music_data = mido.MidiFile(path)
+        else:
+            # 텍스트만 필요한 작업이면 전체 파싱 대신 텍스트 메타 이벤트만 스캔
+            state.music_data = {"format": "midi_text_scan", "text_events": scan_midi_text(path)}
+    else:
+        raise ValueError(f"지원하지 않는 악보 파일 확장자 ({extension})")
+
+    # 분석 단계들이 공유할 경량 악보 표현을 한 번만 생성
+    state.score_ir = build_score_ir(state.music_data)
+    if state.score_ir is not None:
+        results["score_ir"] = state.score_ir.summary()
+        print(f"워커: 경량 악보 표현 생성 완료. 음표 {len(state.score_ir)}개, {state.score_ir.nbytes} bytes")
+    return "success"
+
+
+def _extract_text_from_score(state: TaskState, step: dict) -> str:
+    music_data = state.music_data
+    if instance_of(music_data, stream, "Stream"):
+        text, elements = extract_score_text(music_data)
+    elif instance_of(music_data, mido, "MidiFile"):
+        text = format_text_events(scan_midi_text(state.downloaded_file_path))
+        elements = [{"type": "MIDI Text Event", "content": text}]
+    elif isinstance(music_data, dict) and music_data.get("format") == "midi_text_scan":
+        text = format_text_events(music_data["text_events"])
+        elements = [{"type": "MIDI Text Event", "content": text}]
+    elif isinstance(music_data, dict) and "text_elements" in music_data: # OMR 페이지 조립 결과
+        elements = music_data["text_elements"]
+        text = "\n".join(element["content"] if isinstance(element, dict) else element for element in elements)
+    else:
+        raise TypeError("텍스트 추출을 지원하지 않는 악보 데이터 형식입니다.")
+    if text.strip():
+        state.processed_results["extracted_text_content"] = text
+        state.processed_results["extracted_text_elements"] = elements
+    print(f"워커: 텍스트 추출 완료. 길이: {len(text)}")
+    return "success" # 텍스트가 없는 것도 성공
+
+
+def _translate_to_shakespearean(state: TaskState, step: dict) -> str:
+    results = state.processed_results
+    text = results.get("extracted_text_content")
+    if not shakespeare_llm():
+        results["shakespearean_translation"] = {"status": "skipped", "message": "LLM not initialized"}
+        return "skipped"
+    if not text or not text.strip():
+        results["shakespearean_translation"] = {"status": "skipped", "message": "No text found for translation"}
+        return "skipped"
+    if state.page_text is not None and state.page_text.process_text is not None:
+        # OMR 입력: 악보 데이터 추출 중 페이지마다 시작한 번역 결과를 페이지 순서대로 합침
+        translation = merge_page_translations(state.page_text.results())
+    else:
+        translation = translate_text(text)
+    results["detected_language"] = translation["original_language"]
+    results["shakespearean_translation"] = translation
+    # success / deferred (제공자 차단으로 보류, 작업 전체를 나중에 다시 처리) / completed_with_errors
+    return translation["status"]
+
+
+def _analyze_harmony(state: TaskState, step: dict) -> str:
+    harmony = analyze_score_harmony(state.score_ir)
+    state.processed_results["harmony_analysis"] = {"status": "success", "results": harmony}
+    print(f"워커: 화성 분석 완료. 총 {harmony['count']}개 화음 분석.")
+    return "success"
+
+
+def _analyze_form(state: TaskState, step: dict) -> str:
+    sections = analyze_score_form(state.score_ir)
+    state.processed_results["form_analysis"] = {"status": "success", "sections": sections}
+    print(f"워커: 형식 분석 완료. {len(sections)}개 섹션 식별.")
+    return "success"
+
+
+def _generate_music_file(state: TaskState, step: dict) -> str:
+    output_formats = step_output_formats(step)
+    midi_bytes = None
+    if instance_of(state.music_data, mido, "MidiFile") and "midi" in output_formats:
+        # MIDI 입력은 원본 메시지(컨트롤 체인지 등)를 그대로 유지하여 내보냄
+        midi_buffer = io.BytesIO()
+        state.music_data.save(file=midi_buffer)
+        midi_bytes = midi_buffer.getvalue()
+    generated = generate_outputs(state.score_ir, output_formats, STORAGE_CONFIG["bucket_name"],
+                                 f"results/{state.task_id}/{state.task_id}", s3_client, midi_bytes=midi_bytes)
+    state.processed_results["generated_music_file"] = generated
+    # 일부 형식만 성공해도 결과는 남기고 단계는 실패로 표시하지 않음
+    return "success" if generated["status"] != "failed" else "failed"
+
+
+# 단계 타입 -> (실행 함수, 필요한 선행 결과). 선행 결과가 없으면 단계를 건너뜀
+STEP_HANDLERS = {
+    "extract_music_data": (_extract_music_data, "downloaded_file_path"),
+    "extract_text_from_score": (_extract_text_from_score, "music_data"),
+    "translate_to_shakespearean": (_translate_to_shakespearean, None),
+    "analyze_harmony": (_analyze_harmony, "score_ir"),
+    "analyze_form": (_analyze_form, "score_ir"),
+    "generate_music_file": (_generate_music_file, "score_ir"),
+}
+
+
+def process_task(task_payload: dict, progress: dict = None) -> dict:
+    """
+    주어진 작업 페이로드를 처리합니다. (메시지 큐 메시지 본문 또는 Lambda 직접 호출 페이로드)
+
+    :param progress: in_flight_tasks.begin()의 기록 (선택). 완료된 단계 출력을 completed_steps에 기록합니다.
+    :return: {"task_id", "status", "processing_time_seconds", "results_summary"}.
+             status는 completed, deferred (보류된 단계가 있음), interrupted (Spot 회수 알림), failed
+    """
+    task_id = task_payload.get("task_id", "unknown-task")
+    print(f"\n>>> 워커: 작업 처리 시작 (Task ID: {task_id})")
+    start_time = time.time()
+
+    processed_results = {"task_id": task_id, "metadata": task_payload.get("metadata", {})}
+    state = TaskState(task_id, task_payload.get("processing_steps", []) + task_payload.get("analysis_tasks", []),
+                      processed_results)
+    # 이전 워커가 회수되기 전에 끝낸 단계 출력 (있으면 해당 단계는 다시 실행하지 않고 복원)
+    saved_steps = task_checkpoints.load(task_id) if task_checkpoints else {}
+    completed_steps = (progress if progress is not None else {}).setdefault("completed_steps", {})
+    overall_status = "completed"
+
+    try:
+        try:
+            state.downloaded_file_path = download_input(task_payload.get("file_location") or {}, task_id)
+        except Exception as e:
+            processed_results["download_error"] = str(e)
+            raise
+
+        for step in state.all_tasks:
+            step_type = step.get("type")
+            if spot_watcher.interrupted.is_set():
+                print(f"워커: Spot 회수 알림으로 '{step_type}' 단계부터 처리를 멈춥니다.")
+                overall_status = "interrupted"
+                break
+            if step_type in RESUMABLE_STEP_TYPES and step_type in saved_steps:
+                processed_results.update(saved_steps[step_type])
+                completed_steps[step_type] = saved_steps[step_type]
+                print(f"워커: 작업 단계 '{step_type}' 체크포인트에서 복원 (다시 실행하지 않음).")
+                continue
+            if step_type not in STEP_HANDLERS:
+                print(f"워커: 경고: 알 수 없는 작업 단계 타입: {step_type}. 건너뜁니다.")
+                processed_results[f"{step_type}_status"] = "skipped_unknown_type"
+                continue
+
+            run_step, requires = STEP_HANDLERS[step_type]
+            results_before = dict(processed_results)
+            if requires and getattr(state, requires) is None:
+                print(f"워커: '{step_type}' 단계에 필요한 데이터({requires})가 없어 건너뜁니다.")
+                step_status = "skipped"
+            else:
+                print(f"워커: 작업 단계 '{step_type}' 실행...")
+                try:
+                    step_status = run_step(state, step)
+                except Exception as e:
+                    print(f"워커: 작업 단계 '{step_type}' 오류: {e}")
+                    step_status = "failed"
+                    processed_results[f"{step_type}_error"] = str(e)
+            processed_results[f"{step_type}_status"] = step_status
+
+            # 이 단계가 새로 기록한 결과 (Spot 회수 시 체크포인트로 저장)
+            step_outputs = {key: value for key, value in processed_results.items()
+                            if key not in results_before or results_before[key] is not value}
+            if step_type in RESUMABLE_STEP_TYPES and step_succeeded(step_outputs):
+                completed_steps[step_type] = step_outputs
+
+        if overall_status == "interrupted":
+            if task_checkpoints and completed_steps:
+                task_checkpoints.save(task_id, completed_steps)
+        elif any(key.endswith("_status") and value == "deferred" for key, value in processed_results.items()):
+            # LLM 제공자 차단 등으로 보류된 단계가 있으면 메시지를 지우지 않고 나중에 다시 처리
+            overall_status = "deferred"
+        elif task_checkpoints and saved_steps:
+            task_checkpoints.delete(task_id) # 이어서 처리한 작업 완료
+
+        final_result_payload = {
+            "task_id": task_id,
+            "status": overall_status,
+            "processing_time_seconds": time.time() - start_time,
+            "results_summary": processed_results,
+        }
+        print(f"워커: 작업 {task_id} {overall_status} ({final_result_payload['processing_time_seconds']:.2f}초)")
+        return final_result_payload
+
+    except Exception as e:
+        # 다운로드 실패 등 치명적 오류: 메시지를 삭제하지 않도록 예외를 다시 발생 (SQS 재처리/DLQ)
+        print(f"워커: 작업 '{task_id}' 처리 중 치명적 오류 발생: {e}")
+        raise
+
+    finally:
+        if state.page_text is not None:
+            state.page_text.close() # 번역 단계 전에 중단된 경우에도 페이지 번역 스레드 정리
+        path = state.downloaded_file_path
+        if path and os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"워커: 임시 파일 삭제 중 오류 발생: {e}")
@@ -0,0 +1,80 @@
+# backend/benchmarks/bench_chunk_translation.py
+#
+# Simulate the translate_to_shakespearean step against a fake LLM provider
+# with fixed latency and a sliding-window request limit. Compares the old
+# sequential chunk loop with concurrent translation behind the shared rate
+# limiter, and counts simulated 429 responses.
+#
+# Usage (from the repository root):
+#   python -m backend.benchmarks.bench_chunk_translation --chunks 30 --latency 0.5 --rpm 120
+
+import argparse
+import collections
+import logging
+import threading
+import time
+
+from backend.app.services.chunk_translation import translate_chunks
+from backend.app.services.rate_limiter import RateLimiter, estimate_tokens
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class FakeProvider:
+    """Sleeps for `latency` seconds per call and rejects calls above `rpm` in any 60 s window."""
+    def __init__(self, latency: float, rpm: int):
+        self.latency = latency
+        self.rpm = rpm
+        self.calls = collections.deque()
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def complete(self, text: str) -> str:
+        with self.lock:
+            now = time.monotonic()
+            while self.calls and now - self.calls[0] > 60.0:
+                self.calls.popleft()
+            if len(self.calls) >= self.rpm:
+                self.rejected += 1
+                raise RuntimeError("429 Too Many Requests")
+            self.calls.append(now)
+        time.sleep(self.latency)
+        return f"Hark! {text}"
+
+
+def run_benchmark(num_chunks: int, latency: float, rpm: int, concurrency: int):
+    chunks = [f"verse {i} " * 50 for i in range(num_chunks)]
+
+    provider = FakeProvider(latency, rpm)
+    start = time.perf_counter()
+    sequential = [provider.complete(chunk) for chunk in chunks]
+    sequential_time = time.perf_counter() - start
+
+    provider = FakeProvider(latency, rpm)
+    limiter = RateLimiter(requests_per_minute=rpm, tokens_per_minute=10_000_000)
+
+    def translate(chunk):
+        limiter.acquire(estimate_tokens(chunk))
+        return provider.complete(chunk)
+
+    start = time.perf_counter()
+    results = translate_chunks(chunks, translate, max_concurrency=concurrency)
+    concurrent_time = time.perf_counter() - start
+
+    assert [r["translated_chunk"] for r in results] == [s.strip() for s in sequential]
+    logger.info(f"chunks={num_chunks} latency={latency}s rpm={rpm} concurrency={concurrency}")
+    logger.info(f"sequential: {sequential_time:.2f} s")
+    logger.info(f"concurrent: {concurrent_time:.2f} s ({sequential_time / concurrent_time:.1f}x), "
+                f"429 responses: {provider.rejected}, limiter wait: {limiter.stats['waited_seconds']:.2f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark concurrent chunk translation.")
+    parser.add_argument("--chunks", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.5, help="Simulated LLM latency per call (seconds).")
+    parser.add_argument("--rpm", type=int, default=120, help="Simulated provider requests-per-minute limit.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    run_benchmark(args.chunks, args.latency, args.rpm, args.concurrency)
@@ -0,0 +1,81 @@
+# backend/benchmarks/bench_harmony.py
+#
+# Compare the legacy per-chord analyze_harmony loop (ch.root(), ch.quality(),
+# pitchedCommonNames) against the pitch-class lookup engine on dense scores.
+#
+# Usage (from the repository root):
+#   python -m backend.benchmarks.bench_harmony --chords 10000 20000
+
+import argparse
+import logging
+import random
+import time
+
+from music21 import chord, stream
+
+from backend.app.services.harmony_analysis import analyze_harmony
+from backend.app.services.score_ir import build_score_ir
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Common chord shapes (semitones above the bass) plus a few clusters
+CHORD_SHAPES = [(0, 4, 7), (0, 3, 7), (0, 3, 6), (0, 4, 8), (0, 4, 7, 10), (0, 3, 7, 10), (0, 1, 5), (0, 2, 7)]
+
+
+def build_dense_score(num_chords: int, seed: int = 0) -> stream.Score:
+    rng = random.Random(seed)
+    part = stream.Part()
+    for _ in range(num_chords):
+        bass = rng.randint(40, 60)
+        shape = rng.choice(CHORD_SHAPES)
+        part.append(chord.Chord([bass + s for s in shape], quarterLength=0.5))
+    return stream.Score([part])
+
+
+def legacy_loop(score):
+    harmony_list = []
+    for ch in score.flatten().getElementsByClass('Chord'):
+        try:
+            root_pitch = ch.root()
+            quality = ch.quality
+            harmony_list.append({
+                "offset": ch.offset,
+                "chord": ch.pitchedCommonNames,
+                "harmony": f"{root_pitch.name} {quality}",
+            })
+        except Exception as e:
+            harmony_list.append({"offset": ch.offset, "harmony": "Analysis Failed", "error": str(e)})
+    return harmony_list
+
+
+def run_benchmark(chord_counts):
+    analyze_harmony(build_score_ir(build_dense_score(8))) # warm the lookup table
+    logger.info(f"{'chords':>8} {'legacy (s)':>11} {'IR build (s)':>13} {'engine (s)':>11} {'speedup':>9}")
+    for num_chords in chord_counts:
+        # Fresh scores for each side so neither benefits from music21's per-chord caches
+        legacy_score = build_dense_score(num_chords)
+        start = time.perf_counter()
+        legacy = legacy_loop(legacy_score)
+        legacy_time = time.perf_counter() - start
+
+        score = build_dense_score(num_chords)
+        start = time.perf_counter()
+        ir = build_score_ir(score)
+        ir_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = analyze_harmony(ir)
+        engine_time = time.perf_counter() - start
+
+        assert result["count"] == len(legacy)
+        logger.info(f"{num_chords:>8} {legacy_time:>11.3f} {ir_time:>13.3f} {engine_time:>11.4f} "
+                    f"{legacy_time / engine_time:>8.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized harmony engine.")
+    parser.add_argument("--chords", type=int, nargs="+", default=[10000, 20000], help="Number of chords per score.")
+    args = parser.parse_args()
+
+    run_benchmark(args.chords)
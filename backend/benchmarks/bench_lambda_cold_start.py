@@ -0,0 +1,135 @@
+# backend/benchmarks/bench_lambda_cold_start.py
+#
+# Local harness for the Lambda execution mode: cold vs warm invocation
+# latency of the real handler, app.lambda_entry.lambda_handler
+# (lambda_runtime.make_handler around task_pipeline.process_task).
+#
+# Each mode runs in a fresh interpreter, which plays the role of a new
+# execution environment:
+#   - init: importing the handler's module-scope dependencies
+#   - cold: init plus the first invocation
+#   - warm: median of the following invocations, which reuse the
+#     module-scope state
+# Every invocation is an SQS batch of --batch MIDI tasks running
+# extract_music_data, extract_text_from_score, analyze_harmony and
+# generate_music_file (MIDI). S3 is replaced by local files (download is a
+# copy, upload is kept in memory), so network time is not included.
+#
+# Modes:
+#   lazy   heavy libraries load on first use (the current handler)
+#   eager  music21, pdfminer, langdetect and langchain (when installed) are
+#          imported at init, like the old worker.py module top
+#
+# Usage (from the repository root):
+#   python -m backend.benchmarks.bench_lambda_cold_start --invocations 20 --batch 5
+
+import time
+
+_PROCESS_START = time.perf_counter()
+
+import argparse
+import json
+import logging
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+EAGER_LIBRARIES = ["music21", "pdfminer.high_level", "langdetect", "langchain_openai", "langchain.chains"]
+
+
+def write_midi(path: str, notes: int = 2000):
+    import mido
+    midi = mido.MidiFile()
+    track = mido.MidiTrack()
+    midi.tracks.append(track)
+    track.append(mido.MetaMessage("track_name", name="Voice"))
+    for i in range(notes):
+        if i % 8 == 0:
+            track.append(mido.MetaMessage("lyrics", text=f"la{i // 8}"))
+        track.append(mido.Message("note_on", note=60 + i % 12, velocity=64, time=0))
+        track.append(mido.Message("note_off", note=60 + i % 12, velocity=0, time=240))
+    midi.save(path)
+
+
+class LocalS3:
+    """download_file/put_object against local files, in place of the handler's S3 client."""
+    def __init__(self, path: str):
+        self.path = path
+        self.uploaded_bytes = 0
+
+    def download_file(self, bucket, key, local_path):
+        shutil.copyfile(self.path, local_path)
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.uploaded_bytes += len(Body)
+
+
+def task_payload(task_id: str) -> dict:
+    return {"task_id": task_id,
+            "file_location": {"type": "s3", "bucket": "bench", "key": "uploads/task.mid"},
+            "processing_steps": [{"type": "extract_music_data"}, {"type": "extract_text_from_score"},
+                                 {"type": "generate_music_file", "output_formats": ["midi"]}],
+            "analysis_tasks": [{"type": "analyze_harmony"}]}
+
+
+def main_child(mode: str, midi_path: str, invocations: int, batch: int) -> dict:
+    import importlib
+    if mode == "eager":
+        for name in EAGER_LIBRARIES:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+    from backend.app import lambda_entry, task_pipeline
+    init_ms = (time.perf_counter() - _PROCESS_START) * 1000
+    task_pipeline.s3_client = LocalS3(midi_path)
+    task_pipeline.task_checkpoints = None
+    task_pipeline.STORAGE_CONFIG["bucket_name"] = "bench"
+
+    durations = []
+    for invocation in range(invocations):
+        event = {"Records": [{"messageId": f"{invocation}-{i}", "eventSource": "aws:sqs",
+                              "body": json.dumps(task_payload(f"t{invocation}-{i}"))}
+                             for i in range(batch)]}
+        start = time.perf_counter()
+        response = lambda_entry.lambda_handler(event)
+        durations.append((time.perf_counter() - start) * 1000)
+        assert response == {"batchItemFailures": []}
+    return {"init_ms": init_ms, "first_ms": durations[0], "warm_ms": statistics.median(durations[1:]),
+            "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+
+
+def run(invocations: int, batch: int):
+    midi_path = os.path.join(tempfile.mkdtemp(prefix="bench_lambda_"), "task.mid")
+    write_midi(midi_path)
+    for mode in ("eager", "lazy"):
+        output = subprocess.run([sys.executable, "-m", "backend.benchmarks.bench_lambda_cold_start", "--child", mode,
+                                 "--midi", midi_path, "--invocations", str(invocations), "--batch", str(batch)],
+                                capture_output=True, text=True, check=True)
+        result = json.loads(output.stdout.strip().splitlines()[-1])
+        logger.info(f"{mode:5s} init {result['init_ms']:7.1f}ms  cold (init + 1st) "
+                    f"{result['init_ms'] + result['first_ms']:7.1f}ms  warm {result['warm_ms']:6.1f}ms  "
+                    f"peak RSS {result['max_rss_mb']:.0f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure cold vs warm Lambda-mode invocation latency locally.")
+    parser.add_argument("--invocations", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=5, help="SQS records per invocation.")
+    parser.add_argument("--child", choices=["lazy", "eager"], help=argparse.SUPPRESS)
+    parser.add_argument("--midi", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        import contextlib
+        with contextlib.redirect_stdout(sys.stderr): # handler logs to stderr, result JSON alone on stdout
+            result = main_child(args.child, args.midi, args.invocations, args.batch)
+        print(json.dumps(result))
+    else:
+        run(args.invocations, args.batch)
@@ -0,0 +1,99 @@
+# backend/benchmarks/bench_llm_pool.py
+#
+# Start a local mock of an OpenAI-compatible chat endpoint and send the same
+# sequence of per-task requests two ways: a new HTTP client per task (what the
+# per-task ChatOpenAI construction does) and the worker's shared pooled client.
+# Reports wall time and the number of TCP connections the server accepted.
+#
+# Usage (from the repository root):
+#   python -m backend.benchmarks.bench_llm_pool --tasks 50 --requests-per-task 3 --connect-delay 0.02
+#
+# --connect-delay adds latency to each new connection to stand in for the
+# TCP + TLS handshake to a remote provider.
+
+import argparse
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from backend.app.services.llm_pool import LLMClientPool, create_http_client
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+logging.getLogger("httpx").setLevel(logging.WARNING) # per-request logs
+
+REPLY = json.dumps({"choices": [{"message": {"role": "assistant", "content": "Hark!"}}]}).encode()
+
+
+def make_server(connect_delay: float):
+    connections = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1" # keep-alive
+        disable_nagle_algorithm = True # headers and body are written separately
+
+        def setup(self):
+            super().setup()
+            connections.append(self.client_address)
+            time.sleep(connect_delay)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(REPLY)))
+            self.end_headers()
+            self.wfile.write(REPLY)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, connections
+
+
+def run_tasks(num_tasks: int, requests_per_task: int, url: str, client_for_task):
+    body = {"model": "gpt-3.5-turbo", "messages": [{"role": "user", "content": "Translate: la la la"}]}
+    start = time.perf_counter()
+    for _ in range(num_tasks):
+        client, owned = client_for_task()
+        for _ in range(requests_per_task):
+            client.post(url, json=body).raise_for_status()
+        if owned:
+            client.close()
+    return time.perf_counter() - start
+
+
+def run_benchmark(num_tasks: int, requests_per_task: int, connect_delay: float):
+    server, connections = make_server(connect_delay)
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+
+    per_task = run_tasks(num_tasks, requests_per_task, url, lambda: (create_http_client(), True))
+    per_task_connections = len(connections)
+    connections.clear()
+
+    pool = LLMClientPool(factory=lambda model, temperature, http_client: http_client)
+    pool.warm([("gpt-3.5-turbo", 0.7)], connect=False)
+    pooled = run_tasks(num_tasks, requests_per_task, url, lambda: (pool.get("gpt-3.5-turbo", 0.7), False))
+    pooled_connections = len(connections)
+    pool.close()
+    server.shutdown()
+
+    total = num_tasks * requests_per_task
+    logger.info(f"tasks={num_tasks} requests={total} connect_delay={connect_delay}s")
+    logger.info(f"client per task: {per_task:.2f} s, {per_task_connections} connections")
+    logger.info(f"pooled client:   {pooled:.2f} s, {pooled_connections} connections "
+                f"({per_task / pooled:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark pooled LLM HTTP clients.")
+    parser.add_argument("--tasks", type=int, default=50)
+    parser.add_argument("--requests-per-task", type=int, default=3)
+    parser.add_argument("--connect-delay", type=float, default=0.02, help="Simulated handshake cost per connection.")
+    args = parser.parse_args()
+
+    run_benchmark(args.tasks, args.requests_per_task, args.connect_delay)
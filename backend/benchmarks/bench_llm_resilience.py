@@ -0,0 +1,123 @@
+# backend/benchmarks/bench_llm_resilience.py
+#
+# Start simulation/mock_external_service.py as a provider brownout
+# (SIMULATE_ERROR_RATE, SIMULATE_RATE_LIMIT_ENABLED) and translate the same
+# chunks from several threads two ways:
+#   - naive: every thread retries on its own (3 attempts, exponential backoff),
+#     like the old tenacity decorator
+#   - shared: the worker's LLM resilience layer (Retry-After, global retry
+#     budget, circuit breaker with deferred chunks)
+# Reports provider requests (load amplification), outcomes and wall time.
+#
+# Requires fastapi and uvicorn (simulation/requirements.mock_openai.txt).
+#
+# Usage (from the repository root):
+#   python -m backend.benchmarks.bench_llm_resilience --chunks 200 --error-rate 0.6 --rpm 600
+
+import argparse
+import logging
+import os
+import socket
+import subprocess
+import sys
+import time
+
+# Scale the backoff down so the benchmark finishes quickly (read at import time)
+os.environ.setdefault("LLM_BACKOFF_BASE_SECONDS", "0.05")
+os.environ.setdefault("LLM_BACKOFF_MAX_SECONDS", "0.5")
+
+import httpx
+
+from backend.app.services import llm_resilience
+from backend.app.services.chunk_translation import translate_chunks
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+class ProviderError(Exception):
+    def __init__(self, response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.status_code = response.status_code
+        self.response = response
+
+
+def start_mock(port: int, error_rate: float, rpm: int):
+    env = dict(os.environ, MOCK_HOST="127.0.0.1", MOCK_PORT=str(port), SIMULATE_ERROR_RATE=str(error_rate),
+               SIMULATE_ERROR_STATUS_CODE="503", SIMULATE_RATE_LIMIT_ENABLED="true", RATE_LIMIT_PER_MINUTE=str(rpm))
+    process = subprocess.Popen([sys.executable, "simulation/mock_external_service.py"], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("mock service did not start")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run_mode(name, chunks, concurrency, port, error_rate, rpm, call):
+    process = start_mock(port, error_rate, rpm)
+    client = httpx.Client()
+    requests = 0
+    url = f"http://127.0.0.1:{port}/v1/chat/completions"
+
+    def once(chunk):
+        nonlocal requests
+        requests += 1
+        response = client.post(url, json={"messages": [{"role": "user", "content": chunk}]})
+        if response.status_code != 200:
+            raise ProviderError(response)
+        return response.json()["choices"][0]["message"]["content"]
+
+    try:
+        start = time.perf_counter()
+        results = translate_chunks(chunks, lambda chunk: call(once, chunk), max_concurrency=concurrency)
+        elapsed = time.perf_counter() - start
+    finally:
+        client.close()
+        process.terminate()
+        process.wait()
+    counts = {status: sum(r["status"] == status for r in results) for status in ("success", "failed", "deferred")}
+    logger.info(f"{name:7s}: {requests:4d} provider requests ({requests / len(chunks):.2f} per chunk), "
+                f"success {counts['success']}, failed {counts['failed']}, deferred {counts['deferred']}, {elapsed:.2f} s")
+
+
+def naive_retry(fn, chunk, attempts=3):
+    for attempt in range(1, attempts + 1):
+        try:
+            return fn(chunk)
+        except Exception:
+            if attempt == attempts:
+                raise
+            time.sleep(min(0.5, 0.05 * 2 ** attempt))
+
+
+def run_benchmark(num_chunks: int, error_rate: float, rpm: int, concurrency: int):
+    chunks = [f"verse {i}: la la la" for i in range(num_chunks)]
+    logger.info(f"chunks={num_chunks} error_rate={error_rate} rpm={rpm} concurrency={concurrency}")
+    run_mode("naive", chunks, concurrency, free_port(), error_rate, rpm, naive_retry)
+
+    resilience = llm_resilience.LLMResilience()
+    run_mode("shared", chunks, concurrency, free_port(), error_rate, rpm,
+             lambda fn, chunk: resilience.call(fn, chunk))
+    logger.info(f"shared counters: {resilience.snapshot()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark LLM retry behaviour during a provider brownout.")
+    parser.add_argument("--chunks", type=int, default=200)
+    parser.add_argument("--error-rate", type=float, default=0.6, help="SIMULATE_ERROR_RATE of the mock provider.")
+    parser.add_argument("--rpm", type=int, default=600, help="RATE_LIMIT_PER_MINUTE of the mock provider.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    run_benchmark(args.chunks, args.error_rate, args.rpm, args.concurrency)
@@ -0,0 +1,78 @@
+# backend/benchmarks/bench_midi_text_scan.py
+#
+# Compare full mido parsing plus a message loop (the worker's previous text
+# extraction path for .mid inputs) against the streaming meta-event scanner
+# on large, note-heavy MIDI files with sparse lyrics.
+#
+# Usage (from the repository root):
+#   python -m backend.benchmarks.bench_midi_text_scan --notes 100000 500000
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+
+import mido
+
+from backend.app.services.midi_text_scan import format_text_events, scan_midi_text
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+TEXT_TYPES = ['text', 'lyrics', 'marker', 'cue_marker', 'copyright']
+
+
+def write_large_midi(path: str, num_notes: int, num_tracks: int = 8, seed: int = 0):
+    rng = random.Random(seed)
+    mid = mido.MidiFile(type=1)
+    for t in range(num_tracks):
+        track = mido.MidiTrack()
+        for i in range(num_notes // num_tracks):
+            if i % 16 == 0:
+                track.append(mido.MetaMessage("lyrics", text=f"la{i}", time=0))
+            pitch = rng.randint(36, 96)
+            track.append(mido.Message("note_on", channel=t % 16, note=pitch, velocity=80, time=0))
+            track.append(mido.Message("control_change", channel=t % 16, control=11, value=rng.randint(0, 127), time=60))
+            track.append(mido.Message("note_off", channel=t % 16, note=pitch, velocity=0, time=60))
+        mid.tracks.append(track)
+    mid.save(path)
+
+
+def mido_extract(path: str) -> str:
+    lines = []
+    for i, track in enumerate(mido.MidiFile(path).tracks):
+        for msg in track:
+            if msg.type in TEXT_TYPES:
+                lines.append(f"Track {i}: [{msg.time}] {msg.text}")
+    return "\n".join(lines)
+
+
+def run_benchmark(note_counts):
+    logger.info(f"{'notes':>8} {'size (MB)':>10} {'mido (s)':>9} {'scan (s)':>9} {'speedup':>9}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for num_notes in note_counts:
+            path = os.path.join(tmp_dir, f"bench_{num_notes}.mid")
+            write_large_midi(path, num_notes)
+
+            start = time.perf_counter()
+            reference = mido_extract(path)
+            mido_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            scanned = format_text_events(scan_midi_text(path))
+            scan_time = time.perf_counter() - start
+
+            assert scanned == reference
+            size_mb = os.path.getsize(path) / 1e6
+            logger.info(f"{num_notes:>8} {size_mb:>10.1f} {mido_time:>9.2f} {scan_time:>9.2f} "
+                        f"{mido_time / scan_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the streaming MIDI text-event scanner.")
+    parser.add_argument("--notes", type=int, nargs="+", default=[100000, 500000], help="Number of notes per file.")
+    args = parser.parse_args()
+
+    run_benchmark(args.notes)
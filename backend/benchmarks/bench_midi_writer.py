@@ -0,0 +1,67 @@
+# backend/benchmarks/bench_midi_writer.py
+#
+# Compare music21's score.write('midi') (the generate_music_file step's
+# previous path) against the direct ScoreIR -> SMF writer. The IR build time
+# is reported separately because the worker already builds the IR during
+# extract_music_data.
+#
+# Usage (from the repository root):
+#   python -m backend.benchmarks.bench_midi_writer --notes 5000 20000
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+
+from music21 import note, stream
+
+from backend.app.services.midi_writer import write_midi
+from backend.app.services.score_ir import build_score_ir
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def build_score(num_notes: int, num_parts: int = 4, seed: int = 0) -> stream.Score:
+    rng = random.Random(seed)
+    score = stream.Score()
+    for _ in range(num_parts):
+        part = stream.Part()
+        for _ in range(num_notes // num_parts):
+            part.append(note.Note(rng.randint(40, 84), quarterLength=rng.choice([0.25, 0.5, 1.0])))
+        score.insert(0, part)
+    return score
+
+
+def run_benchmark(note_counts):
+    logger.info(f"{'notes':>8} {'music21 (s)':>12} {'IR build (s)':>13} {'writer (s)':>11} {'speedup':>9}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for num_notes in note_counts:
+            path = os.path.join(tmp_dir, "out.mid")
+
+            score = build_score(num_notes)
+            start = time.perf_counter()
+            score.write('midi', fp=path)
+            music21_time = time.perf_counter() - start
+
+            score = build_score(num_notes)
+            start = time.perf_counter()
+            ir = build_score_ir(score)
+            ir_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            write_midi(ir, fp=path)
+            writer_time = time.perf_counter() - start
+
+            logger.info(f"{num_notes:>8} {music21_time:>12.3f} {ir_time:>13.3f} {writer_time:>11.4f} "
+                        f"{music21_time / writer_time:>8.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the direct MIDI writer.")
+    parser.add_argument("--notes", type=int, nargs="+", default=[5000, 20000], help="Number of notes per score.")
+    args = parser.parse_args()
+
+    run_benchmark(args.notes)
@@ -0,0 +1,86 @@
+# backend/benchmarks/bench_omr_pipeline.py
+#
+# Build a synthetic scanned score (multi-page TIFF, A4 at the given DPI with
+# staff lines and noise) and run the page-parallel OMR pipeline with one page
+# process and with --workers page processes. A CPU-bound recognition stage
+# stands in for per-page OMR work. Reports time to the first page (when the
+# score assembly can start) and total wall time.
+#
+# Usage (from the repository root):
+#   python -m backend.benchmarks.bench_omr_pipeline --pages 100 --dpi 150 --workers 8
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from backend.app.services.omr_pipeline import OMR_MAX_WORKERS, assemble_omr_score, iter_pages
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def synthetic_recognition_stage(page):
+    """Stand-in for symbol recognition: a few full-page passes over the image."""
+    image = page["image"].astype(np.float32)
+    for _ in range(8):
+        image = (image + np.roll(image, 1, axis=0) + np.roll(image, 1, axis=1)) / 3
+    page["ink_rows"] = int((image.mean(axis=1) < 200).sum())
+    return page
+
+
+def write_scanned_score(path, pages, dpi):
+    from PIL import Image
+    height, width = int(11.69 * dpi), int(8.27 * dpi)
+    rng = np.random.default_rng(0)
+    images = []
+    for _ in range(pages):
+        page = np.full((height, width), 255, dtype=np.uint8)
+        for system in range(10):
+            top = int(height * (0.08 + system * 0.09))
+            for line in range(5):
+                page[top + line * dpi // 30, width // 10: width * 9 // 10] = 0
+        page[rng.random(page.shape) < 0.01] = 0 # scanner noise
+        images.append(Image.fromarray(page))
+    images[0].save(path, save_all=True, append_images=images[1:], compression="tiff_deflate")
+
+
+def run(path, workers):
+    start = time.perf_counter()
+    first = None
+
+    def on_page(page):
+        nonlocal first
+        if first is None:
+            first = time.perf_counter() - start
+
+    score = assemble_omr_score(iter_pages(path, max_workers=workers, stages=(synthetic_recognition_stage,)),
+                               on_page=on_page)
+    total = time.perf_counter() - start
+    logger.info(f"workers={workers:2d}: first page after {first:6.2f} s, all {score['page_count']} pages "
+                f"in {total:6.2f} s, failed {score['failed_pages']}")
+    return total
+
+
+def run_benchmark(pages: int, dpi: int, workers: int):
+    logger.info(f"pages={pages} dpi={dpi} workers={workers} (cpu_count={os.cpu_count()})")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "score.tiff")
+        write_scanned_score(path, pages, dpi)
+        logger.info(f"input: {os.path.getsize(path) / 1e6:.1f} MB")
+        sequential = run(path, 1)
+        parallel = run(path, workers)
+    logger.info(f"speedup: {sequential / parallel:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark page-parallel OMR input processing.")
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--dpi", type=int, default=150)
+    parser.add_argument("--workers", type=int, default=OMR_MAX_WORKERS)
+    args = parser.parse_args()
+
+    run_benchmark(args.pages, args.dpi, args.workers)
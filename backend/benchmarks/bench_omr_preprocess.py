@@ -0,0 +1,78 @@
+# backend/benchmarks/bench_omr_preprocess.py
+#
+# Run the OMR preprocessing engine (Otsu binarization, projection-profile
+# deskew, staff/system detection, deskewed system crops) on synthetic A4
+# scans at 300 and 600 DPI, skewed by --angle degrees. For each DPI reports
+# wall time of page analysis and of producing all system crops, and the peak
+# extra memory (tracemalloc) with OMR_TILE_ROWS-sized tiles vs. one tile
+# holding the whole page.
+#
+# Usage (from the repository root):
+#   python -m backend.benchmarks.bench_omr_preprocess --dpi 300 600 --angle 1.2
+
+import argparse
+import logging
+import time
+import tracemalloc
+
+import numpy as np
+from PIL import Image
+
+from backend.app.services.omr_preprocess import OMR_TILE_ROWS, analyze_page, iter_system_crops
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def synthetic_scan(dpi: int, angle: float) -> np.ndarray:
+    """A4 page with six two-staff systems joined by barlines, noise, rotated by angle."""
+    height, width = int(11.69 * dpi), int(8.27 * dpi)
+    spacing, thickness = dpi // 25, max(1, dpi // 150)
+    page = np.full((height, width), 235, dtype=np.uint8)
+    x0, x1, y = width // 10, width * 9 // 10, height // 12
+    for _ in range(6):
+        first = y
+        for staff in range(2):
+            for line in range(5):
+                page[y + line * spacing:y + line * spacing + thickness, x0:x1] = 20
+            last = y + 4 * spacing + thickness
+            y += 4 * spacing + (7 if staff == 0 else 11) * spacing
+        for bx in np.linspace(x0, x1 - thickness, 5).astype(int):
+            page[first:last, bx:bx + thickness] = 20
+    rng = np.random.default_rng(0)
+    page[rng.random(page.shape) < 0.01] = 0
+    return np.array(Image.fromarray(page).rotate(-angle, fillcolor=235, resample=Image.BILINEAR))
+
+
+def measure(page: np.ndarray, tile_rows: int):
+    tracemalloc.start()
+    start = time.perf_counter()
+    layout = analyze_page(page, tile_rows)
+    analyzed = time.perf_counter() - start
+    crop_bytes = max((crop.nbytes for crop in iter_system_crops(page, layout)), default=0)
+    total = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return layout, analyzed, total, peak, crop_bytes
+
+
+def run_benchmark(dpis, angle: float, tile_rows: int):
+    for dpi in dpis:
+        page = synthetic_scan(dpi, angle)
+        logger.info(f"{dpi} DPI: page {page.shape[1]}x{page.shape[0]}, {page.nbytes / 1e6:.1f} MB grayscale")
+        for label, rows in (("tiled", tile_rows), ("whole page", page.shape[0])):
+            layout, analyzed, total, peak, crop_bytes = measure(page, rows)
+            logger.info(f"  {label:10s}: analyze {analyzed * 1000:7.1f} ms, with crops {total * 1000:7.1f} ms, "
+                        f"peak extra memory {peak / 1e6:6.1f} MB (largest crop {crop_bytes / 1e6:.1f} MB)")
+        logger.info(f"  skew {layout['skew_degrees']} deg, staff spacing {layout['staff_spacing']:.1f} px, "
+                    f"systems {[len(system['staves']) for system in layout['systems']]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark NumPy OMR page preprocessing.")
+    parser.add_argument("--dpi", type=int, nargs="+", default=[300, 600])
+    parser.add_argument("--angle", type=float, default=1.2)
+    parser.add_argument("--tile-rows", type=int, default=OMR_TILE_ROWS)
+    args = parser.parse_args()
+
+    run_benchmark(args.dpi, args.angle, args.tile_rows)
@@ -0,0 +1,82 @@
+# backend/benchmarks/bench_packed_translation.py
+#
+# Translate the many tiny text units of a typical score (one-word lyrics,
+# directions such as "rit." and "dolce") against a fake LLM with per-call
+# latency, once with one request per unit and once with packed requests.
+# A configurable fraction of packed segments loses its marker to exercise the
+# per-segment fallback.
+#
+# Usage (from the repository root):
+#   python -m backend.benchmarks.bench_packed_translation --units 60 --latency 0.3 --drop-rate 0.05
+
+import argparse
+import logging
+import random
+import re
+import time
+
+from backend.app.services.chunk_translation import translate_chunks
+from backend.app.services.packed_translation import translate_packed
+from backend.app.services.token_chunker import token_counter
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DIRECTIONS = ["rit.", "dolce", "a tempo", "cresc.", "Andante", "poco a poco", "Allegro", "dim."]
+WORDS = ["love", "night", "star", "heart", "sing", "dream", "light", "sea", "home", "rain"]
+
+
+def make_units(num_units: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [rng.choice(DIRECTIONS) if i % 3 == 0 else " ".join(rng.sample(WORDS, rng.randint(1, 3)))
+            for i in range(num_units)]
+
+
+def run_benchmark(num_units: int, latency: float, drop_rate: float, budget: int, concurrency: int):
+    units = make_units(num_units)
+    rng = random.Random(1)
+    calls = 0
+
+    def one(text):
+        nonlocal calls
+        calls += 1
+        time.sleep(latency)
+        return f"Hark, {text}!"
+
+    def pack(text):
+        nonlocal calls
+        calls += 1
+        time.sleep(latency * 1.5) # longer replies
+        out = []
+        for number, segment in re.findall(r"<<<(\d+)>>>\n(.*?)(?=\n<<<|\Z)", text, re.S):
+            if rng.random() >= drop_rate:
+                out += [f"<<<{number}>>>", f"Hark, {segment}!"]
+        return "\n".join(out)
+
+    start = time.perf_counter()
+    translate_chunks(units, one, max_concurrency=concurrency)
+    unpacked_calls, unpacked_time = calls, time.perf_counter() - start
+
+    calls = 0
+    start = time.perf_counter()
+    results, stats = translate_packed(units, pack, one, max_tokens=budget, count=token_counter("gpt-3.5-turbo"),
+                                      max_concurrency=concurrency)
+    packed_time = time.perf_counter() - start
+    assert [r["translated_chunk"] for r in results] == [f"Hark, {u}!" for u in units]
+
+    logger.info(f"units={num_units} latency={latency}s drop_rate={drop_rate} budget={budget} tokens")
+    logger.info(f"one request per unit: {unpacked_calls} calls, {unpacked_time:.2f} s")
+    logger.info(f"packed:               {calls} calls ({stats['packed_calls']} packed, "
+                f"{stats['single_calls']} single, {stats['fallback_units']} fallback units), {packed_time:.2f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark packed multi-segment translation requests.")
+    parser.add_argument("--units", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.3, help="Simulated LLM latency per call (seconds).")
+    parser.add_argument("--drop-rate", type=float, default=0.05, help="Fraction of packed segments whose marker is lost.")
+    parser.add_argument("--budget", type=int, default=2457, help="Token budget per request.")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    run_benchmark(args.units, args.latency, args.drop_rate, args.budget, args.concurrency)
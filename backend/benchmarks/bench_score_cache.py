@@ -0,0 +1,75 @@
+# backend/benchmarks/bench_score_cache.py
+#
+# Compare music21 converter.parse() time against a ScoreCache load for
+# synthetic MusicXML scores of increasing size.
+#
+# Usage (from the repository root):
+#   python -m backend.benchmarks.bench_score_cache --measures 50 200 800 --parts 4
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from music21 import converter, meter, note, stream
+
+from backend.app.services.score_cache import ScoreCache
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def build_score(num_measures: int, num_parts: int) -> stream.Score:
+    score = stream.Score()
+    for p in range(num_parts):
+        part = stream.Part()
+        for m in range(num_measures):
+            measure = stream.Measure(number=m + 1)
+            if m == 0:
+                measure.append(meter.TimeSignature("4/4"))
+            for beat in range(4):
+                n = note.Note(48 + p * 7 + (m + beat) % 12, quarterLength=1.0)
+                if p == 0:
+                    n.lyric = f"la{beat}"
+                measure.append(n)
+            part.append(measure)
+        score.insert(0, part)
+    return score
+
+
+def time_best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(measure_counts, num_parts: int, repeat: int):
+    with tempfile.TemporaryDirectory() as work_dir:
+        cache = ScoreCache(cache_dir=os.path.join(work_dir, "cache"), max_bytes=1 << 34)
+        logger.info(f"{'measures':>9} {'notes':>8} {'parse (s)':>10} {'cache load (s)':>15} {'speedup':>8}")
+        for num_measures in measure_counts:
+            path = os.path.join(work_dir, f"score_{num_measures}.musicxml")
+            build_score(num_measures, num_parts).write("musicxml", fp=path)
+
+            key = cache.key_for(path)
+            parsed = converter.parse(path, forceSource=True)
+            cache.store(key, parsed)
+
+            parse_time = time_best_of(lambda: converter.parse(path, forceSource=True), repeat)
+            load_time = time_best_of(lambda: cache.load(cache.key_for(path)), repeat)
+            num_notes = num_measures * num_parts * 4
+            logger.info(f"{num_measures:>9} {num_notes:>8} {parse_time:>10.3f} {load_time:>15.3f} {parse_time / load_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the parsed-score cache against converter.parse().")
+    parser.add_argument("--measures", type=int, nargs="+", default=[50, 200, 800], help="Score sizes in measures.")
+    parser.add_argument("--parts", type=int, default=4, help="Number of parts per score.")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N repetitions per measurement.")
+    args = parser.parse_args()
+
+    run_benchmark(args.measures, args.parts, args.repeat)
@@ -0,0 +1,99 @@
+# backend/benchmarks/bench_spot_interruption.py
+#
+# Recovery latency after a spot interruption notice.
+# Node A works through a task of --steps steps (--step-seconds each) and gets
+# a notice (local file stand-in for the metadata endpoint) halfway through.
+# The watcher checkpoints the completed steps and resets the message
+# visibility to 0; node B polls the queue and resumes from the checkpoint.
+#
+# Reported: seconds from the notice until node B holds the message, and the
+# steps node B had to re-run. Without the watcher the message only reappears
+# when the visibility timeout expires, and node B redoes every step; that
+# baseline is computed rather than waited for.
+#
+# Usage (from the repository root):
+#   python -m backend.benchmarks.bench_spot_interruption --steps 6 --step-seconds 0.5 --poll 0.5
+
+import argparse
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from backend.app.services.spot_interruption import (
+    FileNoticeSource, InFlightTasks, LocalCheckpointStore, SpotInterruptionWatcher,
+)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class VisibilitySQS:
+    """One-message queue with visibility timeouts measured on the wall clock."""
+    def __init__(self, visibility_timeout: float):
+        self.visibility_timeout = visibility_timeout
+        self.visible_at = 0.0
+        self.receipts = 0
+        self.lock = threading.Lock()
+
+    def receive(self):
+        with self.lock:
+            if time.monotonic() < self.visible_at:
+                return None
+            self.visible_at = time.monotonic() + self.visibility_timeout
+            self.receipts += 1
+            return f"rh-{self.receipts}"
+
+    def change_message_visibility(self, QueueUrl, ReceiptHandle, VisibilityTimeout):
+        with self.lock:
+            self.visible_at = time.monotonic() + VisibilityTimeout
+
+
+def run(steps: int, step_seconds: float, poll: float, visibility_timeout: float):
+    workdir = tempfile.mkdtemp(prefix="bench_spot_")
+    notice_path = os.path.join(workdir, "notice")
+    sqs = VisibilitySQS(visibility_timeout)
+    checkpoints, tasks = LocalCheckpointStore(os.path.join(workdir, "checkpoints")), InFlightTasks()
+    watcher = SpotInterruptionWatcher(FileNoticeSource(notice_path), poll_seconds=poll)
+    watcher.on_notice(lambda notice: tasks.requeue_all(sqs, checkpoints))
+    watcher.start()
+
+    record = tasks.begin("q-standard", sqs.receive(), "bench-task")
+
+    def node_a():
+        for step in range(steps):
+            if watcher.interrupted.is_set():
+                return
+            time.sleep(step_seconds)
+            record["completed_steps"][f"step-{step}"] = {"output": step}
+
+    worker = threading.Thread(target=node_a)
+    worker.start()
+    notice_after = step_seconds * steps / 2 + step_seconds / 4
+    time.sleep(notice_after)
+    noticed = time.monotonic()
+    with open(notice_path, "w") as f:
+        f.write('{"action": "terminate"}')
+
+    while sqs.receive() is None: # node B polling
+        time.sleep(0.01)
+    recovered = time.monotonic() - noticed
+    worker.join()
+    watcher.stop()
+    restored = len(checkpoints.load("bench-task"))
+    logger.info(f"Notice {notice_after:.2f}s into a {steps}-step task ({step_seconds}s per step), watcher poll {poll}s")
+    logger.info(f"With watcher:    message back after {recovered:.2f}s, node B re-runs {steps - restored} steps "
+                f"({restored} restored from checkpoint)")
+    logger.info(f"Without watcher: message back after ~{visibility_timeout - notice_after:.0f}s "
+                f"(visibility timeout {visibility_timeout:.0f}s), node B re-runs {steps} steps")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark spot interruption draining and requeue.")
+    parser.add_argument("--steps", type=int, default=6)
+    parser.add_argument("--step-seconds", type=float, default=0.5)
+    parser.add_argument("--poll", type=float, default=0.5, help="Notice polling interval (production: 5s).")
+    parser.add_argument("--visibility-timeout", type=float, default=300)
+    args = parser.parse_args()
+    run(args.steps, args.step_seconds, args.poll, args.visibility_timeout)
@@ -0,0 +1,88 @@
+# backend/benchmarks/bench_subprocess_runner.py
+#
+# Compare subprocess.run(capture_output=True) (the old run_command) with the
+# worker's SubprocessRunner:
+#   - a verbose tool writing --mb megabytes to stdout: peak parent memory
+#     (tracemalloc) and wall time
+#   - a hung tool that forks a child and never exits: time until the worker
+#     slot is free again (the old path has no timeout; it is run here with a
+#     cap only so the benchmark ends)
+#   - --runs short commands: per-call overhead
+#
+# Usage (from the repository root):
+#   python -m backend.benchmarks.bench_subprocess_runner --mb 200 --runs 50
+
+import argparse
+import logging
+import os
+import signal
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from backend.app.services.subprocess_runner import SubprocessRunner
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+HUNG_TOOL = ["sh", "-c", "sleep 3600 & sleep 3600"]
+
+
+def verbose_tool(mb: int):
+    return [sys.executable, "-c",
+            f"import sys\nline = 'x' * 1023 + '\\n'\nfor _ in range({mb} * 1024): sys.stdout.write(line)"]
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def run_benchmark(mb: int, runs: int, hang_cap: float, timeout: float):
+    runner = SubprocessRunner(kill_grace=1.0)
+
+    elapsed, peak = measure(lambda: subprocess.run(verbose_tool(mb), capture_output=True, text=True))
+    logger.info(f"verbose {mb} MB, subprocess.run : {elapsed:6.2f} s, peak memory {peak / 1e6:8.1f} MB")
+    elapsed, peak = measure(lambda: runner.run(verbose_tool(mb)))
+    logger.info(f"verbose {mb} MB, runner         : {elapsed:6.2f} s, peak memory {peak / 1e6:8.1f} MB")
+
+    start = time.perf_counter()
+    process = subprocess.Popen(HUNG_TOOL, stdout=subprocess.PIPE, stderr=subprocess.PIPE, start_new_session=True)
+    try:
+        process.communicate(timeout=hang_cap)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL) # clean up the benchmark's own leftovers
+        process.communicate()
+    logger.info(f"hung tool, subprocess.run : slot blocked {time.perf_counter() - start:6.2f} s "
+                f"(no timeout in the old run_command; capped at {hang_cap} s here)")
+    result = runner.run(HUNG_TOOL, timeout=timeout)
+    logger.info(f"hung tool, runner         : slot freed after {result['wall_seconds']:6.2f} s "
+                f"(timeout {timeout} s, timed_out={result['timed_out']})")
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        subprocess.run(["true"], capture_output=True)
+    base = (time.perf_counter() - start) / runs
+    start = time.perf_counter()
+    for _ in range(runs):
+        runner.run(["true"])
+    ours = (time.perf_counter() - start) / runs
+    logger.info(f"short command overhead: subprocess.run {base * 1000:.2f} ms, runner {ours * 1000:.2f} ms per call")
+    logger.info(f"runner stats: {runner.snapshot()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the bounded subprocess runner.")
+    parser.add_argument("--mb", type=int, default=200, help="Megabytes written by the verbose tool.")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--hang-cap", type=float, default=5.0)
+    parser.add_argument("--timeout", type=float, default=2.0)
+    args = parser.parse_args()
+
+    run_benchmark(args.mb, args.runs, args.hang_cap, args.timeout)
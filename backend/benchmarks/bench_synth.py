@@ -0,0 +1,60 @@
+# backend/benchmarks/bench_synth.py
+#
+# Measure the real-time factor (audio seconds rendered per wall-clock second)
+# of the block-based NumPy synthesizer for each available output format, and
+# the peak size of the rendering buffers.
+#
+# Usage (from the repository root):
+#   python -m backend.benchmarks.bench_synth --notes 2000 --parts 4
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+
+import numpy as np
+
+from backend.app.services import synth
+from backend.app.services.score_ir import NOTE_DTYPE, ScoreIR
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def build_ir(num_notes: int, num_parts: int, seed: int = 0) -> ScoreIR:
+    rng = random.Random(seed)
+    rows = []
+    for part in range(num_parts):
+        onset = 0.0
+        for _ in range(num_notes // num_parts):
+            duration = rng.choice([0.25, 0.5, 1.0])
+            rows.append((onset, duration, rng.randint(40, 84), rng.randint(60, 110), part, -1))
+            onset += duration
+    notes = np.array(rows, dtype=NOTE_DTYPE)
+    notes.sort(order=["onset", "part", "pitch"])
+    return ScoreIR(notes)
+
+
+def run_benchmark(num_notes: int, num_parts: int, formats):
+    ir = build_ir(num_notes, num_parts)
+    block_mb = synth.MAX_VOICES_PER_PASS * synth.BLOCK_FRAMES * 8 / 1e6
+    logger.info(f"{num_notes} notes, {num_parts} parts; per-pass buffer ~{block_mb:.1f} MB")
+    logger.info(f"{'format':>7} {'audio (s)':>10} {'render (s)':>11} {'RTF':>8} {'size (MB)':>10}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for output_format in formats:
+            path = os.path.join(tmp_dir, f"out.{output_format}")
+            with open(path, "wb") as sink:
+                stats = synth.render_audio(ir, output_format, sink)
+            logger.info(f"{output_format:>7} {stats['duration_seconds']:>10.1f} {stats['render_seconds']:>11.2f} "
+                        f"{stats['realtime_factor']:>7.1f}x {os.path.getsize(path) / 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the NumPy synthesis engine.")
+    parser.add_argument("--notes", type=int, default=2000, help="Total number of notes.")
+    parser.add_argument("--parts", type=int, default=4, help="Number of simultaneous parts.")
+    parser.add_argument("--formats", nargs="+", default=None, help="Output formats (default: all available).")
+    args = parser.parse_args()
+
+    run_benchmark(args.notes, args.parts, args.formats or synth.available_formats())
@@ -0,0 +1,109 @@
+# backend/benchmarks/bench_task_queues.py
+#
+# Discrete-event simulation of the worker fleet draining a large bulk
+# backlog while interactive uploads keep arriving. Compares:
+#   - single queue: every task goes to one SQS queue (the old SQS_QUEUE_URL)
+#   - priority queues: interactive / standard / bulk queues polled by
+#     WeightedQueuePoller (weighted fairness + prefetch preemption)
+# Reports interactive and bulk latency (arrival to completion, simulated
+# seconds) and bulk throughput. SQS is an in-memory fake; no AWS calls.
+#
+# Usage (from the repository root):
+#   python -m backend.benchmarks.bench_task_queues --bulk 500 --workers 4 --interactive-every 15
+
+import argparse
+import logging
+import random
+from collections import deque
+
+import numpy as np
+
+from backend.app.services.task_queues import WeightedQueuePoller
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SERVICE_SECONDS = {"interactive": 3.0, "standard": 10.0, "bulk": 30.0}
+
+
+class SimulatedSQS:
+    def __init__(self, urls):
+        self.queues = {url: deque() for url in set(urls)}
+        self.in_flight = {}
+
+    def receive_message(self, QueueUrl, MaxNumberOfMessages, WaitTimeSeconds, VisibilityTimeout):
+        queue = self.queues[QueueUrl]
+        messages = [queue.popleft() for _ in range(min(MaxNumberOfMessages, len(queue)))]
+        for message in messages:
+            self.in_flight[message["ReceiptHandle"]] = (QueueUrl, message)
+        return {"Messages": messages} if messages else {}
+
+    def change_message_visibility(self, QueueUrl, ReceiptHandle, VisibilityTimeout):
+        url, message = self.in_flight.pop(ReceiptHandle)
+        self.queues[url].appendleft(message)
+
+
+def simulate(urls, bulk: int, workers: int, interactive_every: float, duration: float, prefetch: int, seed: int):
+    rng = random.Random(seed)
+    sqs = SimulatedSQS(urls.values())
+    arrivals = [(0.0, "bulk", i) for i in range(bulk)]
+    t, i = 0.0, 0
+    while t < duration:
+        t += rng.expovariate(1 / interactive_every)
+        arrivals.append((t, "interactive", i))
+        i += 1
+    arrivals.sort()
+    pending = deque(arrivals)
+
+    pollers = [WeightedQueuePoller(sqs, urls, prefetch=prefetch) for _ in range(workers)]
+    free_at = [0.0] * workers
+    latencies = {"interactive": [], "bulk": []}
+    finished = 0.0
+    while True:
+        worker = min(range(workers), key=free_at.__getitem__)
+        now = free_at[worker]
+        while pending and pending[0][0] <= now:
+            arrived, kind, index = pending.popleft()
+            sqs.queues[urls[kind]].append({"Body": kind, "ReceiptHandle": f"{kind}-{index}", "arrived": arrived})
+        polled = pollers[worker].next_message()
+        if polled is None:
+            # idle until the next arrival; a worker with nothing left stops (others may still hold prefetch)
+            free_at[worker] = pending[0][0] if pending else float("inf")
+            if not pending and all(t == float("inf") for t in free_at):
+                break
+            continue
+        kind = polled["message"]["Body"]
+        free_at[worker] = now + SERVICE_SECONDS[kind]
+        finished = max(finished, free_at[worker])
+        latencies[kind].append(free_at[worker] - polled["message"]["arrived"])
+    return latencies, finished
+
+
+def report(name, latencies, makespan):
+    interactive = np.array(latencies["interactive"])
+    bulk = np.array(latencies["bulk"])
+    logger.info(f"{name:15s}: interactive n={len(interactive)} p50 {np.percentile(interactive, 50):7.1f} s "
+                f"p95 {np.percentile(interactive, 95):7.1f} s max {interactive.max():7.1f} s | "
+                f"bulk done {len(bulk)}, last at {makespan:7.1f} s")
+
+
+def run_benchmark(bulk: int, workers: int, interactive_every: float, prefetch: int, seed: int):
+    duration = bulk * SERVICE_SECONDS["bulk"] / workers # interactive traffic while the backlog drains
+    logger.info(f"bulk backlog {bulk}, workers {workers}, interactive every {interactive_every} s "
+                f"for {duration:.0f} s, prefetch {prefetch}")
+    single = {"interactive": "q", "standard": "q", "bulk": "q"}
+    report("single queue", *simulate(single, bulk, workers, interactive_every, duration, prefetch, seed))
+    split = {"interactive": "q-interactive", "standard": "q-standard", "bulk": "q-bulk"}
+    report("priority queues", *simulate(split, bulk, workers, interactive_every, duration, prefetch, seed))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate interactive latency under a bulk backlog.")
+    parser.add_argument("--bulk", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--interactive-every", type=float, default=15.0, help="Mean seconds between uploads.")
+    parser.add_argument("--prefetch", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    run_benchmark(args.bulk, args.workers, args.interactive_every, args.prefetch, args.seed)
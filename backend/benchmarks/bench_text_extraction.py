@@ -0,0 +1,93 @@
+# backend/benchmarks/bench_text_extraction.py
+#
+# Compare the legacy extract_text_from_score loop (flat.elements x per-class
+# dynamic getattr lookups) against the single-pass extractor on lyric-heavy
+# scores. The legacy lookup is emulated against the music21 submodules,
+# because getattr(music21, 'Lyric') itself raises AttributeError.
+#
+# Usage (from the repository root):
+#   python -m backend.benchmarks.bench_text_extraction --notes 5000 20000
+
+import argparse
+import importlib
+import logging
+import random
+import time
+
+from music21 import expressions, note, stream
+
+from backend.app.services.text_extraction import TEXT_CLASS_NAMES, _SEARCH_MODULES, extract_text
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SYLLABLES = ["la", "ri", "do", "mi", "so", "ne", "ta", "ko"]
+
+
+def build_lyric_score(num_notes: int, num_parts: int = 4, seed: int = 0) -> stream.Score:
+    rng = random.Random(seed)
+    score = stream.Score()
+    for _ in range(num_parts):
+        part = stream.Part()
+        for i in range(num_notes // num_parts):
+            n = note.Note(rng.randint(55, 75), quarterLength=0.5)
+            n.lyric = rng.choice(SYLLABLES)
+            part.append(n)
+            if i % 32 == 0:
+                part.append(expressions.TextExpression("espressivo"))
+        score.insert(0, part)
+    return score
+
+
+def legacy_lookup(cls_name):
+    # Per-call dynamic lookup, as in the original loop
+    for module_name in _SEARCH_MODULES:
+        cls = getattr(importlib.import_module(f"music21.{module_name}"), cls_name, None)
+        if cls is not None:
+            return cls
+    return None
+
+
+def legacy_extract(score):
+    text_elements_with_info = []
+    for element in score.flatten().elements:
+        for cls_name in TEXT_CLASS_NAMES:
+            cls = legacy_lookup(cls_name)
+            if cls is not None and issubclass(type(element), cls):
+                text_content = getattr(element, 'text', None) or getattr(element, 'content', None)
+                if isinstance(text_content, str) and text_content.strip():
+                    text_elements_with_info.append({"type": cls_name, "content": text_content.strip(),
+                                                    "offset": element.offset})
+                break
+        # Lyrics hang off notes rather than being flat elements
+        for lyric in getattr(element, 'lyrics', []):
+            if lyric.text and lyric.text.strip():
+                text_elements_with_info.append({"type": "Lyric", "content": lyric.text.strip(),
+                                                "offset": element.offset})
+    return text_elements_with_info
+
+
+def run_benchmark(note_counts):
+    logger.info(f"{'notes':>8} {'legacy (s)':>11} {'single pass (s)':>16} {'speedup':>9}")
+    for num_notes in note_counts:
+        score = build_lyric_score(num_notes)
+        score.flatten() # build the flat cache once so both sides start equal
+
+        start = time.perf_counter()
+        legacy = legacy_extract(score)
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, elements = extract_text(score)
+        new_time = time.perf_counter() - start
+
+        assert len(elements) == len(legacy)
+        logger.info(f"{num_notes:>8} {legacy_time:>11.3f} {new_time:>16.3f} {legacy_time / new_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark single-pass score text extraction.")
+    parser.add_argument("--notes", type=int, nargs="+", default=[5000, 20000], help="Number of lyric notes per score.")
+    args = parser.parse_args()
+
+    run_benchmark(args.notes)
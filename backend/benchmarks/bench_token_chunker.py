@@ -0,0 +1,54 @@
+# backend/benchmarks/bench_token_chunker.py
+#
+# Compare the legacy 1500-character chunking with token-aware chunking for
+# English, Korean and Japanese lyrics: chunks per task and the largest chunk
+# in model tokens (tiktoken when installed, otherwise the CJK-aware estimate).
+#
+# Usage (from the repository root):
+#   python -m backend.benchmarks.bench_token_chunker --lines 400 --model gpt-3.5-turbo
+
+import argparse
+import logging
+import time
+
+from backend.app.services.token_chunker import (
+    _tiktoken_encoding, chunk_token_budget, split_by_tokens, token_counter,
+)
+
+from .bench_lyric_dedup import split_lines
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SAMPLES = {
+    "english": "Shall I compare thee to a summer's day, my love, line {i}",
+    "korean": "그대를 여름날에 비할 수 있을까요, 나의 사랑이여 {i}번째 줄",
+    "japanese": "君を夏の日にたとえようか、愛しい人よ、第{i}行",
+}
+
+
+def run_benchmark(num_lines: int, model: str, chunk_chars: int):
+    count = token_counter(model)
+    budget = chunk_token_budget(model)
+    tokenizer = "tiktoken" if _tiktoken_encoding(model) is not None else "estimate"
+    logger.info(f"model={model} tokenizer={tokenizer} token budget={budget} legacy chunk={chunk_chars} chars")
+
+    for language, template in SAMPLES.items():
+        text = "\n".join(template.format(i=i) + ("\n" if i % 8 == 7 else "") for i in range(num_lines))
+        by_chars = split_lines(text, chunk_chars)
+        start = time.perf_counter()
+        by_tokens = split_by_tokens(text, budget, count)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"{language:9s} {count(text):6d} tokens | chars: {len(by_chars):3d} chunks, "
+                    f"max {max(count(c) for c in by_chars):5d} tokens | tokens: {len(by_tokens):3d} chunks, "
+                    f"max {max(count(c) for c in by_tokens):5d} tokens ({elapsed_ms:.1f} ms)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark token-aware chunking.")
+    parser.add_argument("--lines", type=int, default=400)
+    parser.add_argument("--model", default="gpt-3.5-turbo")
+    parser.add_argument("--chunk-chars", type=int, default=1500, help="Legacy character chunk size.")
+    args = parser.parse_args()
+
+    run_benchmark(args.lines, args.model, args.chunk_chars)
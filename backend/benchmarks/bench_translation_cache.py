@@ -0,0 +1,94 @@
+# backend/benchmarks/bench_translation_cache.py
+#
+# Simulate a stream of translation tasks whose texts share common lyrics,
+# tempo/expression markings and refrains. Counts LLM calls and wall time with
+# and without the translation cache, and reports the cache hit rate per tier
+# (a second pass with a fresh in-process tier shows the SQLite tier alone).
+#
+# Usage (from the repository root):
+#   python -m backend.benchmarks.bench_translation_cache --tasks 40 --latency 0.05
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+
+from backend.app.services.translation_cache import SQLiteTier, TranslationCache
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+TEMPLATE = "Translate {original_text} ({original_language}) in the style of Shakespeare."
+COMMON = ["Andante con moto", "Allegro ma non troppo", "Amen", "dolce e cantabile",
+          "Kyrie eleison", "Gloria in excelsis Deo", "Ave Maria, gratia plena",
+          "Silent night, holy night\nAll is calm, all is bright"]
+
+
+def make_tasks(num_tasks: int, chunks_per_task: int, unique_ratio: float, seed: int = 0):
+    rng = random.Random(seed)
+    tasks = []
+    for t in range(num_tasks):
+        chunks = []
+        for c in range(chunks_per_task):
+            if rng.random() < unique_ratio:
+                chunks.append(f"task {t} verse {c}: " + " ".join(rng.choice(COMMON) for _ in range(3)))
+            else:
+                chunks.append(rng.choice(COMMON))
+        tasks.append(chunks)
+    return tasks
+
+
+def run_pass(tasks, cache, latency: float):
+    calls = 0
+
+    def llm(text):
+        nonlocal calls
+        calls += 1
+        time.sleep(latency)
+        return f"Hark! {text}"
+
+    start = time.perf_counter()
+    for chunks in tasks:
+        for chunk in chunks:
+            if cache is None:
+                llm(chunk)
+            else:
+                cache.get_or_translate(chunk, "en", "gpt-3.5-turbo", TEMPLATE, llm)
+    return calls, time.perf_counter() - start
+
+
+def run_benchmark(num_tasks: int, chunks_per_task: int, unique_ratio: float, latency: float):
+    tasks = make_tasks(num_tasks, chunks_per_task, unique_ratio)
+    total = num_tasks * chunks_per_task
+
+    calls, elapsed = run_pass(tasks, None, latency)
+    logger.info(f"tasks={num_tasks} chunks={total} unique_ratio={unique_ratio} latency={latency}s")
+    logger.info(f"no cache:    {calls} LLM calls, {elapsed:.2f} s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "translation_cache.sqlite3")
+        cache = TranslationCache(persistent=SQLiteTier(path))
+        calls, cached_elapsed = run_pass(tasks, cache, latency)
+        stats = cache.snapshot()
+        logger.info(f"cold cache:  {calls} LLM calls, {cached_elapsed:.2f} s ({elapsed / cached_elapsed:.1f}x), "
+                    f"hit rate {stats['memory_hits'] / total:.0%}")
+
+        # New worker process: empty memory tier, shared SQLite file
+        restarted = TranslationCache(persistent=SQLiteTier(path))
+        calls, warm_elapsed = run_pass(tasks, restarted, latency)
+        stats = restarted.snapshot()
+        logger.info(f"restarted:   {calls} LLM calls, {warm_elapsed:.3f} s, "
+                    f"sqlite hits {stats['persistent_hits']}, memory hits {stats['memory_hits']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the translation cache.")
+    parser.add_argument("--tasks", type=int, default=40)
+    parser.add_argument("--chunks-per-task", type=int, default=10)
+    parser.add_argument("--unique-ratio", type=float, default=0.3, help="Fraction of chunks unique to one task.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated LLM latency per call (seconds).")
+    args = parser.parse_args()
+
+    run_benchmark(args.tasks, args.chunks_per_task, args.unique_ratio, args.latency)
@@ -0,0 +1,118 @@
+# backend/benchmarks/bench_worker_startup.py
+#
+# Worker start-up cost per import configuration. Each configuration is
+# imported in a fresh interpreter, which reports:
+#   - import time (wall seconds)
+#   - peak RSS (ru_maxrss)
+#   - modules that are not installed here, which are skipped and listed
+#   - heavy libraries loaded by the end of the run
+#
+# backend/worker.py itself is not importable (it is a concatenation of step
+# drafts), so the worker is measured through backend.app.task_pipeline, the
+# importable process_task with the same service imports, plus the two
+# services only the queue loop uses (task_queues, subprocess_runner).
+#
+# Configurations:
+#   eager           the libraries worker.py used to import at module top,
+#                   plus the worker modules
+#   lazy            only the worker modules (lazy_imports)
+#   lazy+midi       lazy, then one MIDI task through process_task
+#                   (extract, text, harmony), which exercises the
+#                   lazy_import / instance_of paths
+#   lazy+prewarm    lazy with WORKER_PREWARM=all
+#
+# Usage (from the repository root):
+#   python -m backend.benchmarks.bench_worker_startup --repeat 3
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+
+from backend.app.services.lazy_imports import prewarm_modules
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# 워커 시작 시 임포트되는 모듈 (task_pipeline이 모든 단계 서비스를 임포트)
+WORKER_MODULES = ["backend.app.task_pipeline", "backend.app.services.task_queues",
+                  "backend.app.services.subprocess_runner"]
+# 이전 worker.py가 모듈 맨 위에서 임포트하던 라이브러리
+EAGER_LIBRARIES = [
+    "pdfminer.high_level", "langchain_openai", "langchain.prompts", "langchain.chains",
+    "langchain_community.document_loaders", "langchain.text_splitter", "music21", "mido", "langdetect",
+]
+HEAVY_LIBRARIES = ["music21", "mido", "langchain", "langchain_openai", "pdfminer", "langdetect"]
+
+CONFIGURATIONS = {
+    "eager": (EAGER_LIBRARIES + WORKER_MODULES, False),
+    "lazy": (WORKER_MODULES, False),
+    "lazy+midi": (WORKER_MODULES, True),
+    "lazy+prewarm": (WORKER_MODULES + prewarm_modules("all"), False),
+}
+
+CHILD = """
+import contextlib, importlib, json, resource, sys, time
+modules, midi_path = sys.argv[2:], sys.argv[1]
+missing = []
+start = time.perf_counter()
+for name in modules:
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        missing.append(name)
+if midi_path:
+    from backend.app.task_pipeline import process_task
+    with contextlib.redirect_stdout(sys.stderr):
+        result = process_task({"task_id": "bench", "file_location": {"type": "onprem", "key": midi_path},
+                               "processing_steps": [{"type": "extract_music_data"}, {"type": "extract_text_from_score"}],
+                               "analysis_tasks": [{"type": "analyze_harmony"}]})
+    assert result["status"] == "completed", result
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                  "missing": missing, "loaded": [name for name in %r if name in sys.modules]}))
+""" % HEAVY_LIBRARIES
+
+
+def write_midi(path: str, notes: int = 500):
+    import mido
+    midi = mido.MidiFile()
+    track = mido.MidiTrack()
+    midi.tracks.append(track)
+    for i in range(notes):
+        if i % 8 == 0:
+            track.append(mido.MetaMessage("lyrics", text=f"la{i // 8}"))
+        track.append(mido.Message("note_on", note=60 + i % 12, velocity=64, time=0))
+        track.append(mido.Message("note_off", note=60 + i % 12, velocity=0, time=240))
+    midi.save(path)
+
+
+def measure(modules: list, midi_path: str = "") -> dict:
+    output = subprocess.run([sys.executable, "-c", CHILD, midi_path, *modules], capture_output=True, text=True,
+                            check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def run(repeat: int):
+    bare = measure([])
+    logger.info(f"Bare interpreter: {bare['max_rss_kb'] / 1024:.1f} MB RSS")
+    midi_path = os.path.join(tempfile.mkdtemp(prefix="bench_startup_"), "task.mid")
+    write_midi(midi_path)
+    for name, (modules, run_task) in CONFIGURATIONS.items():
+        runs = [measure(modules, midi_path if run_task else "") for _ in range(repeat)]
+        seconds = sorted(r["seconds"] for r in runs)[len(runs) // 2]
+        rss = max(r["max_rss_kb"] for r in runs) / 1024
+        missing = runs[0]["missing"]
+        logger.info(f"{name:13s} import {seconds:6.3f}s  peak RSS {rss:6.1f} MB"
+                    f"  loaded [{', '.join(runs[0]['loaded'])}]"
+                    + (f"  (not installed, skipped: {', '.join(missing)})" if missing else ""))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark worker start-up import time and memory.")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per configuration (median time).")
+    args = parser.parse_args()
+    run(args.repeat)
@@ -0,0 +1,172 @@
+# backend/test/unit/services/test_autoscaler.py
+
+import random
+from datetime import datetime, timezone
+
+from backend.app.services.autoscaler import (
+    AutoScalingGroupProvider, AutoscalingController, SimulatedCapacityProvider, SimulatedClock, SqsBacklogSource,
+    simulate,
+)
+
+
+class ScriptedSource:
+    """Returns pre-built backlog samples, advancing the shared clock by `interval` each time."""
+    def __init__(self, clock, interval=30):
+        self.clock = clock
+        self.interval = interval
+        self.next = {"visible": 0, "in_flight": 0, "oldest_age_seconds": 0.0, "completed": 0}
+
+    def sample(self):
+        self.clock.now += self.interval
+        return dict(self.next, time=self.clock.now)
+
+
+def make_controller(initial=0, **options):
+    clock = SimulatedClock()
+    provider = SimulatedCapacityProvider(initial, boot_seconds=0, clock=clock)
+    source = ScriptedSource(clock)
+    options.setdefault("initial_throughput", 1 / 60)
+    return AutoscalingController(provider, source, **options), provider, source
+
+
+def test_scales_up_immediately_when_backlog_appears():
+    controller, provider, source = make_controller(drain_seconds=300, max_workers=50)
+    source.next.update(visible=50)
+    decision = controller.step()
+    # 50 tasks at 1/60 per worker drained in 300s -> 10 workers
+    assert decision["action"] == "scale_up"
+    assert decision["desired"] == 10
+    assert provider.capacity()["desired"] == 10
+
+
+def test_scale_up_cooldown_holds_second_increase():
+    controller, provider, source = make_controller(scale_up_cooldown=120, max_workers=50)
+    source.next.update(visible=20)
+    assert controller.step()["action"] == "scale_up"
+    source.next.update(visible=200)
+    decision = controller.step()
+    assert decision["action"] == "hold"
+    assert "scale-up cooldown" in decision["reason"]
+    for _ in range(3):
+        decision = controller.step()
+    assert decision["action"] == "scale_up"
+
+
+def test_scales_down_slowly_after_cooldown():
+    controller, provider, source = make_controller(initial=10, scale_down_cooldown=300)
+    decisions = [controller.step() for _ in range(40)] # idle queue, 30s apart
+    downs = [d for d in decisions if d["action"] == "scale_down"]
+    assert downs and provider.capacity()["desired"] == 0
+    assert all(b["time"] - a["time"] >= 300 for a, b in zip(downs, downs[1:]))
+    assert 0 < downs[0]["desired"] < 10 # smoothed target steps down, not straight to zero
+
+
+def test_clamps_to_min_and_max_workers():
+    controller, provider, source = make_controller(min_workers=2, max_workers=5)
+    source.next.update(visible=1000)
+    assert controller.step()["desired"] == 5
+    source.next.update(visible=0)
+    for _ in range(60):
+        controller.step()
+    assert provider.capacity()["desired"] == 2
+
+
+def test_old_message_adds_a_worker():
+    controller, provider, source = make_controller(initial=3, max_age_seconds=600)
+    source.next.update(visible=1, in_flight=3, oldest_age_seconds=900)
+    decision = controller.step()
+    assert decision["desired"] == 4
+    assert "oldest message" in decision["reason"]
+
+
+def test_step_load_tracks_demand_without_overprovisioning():
+    rng = random.Random(1)
+    arrivals, t = [], 0.0
+    while t < 5400:
+        t += rng.expovariate(1 / 20 if t < 1800 or t >= 3600 else 1 / 3) # burst: 20 tasks/min
+        arrivals.append(t)
+    result = simulate(arrivals, service_seconds=60, duration=7200, interval=30, boot_seconds=60, max_workers=40)
+    latencies = sorted(result["latencies"])
+    peak = max(d["desired"] for d in result["decisions"])
+    assert result["remaining"] == 0
+    assert latencies[int(len(latencies) * 0.95)] < 300
+    assert 20 <= peak <= 40
+    assert result["worker_seconds"] < peak * 7200 * 0.5 # well under a static fleet sized for the burst
+    assert result["decisions"][-1]["desired"] == 0
+
+
+class FakeAutoScaling:
+    def __init__(self):
+        self.desired = 2
+        self.calls = []
+
+    def describe_auto_scaling_groups(self, AutoScalingGroupNames):
+        instances = [{"LifecycleState": "InService"}, {"LifecycleState": "Pending"}]
+        return {"AutoScalingGroups": [{"DesiredCapacity": self.desired, "Instances": instances}]}
+
+    def set_desired_capacity(self, **kwargs):
+        self.calls.append(kwargs)
+        self.desired = kwargs["DesiredCapacity"]
+
+
+def test_auto_scaling_group_provider():
+    client = FakeAutoScaling()
+    provider = AutoScalingGroupProvider("spot-workers", client=client)
+    assert provider.capacity() == {"desired": 2, "active": 1}
+    provider.set_desired(5)
+    assert client.calls == [{"AutoScalingGroupName": "spot-workers", "DesiredCapacity": 5, "HonorCooldown": False}]
+
+
+class LateCloudWatch:
+    """Per-minute SQS datapoints that only become visible `published_at` seconds into the run."""
+    def __init__(self, clock):
+        self.clock = clock
+        self.points = [] # (metric, minute start, value, published_at)
+
+    def publish(self, metric, minute, value, published_at):
+        self.points.append((metric, minute, value, published_at))
+
+    def get_metric_statistics(self, MetricName, StartTime, EndTime, Period, Statistics, **kwargs):
+        assert Period == 60 and StartTime.second == 0 and EndTime.second == 0
+        latest = {}
+        for metric, minute, value, published_at in self.points:
+            if (metric == MetricName and published_at <= self.clock()
+                    and StartTime.timestamp() <= minute < EndTime.timestamp()):
+                latest[minute] = value # later publications revise the minute
+        return {"Datapoints": [{"Timestamp": datetime.fromtimestamp(minute, timezone.utc), Statistics[0]: value}
+                               for minute, value in latest.items()]}
+
+
+class StaticSQS:
+    def get_queue_attributes(self, QueueUrl, AttributeNames):
+        return {"Attributes": {"ApproximateNumberOfMessages": "7", "ApproximateNumberOfMessagesNotVisible": "2"}}
+
+
+def test_backlog_source_counts_late_and_revised_datapoints_once():
+    clock = SimulatedClock(now=3600.0)
+    cloudwatch = LateCloudWatch(clock)
+    source = SqsBacklogSource(["https://sqs/q-standard"], sqs_client=StaticSQS(), cloudwatch_client=cloudwatch,
+                              clock=clock)
+    # minute 3600 completes 10 tasks: 6 reported 150 s late, the full 10 only 270 s late
+    cloudwatch.publish("NumberOfMessagesDeleted", 3600, 6, published_at=3810)
+    cloudwatch.publish("NumberOfMessagesDeleted", 3600, 10, published_at=3930)
+    # minute 3660 completes 4 tasks, reported 120 s late
+    cloudwatch.publish("NumberOfMessagesDeleted", 3660, 4, published_at=3840)
+    cloudwatch.publish("ApproximateAgeOfOldestMessage", 3600, 200, published_at=3810)
+    cloudwatch.publish("ApproximateAgeOfOldestMessage", 3660, 260, published_at=3840)
+
+    samples = []
+    while clock.now < 4000:
+        samples.append(source.sample())
+        clock.now += 30 # default sampling interval, shorter than the metric period
+
+    assert sum(sample["completed"] for sample in samples) == 14
+    assert max(sample["completed"] for sample in samples) < 14 # spread over the samples that saw each publication
+    assert samples[-1]["oldest_age_seconds"] == 260
+    assert (samples[-1]["visible"], samples[-1]["in_flight"]) == (7, 2)
+
+
+def test_backlog_source_window_is_lagged_and_minute_aligned():
+    source = SqsBacklogSource([], sqs_client=StaticSQS(), cloudwatch_client=LateCloudWatch(SimulatedClock()),
+                              metric_lag=60, metric_lookback=360)
+    assert source.metric_window(3725.0) == (3300.0, 3660.0) # the still-arriving last full minute is skipped
@@ -0,0 +1,57 @@
+# backend/test/unit/services/test_chunk_translation.py
+
+import random
+import threading
+import time
+
+from backend.app.services.chunk_translation import translate_chunks
+
+
+def test_results_keep_chunk_order_with_out_of_order_completion():
+    rng = random.Random(0)
+    chunks = [f"chunk {i}" for i in range(12)]
+
+    def translate(chunk):
+        time.sleep(rng.uniform(0.0, 0.03))
+        return f"  {chunk.upper()}  "
+
+    results = translate_chunks(chunks, translate, max_concurrency=6)
+
+    assert [r["chunk_index"] for r in results] == list(range(12))
+    assert [r["translated_chunk"] for r in results] == [c.upper() for c in chunks]
+    assert all(r["status"] == "success" for r in results)
+
+
+def test_concurrency_is_capped():
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def translate(chunk):
+        with lock:
+            active.append(chunk)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.remove(chunk)
+        return chunk
+
+    start = time.monotonic()
+    translate_chunks([str(i) for i in range(12)], translate, max_concurrency=3)
+    elapsed = time.monotonic() - start
+
+    assert max(peak) == 3
+    assert elapsed < 12 * 0.02 # faster than sequential
+
+
+def test_failed_chunk_is_recorded_in_place():
+    def translate(chunk):
+        if chunk == "bad":
+            raise RuntimeError("provider error")
+        return chunk
+
+    results = translate_chunks(["a", "bad", "c"], translate, max_concurrency=2)
+
+    assert [r["status"] for r in results] == ["success", "failed", "success"]
+    assert results[1]["error"] == "provider error"
+    assert results[1]["translated_chunk"] is None
@@ -0,0 +1,87 @@
+# backend/test/unit/services/test_form_analysis.py
+
+import time
+
+import numpy as np
+
+from backend.app.services import form_analysis
+from backend.app.services.score_ir import NOTE_DTYPE, ScoreIR
+
+THEME_A = ([60, 64, 67, 72], 1.0)      # quarter-note C major arpeggio
+THEME_B = ([66, 69, 73, 61, 63], 0.5)  # eighth-note F# figure
+THEME_C = ([62, 65, 69], 0.25)         # sixteenth-note D minor figure
+
+
+def section_rows(theme, first_measure, num_measures):
+    pitches, step = theme
+    rows = []
+    for m in range(num_measures):
+        beat = 0.0
+        i = 0
+        while beat < 4.0 - 1e-9:
+            measure = first_measure + m
+            rows.append(((measure - 1) * 4 + beat, step, pitches[(i + m) % len(pitches)], 64, 0, measure))
+            beat += step
+            i += 1
+    return rows
+
+
+def build_ir(themes, measures_per_section=8):
+    rows = []
+    for index, theme in enumerate(themes):
+        rows += section_rows(theme, index * measures_per_section + 1, measures_per_section)
+    return ScoreIR(np.array(rows, dtype=NOTE_DTYPE))
+
+
+def test_detects_and_labels_repeated_sections():
+    ir = build_ir([THEME_A, THEME_B, THEME_A, THEME_B, THEME_C])
+
+    sections = form_analysis.analyze_form(ir)
+
+    assert [s["label"] for s in sections] == ["A", "B", "A", "B", "C"]
+    assert [(s["start"], s["end"]) for s in sections] == [(1, 9), (9, 17), (17, 25), (25, 33), (33, 41)]
+
+
+def test_uniform_piece_is_single_section():
+    ir = build_ir([THEME_A, THEME_A, THEME_A])
+
+    assert form_analysis.analyze_form(ir) == [{"label": "A", "start": 1, "end": 25}]
+
+
+def test_measure_numbers_derived_from_time_signature_when_missing():
+    ir = build_ir([THEME_A, THEME_B])
+    ir.notes["measure"] = -1 # e.g. a MIDI source without measure information
+
+    sections = form_analysis.analyze_form(ir)
+
+    assert [(s["label"], s["start"], s["end"]) for s in sections] == [("A", 1, 9), ("B", 9, 17)]
+
+
+def test_banded_similarity_matches_full_matrix_inside_band():
+    _, features = form_analysis.measure_features(build_ir([THEME_A, THEME_B, THEME_C]))
+    full = features @ features.T
+    band = 5
+
+    banded = form_analysis.banded_self_similarity(features, band)
+
+    assert banded.shape == (len(features), 2 * band + 1)
+    for i in range(len(features)):
+        for d in range(-band, band + 1):
+            if 0 <= i + d < len(features):
+                assert np.isclose(banded[i, band + d], full[i, i + d])
+
+
+def test_runs_fast_on_several_hundred_measures():
+    themes = [THEME_A, THEME_B, THEME_C] * 17 # 408 measures
+    ir = build_ir(themes)
+
+    start = time.perf_counter()
+    sections = form_analysis.analyze_form(ir)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5
+    assert {s["label"] for s in sections} == {"A", "B", "C"}
+
+
+def test_empty_score_has_no_sections():
+    assert form_analysis.analyze_form(ScoreIR(np.zeros(0, dtype=NOTE_DTYPE))) == []
@@ -0,0 +1,91 @@
+# backend/test/unit/services/test_harmony_analysis.py
+
+import numpy as np
+import pytest
+
+from backend.app.services import harmony_analysis
+from backend.app.services.score_ir import KEY_SIGNATURE_DTYPE, NOTE_DTYPE, ScoreIR
+
+
+def make_ir(rows, key_sharps=None):
+    notes = np.array([(onset, dur, pitch, 64, 0, 1) for onset, dur, pitch in rows], dtype=NOTE_DTYPE)
+    keys = None
+    if key_sharps is not None:
+        keys = np.array([(0.0, key_sharps)], dtype=KEY_SIGNATURE_DTYPE)
+    return ScoreIR(notes, key_signatures=keys)
+
+
+# --- Simultaneity masks ---
+
+def test_simultaneities_split_at_note_starts_and_ends():
+    # C4 held for 2 beats, E4 and G4 enter on beat 1, G4 ends early; rest, then D4
+    ir = make_ir([(0.0, 2.0, 60), (1.0, 1.0, 64), (1.0, 0.5, 67), (3.0, 1.0, 62)])
+
+    offsets, durations, masks = harmony_analysis.simultaneity_masks(ir.notes)
+
+    assert list(offsets) == [0.0, 1.0, 1.5, 3.0]
+    assert list(durations) == [1.0, 0.5, 0.5, 1.0]
+    assert list(masks) == [1 << 0, (1 << 0) | (1 << 4) | (1 << 7), (1 << 0) | (1 << 4), 1 << 2]
+
+
+def test_analyze_harmony_returns_columnar_labels():
+    ir = make_ir([(0.0, 1.0, 57), (0.0, 1.0, 60), (0.0, 1.0, 64),   # A minor
+                  (1.0, 1.0, 59), (1.0, 1.0, 62), (1.0, 1.0, 65)])  # B diminished
+
+    result = harmony_analysis.analyze_harmony(ir)
+
+    assert result["count"] == 2
+    assert result["roots"] == ["A", "B"]
+    assert result["qualities"] == ["minor", "diminished"]
+
+
+def test_key_signature_selects_spelling():
+    # F#-A#-C# in a six-flat (G- major) key is spelled G- B- D- and still a major triad
+    ir = make_ir([(0.0, 1.0, 66), (0.0, 1.0, 70), (0.0, 1.0, 73)], key_sharps=-6)
+
+    result = harmony_analysis.analyze_harmony(ir)
+
+    assert result["roots"] == ["G-"]
+    assert result["qualities"] == ["major"]
+
+
+def test_spell_pitch_class_default_matches_music21_defaults():
+    names = [harmony_analysis.spell_pitch_class(pc)[2] for pc in range(12)]
+    assert names == ["C", "C#", "D", "E-", "E", "F", "F#", "G", "G#", "A", "B-", "B"]
+
+
+# --- Agreement with music21 ---
+
+def test_lookup_table_matches_music21_chord_labels():
+    music21 = pytest.importorskip("music21")
+    from music21 import chord, pitch
+
+    roots, qualities, names = harmony_analysis.lookup_tables(0)
+    for mask in range(1, 4096, 3):
+        pcs = [pc for pc in range(12) if mask & (1 << pc)]
+        m21_chord = chord.Chord([pitch.Pitch(pc) for pc in pcs])
+        assert names[roots[mask]] == m21_chord.root().name, pcs
+        assert harmony_analysis.QUALITY_NAMES[qualities[mask]] == m21_chord.quality, pcs
+
+
+def test_matches_music21_chordify_on_bach_chorales():
+    music21 = pytest.importorskip("music21")
+    from music21 import corpus
+    from backend.app.services.score_ir import build_score_ir
+
+    compared = agreed = 0
+    for work in ["bach/bwv66.6", "bach/bwv1.6", "bach/bwv10.7", "bach/bwv101.7", "bach/bwv102.7"]:
+        score = corpus.parse(work)
+        result = harmony_analysis.analyze_harmony(build_score_ir(score))
+        reference = {float(c.offset): c for c in score.chordify().flatten().getElementsByClass("Chord")
+                     if len(c.pitches)}
+        for offset, root, quality in zip(result["offsets"], result["roots"], result["qualities"]):
+            m21_chord = reference.get(offset)
+            if m21_chord is None:
+                continue
+            compared += 1
+            agreed += (m21_chord.root().name == root and m21_chord.quality == quality)
+
+    # Only chromatic spellings outside the key-signature window can differ
+    assert compared > 350
+    assert agreed / compared >= 0.97
@@ -0,0 +1,60 @@
+# backend/test/unit/services/test_lambda_runtime.py
+
+import json
+
+from backend.app.services.lambda_runtime import InvocationStats, is_sqs_event, make_handler, process_sqs_batch
+
+
+def sqs_event(*bodies):
+    return {"Records": [{"messageId": f"m{i}", "eventSource": "aws:sqs", "receiptHandle": f"rh{i}",
+                         "body": body if isinstance(body, str) else json.dumps(body)}
+                        for i, body in enumerate(bodies)]}
+
+
+def fake_process(payload):
+    if payload.get("explode"):
+        raise RuntimeError("step crashed")
+    return {"task_id": payload["task_id"], "status": payload.get("status", "completed")}
+
+
+class Context:
+    def __init__(self, remaining):
+        self.remaining = list(remaining)
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining.pop(0)
+
+
+def test_partial_batch_failures():
+    event = sqs_event({"task_id": "ok"}, {"task_id": "boom", "explode": True}, "{not json",
+                      {"task_id": "later", "status": "deferred"}, {"task_id": "ok2"})
+    response = make_handler(fake_process)(event)
+    assert response == {"batchItemFailures": [{"itemIdentifier": "m1"}, {"itemIdentifier": "m2"},
+                                              {"itemIdentifier": "m3"}]}
+
+
+def test_low_remaining_time_returns_rest_of_batch():
+    processed = []
+    event = sqs_event({"task_id": "a"}, {"task_id": "b"}, {"task_id": "c"})
+    response = process_sqs_batch(event["Records"], lambda p: processed.append(p["task_id"]) or {"status": "completed"},
+                                 Context([60000, 10000, 10000]), min_remaining_ms=30000)
+    assert processed == ["a"]
+    assert [f["itemIdentifier"] for f in response["batchItemFailures"]] == ["m1", "m2"]
+
+
+def test_direct_invocation_returns_result():
+    handler = make_handler(fake_process)
+    assert handler({"task_id": "t1"}) == {"task_id": "t1", "status": "completed"}
+    assert not is_sqs_event({"task_id": "t1"})
+    assert not is_sqs_event({"Records": [{"eventSource": "aws:s3"}]})
+
+
+def test_first_invocation_is_cold_and_state_is_reused():
+    stats = InvocationStats()
+    handler = make_handler(fake_process, stats)
+    handler(sqs_event({"task_id": "a"}))
+    handler(sqs_event({"task_id": "b", "explode": True}, {"task_id": "c"}))
+    snapshot = handler.stats.snapshot()
+    assert snapshot["invocations"] == 2 and snapshot["cold_starts"] == 1
+    assert snapshot["records"] == 3 and snapshot["failed_records"] == 1
+    assert snapshot["init_ms"] is not None
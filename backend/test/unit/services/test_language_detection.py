@@ -0,0 +1,47 @@
+import pytest
+
+from backend.app.services.language_detection import LanguageDetector, sample_text
+
+pytest.importorskip("langdetect")
+
+ENGLISH = "Shall I compare thee to a summer's day? Thou art more lovely and more temperate. "
+KOREAN = "그대를 여름날에 비할 수 있을까요? 그대는 더 사랑스럽고 더 온화합니다. "
+
+
+def test_detects_and_is_deterministic():
+    first = LanguageDetector()
+    second = LanguageDetector()
+    mixed = ENGLISH + KOREAN # ambiguous input where unseeded langdetect may flip
+    assert first.detect(ENGLISH * 3) == "en"
+    assert first.detect(KOREAN * 3) == "ko"
+    assert first.detect(mixed) == second.detect(mixed)
+
+
+def test_results_are_cached_by_text():
+    detector = LanguageDetector()
+    text = ENGLISH * 5
+    assert detector.detect(text) == detector.detect(text)
+    assert detector.stats["detections"] == 1
+    assert detector.stats["cache_hits"] == 1
+
+
+def test_short_text_is_unknown_without_detection():
+    detector = LanguageDetector()
+    assert detector.detect("la la") == "unknown"
+    assert detector.detect("1234567890 !!") == "unknown" # no language features
+    assert detector.stats["detections"] == 1
+
+
+def test_warm_loads_profiles_once():
+    detector = LanguageDetector()
+    factory = detector.warm()
+    assert detector.warm() is factory
+    assert "ko" in factory.langlist
+
+
+def test_sample_is_bounded_and_spans_the_text():
+    text = " ".join(f"word{i}" for i in range(5000))
+    sample = sample_text(text, max_chars=400, windows=4)
+    assert len(sample) <= 400
+    assert "word0" in sample and "word4999" in sample
+    assert sample_text("short text", max_chars=400) == "short text"
@@ -0,0 +1,56 @@
+# backend/test/unit/services/test_lazy_imports.py
+
+import sys
+
+import pytest
+
+from backend.app.services import lazy_imports
+from backend.app.services.lazy_imports import LazyModule, instance_of, lazy_import, prewarm, prewarm_modules
+
+
+@pytest.fixture
+def fake_module(tmp_path, monkeypatch):
+    """A throwaway module on sys.path that records being imported."""
+    (tmp_path / "heavy_fake_lib.py").write_text("IMPORTED = True\nclass Score:\n    pass\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    sys.modules.pop("heavy_fake_lib", None)
+    lazy_imports._modules.pop("heavy_fake_lib", None)
+    yield "heavy_fake_lib"
+    sys.modules.pop("heavy_fake_lib", None)
+    lazy_imports._modules.pop("heavy_fake_lib", None)
+
+
+def test_module_is_imported_on_first_attribute_access(fake_module):
+    module = lazy_import(fake_module)
+    assert lazy_import(fake_module) is module
+    assert not module.loaded and fake_module not in sys.modules
+    assert module.IMPORTED is True
+    assert module.loaded and fake_module in sys.modules
+    assert fake_module in lazy_imports.snapshot()["import_seconds"]
+
+
+def test_instance_of_does_not_import(fake_module):
+    module = lazy_import(fake_module)
+    assert instance_of(object(), module, "Score") is False
+    assert fake_module not in sys.modules
+    score = module.Score()
+    assert instance_of(score, module, "Score") is True
+
+
+def test_missing_module_raises_on_use():
+    module = LazyModule("definitely_not_installed_lib")
+    with pytest.raises(ImportError):
+        module.anything
+
+
+def test_prewarm_modules_expands_step_types():
+    assert prewarm_modules("generate_music_file") == ["music21.stream", "mido"]
+    assert prewarm_modules("extract_text_from_score, generate_music_file, numpy") == ["music21.stream", "mido", "numpy"]
+    assert set(prewarm_modules("all")) == {m for mods in lazy_imports.STEP_MODULES.values() for m in mods}
+    assert prewarm_modules("") == []
+
+
+def test_prewarm_reports_missing(fake_module):
+    result = prewarm([fake_module, "definitely_not_installed_lib"])
+    assert list(result["modules"]) == [fake_module]
+    assert result["missing"] == ["definitely_not_installed_lib"]
@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+
+from backend.app.services.llm_pool import LLMClientPool, parse_warm_spec
+
+
+class FakeHTTPClient:
+    def __init__(self):
+        self.requests = []
+        self.closed = False
+
+    def get(self, url, headers=None):
+        self.requests.append(url)
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool():
+    created = []
+
+    def factory(model, temperature, http_client):
+        created.append((model, temperature))
+        return {"model": model, "temperature": temperature, "http_client": http_client}
+
+    return LLMClientPool(factory=factory, http_client_factory=FakeHTTPClient), created
+
+
+def test_clients_are_reused_per_model_and_temperature():
+    pool, created = make_pool()
+
+    first = pool.get("gpt-3.5-turbo", 0.7)
+    assert pool.get("gpt-3.5-turbo", 0.7) is first
+    assert pool.get("gpt-3.5-turbo", 0.2) is not first
+    assert pool.get("gpt-4o", 0.7)["http_client"] is first["http_client"] # one shared connection pool
+    assert created == [("gpt-3.5-turbo", 0.7), ("gpt-3.5-turbo", 0.2), ("gpt-4o", 0.7)]
+    assert pool.stats["hits"] == 1
+
+
+def test_concurrent_first_use_creates_one_client():
+    pool, created = make_pool()
+    barrier = threading.Barrier(8)
+    results = []
+
+    def use():
+        barrier.wait()
+        results.append(pool.get("gpt-3.5-turbo", 0.7))
+
+    threads = [threading.Thread(target=use) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_warm_creates_clients_and_opens_a_connection():
+    pool, created = make_pool()
+    pool.warm([("gpt-3.5-turbo", 0.7)], connect=True, base_url="http://localhost:8080/v1/")
+
+    assert created == [("gpt-3.5-turbo", 0.7)]
+    assert pool.http_client.requests == ["http://localhost:8080/v1/models"]
+    assert pool.stats["warm_connections"] == 1
+
+
+def test_warm_failures_do_not_raise():
+    def broken(model, temperature, http_client):
+        raise RuntimeError("no api key")
+
+    pool = LLMClientPool(factory=broken, http_client_factory=FakeHTTPClient)
+    pool.warm([("gpt-3.5-turbo", 0.7)], connect=False)
+    assert pool.stats["clients_created"] == 0
+
+
+def test_close_releases_http_client():
+    pool, _ = make_pool()
+    http_client = pool.get("m", 0.0)["http_client"]
+    pool.close()
+    assert http_client.closed
+    assert pool.get("m", 0.0)["http_client"] is not http_client
+
+
+def test_parse_warm_spec():
+    assert parse_warm_spec("gpt-3.5-turbo:0.7, gpt-4o ,") == [("gpt-3.5-turbo", 0.7), ("gpt-4o", 0.7)]
+    assert parse_warm_spec("") == []
+
+
+def test_chains_are_reused_per_template():
+    pytest.importorskip("langchain")
+    pool, created = make_pool()
+    chain = pool.get_chain("Translate {original_text}", "m", 0.7)
+    assert pool.get_chain("Translate {original_text}", "m", 0.7) is chain
+    assert pool.stats["chains_created"] == 1
@@ -0,0 +1,119 @@
+import time
+
+import pytest
+
+from backend.app.services import llm_resilience as lr
+from backend.app.services.chunk_translation import translate_chunks
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class APIStatusError(Exception):
+    """Shaped like openai.APIStatusError: carries the HTTP response."""
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = FakeResponse(status_code, headers)
+
+
+class Flaky:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else "ok"
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def make(max_attempts=3, threshold=5, budget=None):
+    sleeps = []
+    resilience = lr.LLMResilience(max_attempts=max_attempts, budget=budget or lr.RetryBudget(minimum=100),
+                                  breaker=lr.CircuitBreaker(failure_threshold=threshold, reset_seconds=30),
+                                  sleep=sleeps.append)
+    return resilience, sleeps
+
+
+def test_retry_after_header_is_honored():
+    resilience, sleeps = make()
+    fn = Flaky(APIStatusError(429, {"retry-after": "7"}), "done")
+
+    assert resilience.call(fn) == "done"
+    assert sleeps == [7.0]
+    assert resilience.stats["retry_after_honored"] == 1
+
+
+def test_retry_after_ms_and_http_date():
+    assert lr.retry_after_seconds(APIStatusError(429, {"retry-after-ms": "1500"})) == 1.5
+    future = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 20))
+    assert 15 < lr.retry_after_seconds(APIStatusError(503, {"retry-after": future})) <= 20
+    assert lr.retry_after_seconds(APIStatusError(503, {"retry-after": "soon"})) is None
+
+
+def test_client_errors_are_not_retried():
+    resilience, sleeps = make()
+    fn = Flaky(APIStatusError(400))
+
+    with pytest.raises(APIStatusError):
+        resilience.call(fn)
+    assert fn.calls == 1 and sleeps == []
+
+
+def test_circuit_opens_and_fails_fast_then_recovers(monkeypatch):
+    resilience, _ = make(max_attempts=1, threshold=2)
+    failing = Flaky(*[APIStatusError(503)] * 10)
+    for _ in range(2):
+        with pytest.raises(APIStatusError):
+            resilience.call(failing)
+
+    with pytest.raises(lr.CircuitOpenError) as error:
+        resilience.call(failing)
+    assert error.value.deferred
+    assert failing.calls == 2 # rejected without calling the provider
+    assert resilience.snapshot()["circuit_state"] == "open"
+
+    now = time.time()
+    monkeypatch.setattr(lr.time, "time", lambda: now + 31)
+    assert resilience.call(Flaky("probe ok")) == "probe ok" # half-open probe
+    assert resilience.snapshot()["circuit_state"] == "closed"
+
+
+def test_long_retry_after_trips_the_breaker_instead_of_sleeping():
+    resilience, sleeps = make()
+    with pytest.raises(lr.CircuitOpenError) as error:
+        resilience.call(Flaky(APIStatusError(429, {"retry-after": "600"})))
+    assert sleeps == []
+    assert error.value.retry_at > time.time() + 500
+
+
+def test_global_retry_budget_limits_amplification():
+    budget = lr.RetryBudget(ratio=0.1, minimum=2)
+    resilience, sleeps = make(budget=budget)
+    outcomes = []
+    for _ in range(5):
+        try:
+            outcomes.append(resilience.call(Flaky(TimeoutError("slow"), "ok")))
+        except lr.RetryBudgetExhausted:
+            outcomes.append("deferred")
+
+    assert outcomes == ["ok", "ok", "deferred", "deferred", "deferred"]
+    assert len(sleeps) == 2
+    assert resilience.stats["budget_exhausted"] == 3
+
+
+def test_deferred_chunks_are_reported_by_translate_chunks():
+    def translate(chunk):
+        if chunk == "b":
+            raise lr.CircuitOpenError(time.time() + 10)
+        return chunk.upper()
+
+    results = translate_chunks(["a", "b"], translate, max_concurrency=1)
+    assert [r["status"] for r in results] == ["success", "deferred"]
+    assert results[1]["retry_at"] > time.time()
@@ -0,0 +1,43 @@
+from backend.app.services.lyric_dedup import dedupe_lines
+
+VERSE_1 = "When the night has come\nAnd the land is dark"
+VERSE_2 = "If the sky that we look upon\nShould tumble and fall"
+CHORUS = "So darling, darling\nStand by me\nOh, stand by me"
+
+
+def test_repeated_chorus_is_translated_once_and_re_expanded():
+    text = "\n".join([VERSE_1, CHORUS, VERSE_2, CHORUS, CHORUS])
+    deduped = dedupe_lines(text)
+
+    assert deduped.segments == [VERSE_1, CHORUS, VERSE_2]
+    assert deduped.layout == [0, 1, 2, 1, 1]
+    assert deduped.expand(deduped.segments) == text
+    assert deduped.expand([s.upper() for s in deduped.segments]) == text.upper()
+    assert deduped.saved_ratio > 0.3
+
+
+def test_whitespace_variants_count_as_repeats():
+    text = "\n".join([CHORUS, VERSE_1, CHORUS.replace(" by", "  by ")])
+    assert dedupe_lines(text).layout == [0, 1, 0]
+
+
+def test_partial_repeat_splits_the_earlier_block():
+    text = "\n".join(["a", "b", "c", "d", "x", "a", "b"])
+    deduped = dedupe_lines(text)
+
+    assert deduped.segments == ["a\nb", "c\nd\nx"]
+    assert deduped.layout == [0, 1, 0]
+    assert deduped.expand(deduped.segments) == text
+
+
+def test_single_line_repeats_are_kept_inline():
+    text = "Amen\nAmen\nAlleluia\nAmen"
+    deduped = dedupe_lines(text)
+
+    assert deduped.segments == [text]
+    assert deduped.saved_ratio == 0.0
+
+
+def test_no_repetition_and_empty_text():
+    assert dedupe_lines(VERSE_1).layout == [0]
+    assert dedupe_lines("").expand([]) == ""
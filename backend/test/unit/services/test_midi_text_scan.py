@@ -0,0 +1,80 @@
+# backend/test/unit/services/test_midi_text_scan.py
+
+import pytest
+
+mido = pytest.importorskip("mido")
+
+from backend.app.services import midi_text_scan
+
+
+def write_midi(path, midi_type=1):
+    mid = mido.MidiFile(type=midi_type)
+    conductor = mido.MidiTrack([
+        mido.MetaMessage("copyright", text="(c) 2024", time=0),
+        mido.MetaMessage("set_tempo", tempo=500000, time=0),
+        mido.MetaMessage("marker", text="Verse", time=0),
+        mido.MetaMessage("cue_marker", text="Cue A", time=960),
+    ])
+    melody = mido.MidiTrack()
+    melody.append(mido.Message("program_change", program=5, time=0))
+    for i, syllable in enumerate(["Twin", "kle", "twin", "kle"]):
+        melody.append(mido.MetaMessage("lyrics", text=syllable, time=0 if i == 0 else 10))
+        melody.append(mido.Message("note_on", note=60 + i, velocity=80, time=0))
+        melody.append(mido.Message("control_change", control=7, value=100, time=5))
+        melody.append(mido.Message("pitchwheel", pitch=200, time=0))
+        melody.append(mido.Message("note_off", note=60 + i, velocity=0, time=470))
+    melody.append(mido.Message("sysex", data=[1, 2, 3], time=0))
+    melody.append(mido.MetaMessage("text", text="Fine café", time=20))
+    mid.tracks += [conductor, melody]
+    mid.save(path)
+    return path
+
+
+def mido_reference(path):
+    lines = []
+    for i, track in enumerate(mido.MidiFile(path).tracks):
+        for msg in track:
+            if msg.type in midi_text_scan.TEXT_META_TYPES.values():
+                lines.append(f"Track {i}: [{msg.time}] {msg.text}")
+    return "\n".join(lines)
+
+
+def test_matches_mido_text_output(tmp_path):
+    path = write_midi(str(tmp_path / "song.mid"))
+
+    events = midi_text_scan.scan_midi_text(path)
+
+    assert midi_text_scan.format_text_events(events) == mido_reference(path)
+    assert [e["type"] for e in events] == ["copyright", "marker", "cue_marker",
+                                           "lyrics", "lyrics", "lyrics", "lyrics", "text"]
+    assert events[-1]["text"] == "Fine café"
+
+
+def test_running_status_is_skipped_correctly(tmp_path):
+    # mido writes running status for consecutive messages with the same status byte
+    mid = mido.MidiFile()
+    track = mido.MidiTrack()
+    for i in range(50):
+        track.append(mido.Message("note_on", note=40 + i, velocity=90, time=1))
+    track.append(mido.MetaMessage("lyrics", text="end", time=7))
+    mid.tracks.append(track)
+    path = str(tmp_path / "running.mid")
+    mid.save(path)
+
+    assert midi_text_scan.scan_midi_text(path) == [{"track": 0, "time": 7, "type": "lyrics", "text": "end"}]
+
+
+def test_meta_type_filter(tmp_path):
+    path = write_midi(str(tmp_path / "song.mid"))
+
+    events = midi_text_scan.scan_midi_text(path, meta_types={0x05: "lyrics"})
+
+    assert [e["text"] for e in events] == ["Twin", "kle", "twin", "kle"]
+
+
+def test_rejects_non_midi_file(tmp_path):
+    path = tmp_path / "not.mid"
+    path.write_bytes(b"RIFF0000WAVE")
+
+    with pytest.raises(ValueError):
+        midi_text_scan.scan_midi_text(str(path))
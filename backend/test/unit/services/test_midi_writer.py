@@ -0,0 +1,100 @@
+# backend/test/unit/services/test_midi_writer.py
+
+import io
+
+import numpy as np
+import pytest
+
+mido = pytest.importorskip("mido")
+
+from backend.app.services import midi_writer
+from backend.app.services.score_ir import LYRIC_DTYPE, NOTE_DTYPE, TEMPO_DTYPE, TIME_SIGNATURE_DTYPE, ScoreIR
+
+NOTE_FIELDS = ["onset", "duration", "pitch", "velocity", "part"]
+
+
+def resave_with_mido(data):
+    out = io.BytesIO()
+    mido.MidiFile(file=io.BytesIO(data)).save(file=out)
+    return out.getvalue()
+
+
+def sorted_notes(notes):
+    return np.sort(notes[NOTE_FIELDS].copy(), order=NOTE_FIELDS)
+
+
+def small_ir():
+    notes = np.array([
+        (0.0, 1.0, 60, 80, 0, 1),
+        (0.0, 2.0, 64, 70, 0, 1),
+        (1.0, 1.0, 60, 90, 0, 1),  # same pitch restarted exactly where the first one ends
+        (0.5, 0.0, 72, 64, 1, 1),  # grace note without duration is dropped
+        (0.5, 200.0, 48, 64, 1, 1), # long note needs a multi-byte delta
+    ], dtype=NOTE_DTYPE)
+    return ScoreIR(
+        notes,
+        lyrics=np.array([(0.0, 0, 1, 1), (1.0, 0, 1, 1)], dtype=LYRIC_DTYPE),
+        lyric_texts=["사랑", "love"],
+        tempos=np.array([(0.0, 90.0)], dtype=TEMPO_DTYPE),
+        time_signatures=np.array([(0.0, 3, 4, 1)], dtype=TIME_SIGNATURE_DTYPE),
+    )
+
+
+def test_encode_varlen():
+    assert midi_writer.encode_varlen(0) == b"\x00"
+    assert midi_writer.encode_varlen(0x7F) == b"\x7f"
+    assert midi_writer.encode_varlen(0x80) == b"\x81\x00"
+    assert midi_writer.encode_varlen(0x0FFFFFFF) == b"\xff\xff\xff\x7f"
+
+
+def test_output_is_byte_identical_after_mido_round_trip():
+    data = midi_writer.write_midi(small_ir())
+
+    assert resave_with_mido(data) == data
+
+
+def test_events_round_trip_through_mido():
+    ir = small_ir()
+
+    back = ScoreIR.from_mido(mido.MidiFile(file=io.BytesIO(midi_writer.write_midi(ir))))
+
+    expected = ir.notes[ir.notes["duration"] > 0]
+    back.notes["part"] -= 1 # track 0 is the conductor track
+    assert np.array_equal(sorted_notes(back.notes), sorted_notes(expected))
+    assert [t.encode("latin1").decode("utf-8") for t in back.lyric_texts] == ["사랑", "love"]
+    assert np.allclose(back.tempos["qpm"], [90.0])
+    assert (back.time_signatures["numerator"][0], back.time_signatures["denominator"][0]) == (3, 4)
+
+
+def test_running_status_is_used_for_note_events():
+    ir = ScoreIR(np.array([(i * 0.5, 0.5, 60 + i, 64, 0, 1) for i in range(10)], dtype=NOTE_DTYPE))
+
+    data = midi_writer.write_midi(ir)
+
+    # One status byte for the whole part track: 20 events x 2 data bytes, ten 0-tick deltas,
+    # ten 480-tick (two byte) deltas, a single status byte and the end-of-track event
+    part_track = data[data.rindex(b"MTrk"):]
+    assert int.from_bytes(part_track[4:8], "big") == 20 * 2 + 10 * 1 + 10 * 2 + 1 + 4
+
+
+def test_matches_corpus_notes_and_writes_file(tmp_path):
+    pytest.importorskip("music21")
+    from music21 import corpus
+    from backend.app.services.score_ir import build_score_ir
+
+    for work in ["bach/bwv66.6", "bach/bwv1.6"]:
+        ir = build_score_ir(corpus.parse(work))
+        path = tmp_path / "out.mid"
+
+        data = midi_writer.write_midi(ir, fp=str(path))
+
+        assert path.read_bytes() == data
+        assert resave_with_mido(data) == data
+        back = ScoreIR.from_mido(mido.MidiFile(str(path)))
+        back.notes["part"] -= 1
+        assert np.array_equal(sorted_notes(back.notes), sorted_notes(ir.notes[ir.notes["duration"] > 0]))
+
+
+def test_rejects_unsupported_input():
+    with pytest.raises(TypeError):
+        midi_writer.write_midi({"notes_data": "mock_omr_result"})
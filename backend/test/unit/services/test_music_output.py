@@ -0,0 +1,118 @@
+# backend/test/unit/services/test_music_output.py
+
+import io
+import threading
+import wave
+
+import numpy as np
+import pytest
+
+from backend.app.services import music_output, synth
+from backend.app.services.score_ir import NOTE_DTYPE, ScoreIR
+
+from .test_s3_multipart import FakeS3Client
+
+
+class ThreadRecordingClient(FakeS3Client):
+    """Remembers which thread performed each upload. With a barrier, put_object waits for the other uploads."""
+    def __init__(self, barrier: threading.Barrier = None):
+        super().__init__()
+        self.threads = set()
+        self.barrier = barrier
+        self._lock = threading.Lock()
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5) # BrokenBarrierError if uploads run one after another
+        with self._lock:
+            self.threads.add(threading.current_thread().name)
+            super().put_object(Bucket, Key, Body, **kwargs)
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        with self._lock:
+            self.threads.add(threading.current_thread().name)
+            self.parts[(Key, PartNumber)] = Body
+            return {"ETag": f"{Key}-{PartNumber}"}
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        return {"UploadId": Key}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.objects[Key] = b"".join(self.parts[(Key, p["PartNumber"])] for p in MultipartUpload["Parts"])
+
+
+def small_ir():
+    return ScoreIR(np.array([(i * 0.5, 0.5, 60 + i % 12, 90, i % 2, 1) for i in range(16)], dtype=NOTE_DTYPE))
+
+
+def test_parse_output_formats():
+    assert music_output.parse_output_formats("midi, MP3,midi") == ["midi", "mp3"]
+    assert music_output.parse_output_formats(["wav", "mid"]) == ["wav", "midi"]
+    assert music_output.parse_output_formats(None) == ["midi"]
+    with pytest.raises(ValueError):
+        music_output.parse_output_formats("midi,aiff")
+
+
+def test_step_output_formats_accepts_legacy_single_format():
+    assert music_output.step_output_formats({"type": "generate_music_file", "output_format": "mp3"}) == ["mp3"]
+    assert music_output.step_output_formats({"output_formats": ["midi", "wav"]}) == ["midi", "wav"]
+
+
+def test_all_formats_from_one_render_uploaded_in_parallel(monkeypatch):
+    renders = []
+    original_render = synth.render_blocks
+    monkeypatch.setattr(music_output, "render_blocks",
+                        lambda *args, **kwargs: renders.append(1) or original_render(*args, **kwargs))
+    client = ThreadRecordingClient(barrier=threading.Barrier(2)) # small outputs finish with put_object
+
+    result = music_output.generate_outputs(small_ir(), ["midi", "wav", "wav"], "bucket", "results/t1/t1", client,
+                                           sample_rate=8000, block_frames=512)
+
+    assert result["status"] == "success"
+    assert list(result["formats"]) == ["midi", "wav"]
+    assert result["formats"]["midi"]["s3_key"] == "results/t1/t1.mid"
+    assert client.objects["results/t1/t1.mid"][:4] == b"MThd"
+    with wave.open(io.BytesIO(client.objects["results/t1/t1.wav"])) as wav:
+        assert wav.getnframes() == result["render"]["frames"]
+    assert len(renders) == 1
+    assert len(client.threads) == 2 # each format uploads from its own thread
+
+
+def test_audio_formats_share_identical_pcm():
+    soundfile = pytest.importorskip("soundfile")
+    client = ThreadRecordingClient()
+
+    result = music_output.generate_outputs(small_ir(), "wav,flac", "bucket", "r/x", client, sample_rate=8000)
+
+    wav_pcm, _ = soundfile.read(io.BytesIO(client.objects["r/x.wav"]), dtype="int16")
+    flac_pcm, _ = soundfile.read(io.BytesIO(client.objects["r/x.flac"]), dtype="int16")
+    assert result["status"] == "success"
+    assert np.array_equal(wav_pcm, flac_pcm)
+
+
+def test_original_midi_bytes_are_passed_through():
+    client = ThreadRecordingClient()
+
+    music_output.generate_outputs(small_ir(), ["midi"], "bucket", "r/y", client, midi_bytes=b"MThd-original")
+
+    assert client.objects["r/y.mid"] == b"MThd-original"
+
+
+def test_failing_format_does_not_block_others(monkeypatch):
+    original_open = music_output.open_encoder
+
+    def open_encoder(output_format, *args):
+        if output_format == "mp3":
+            raise RuntimeError("no mp3 encoder")
+        return original_open(output_format, *args)
+
+    monkeypatch.setattr(music_output, "open_encoder", open_encoder)
+    monkeypatch.setattr(music_output, "ENCODER_QUEUE_BLOCKS", 1)
+    client = ThreadRecordingClient()
+
+    result = music_output.generate_outputs(small_ir(), ["wav", "mp3"], "bucket", "r/z", client,
+                                           sample_rate=8000, block_frames=256)
+
+    assert result["status"] == "partial"
+    assert result["formats"]["wav"]["status"] == "success"
+    assert result["formats"]["mp3"] == {"status": "failed", "format": "mp3", "error": "no mp3 encoder"}
@@ -0,0 +1,149 @@
+import time
+
+import pytest
+
+from backend.app.services import omr_pipeline
+
+pytest.importorskip("numpy")
+
+
+def write_tiff(path, pages):
+    from PIL import Image
+    images = [Image.new("L", (40 + 10 * i, 30), color=255) for i in range(pages)]
+    images[0].save(path, save_all=True, append_images=images[1:])
+    return str(path)
+
+
+def write_text_pdf(path, page_texts):
+    """Minimal PDF with one Helvetica text line per page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in page_texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+    body, offsets = b"%PDF-1.4\n", []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += f"{number} 0 obj\n{obj}\nendobj\n".encode()
+    xref = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    body += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    path.write_bytes(body)
+    return str(path)
+
+
+def slow_first_page_stage(page):
+    if page["page_index"] == 0:
+        time.sleep(0.5)
+    page["finished_at"] = time.time()
+    return page
+
+
+def failing_stage(page):
+    if page["page_index"] == 1:
+        raise ValueError("unreadable page")
+    return page
+
+
+def test_image_pages_are_processed_in_order(tmp_path):
+    pytest.importorskip("PIL")
+    path = write_tiff(tmp_path / "score.tiff", 5)
+
+    pages = list(omr_pipeline.iter_pages(path, max_workers=2))
+
+    assert [page["page_index"] for page in pages] == [0, 1, 2, 3, 4]
+    assert [page["size"] for page in pages] == [(30, 40 + 10 * i) for i in range(5)]
+    assert all("image" not in page for page in pages) # arrays stay in the page process
+
+
+def test_pages_stream_in_order_when_later_pages_finish_first(tmp_path):
+    pytest.importorskip("PIL")
+    path = write_tiff(tmp_path / "score.tiff", 4)
+
+    pages = list(omr_pipeline.iter_pages(path, max_workers=2, stages=(slow_first_page_stage,)))
+
+    assert [page["page_index"] for page in pages] == [0, 1, 2, 3]
+    assert pages[1]["finished_at"] < pages[0]["finished_at"]
+
+
+def test_pdf_text_layer_becomes_text_elements(tmp_path):
+    pytest.importorskip("pdfminer")
+    path = write_text_pdf(tmp_path / "score.pdf", ["Amazing grace", "How sweet the sound"])
+
+    score = omr_pipeline.assemble_omr_score(omr_pipeline.iter_pages(path, max_workers=1))
+
+    assert score["page_count"] == 2
+    assert [(e["page"], e["content"]) for e in score["text_elements"]] == [(1, "Amazing grace"),
+                                                                          (2, "How sweet the sound")]
+
+
+def test_failed_page_is_reported_and_assembly_continues(tmp_path):
+    pytest.importorskip("PIL")
+    path = write_tiff(tmp_path / "score.tiff", 3)
+    seen = []
+
+    score = omr_pipeline.assemble_omr_score(
+        omr_pipeline.iter_pages(path, max_workers=1, stages=(failing_stage, omr_pipeline.text_layer_stage)),
+        on_page=lambda page: seen.append(page["page_index"]))
+
+    assert seen == [0, 1, 2]
+    assert score["failed_pages"] == [2]
+    assert "unreadable page" in score["pages"][1]["error"]
+
+
+def text_page(index, content, status="success"):
+    return {"page_index": index, "status": status, "seconds": 0.0,
+            "text_elements": [{"type": "PDF Text", "content": content, "page": index + 1}]}
+
+
+def test_page_text_stream_starts_downstream_work_before_the_last_page():
+    started, last_page_at = {}, []
+
+    def pages():
+        yield text_page(0, "Amazing grace")
+        yield text_page(1, "How sweet the sound")
+        time.sleep(0.3) # slow last page
+        last_page_at.append(time.time())
+        yield text_page(2, "That saved a wretch")
+
+    def translate(text):
+        started[text] = time.time()
+        return text.upper()
+
+    stream = omr_pipeline.PageTextStream(process_text=translate)
+    omr_pipeline.assemble_omr_score(pages(), on_page=stream)
+    results = stream.results()
+    stream.close()
+
+    assert [r["result"] for r in results] == ["AMAZING GRACE", "HOW SWEET THE SOUND", "THAT SAVED A WRETCH"]
+    assert started["Amazing grace"] < last_page_at[0]
+    assert started["How sweet the sound"] < last_page_at[0]
+    assert stream.text == "Amazing grace\nHow sweet the sound\nThat saved a wretch"
+
+
+def test_page_text_stream_skips_empty_and_failed_pages_and_reports_errors():
+    def translate(text):
+        if text == "bad":
+            raise ValueError("provider error")
+        return text
+
+    stream = omr_pipeline.PageTextStream(process_text=translate)
+    omr_pipeline.assemble_omr_score(
+        [text_page(0, "ok"), text_page(1, ""), text_page(2, "lost", status="failed"), text_page(3, "bad")],
+        on_page=stream)
+    results = stream.results()
+    stream.close()
+
+    assert [(r["page_index"], r.get("result")) for r in results] == [(0, "ok"), (3, None)]
+    assert "provider error" in results[1]["error"]
+    assert stream.snapshot() == {"pages": 4, "text_pages": 2, "started": 2}
+
+
+def test_unsupported_extension():
+    with pytest.raises(ValueError):
+        omr_pipeline.count_pages("score.docx")
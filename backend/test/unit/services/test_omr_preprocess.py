@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from backend.app.services import omr_preprocess as pre
+
+PAPER, INK = 235, 20
+
+
+def scanned_page(staves_per_system=2, systems=3, angle=0.0, noise=0.005, height=1200, width=900, spacing=12):
+    """Synthetic page: systems of 5-line staves joined by barlines, optionally rotated."""
+    page = np.full((height, width), PAPER, dtype=np.uint8)
+    x0, x1, y = width // 10, width * 9 // 10, height // 10
+    for _ in range(systems):
+        first = y
+        for staff in range(staves_per_system):
+            for line in range(5):
+                page[y + line * spacing:y + line * spacing + 2, x0:x1] = INK
+            last = y + 4 * spacing + 2
+            y += 4 * spacing + (8 if staff < staves_per_system - 1 else 14) * spacing
+        if staves_per_system > 1:
+            for bx in np.linspace(x0, x1 - 2, 4).astype(int):
+                page[first:last, bx:bx + 2] = INK
+    rng = np.random.default_rng(0)
+    page[rng.random(page.shape) < noise] = 0
+    if angle:
+        from PIL import Image
+        page = np.array(Image.fromarray(page).rotate(-angle, fillcolor=PAPER, resample=Image.BILINEAR))
+    return page
+
+
+def test_otsu_threshold_separates_ink_from_paper():
+    threshold = pre.otsu_threshold(scanned_page(), tile_rows=100)
+    assert INK <= threshold < PAPER
+
+
+def test_staves_and_systems_are_detected():
+    layout = pre.analyze_page(scanned_page(), tile_rows=128)
+
+    assert layout["skew_degrees"] == 0
+    assert layout["staff_spacing"] == pytest.approx(12, abs=0.5)
+    assert [len(system["staves"]) for system in layout["systems"]] == [2, 2, 2]
+    assert all(len(staff["lines"]) == 5 for system in layout["systems"] for staff in system["staves"])
+
+
+def test_unconnected_staves_are_separate_systems():
+    layout = pre.analyze_page(scanned_page(staves_per_system=1, systems=4))
+    assert [len(system["staves"]) for system in layout["systems"]] == [1, 1, 1, 1]
+
+
+@pytest.mark.parametrize("angle", [1.5, -2.0])
+def test_skew_is_estimated_and_crops_are_level(angle):
+    pytest.importorskip("PIL")
+    page = scanned_page(angle=angle)
+    layout = pre.analyze_page(page)
+
+    assert layout["skew_degrees"] == pytest.approx(angle, abs=0.2)
+    assert len(layout["systems"]) == 3
+    for system, crop in zip(layout["systems"], pre.iter_system_crops(page, layout)):
+        assert crop.shape == (system["bottom"] - system["top"], page.shape[1])
+        rows = crop.mean(axis=1)
+        assert (rows > 0.5).sum() >= 10 # ten staff lines stay horizontal after deskew
+
+
+def test_tiling_does_not_change_the_result():
+    page = scanned_page(angle=1.0)
+    assert pre.analyze_page(page, tile_rows=64) == pre.analyze_page(page, tile_rows=page.shape[0])
+
+
+def test_blank_page_has_no_systems():
+    layout = pre.analyze_page(np.full((300, 200), PAPER, dtype=np.uint8))
+    assert layout["systems"] == [] and layout["staff_spacing"] is None
+
+
+def test_preprocess_stage_skips_pages_without_raster():
+    page = pre.preprocess_stage({"page_index": 0, "image": None})
+    assert "omr_layout" not in page
@@ -0,0 +1,95 @@
+import re
+import threading
+
+from backend.app.services import packed_translation as pt
+
+
+def words(text):
+    return len(text.split())
+
+
+class FakeLLM:
+    """Upper-cases each segment; optionally drops some markers from packed replies."""
+    def __init__(self, drop=()):
+        self.drop = set(drop)
+        self.packed_calls = 0
+        self.single_calls = []
+        self._lock = threading.Lock()
+
+    def translate_pack(self, text):
+        with self._lock:
+            self.packed_calls += 1
+        lines = ["Here are the translations:"]
+        for number, segment in re.findall(r"<<<(\d+)>>>\n(.*?)(?=\n<<<|\Z)", text, re.S):
+            if segment not in self.drop:
+                lines += [f"<<<{number}>>>", segment.upper()]
+        return "\n".join(lines)
+
+    def translate_one(self, text):
+        with self._lock:
+            self.single_calls.append(text)
+        return text.upper()
+
+
+def test_many_short_segments_use_few_requests():
+    segments = [f"dolce {i}" for i in range(30)] + ["rit.", "a tempo"]
+    llm = FakeLLM()
+
+    results, stats = pt.translate_packed(segments, llm.translate_pack, llm.translate_one, max_tokens=100, count=words)
+
+    assert [r["translated_chunk"] for r in results] == [s.upper() for s in segments]
+    assert [r["chunk_index"] for r in results] == list(range(len(segments)))
+    assert llm.packed_calls == stats["packed_calls"] == 3 # 12 segments of 8 tokens per pack
+    assert stats["single_calls"] <= 1
+
+
+def test_missing_markers_fall_back_per_segment():
+    segments = ["Amen", "Gloria", "Kyrie", "Sanctus"]
+    llm = FakeLLM(drop={"Kyrie"})
+
+    results, stats = pt.translate_packed(segments, llm.translate_pack, llm.translate_one, max_tokens=100, count=words)
+
+    assert [r["translated_chunk"] for r in results] == ["AMEN", "GLORIA", "KYRIE", "SANCTUS"]
+    assert [r["source"] for r in results] == ["packed", "packed", "single", "packed"]
+    assert llm.single_calls == ["Kyrie"]
+    assert stats["fallback_units"] == 1
+
+
+def test_failed_pack_request_falls_back_and_reports_failures():
+    def broken_pack(text):
+        raise RuntimeError("500")
+
+    def one(text):
+        if text == "bad":
+            raise RuntimeError("still failing")
+        return text.upper()
+
+    results, _ = pt.translate_packed(["good", "bad"], broken_pack, one, max_tokens=100, count=words)
+
+    assert results[0]["translated_chunk"] == "GOOD"
+    assert results[1]["status"] == "failed"
+    assert "still failing" in results[1]["error"]
+
+
+def test_cache_hits_skip_the_llm_and_new_results_are_stored():
+    llm = FakeLLM()
+    stored = {}
+    results, stats = pt.translate_packed(
+        ["Amen", "Gloria", "Kyrie"], llm.translate_pack, llm.translate_one, max_tokens=100, count=words,
+        lookup={"Amen": "So be it"}.get, store=stored.__setitem__)
+
+    assert results[0]["translated_chunk"] == "So be it" and results[0]["source"] == "cache"
+    assert stats["cache_hits"] == 1
+    assert stored == {"Gloria": "GLORIA", "Kyrie": "KYRIE"}
+
+
+def test_parse_packed_response_rejects_duplicates_and_out_of_range():
+    response = "preamble\n<<<1>>>\none\n<<<2>>>\ntwo\n<<<2>>>\nagain\n<<<9>>>\nnine\n<<< 3 >>>\n\n"
+    assert pt.parse_packed_response(response, 3) == {1: "one"}
+
+
+def test_pack_segments_respects_budget_and_segment_limit():
+    packs = pt.pack_segments(["a b c"] * 10, max_tokens=20, count=words, max_segments=3)
+    assert [len(pack) for pack in packs] == [2, 2, 2, 2, 2]
+    packs = pt.pack_segments(["a"] * 10, max_tokens=1000, count=words, max_segments=4)
+    assert [len(pack) for pack in packs] == [4, 4, 2]
@@ -0,0 +1,81 @@
+# backend/test/unit/services/test_rate_limiter.py
+
+import threading
+import time
+
+import pytest
+
+from backend.app.services import rate_limiter
+
+
+def test_bucket_allows_burst_then_throttles():
+    bucket = rate_limiter.TokenBucket(rate_per_second=20.0, capacity=5.0)
+
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    burst_elapsed = time.monotonic() - start
+    for _ in range(4):
+        bucket.acquire()
+    throttled_elapsed = time.monotonic() - start
+
+    assert burst_elapsed < 0.05
+    assert throttled_elapsed == pytest.approx(4 / 20.0, abs=0.06)
+
+
+def test_oversized_request_is_clamped_to_capacity():
+    bucket = rate_limiter.TokenBucket(rate_per_second=1.0, capacity=3.0)
+
+    assert bucket.acquire(100.0, timeout=0.1) == pytest.approx(0.0, abs=0.01)
+
+
+def test_timeout_raises():
+    bucket = rate_limiter.TokenBucket(rate_per_second=0.5, capacity=1.0)
+    bucket.acquire()
+
+    with pytest.raises(TimeoutError):
+        bucket.acquire(timeout=0.05)
+
+
+def test_shared_limiter_caps_rate_across_threads():
+    limiter = rate_limiter.RateLimiter(requests_per_minute=600, tokens_per_minute=1e9, burst_seconds=0.2) # 10/s, burst 2
+    timestamps = []
+    lock = threading.Lock()
+
+    def call():
+        limiter.acquire(tokens=10)
+        with lock:
+            timestamps.append(time.monotonic())
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    start = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # burst of 2, then 6 more at 10 per second
+    assert max(timestamps) - start == pytest.approx(0.6, abs=0.15)
+    assert limiter.stats["acquired"] == 8
+
+
+def test_token_budget_and_usage_correction():
+    limiter = rate_limiter.RateLimiter(requests_per_minute=6000, tokens_per_minute=600, burst_seconds=10) # 10 tok/s, cap 100
+    limiter.acquire(tokens=100)
+    limiter.record_usage(estimated_tokens=100, actual_tokens=50) # half the estimate was returned
+
+    assert limiter.acquire(tokens=50, timeout=0.05) < 0.05
+
+
+def test_usage_above_estimate_delays_next_acquire():
+    limiter = rate_limiter.RateLimiter(requests_per_minute=6000, tokens_per_minute=600, burst_seconds=10) # 10 tok/s, cap 100
+    limiter.acquire(tokens=50)
+    limiter.record_usage(estimated_tokens=50, actual_tokens=100) # the response used the rest of the bucket
+
+    with pytest.raises(TimeoutError):
+        limiter.acquire(tokens=50, timeout=0.05)
+
+
+def test_estimate_tokens_counts_wide_characters_per_character():
+    assert rate_limiter.estimate_tokens("a" * 40, completion_ratio=0) == 11
+    assert rate_limiter.estimate_tokens("가" * 40, completion_ratio=0) == 41
@@ -0,0 +1,96 @@
+# backend/test/unit/services/test_s3_multipart.py
+
+import io
+
+import pytest
+
+from backend.app.services.s3_multipart import S3MultipartWriter
+
+
+class FakeS3Client:
+    """Records multipart calls and assembles the final object like S3 would."""
+    def __init__(self):
+        self.objects = {}
+        self.parts = {}
+        self.calls = []
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        self.calls.append("create")
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.calls.append(("part", PartNumber, len(Body)))
+        self.parts[PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.calls.append("complete")
+        self.objects[Key] = b"".join(self.parts[p["PartNumber"]] for p in MultipartUpload["Parts"])
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.calls.append("abort")
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.calls.append("put")
+        self.objects[Key] = Body
+
+
+def test_small_object_uses_single_put():
+    client = FakeS3Client()
+
+    with S3MultipartWriter("bucket", "small.bin", client=client, part_size=16) as writer:
+        writer.write(b"hello")
+
+    assert client.calls == ["put"]
+    assert client.objects["small.bin"] == b"hello"
+
+
+def test_parts_are_streamed_and_first_part_is_uploaded_last():
+    client = FakeS3Client()
+    payload = bytes(range(256)) * 4
+
+    with S3MultipartWriter("bucket", "big.bin", client=client, part_size=100) as writer:
+        for i in range(0, len(payload), 37):
+            writer.write(payload[i:i + 37])
+        # parts are flushed while writing, never holding more than two parts
+        assert ("part", 2, 100) in client.calls
+
+    assert client.objects["big.bin"] == payload
+    assert client.calls[-2:] == [("part", 1, 100), "complete"]
+
+
+def test_seek_back_into_first_part_rewrites_header():
+    client = FakeS3Client()
+
+    with S3MultipartWriter("bucket", "audio.flac", client=client, part_size=10) as writer:
+        writer.write(b"HEADER????" + b"x" * 35)
+        writer.seek(6)
+        writer.write(b"DONE")
+        writer.seek(0, io.SEEK_END)
+        writer.write(b"!")
+
+    assert client.objects["audio.flac"] == b"HEADERDONE" + b"x" * 35 + b"!"
+
+
+def test_seek_into_uploaded_part_is_rejected():
+    client = FakeS3Client()
+    writer = S3MultipartWriter("bucket", "x.bin", client=client, part_size=10)
+    writer.write(b"a" * 35)
+
+    with pytest.raises(io.UnsupportedOperation):
+        writer.seek(15)
+    writer.abort()
+
+    assert client.calls[-1] == "abort"
+    assert "x.bin" not in client.objects
+
+
+def test_error_inside_context_aborts_upload():
+    client = FakeS3Client()
+
+    with pytest.raises(RuntimeError):
+        with S3MultipartWriter("bucket", "y.bin", client=client, part_size=10) as writer:
+            writer.write(b"b" * 25)
+            raise RuntimeError("encoder failed")
+
+    assert "abort" in client.calls and "complete" not in client.calls
@@ -0,0 +1,84 @@
+# backend/test/unit/services/test_score_cache.py
+
+import os
+import pytest
+
+music21 = pytest.importorskip("music21")
+from music21 import stream, note
+
+from backend.app.services import score_cache
+
+
+# --- Helpers ---
+
+def write_score(path, num_notes=8, start_midi=60):
+    # Build a tiny single-part score and write it as MusicXML
+    part = stream.Part()
+    for i in range(num_notes):
+        part.append(note.Note(start_midi + (i % 12), quarterLength=1.0))
+    score = stream.Score([part])
+    score.write("musicxml", fp=str(path))
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return score_cache.ScoreCache(cache_dir=str(tmp_path / "cache"), max_bytes=50 * 1024 * 1024)
+
+
+# --- Tests ---
+
+def test_second_parse_is_cache_hit(cache, tmp_path):
+    score_path = write_score(tmp_path / "a.musicxml")
+
+    first, hit1 = cache.parse(score_path)
+    second, hit2 = cache.parse(score_path)
+
+    assert hit1 is False
+    assert hit2 is True
+    assert len(second.flatten().notes) == len(first.flatten().notes) == 8
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+
+def test_key_depends_on_content_not_path(cache, tmp_path):
+    path_a = write_score(tmp_path / "a.musicxml")
+    path_b = tmp_path / "renamed.musicxml"
+    path_b.write_bytes(open(path_a, "rb").read())
+    path_c = write_score(tmp_path / "c.musicxml", start_midi=62)
+
+    assert cache.key_for(path_a) == cache.key_for(str(path_b))
+    assert cache.key_for(path_a) != cache.key_for(path_c)
+
+
+def test_corrupt_entry_falls_back_to_fresh_parse(cache, tmp_path):
+    score_path = write_score(tmp_path / "a.musicxml")
+    cache.parse(score_path)
+
+    # Corrupt the stored entry
+    entry = cache._entry_path(cache.key_for(score_path))
+    with open(entry, "wb") as f:
+        f.write(b"not a pickle")
+
+    score, hit = cache.parse(score_path)
+
+    assert hit is False
+    assert len(score.flatten().notes) == 8
+    assert cache.stats["errors"] == 1
+    # The entry is rewritten with a valid payload
+    assert cache.load(cache.key_for(score_path)) is not None
+
+
+def test_eviction_keeps_cache_under_limit(tmp_path):
+    small_cache = score_cache.ScoreCache(cache_dir=str(tmp_path / "cache"), max_bytes=1)
+    probe = score_cache.ScoreCache(cache_dir=str(tmp_path / "probe"), max_bytes=1 << 30)
+    first = write_score(tmp_path / "a.musicxml")
+    probe.parse(first)
+    entry_size = probe.total_bytes()
+
+    small_cache.max_bytes = int(entry_size * 1.5)
+    small_cache.parse(first)
+    small_cache.parse(write_score(tmp_path / "b.musicxml", start_midi=65))
+
+    assert small_cache.total_bytes() <= small_cache.max_bytes
+    assert small_cache.stats["evictions"] >= 1
+    assert len(os.listdir(small_cache.cache_dir)) == 1
@@ -0,0 +1,147 @@
+# backend/test/unit/services/test_score_ir.py
+
+import numpy as np
+import pytest
+
+from backend.app.services import score_ir
+from backend.app.services.score_ir import ScoreIR, assign_measures, build_score_ir
+
+
+# --- music21 source ---
+
+def test_from_music21_expands_chords_and_collects_side_tables():
+    music21 = pytest.importorskip("music21")
+    from music21 import chord, meter, note, stream, tempo
+
+    part = stream.Part()
+    m1 = stream.Measure(number=1)
+    m1.append(meter.TimeSignature("3/4"))
+    m1.append(tempo.MetronomeMark(number=90))
+    n = note.Note("C4", quarterLength=1.0)
+    n.lyric = "Amen"
+    m1.append(n)
+    m1.append(chord.Chord(["E4", "G4"], quarterLength=2.0))
+    m2 = stream.Measure(number=2)
+    m2.append(note.Note("D4", quarterLength=3.0))
+    part.append([m1, m2])
+    score = stream.Score([part])
+
+    ir = build_score_ir(score)
+
+    assert ir.source == "music21"
+    assert list(ir.notes["pitch"]) == [60, 64, 67, 62]
+    assert list(ir.notes["onset"]) == [0.0, 1.0, 1.0, 3.0]
+    assert list(ir.notes["measure"]) == [1, 1, 1, 2]
+    assert ir.lyric_texts == ["Amen"]
+    assert ir.tempos["qpm"][0] == pytest.approx(90.0)
+    assert (ir.time_signatures["numerator"][0], ir.time_signatures["denominator"][0]) == (3, 4)
+    assert ir.end_time == pytest.approx(6.0)
+
+
+def test_from_music21_merges_tied_notes_across_barlines():
+    music21 = pytest.importorskip("music21")
+    from music21 import chord, meter, note, stream, tie
+
+    part = stream.Part()
+    m1 = stream.Measure(number=1)
+    m1.append(meter.TimeSignature("2/4"))
+    m1.append(note.Note("C4", quarterLength=1.0))
+    held = note.Note("E4", quarterLength=1.0)
+    held.tie = tie.Tie("start")
+    m1.append(held)
+    m2 = stream.Measure(number=2)
+    middle = note.Note("E4", quarterLength=2.0)
+    middle.tie = tie.Tie("continue")
+    m2.append(middle)
+    m3 = stream.Measure(number=3)
+    last = note.Note("E4", quarterLength=1.0)
+    last.tie = tie.Tie("stop")
+    m3.append(last)
+    tied_chord = chord.Chord(["G4", "B4"], quarterLength=1.0)
+    tied_chord.tie = tie.Tie("start")
+    m3.append(tied_chord)
+    m4 = stream.Measure(number=4)
+    chord_end = chord.Chord(["G4", "B4"], quarterLength=1.0)
+    chord_end.tie = tie.Tie("stop")
+    m4.append(chord_end)
+    m4.append(note.Note("E4", quarterLength=1.0))
+    part.append([m1, m2, m3, m4])
+
+    ir = build_score_ir(stream.Score([part]))
+
+    assert list(ir.notes["pitch"]) == [60, 64, 67, 71, 64]
+    assert list(ir.notes["onset"]) == [0.0, 1.0, 5.0, 5.0, 7.0]
+    assert list(ir.notes["duration"]) == [1.0, 4.0, 2.0, 2.0, 1.0]
+    assert list(ir.notes["measure"]) == [1, 1, 3, 3, 4]
+
+
+def test_from_music21_dedupes_tempo_marks_repeated_per_part():
+    music21 = pytest.importorskip("music21")
+    from music21 import note, stream, tempo
+
+    parts = []
+    for pitch in ("C4", "C3"):
+        part = stream.Part()
+        measure = stream.Measure(number=1)
+        measure.append(tempo.MetronomeMark(number=100))
+        measure.append(note.Note(pitch, quarterLength=4.0))
+        part.append(measure)
+        parts.append(part)
+
+    ir = build_score_ir(stream.Score(parts))
+
+    assert list(ir.tempos["onset"]) == [0.0]
+    assert ir.tempos["qpm"][0] == pytest.approx(100.0)
+
+
+def test_memory_per_note_is_small():
+    assert score_ir.NOTE_DTYPE.itemsize <= 24
+
+
+# --- mido source ---
+
+def test_from_mido_pairs_note_on_off_and_assigns_measures():
+    mido = pytest.importorskip("mido")
+
+    mid = mido.MidiFile(type=1, ticks_per_beat=480)
+    meta = mido.MidiTrack()
+    meta.append(mido.MetaMessage("time_signature", numerator=4, denominator=4, time=0))
+    meta.append(mido.MetaMessage("set_tempo", tempo=500000, time=0))
+    meta.append(mido.MetaMessage("time_signature", numerator=3, denominator=4, time=1920))
+    track = mido.MidiTrack()
+    track.append(mido.MetaMessage("lyrics", text="la", time=0))
+    track.append(mido.Message("note_on", note=60, velocity=100, time=0))
+    track.append(mido.Message("note_on", note=60, velocity=0, time=480)) # note_on vel 0 == note_off
+    track.append(mido.Message("note_on", note=67, velocity=80, time=1440))
+    track.append(mido.Message("note_off", note=67, velocity=0, time=960))
+    mid.tracks.extend([meta, track])
+
+    ir = build_score_ir(mid)
+
+    assert ir.source == "mido"
+    assert list(ir.notes["pitch"]) == [60, 67]
+    assert list(ir.notes["onset"]) == [0.0, 4.0]
+    assert list(ir.notes["duration"]) == [1.0, 2.0]
+    assert list(ir.notes["velocity"]) == [100, 80]
+    assert list(ir.notes["part"]) == [1, 1]
+    assert list(ir.notes["measure"]) == [1, 2]
+    assert ir.lyric_texts == ["la"]
+    assert ir.tempos["qpm"][0] == pytest.approx(120.0)
+
+
+def test_assign_measures_across_time_signature_change():
+    ts = np.array([(0.0, 4, 4, -1), (8.0, 3, 4, -1)], dtype=score_ir.TIME_SIGNATURE_DTYPE)
+    onsets = np.array([0.0, 3.9, 4.0, 8.0, 10.9, 11.0])
+
+    assert list(assign_measures(onsets, ts)) == [1, 1, 2, 3, 3, 4]
+
+
+def test_assign_measures_defaults_to_common_time():
+    empty = np.zeros(0, dtype=score_ir.TIME_SIGNATURE_DTYPE)
+
+    assert list(assign_measures(np.array([0.0, 4.0, 9.0]), empty)) == [1, 2, 3]
+
+
+def test_unsupported_representation_returns_none():
+    assert build_score_ir({"notes_data": "mock_omr_result"}) is None
+    assert len(ScoreIR(np.zeros(0, dtype=score_ir.NOTE_DTYPE))) == 0
@@ -0,0 +1,65 @@
+import pytest
+
+from backend.app.services import shakespeare_translation as st
+from backend.app.services.llm_resilience import CircuitOpenError
+from backend.app.services.translation_cache import TranslationCache
+
+LYRICS = "Amazing grace\nHow sweet the sound\nSing it once\nSing it again\nSing it once\nSing it again"
+
+
+@pytest.fixture(autouse=True)
+def memory_only_cache(monkeypatch):
+    monkeypatch.setattr(st, "translation_cache", TranslationCache())
+
+
+def test_translate_text_packs_dedupes_and_restores_repeats():
+    packed_calls = []
+
+    def translate_pack(text):
+        packed_calls.append(text)
+        return text.upper() # marker lines survive upper-casing
+
+    result = st.translate_text(LYRICS, original_language="en", translate_one=str.upper, translate_pack=translate_pack)
+
+    assert result["status"] == "success"
+    assert result["full_translated_text"] == LYRICS.upper()
+    assert result["dedup"] is not None
+    assert len(packed_calls) == 1
+    assert "deferred_chunks" not in result
+
+
+def test_translate_text_reports_deferred_chunks(monkeypatch):
+    monkeypatch.setattr(st, "TRANSLATION_PACKING", False)
+
+    def translate_one(text):
+        raise CircuitOpenError(retry_at=1234.0)
+
+    result = st.translate_text("Amazing grace", original_language="en", translate_one=translate_one)
+
+    assert result["status"] == "deferred"
+    assert result["deferred_chunks"] == [0]
+    assert result["retry_at"] == 1234.0
+    assert result["full_translated_text"] is None
+
+
+def test_merge_page_translations_keeps_page_order_and_marks_failed_pages():
+    pages = [
+        {"page_index": 0, "text": "Amazing grace",
+         "result": st.translate_text("Amazing grace", "en", translate_one=str.upper, translate_pack=str.upper)},
+        {"page_index": 1, "text": "How sweet", "error": "ValueError: provider error"},
+        {"page_index": 2, "text": "the sound",
+         "result": st.translate_text("the sound", "en", translate_one=str.upper, translate_pack=str.upper)},
+    ]
+
+    merged = st.merge_page_translations(pages)
+
+    assert merged["status"] == "completed_with_errors"
+    assert [res["chunk_index"] for res in merged["translation_results_per_chunk"]] == [0, 1, 2]
+    assert [res["page"] for res in merged["translation_results_per_chunk"]] == [1, 2, 3]
+    assert [page["status"] for page in merged["pages"]] == ["success", "failed", "success"]
+    assert merged["full_translated_text"] is None
+
+    merged = st.merge_page_translations([pages[0], pages[2]])
+    assert merged["status"] == "success"
+    assert merged["original_language"] == "en"
+    assert merged["full_translated_text"] == "AMAZING GRACE\nTHE SOUND"
@@ -0,0 +1,155 @@
+# backend/test/unit/services/test_spot_interruption.py
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from backend.app.services.spot_interruption import (
+    FileNoticeSource, ImdsNoticeSource, InFlightTasks, LocalCheckpointStore, S3CheckpointStore,
+    SpotInterruptionWatcher, step_succeeded,
+)
+
+
+class FakeSQS:
+    def __init__(self):
+        self.visibility = []
+
+    def change_message_visibility(self, QueueUrl, ReceiptHandle, VisibilityTimeout):
+        self.visibility.append((QueueUrl, ReceiptHandle, VisibilityTimeout, time.monotonic()))
+
+
+def test_file_notice_source(tmp_path):
+    path = tmp_path / "notice"
+    source = FileNoticeSource(str(path))
+    assert source.fetch() is None
+    path.write_text("")
+    assert source.fetch()["action"] == "terminate"
+    path.write_text(json.dumps({"action": "stop", "time": "2026-10-19T08:22:00Z"}))
+    assert source.fetch() == {"action": "stop", "time": "2026-10-19T08:22:00Z"}
+
+
+def test_watcher_requeues_in_flight_messages_within_a_poll(tmp_path):
+    path = tmp_path / "notice"
+    sqs, checkpoints, tasks = FakeSQS(), LocalCheckpointStore(str(tmp_path / "ckpt")), InFlightTasks()
+    watcher = SpotInterruptionWatcher(FileNoticeSource(str(path)), poll_seconds=0.02)
+    watcher.on_notice(lambda notice: tasks.requeue_all(sqs, checkpoints))
+    record = tasks.begin("q-standard", "rh-1", "task-1")
+    record["completed_steps"]["extract_text_from_score"] = {"extracted_text_content": "Ave Maria"}
+    watcher.start()
+    try:
+        time.sleep(0.1)
+        assert not watcher.interrupted.is_set()
+        noticed = time.monotonic()
+        path.write_text('{"action": "terminate", "time": "2026-10-19T08:22:00Z"}')
+        assert watcher.interrupted.wait(2)
+        deadline = time.monotonic() + 2
+        while not sqs.visibility and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        watcher.stop()
+    assert [v[:3] for v in sqs.visibility] == [("q-standard", "rh-1", 0)]
+    assert sqs.visibility[0][3] - noticed < 1.0
+    assert checkpoints.load("task-1") == {"extract_text_from_score": {"extracted_text_content": "Ave Maria"}}
+    assert watcher.snapshot()["notice"]["action"] == "terminate"
+
+
+def test_requeue_happens_once_and_skips_empty_checkpoint(tmp_path):
+    sqs, checkpoints, tasks = FakeSQS(), LocalCheckpointStore(str(tmp_path)), InFlightTasks()
+    record = tasks.begin("q-bulk", "rh-2", "task-2")
+    tasks.requeue_all(sqs, checkpoints)
+    tasks.requeue(record, sqs, checkpoints)
+    assert len(sqs.visibility) == 1
+    assert checkpoints.load("task-2") == {}
+    tasks.end(record)
+    assert tasks.snapshot() == {"requeued": 1, "checkpoints_saved": 0, "requeue_errors": 0, "in_flight": 0}
+
+
+def test_local_checkpoint_store_roundtrip(tmp_path):
+    store = LocalCheckpointStore(str(tmp_path))
+    store.save("t", {"generate_music_file": {"generated_music_file": {"status": "success"}}})
+    assert store.load("t")["generate_music_file"]["generated_music_file"]["status"] == "success"
+    store.delete("t")
+    store.delete("t")
+    assert store.load("t") == {}
+
+
+class FakeS3:
+    class exceptions:
+        class NoSuchKey(Exception):
+            pass
+
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        self.objects[(Bucket, Key)] = Body
+
+    def get_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise self.exceptions.NoSuchKey()
+        body = self.objects[(Bucket, Key)]
+        return {"Body": type("Body", (), {"read": lambda self: body})()}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+
+def test_s3_checkpoint_store():
+    client = FakeS3()
+    store = S3CheckpointStore("bucket", client)
+    assert store.load("t") == {}
+    store.save("t", {"translate_to_shakespearean": {"x": 1}})
+    assert ("bucket", "checkpoints/t.json") in client.objects
+    assert store.load("t") == {"translate_to_shakespearean": {"x": 1}}
+
+
+@pytest.mark.parametrize("outputs, expected", [
+    ({"extracted_text_content": "la la", "extract_text_from_score_status": "success"}, True),
+    ({"shakespearean_translation": {"status": "failed", "error": "x"}}, False),
+    ({"translate_to_shakespearean_status": "deferred"}, False),
+    ({"generated_music_file": {"status": "skipped"}}, False),
+    ({"generate_music_file_error": "boom"}, False),
+])
+def test_step_succeeded(outputs, expected):
+    assert step_succeeded(outputs) is expected
+
+
+class FakeImds(BaseHTTPRequestHandler):
+    notice = None
+
+    def do_PUT(self):
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b"token-123")
+
+    def do_GET(self):
+        if self.headers.get("X-aws-ec2-metadata-token") != "token-123":
+            self.send_response(401)
+            self.end_headers()
+            return
+        if FakeImds.notice is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(json.dumps(FakeImds.notice).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+def test_imds_notice_source():
+    server = HTTPServer(("127.0.0.1", 0), FakeImds)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        source = ImdsNoticeSource(f"http://127.0.0.1:{server.server_port}")
+        FakeImds.notice = None
+        assert source.fetch() is None
+        FakeImds.notice = {"action": "terminate", "time": "2026-10-19T08:22:00Z"}
+        assert source.fetch() == FakeImds.notice
+    finally:
+        server.shutdown()
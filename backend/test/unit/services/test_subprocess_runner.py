@@ -0,0 +1,99 @@
+import asyncio
+import sys
+import threading
+import time
+
+import pytest
+
+from backend.app.services.subprocess_runner import RingBuffer, SubprocessRunner, resource_usage
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="process groups and wait4 are POSIX-only")
+
+
+def python(code):
+    return [sys.executable, "-c", code]
+
+
+def test_output_exit_code_and_resource_usage():
+    runner = SubprocessRunner(max_concurrency=2)
+    result = runner.run(python("import sys; print('out'); print('err', file=sys.stderr); sys.exit(3)"))
+
+    assert result["exit_code"] == 3
+    assert result["stdout"] == "out\n" and result["stderr"] == "err\n"
+    assert result["max_rss_kb"] > 0 and result["cpu_user_seconds"] >= 0
+    assert set(resource_usage(result)) >= {"exit_code", "wall_seconds", "max_rss_kb", "cpu_user_seconds"}
+    assert runner.stats["nonzero_exits"] == 1
+
+
+def test_output_is_kept_in_a_bounded_ring_buffer():
+    runner = SubprocessRunner(output_bytes=1024)
+    result = runner.run(python("import sys\nfor i in range(100000): sys.stdout.write(f'{i}\\n')"))
+
+    assert result["stdout_bytes"] > 500000
+    assert len(result["stdout"]) <= 1024 and result["output_truncated"]
+    assert result["stdout"].endswith("99999\n")
+
+
+def test_ring_buffer_keeps_the_tail():
+    buffer = RingBuffer(capacity=4)
+    for chunk in (b"ab", b"cdef", b"g"):
+        buffer.write(chunk)
+    assert buffer.getvalue() == "defg" and buffer.total_bytes == 7 and buffer.truncated
+
+
+def test_timeout_kills_the_whole_process_group():
+    runner = SubprocessRunner(kill_grace=0.5)
+    start = time.monotonic()
+    # the grandchild keeps the pipes open; it must be killed with the group
+    result = runner.run(["sh", "-c", "sleep 30 & sleep 30"], timeout=0.3)
+
+    assert result["timed_out"]
+    assert time.monotonic() - start < 5
+    assert runner.stats["timeouts"] == 1
+
+
+def test_output_is_streamed_while_the_command_runs():
+    lines = []
+    runner = SubprocessRunner()
+    result = runner.run(python("import time; print('ready', flush=True); time.sleep(0.5); print('done')"),
+                        on_output=lambda stream, line: lines.append((stream, line, time.monotonic())))
+    finished = time.monotonic()
+
+    assert [(stream, line) for stream, line, _ in lines] == [("stdout", "ready"), ("stdout", "done")]
+    assert finished - lines[0][2] >= 0.4
+    assert result["exit_code"] == 0
+
+
+def test_concurrency_is_limited():
+    runner = SubprocessRunner(max_concurrency=1)
+    threads = [threading.Thread(target=runner.run, args=(["sleep", "0.3"],)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert runner.stats["queue_seconds"] >= 0.2
+
+
+def test_missing_executable_raises():
+    with pytest.raises(FileNotFoundError):
+        SubprocessRunner().run(["definitely-not-a-real-tool"])
+
+
+def test_async_run_and_cancellation_kills_the_process():
+    runner = SubprocessRunner(kill_grace=0.5)
+    lines = []
+
+    async def main():
+        result = await runner.run_async(python("print('hello')"), on_output=lambda s, line: lines.append(line))
+        task = asyncio.ensure_future(runner.run_async(["sleep", "30"]))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        start = time.monotonic()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return result, time.monotonic() - start
+
+    result, cancel_seconds = asyncio.run(main())
+    assert result["stdout"] == "hello\n" and lines == ["hello"]
+    assert cancel_seconds < 3
+    assert runner.stats["cancelled"] == 1
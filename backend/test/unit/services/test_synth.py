@@ -0,0 +1,90 @@
+# backend/test/unit/services/test_synth.py
+
+import io
+import wave
+
+import numpy as np
+import pytest
+
+from backend.app.services import synth
+from backend.app.services.s3_multipart import S3MultipartWriter
+from backend.app.services.score_ir import NOTE_DTYPE, TEMPO_DTYPE, ScoreIR
+
+from .test_s3_multipart import FakeS3Client
+
+SAMPLE_RATE = 8000
+
+
+def scale_ir(num_notes=8, qpm=120.0):
+    notes = np.array([(i * 0.5, 0.5, 60 + i, 100, 0, 1) for i in range(num_notes)], dtype=NOTE_DTYPE)
+    return ScoreIR(notes, tempos=np.array([(0.0, qpm)], dtype=TEMPO_DTYPE))
+
+
+def test_quarters_to_seconds_follows_tempo_changes():
+    tempos = np.array([(0.0, 60.0), (4.0, 120.0)], dtype=TEMPO_DTYPE)
+
+    seconds = synth.quarters_to_seconds([0.0, 2.0, 4.0, 6.0], tempos)
+
+    assert np.allclose(seconds, [0.0, 2.0, 4.0, 5.0])
+
+
+def test_blocks_are_bounded_and_phase_continuous():
+    ir = ScoreIR(np.array([(0.0, 2.0, 69, 127, 0, 1)], dtype=NOTE_DTYPE)) # one A4 at the default 120 qpm
+    events = synth.NoteEvents(ir, SAMPLE_RATE)
+
+    small = list(synth.render_blocks(events, block_frames=256))
+    whole = np.concatenate(list(synth.render_blocks(events, block_frames=events.total_frames)))
+
+    assert max(len(b) for b in small) == 256
+    assert len(whole) == events.total_frames == SAMPLE_RATE + int(synth.RELEASE * SAMPLE_RATE)
+    assert np.allclose(np.concatenate(small), whole, atol=1e-6)
+    assert np.abs(whole).max() < 1.0
+
+
+def test_envelope_releases_to_silence():
+    events = synth.NoteEvents(scale_ir(1), SAMPLE_RATE)
+
+    audio = np.concatenate(list(synth.render_blocks(events)))
+
+    assert np.abs(audio[:10]).max() < np.abs(audio[SAMPLE_RATE // 8:SAMPLE_RATE // 4]).max() # attack
+    assert np.abs(audio[-5:]).max() < 1e-2 # released
+
+
+def test_wav_output_streams_to_s3_multipart():
+    client = FakeS3Client()
+
+    with S3MultipartWriter("bucket", "out.wav", client=client, part_size=4096) as sink:
+        stats = synth.render_audio(scale_ir(), "wav", sink, sample_rate=SAMPLE_RATE, block_frames=1024)
+
+    with wave.open(io.BytesIO(client.objects["out.wav"])) as wav:
+        assert wav.getframerate() == SAMPLE_RATE
+        assert wav.getnframes() == stats["frames"]
+    assert stats["duration_seconds"] == pytest.approx(2.0 + synth.RELEASE, abs=1e-3) # 8 eighth notes at 120 qpm
+    assert stats["realtime_factor"] > 1.0
+
+
+@pytest.mark.parametrize("output_format", ["flac", "ogg"])
+def test_soundfile_formats_through_multipart(output_format):
+    soundfile = pytest.importorskip("soundfile")
+    client = FakeS3Client()
+
+    with S3MultipartWriter("bucket", f"out.{output_format}", client=client, part_size=4096) as sink:
+        stats = synth.render_audio(scale_ir(), output_format, sink, sample_rate=SAMPLE_RATE)
+
+    data, sample_rate = soundfile.read(io.BytesIO(client.objects[f"out.{output_format}"]))
+    assert sample_rate == SAMPLE_RATE
+    assert len(data) == stats["frames"]
+
+
+def test_mp3_output():
+    pytest.importorskip("lameenc")
+    sink = io.BytesIO()
+
+    synth.render_audio(scale_ir(), "mp3", sink, sample_rate=16000)
+
+    assert sink.getvalue()[:3] == b"ID3" or sink.getvalue()[0] == 0xFF
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        synth.render_audio(scale_ir(), "aiff", io.BytesIO())
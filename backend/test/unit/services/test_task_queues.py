@@ -0,0 +1,139 @@
+from collections import Counter, deque
+
+import pytest
+
+from backend.app.services import task_queues as tq
+
+URLS = {"interactive": "q-interactive", "standard": "q-standard", "bulk": "q-bulk"}
+
+
+class FakeSQS:
+    """In-memory SQS: receive hides messages until the visibility timeout ends, visibility 0 puts them back first."""
+    def __init__(self, clock=lambda: 0.0):
+        self.clock = clock
+        self.queues = {url: deque() for url in URLS.values()}
+        self.in_flight = {}
+        self.receives = []
+        self.extensions = []
+
+    def send(self, url, body):
+        handle = f"{url}:{body}"
+        self.queues[url].append({"Body": body, "ReceiptHandle": handle})
+
+    def _expire(self):
+        for handle, (url, message, visible_at) in list(self.in_flight.items()):
+            if self.clock() >= visible_at:
+                del self.in_flight[handle]
+                self.queues[url].append(message)
+
+    def receive_message(self, QueueUrl, MaxNumberOfMessages, WaitTimeSeconds, VisibilityTimeout):
+        self._expire()
+        self.receives.append((QueueUrl, MaxNumberOfMessages, WaitTimeSeconds))
+        queue = self.queues[QueueUrl]
+        messages = [queue.popleft() for _ in range(min(MaxNumberOfMessages, len(queue)))]
+        for message in messages:
+            self.in_flight[message["ReceiptHandle"]] = (QueueUrl, message, self.clock() + VisibilityTimeout)
+        return {"Messages": messages} if messages else {}
+
+    def delete_message(self, QueueUrl, ReceiptHandle):
+        self._expire()
+        url, _, _ = self.in_flight.pop(ReceiptHandle) # KeyError: already visible again
+        assert url == QueueUrl
+
+    def change_message_visibility(self, QueueUrl, ReceiptHandle, VisibilityTimeout):
+        self._expire()
+        url, message, _ = self.in_flight.pop(ReceiptHandle) # KeyError: already visible again
+        assert url == QueueUrl
+        if VisibilityTimeout == 0:
+            self.queues[url].appendleft(message)
+        else:
+            self.in_flight[ReceiptHandle] = (url, message, self.clock() + VisibilityTimeout)
+            self.extensions.append(message["Body"])
+
+
+def fill(sqs, priority, count):
+    for i in range(count):
+        sqs.send(URLS[priority], f"{priority}-{i}")
+
+
+def test_weighted_share_when_all_queues_are_backlogged():
+    sqs = FakeSQS()
+    for priority in URLS:
+        fill(sqs, priority, 100)
+    poller = tq.WeightedQueuePoller(sqs, URLS, weights={"interactive": 6, "standard": 3, "bulk": 1}, prefetch=1)
+
+    taken = Counter(poller.next_message()["priority"] for _ in range(100))
+
+    assert taken == {"interactive": 60, "standard": 30, "bulk": 10}
+
+
+def test_lower_priorities_are_not_starved_and_empty_queues_are_skipped():
+    sqs = FakeSQS()
+    fill(sqs, "bulk", 3)
+    poller = tq.WeightedQueuePoller(sqs, URLS, prefetch=10)
+
+    bodies = [poller.next_message()["message"]["Body"] for _ in range(3)]
+
+    assert bodies == ["bulk-0", "bulk-1", "bulk-2"]
+    assert poller.next_message() is None
+    assert sqs.receives[-1] == ("q-interactive", 1, tq.TASK_QUEUE_IDLE_WAIT_SECONDS) # idle long poll
+
+
+def test_interactive_message_preempts_prefetched_bulk_messages():
+    sqs = FakeSQS()
+    fill(sqs, "bulk", 5)
+    poller = tq.WeightedQueuePoller(sqs, URLS, prefetch=5)
+    assert poller.next_message()["message"]["Body"] == "bulk-0" # bulk-1..4 prefetched
+
+    fill(sqs, "interactive", 1)
+    polled = poller.next_message()
+
+    assert polled["priority"] == "interactive" and polled["queue_url"] == "q-interactive"
+    assert poller.stats["preemptions"] == 1 and poller.stats["released"] == 4
+    assert sorted(m["Body"] for m in sqs.queues["q-bulk"]) == ["bulk-1", "bulk-2", "bulk-3", "bulk-4"]
+    assert poller.next_message()["priority"] == "bulk"
+
+
+def test_buffered_messages_do_not_outlive_visibility_timeout():
+    now = [0.0]
+    sqs = FakeSQS(clock=lambda: now[0])
+    fill(sqs, "standard", 4)
+    poller = tq.WeightedQueuePoller(sqs, URLS, prefetch=4, visibility_timeout=300, max_age_fraction=0.5,
+                                    clock=lambda: now[0])
+
+    processed = []
+    for seconds in (120, 80, 250, 10): # task durations; the first receive prefetches standard-1..3
+        polled = poller.next_message()
+        now[0] += seconds
+        # fails if the message became visible again (another worker could have taken it) while buffered/processed
+        sqs.delete_message(QueueUrl=polled["queue_url"], ReceiptHandle=polled["message"]["ReceiptHandle"])
+        processed.append(polled["message"]["Body"])
+
+    assert sorted(processed) == ["standard-0", "standard-1", "standard-2", "standard-3"]
+    assert sqs.extensions[0] == "standard-1" # popped after 120s: timer restarted for its processing
+    assert poller.stats["expired_prefetch"] == 3 # waited >= 150s: released and received afresh
+    assert not sqs.in_flight and not sqs.queues["q-standard"]
+
+
+def test_single_queue_url_is_shared_by_all_priorities():
+    urls = tq.task_queue_urls({"SQS_QUEUE_URL": "q-main", "SQS_QUEUE_URL_BULK": "q-bulk"})
+    assert urls == {"interactive": "q-main", "standard": "q-main", "bulk": "q-bulk"}
+
+    poller = tq.WeightedQueuePoller(FakeSQS(), urls)
+    assert [q["priority"] for q in poller.queues] == ["interactive", "bulk"]
+
+
+def test_route_priority():
+    mb = 1024 * 1024
+    assert tq.route_priority(".png", 300 * 1024) == "interactive"
+    assert tq.route_priority(".pdf", 300 * 1024) == "standard" # multi-page input
+    assert tq.route_priority(".mid", 5 * mb) == "standard"
+    assert tq.route_priority(".pdf", 50 * mb) == "bulk"
+    assert tq.route_priority(".png", 1024, batch=True) == "bulk"
+    assert tq.route_priority(".pdf", 50 * mb, requested="interactive") == "interactive"
+    with pytest.raises(ValueError):
+        tq.route_priority(".png", 1024, requested="urgent")
+
+
+def test_parse_weights():
+    assert tq.parse_weights("interactive:8, bulk:2,unknown:5") == {"interactive": 8, "standard": 1, "bulk": 2}
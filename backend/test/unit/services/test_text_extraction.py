@@ -0,0 +1,61 @@
+# backend/test/unit/services/test_text_extraction.py
+
+import pytest
+
+music21 = pytest.importorskip("music21")
+from music21 import expressions, meter, note, stream
+
+from backend.app.services import text_extraction
+
+
+def build_score():
+    part = stream.Part()
+    for measure_number, words in enumerate([["Hel", "lo"], ["wor", "ld"]], start=1):
+        measure = stream.Measure(number=measure_number)
+        if measure_number == 1:
+            measure.append(meter.TimeSignature("2/4"))
+        for word in words:
+            n = note.Note("C4", quarterLength=1.0)
+            n.lyric = word
+            measure.append(n)
+        part.append(measure)
+    part.measure(2).insert(1.0, expressions.TextExpression("dolce"))
+    return stream.Score([part])
+
+
+def test_lyrics_and_expressions_use_absolute_offsets():
+    elements = text_extraction.extract_text_elements(build_score())
+
+    assert elements == [
+        {"type": "Lyric", "content": "Hel", "offset": 0.0},
+        {"type": "Lyric", "content": "lo", "offset": 1.0},
+        {"type": "Lyric", "content": "wor", "offset": 2.0},
+        # same offset: music21's sort order puts expressions before notes, as in flat
+        {"type": "TextExpression", "content": "dolce", "offset": 3.0},
+        {"type": "Lyric", "content": "ld", "offset": 3.0},
+    ]
+
+
+def test_extract_text_joins_contents_line_by_line():
+    extracted_text, elements = text_extraction.extract_text(build_score())
+
+    assert extracted_text == "Hel\nlo\nwor\ndolce\nld\n"
+    assert len(elements) == 5
+
+
+def test_unknown_class_names_are_ignored_and_resolved_once():
+    text_extraction.resolve_text_classes.cache_clear()
+    names = ("TextExpression", "NoSuchMusic21Class")
+
+    first = text_extraction.resolve_text_classes(names)
+    second = text_extraction.resolve_text_classes(names)
+
+    assert first == (expressions.TextExpression,)
+    assert second is first
+    assert text_extraction.resolve_text_classes.cache_info().hits == 1
+
+
+def test_class_filter_excludes_lyrics():
+    elements = text_extraction.extract_text_elements(build_score(), ("TextExpression",))
+
+    assert [e["content"] for e in elements] == ["dolce"]
@@ -0,0 +1,69 @@
+from backend.app.services import token_chunker
+
+
+def words(text):
+    return len(text.split())
+
+
+def test_packs_stanzas_up_to_budget_without_splitting_them():
+    stanzas = ["one two\nthree four", "five six\nseven eight", "nine ten\neleven twelve"]
+    chunks = token_chunker.split_by_tokens("\n\n".join(stanzas), max_tokens=13, count=words) # 6 per stanza + blank line
+
+    assert chunks == ["\n\n".join(stanzas[:2]), stanzas[2]]
+
+
+def test_oversized_stanza_is_split_on_lines_and_chunks_do_not_overlap():
+    lines = [f"w{i} x y" for i in range(10)]
+    text = "\n".join(lines)
+    chunks = token_chunker.split_by_tokens(text, max_tokens=8, count=words)
+
+    assert all(sum(words(line) + 1 for line in chunk.split("\n")) <= 8 for chunk in chunks)
+    assert "\n".join(chunks) == text
+
+
+def test_long_line_without_spaces_is_split_by_characters():
+    line = "가" * 50
+    chunks = token_chunker.split_by_tokens(line, max_tokens=10, count=len)
+
+    assert "".join(chunks) == line
+    assert all(len(chunk) <= 10 for chunk in chunks)
+
+
+def test_estimated_counter_weights_cjk_characters(monkeypatch):
+    monkeypatch.setattr(token_chunker, "_tiktoken_encoding", lambda model: None)
+    count = token_chunker.token_counter("gpt-3.5-turbo")
+
+    assert count("사랑해요 나의 노래") > count("my love song")
+
+
+def test_token_mode_makes_fewer_english_chunks_and_smaller_cjk_chunks(monkeypatch):
+    monkeypatch.setattr(token_chunker, "_tiktoken_encoding", lambda model: None)
+    count = token_chunker.token_counter("gpt-3.5-turbo")
+    english = "\n".join(f"Shall I compare thee to a summer's day, line {i}" for i in range(200))
+    korean = "\n".join(f"그대를 여름날에 비할 수 있을까요 {i}번째 줄" for i in range(200))
+
+    english_chunks = token_chunker.split_by_tokens(english, 1000, count)
+    korean_chunks = token_chunker.split_by_tokens(korean, 1000, count)
+
+    assert len(english_chunks) < len(english) / 1500
+    assert max(count(chunk) for chunk in korean_chunks) <= 1000
+
+
+def test_chunk_token_budget(monkeypatch):
+    monkeypatch.setattr(token_chunker, "TRANSLATION_CHUNK_MAX_TOKENS", 0)
+    assert token_chunker.context_tokens("gpt-4o-mini") == 128000
+    assert token_chunker.context_tokens("gpt-4-0613") == 8192
+    assert token_chunker.context_tokens("local-model") == token_chunker.DEFAULT_CONTEXT_TOKENS
+    budget = token_chunker.chunk_token_budget("gpt-3.5-turbo")
+    assert budget == int(16385 * token_chunker.TRANSLATION_CHUNK_CONTEXT_FRACTION)
+    assert token_chunker.chunk_token_budget("gpt-3.5-turbo", "word " * 100) < budget
+
+
+def test_chunk_token_budget_fits_model_output_cap(monkeypatch):
+    monkeypatch.setattr(token_chunker, "TRANSLATION_CHUNK_MAX_TOKENS", 0)
+    expansion = token_chunker.TRANSLATION_OUTPUT_EXPANSION
+    for model, output_cap in [("gpt-4o", 16384), ("gpt-4o-mini", 16384), ("gpt-4-turbo", 4096), ("gpt-4.1", 32768)]:
+        assert token_chunker.max_output_tokens(model) == output_cap
+        budget = token_chunker.chunk_token_budget(model, "word " * 50)
+        assert budget * expansion <= output_cap
+        assert budget < int(token_chunker.context_tokens(model) * token_chunker.TRANSLATION_CHUNK_CONTEXT_FRACTION)
@@ -0,0 +1,147 @@
+import os
+import subprocess
+import sys
+
+from backend.app.services import translation_cache as tc
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+TEMPLATE = "Translate {original_text} from {original_language}"
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.expiry[key] = ex
+
+
+def make_cache(tmp_path, **kwargs):
+    return tc.TranslationCache(persistent=tc.SQLiteTier(str(tmp_path / "cache.sqlite3")), **kwargs)
+
+
+def test_key_ignores_whitespace_but_not_language_model_or_prompt():
+    cache = tc.TranslationCache()
+    base = cache.key_for("Amen,  amen\n", "la", "gpt-3.5-turbo", TEMPLATE)
+    assert cache.key_for("  Amen, amen", "la", "gpt-3.5-turbo", TEMPLATE) == base
+    assert cache.key_for("Amen, amen", "it", "gpt-3.5-turbo", TEMPLATE) != base
+    assert cache.key_for("Amen, amen", "la", "gpt-4o", TEMPLATE) != base
+    assert cache.key_for("Amen, amen", "la", "gpt-3.5-turbo", TEMPLATE + " ") != base
+    # line breaks carry lyric structure and stay significant
+    assert cache.key_for("Amen,\namen", "la", "gpt-3.5-turbo", TEMPLATE) != base
+
+
+def test_normalize_text_uses_nfc():
+    assert tc.normalize_text("café") == tc.normalize_text("café")
+
+
+def test_get_or_translate_calls_llm_once(tmp_path):
+    cache = make_cache(tmp_path)
+    calls = []
+
+    def translate(text):
+        calls.append(text)
+        return f"<{text}>"
+
+    assert cache.get_or_translate("Gloria", "la", "m", TEMPLATE, translate) == "<Gloria>"
+    assert cache.get_or_translate("Gloria ", "la", "m", TEMPLATE, translate) == "<Gloria>"
+    assert calls == ["Gloria"]
+    assert cache.snapshot()["misses"] == 1
+    assert cache.snapshot()["memory_hits"] == 1
+    assert cache.snapshot()["stores"] == 1
+
+
+def test_persistent_tier_survives_new_process(tmp_path):
+    make_cache(tmp_path).get_or_translate("Kyrie", "el", "m", TEMPLATE, lambda text: "Lord, have mercy")
+
+    fresh = make_cache(tmp_path)
+    assert fresh.get_or_translate("Kyrie", "el", "m", TEMPLATE, lambda text: 1 / 0) == "Lord, have mercy"
+    assert fresh.snapshot()["persistent_hits"] == 1
+    # promoted to memory
+    fresh.get_or_translate("Kyrie", "el", "m", TEMPLATE, lambda text: 1 / 0)
+    assert fresh.snapshot()["memory_hits"] == 1
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = make_cache(tmp_path, ttl=-1)
+    cache.set("k", "v")
+    assert cache.get("k") is None
+
+
+def test_empty_results_and_errors_are_not_cached(tmp_path):
+    cache = make_cache(tmp_path)
+    assert cache.get_or_translate("x", "en", "m", TEMPLATE, lambda text: "  ") == "  "
+    try:
+        cache.get_or_translate("y", "en", "m", TEMPLATE, lambda text: 1 / 0)
+    except ZeroDivisionError:
+        pass
+    assert cache.snapshot()["stores"] == 0
+
+
+def test_memory_tier_evicts_least_recently_used():
+    memory = tc.MemoryTier(max_items=2)
+    memory.set("a", "1", 60)
+    memory.set("b", "2", 60)
+    memory.get("a")
+    memory.set("c", "3", 60)
+    assert memory.get("b") is None
+    assert memory.get("a") == "1"
+
+
+def test_redis_tier_sets_ttl():
+    client = FakeRedis()
+    cache = tc.TranslationCache(persistent=tc.RedisTier(client=client), ttl=3600)
+    cache.set("abc", "thou")
+    assert client.expiry[tc.REDIS_KEY_PREFIX + "abc"] == 3600
+    assert tc.TranslationCache(persistent=tc.RedisTier(client=client)).get("abc") == "thou"
+
+
+def test_persistent_errors_degrade_to_miss():
+    class Broken:
+        name = "broken"
+
+        def get(self, key):
+            raise ConnectionError("down")
+
+        def set(self, key, value, ttl):
+            raise ConnectionError("down")
+
+    cache = tc.TranslationCache(persistent=Broken())
+    assert cache.get_or_translate("a", "en", "m", TEMPLATE, lambda text: "b") == "b"
+    assert cache.snapshot()["errors"] == 2
+    assert cache.get_or_translate("a", "en", "m", TEMPLATE, lambda text: 1 / 0) == "b"
+
+
+def test_persistent_tier_is_built_on_first_use(tmp_path):
+    built = []
+
+    def factory():
+        built.append(1)
+        return tc.SQLiteTier(str(tmp_path / "cache.sqlite3"))
+
+    cache = tc.TranslationCache(persistent_factory=factory)
+    assert built == [] and not (tmp_path / "cache.sqlite3").exists()
+
+    cache.set("abc", "thou")
+    assert cache.get("missing") is None
+    assert built == [1]
+    assert (tmp_path / "cache.sqlite3").exists()
+
+
+def test_import_does_not_create_sqlite_file(tmp_path):
+    path = tmp_path / "imported.sqlite3"
+    child = ("from backend.app.services.translation_cache import translation_cache\n"
+             "import os, sys\n"
+             "print(os.path.exists(sys.argv[1]))\n"
+             "translation_cache.get('abc')\n"
+             "print(os.path.exists(sys.argv[1]))\n")
+    env = dict(os.environ, TRANSLATION_CACHE_SQLITE_PATH=str(path))
+    env.pop("TRANSLATION_CACHE_REDIS_URL", None)
+    output = subprocess.run([sys.executable, "-c", child, str(path)], capture_output=True, text=True, check=True, env=env,
+                            cwd=REPO_ROOT)
+    assert output.stdout.split() == ["False", "True"]
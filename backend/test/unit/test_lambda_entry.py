@@ -0,0 +1,94 @@
+# backend/test/unit/test_lambda_entry.py
+
+import json
+import shutil
+
+import mido
+import pytest
+
+from backend.app import lambda_entry, task_pipeline
+
+
+class LocalS3:
+    """download_file/put_object only, backed by local files and a dict."""
+    def __init__(self, files):
+        self.files = files
+        self.objects = {}
+
+    def download_file(self, bucket, key, path):
+        shutil.copyfile(self.files[(bucket, key)], path)
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[(Bucket, Key)] = Body
+
+
+@pytest.fixture
+def s3(tmp_path, monkeypatch):
+    midi = mido.MidiFile()
+    track = mido.MidiTrack()
+    midi.tracks.append(track)
+    for i, root in enumerate([60, 65, 67, 60] * 2):
+        track.append(mido.MetaMessage("lyrics", text=f"la{i}", time=0))
+        for note in (root, root + 4, root + 7):
+            track.append(mido.Message("note_on", note=note, velocity=64, time=0))
+        track.append(mido.Message("note_off", note=root, velocity=0, time=1920))
+        track.append(mido.Message("note_off", note=root + 4, velocity=0, time=0))
+        track.append(mido.Message("note_off", note=root + 7, velocity=0, time=0))
+    path = tmp_path / "song.mid"
+    midi.save(path)
+
+    client = LocalS3({("in-bucket", "uploads/song.mid"): str(path)})
+    monkeypatch.setattr(task_pipeline, "s3_client", client)
+    monkeypatch.setattr(task_pipeline, "task_checkpoints", None)
+    monkeypatch.setattr(task_pipeline, "TASK_TMP_DIR", str(tmp_path))
+    monkeypatch.setitem(task_pipeline.STORAGE_CONFIG, "bucket_name", "out-bucket")
+    return client
+
+
+def task(task_id, **extra):
+    return {"task_id": task_id,
+            "file_location": {"type": "s3", "bucket": "in-bucket", "key": "uploads/song.mid"},
+            "processing_steps": [{"type": "extract_music_data"}, {"type": "extract_text_from_score"},
+                                 {"type": "generate_music_file", "output_formats": ["midi"]}],
+            "analysis_tasks": [{"type": "analyze_harmony"}, {"type": "analyze_form"}],
+            **extra}
+
+
+def test_direct_invocation_runs_every_step(s3):
+    result = lambda_entry.lambda_handler(task("t1"))
+
+    summary = result["results_summary"]
+    assert result["status"] == "completed"
+    for step in ("extract_music_data", "extract_text_from_score", "generate_music_file",
+                 "analyze_harmony", "analyze_form"):
+        assert summary[f"{step}_status"] == "success"
+    assert "la0" in summary["extracted_text_content"]
+    assert summary["harmony_analysis"]["results"]["count"] > 0
+    assert ("out-bucket", "results/t1/t1.mid") in s3.objects
+
+
+def test_sqs_batch_reports_only_failed_records(s3):
+    event = {"Records": [
+        {"messageId": "ok", "eventSource": "aws:sqs", "body": json.dumps(task("t2"))},
+        {"messageId": "missing", "eventSource": "aws:sqs",
+         "body": json.dumps(task("t3", file_location={"type": "s3", "bucket": "in-bucket", "key": "nope.mid"}))},
+        {"messageId": "bad-json", "eventSource": "aws:sqs", "body": "{not json"},
+    ]}
+
+    response = lambda_entry.lambda_handler(event)
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "missing"}, {"itemIdentifier": "bad-json"}]}
+    assert ("out-bucket", "results/t2/t2.mid") in s3.objects
+    assert lambda_entry.lambda_handler.stats.snapshot()["records"] >= 3
+
+
+def test_text_only_task_skips_full_midi_parse(s3):
+    payload = task("t4")
+    payload["processing_steps"] = payload["processing_steps"][:2]
+    payload["analysis_tasks"] = []
+
+    result = lambda_entry.lambda_handler(payload)
+
+    assert result["status"] == "completed"
+    assert result["results_summary"]["extract_text_from_score_status"] == "success"
+    assert "score_ir" not in result["results_summary"]
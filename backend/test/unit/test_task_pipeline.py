@@ -0,0 +1,47 @@
+# backend/test/unit/test_task_pipeline.py
+
+import json
+import os
+import subprocess
+import sys
+
+import mido
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+HEAVY_LIBRARIES = ["music21", "mido", "langchain", "langchain_openai", "pdfminer", "langdetect"]
+
+CHILD = """
+import json, sys
+heavy = json.loads(sys.argv[2])
+from backend.app.task_pipeline import process_task
+after_import = [name for name in heavy if name in sys.modules]
+result = process_task({"task_id": "t", "file_location": {"type": "onprem", "key": sys.argv[1]},
+                       "processing_steps": [{"type": "extract_music_data"}, {"type": "extract_text_from_score"}],
+                       "analysis_tasks": [{"type": "analyze_harmony"}]})
+print(json.dumps({"after_import": after_import, "after_task": [name for name in heavy if name in sys.modules],
+                  "status": result["status"], "text": result["results_summary"].get("extracted_text_content")}))
+"""
+
+
+def test_worker_import_is_lazy_and_midi_task_loads_only_mido(tmp_path):
+    midi = mido.MidiFile()
+    track = mido.MidiTrack()
+    midi.tracks.append(track)
+    track.append(mido.MetaMessage("lyrics", text="hello"))
+    track.append(mido.Message("note_on", note=60, velocity=64, time=0))
+    track.append(mido.Message("note_off", note=60, velocity=0, time=480))
+    path = tmp_path / "song.mid"
+    midi.save(path)
+
+    env = dict(os.environ, TASK_TMP_DIR=str(tmp_path))
+    env.pop("S3_BUCKET_NAME", None)
+    env.pop("SPOT_CHECKPOINT_DIR", None)
+    output = subprocess.run([sys.executable, "-c", CHILD, str(path), json.dumps(HEAVY_LIBRARIES)],
+                            capture_output=True, text=True, check=True, env=env, cwd=REPO_ROOT)
+    report = json.loads(output.stdout.strip().splitlines()[-1])
+
+    assert report["after_import"] == []
+    # the music21 Stream check (instance_of) must not import music21 for a mido input
+    assert report["after_task"] == ["mido"]
+    assert report["status"] == "completed"
+    assert "hello" in report["text"]
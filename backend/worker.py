@@ -8,6 +8,7 @@ import uuid # 결과 파일 이름 등에 사용될 수 있음
 # 파일 다운로드 서비스 임포트 (상대 경로 사용)
 # backend/app/services 디렉토리의 모듈을 임포트합니다.
 from .services.s3_service import download_file_from_s3 # S3 다운로드 함수가 있다고 가정
+from .services.llm_pool import llm_pool # 워커 공유 LLM 클라이언트/체인 (HTTP 연결 재사용)
 
 # PDF 텍스트 추출 라이브러리 임포트
 from pdfminer.high_level import extract_text as pdf_extract_text
@@ -164,9 +165,8 @@ def process_task(task_payload: dict):
                         Original Text: "{original_text}"
                         Shakespearean Style Translation:"""
 
-                        PROMPT = PromptTemplate(input_variables=["original_text"], template=prompt_template)
-                        llm = ChatOpenAI(model=task_payload.get("model", "gpt-3.5-turbo"), temperature=0.7)
-                        chain = LLMChain(llm=llm, prompt=PROMPT)
+                        # 작업마다 새로 만들지 않고 워커 공유 체인을 사용 (keep-alive 연결 재사용)
+                        chain = llm_pool.get_chain(prompt_template, task_payload.get("model", "gpt-3.5-turbo"), 0.7)
 
                         try:
                             # 실제 구현 시 토큰 제한 고려 분할 처리 필수!
@@ -203,46 +203,19 @@ def process_task(task_payload: dict):
 
             elif step_type == "analyze_harmony":
                 # 화성 분석 로직 구현
-                if isinstance(music_data_representation, stream.Stream):
-                    print("워커: 화성 분석 시작 (Music21 예시)...")
+                if score_ir is not None:
+                    print("워커: 화성 분석 시작 (음이름 집합 룩업 테이블)...")
                     step_status = "processing"
                     try:
-                        # Music21의 화성 분석 모듈 사용
-                        # analyze() 메소드는 Stream에 직접 적용하거나 analysis.harmony 모듈 사용
-                        # 예시: 화음 분석 결과를 Stream에 삽입
-                        # harmony_analyzer = analysis.harmony.HarmonicAnalysis(music_data_representation)
-                        # harmony_analyzer.analyze()
-                        # analysis_results_stream = harmony_analyzer.music21Object # 분석 결과가 포함된 Music21 Stream
-
-                        # 간단한 화음 리스트 추출 예시
-                        chords = music_data_representation.flat.getElementsByClass('Chord')
-                        harmony_list = []
-                        for ch in chords:
-                            try:
-                                # 화음의 근음과 형태 분석
-                                root_pitch = ch.root()
-                                quality = ch.quality()
-                                harmony_name = f"{root_pitch.name} {quality}"
-                                harmony_list.append({
-                                    "offset": ch.offset, # 악보 내 위치
-                                    "chord": ch.pitchedCommonNames, # 구성음 이름
-                                    "harmony": harmony_name # 분석된 화음 이름
-                                })
-                            except Exception as e:
-                                 # 분석 불가능한 화음 등 오류 처리
-                                 print(f"워커: 화음 분석 오류 발생: {e}")
-                                 harmony_list.append({
-                                      "offset": ch.offset,
-                                      "chord": ch.pitchedCommonNames,
-                                      "harmony": "Analysis Failed",
-                                      "error": str(e)
-                                 })
-
-
-                        print(f"워커: 화성 분석 완료. 총 {len(harmony_list)}개 화음 분석.")
+                        # 화음마다 ch.root()/ch.quality()를 호출하는 대신, 동시 발음 구간별
+                        # 12비트 음이름 집합을 만들어 룩업 테이블로 근음/형태를 한 번에 구합니다.
+                        # 결과는 화음별 dict 대신 같은 길이의 리스트(offsets, roots, qualities 등)입니다.
+                        harmony = analyze_score_harmony(score_ir)
+
+                        print(f"워커: 화성 분석 완료. 총 {harmony['count']}개 화음 분석.")
                         processed_results["harmony_analysis"] = {
                             "status": "success",
-                            "results": harmony_list
+                            "results": harmony
                         }
                         step_status = "success"
 
@@ -252,23 +225,20 @@ def process_task(task_payload: dict):
                         processed_results[f"{step_type}_error"] = str(e)
 
                 else:
-                    print("워커: Music21 Stream 객체가 없어 화성 분석 건너뜁니다.")
+                    print("워커: 악보 데이터(경량 악보 표현)가 없어 화성 분석 건너뜁니다.")
                     step_status = "skipped"
 
                 processed_results[f"{step_type}_status"] = step_status
 
             elif step_type == "analyze_form":
-                 # 형식 분석 로직 구현 (Music21 또는 다른 라이브러리 사용)
-                 if isinstance(music_data_representation, stream.Stream):
-                      print("워커: 형식 분석 시작 (Music21/다른 기법 예시)...")
+                 # 형식 분석: 마디별 특징 벡터의 자기 유사도 행렬(band 계산)로 구간 경계와 라벨을 찾습니다.
+                 if score_ir is not None:
+                      print("워커: 형식 분석 시작 (자기 유사도 행렬)...")
                       step_status = "processing"
                       try:
-                           # Music21의 분석 모듈 또는 커스텀 로직 사용
-                           # 예: 반복 구조, 주제 악구 등을 찾는 로직
-                           # form_structure = analysis.form.FormAnalysis(music_data_representation).analyze()
-                           form_sections = [{"label": "A", "start": 0, "end": 16}, {"label": "B", "start": 16, "end": 32}] # Mock 결과
+                           form_sections = analyze_score_form(score_ir) # [{"label": "A", "start": 1, "end": 9}, ...]
 
-                           print(f"워커: 형식 분석 완료 (예시). {len(form_sections)}개 섹션 식별.")
+                           print(f"워커: 형식 분석 완료. {len(form_sections)}개 섹션 식별.")
                            processed_results["form_analysis"] = {
                                "status": "success",
                                "sections": form_sections
@@ -280,7 +250,7 @@ def process_task(task_payload: dict):
                            step_status = "failed"
                            processed_results[f"{step_type}_error"] = str(e)
                  else:
-                      print("워커: Music21 Stream 객체가 없어 형식 분석 건너뜁니다.")
+                      print("워커: 악보 데이터(경량 악보 표현)가 없어 형식 분석 건너뜁니다.")
                       step_status = "skipped"
                  processed_results[f"{step_type}_status"] = step_status
 
@@ -404,7 +374,7 @@ def process_task(task_payload: dict):
 # if __name__ == "__main__": ...
 
 # 예시 2: AWS Lambda 핸들러
-# def lambda_handler(event, context): ...
+# app/lambda_entry.py의 lambda_handler (services/lambda_runtime.py, app/task_pipeline.py) 참고
 
 # 예시 3: HTTP API 호출을 받는 워커 (FastAPI 등 사용)
 # from fastapi import FastAPI, HTTPException
@@ -414,25 +384,34 @@ def process_task(task_payload: dict):
 
 # backend/app/worker.py
 
+import atexit
+import io
 import json
 import os
 import time
 import uuid
 import boto3 # S3 접근을 위해 워커에서도 boto3 필요
 
-# PDF 텍스트 추출 라이브러리 임포트
-from pdfminer.high_level import extract_text as pdf_extract_text
-
-# LangChain 및 OpenAI 라이브러리 임포트
-from langchain_openai import OpenAI, ChatOpenAI
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
-from langchain_community.document_loaders import TextLoader
-from langchain.text_splitter import CharacterTextSplitter
-
-# 음악 처리 라이브러리 임포트 (예시)
-from music21 import converter, stream # MusicXML, MIDI 파싱/생성 등
-import mido # MIDI 파일 처리
+# 무거운 라이브러리(music21, mido, langchain 등)는 처음 사용하는 단계에서 임포트 (WORKER_PREWARM으로 미리 임포트)
+# PDF 텍스트 레이어는 omr_pipeline(pdfminer), LLM 클라이언트/체인은 llm_pool(langchain)이 필요할 때 임포트
+from .services.lazy_imports import WORKER_PREWARM, instance_of, lazy_import, prewarm
+
+# 음악 처리 라이브러리 (예시)
+stream = lazy_import("music21.stream") # MusicXML, MIDI 파싱/생성 등 (파싱은 score_cache에서 music21.converter)
+mido = lazy_import("mido") # MIDI 파일 처리
+from .services.score_cache import parse_score_cached # 파싱된 악보 캐시
+from .services.score_ir import build_score_ir # 분석 단계용 경량 악보 표현
+from .services.harmony_analysis import analyze_harmony as analyze_score_harmony # 벡터화 화성 분석
+from .services.form_analysis import analyze_form as analyze_score_form # 자기 유사도 행렬 형식 분석
+from .services.text_extraction import extract_text as extract_score_text # 단일 순회 텍스트 추출
+from .services.midi_text_scan import scan_midi_text, format_text_events # MIDI 텍스트 메타 이벤트 스트리밍 스캔
+from .services.music_output import generate_outputs, step_output_formats # 여러 출력 형식 동시 생성/업로드
+from .services.llm_pool import LLM_POOL_WARM, LLM_POOL_WARM_ON_START, llm_pool, parse_warm_spec # 워커 공유 LLM 클라이언트 풀
+from .services.omr_pipeline import PageTextStream, assemble_omr_score, iter_pages as iter_omr_pages # 페이지 병렬 OMR 입력 처리
+from .services.task_queues import WeightedQueuePoller, task_queue_urls # 우선순위별 작업 큐 가중치 폴링
+from .services.spot_interruption import ( # Spot 회수 알림 감시, 처리 중 메시지 반환, 단계 체크포인트
+    RESUMABLE_STEP_TYPES, default_checkpoint_store, in_flight_tasks, spot_watcher, step_succeeded,
+)
 # 오디오 렌더링 및 MP3 인코딩 관련 라이브러리는 더 복잡하며, 외부 도구(ffmpeg 등)가 필요할 수 있습니다.
 # 예: from pydub import AudioSegment # 오디오 처리 (ffmpeg 필요)
 
@@ -447,14 +426,21 @@ sqs_client = boto3.client("sqs")
 s3_client = boto3.client("s3")
 
 # SQS 큐 URL 및 스토리지 설정 로드
-WORKER_SQS_QUEUE_URL = os.getenv("SQS_QUEUE_URL")
+# 우선순위별 큐 (SQS_QUEUE_URL_INTERACTIVE/STANDARD/BULK, 없으면 SQS_QUEUE_URL 하나를 함께 사용)
+WORKER_TASK_QUEUE_URLS = task_queue_urls()
 STORAGE_CONFIG = {
     "type": os.getenv("STORAGE_TYPE", "s3"),
     "bucket_name": os.getenv("S3_BUCKET_NAME")
     # OCI 등 다른 스토리지 설정도 여기에 추가
 }
 
-if not WORKER_SQS_QUEUE_URL:
+# Spot 회수로 중단된 작업의 완료 단계 출력 (다른 워커가 이어서 처리, SPOT_CHECKPOINT_DIR 또는 S3 버킷)
+task_checkpoints = default_checkpoint_store(STORAGE_CONFIG["bucket_name"], s3_client)
+
+# 음표 데이터 없이 텍스트만으로 처리 가능한 단계 (MIDI 입력 시 전체 파싱 생략)
+TEXT_ONLY_STEP_TYPES = {"extract_music_data", "extract_text_from_score", "translate_to_shakespearean"}
+
+if not WORKER_TASK_QUEUE_URLS:
     print("경고: SQS_QUEUE_URL 환경 변수가 설정되지 않았습니다. 워커가 메시지를 받지 못합니다.")
 if not STORAGE_CONFIG["bucket_name"]:
     print("경고: 스토리지 버킷 이름이 설정되지 않았습니다. 파일 다운로드/업로드가 작동하지 않습니다.")
@@ -482,75 +468,73 @@ def upload_local_file_to_s3(local_path: str, bucket_name: str, object_key: str):
          raise
 # backend/app/worker.py (부분 코드)
 
-import subprocess
 import sys # 에러 로깅에 필요
 
+from .services.subprocess_runner import CommandTimeoutError, resource_usage, subprocess_runner # 외부 도구 실행 (타임아웃/출력 제한)
+
 # ... (다른 임포트 유지) ...
 
-def run_command(command: list, cwd: str = None, shell: bool = False, env: dict = None):
+def run_command(command: list, cwd: str = None, shell: bool = False, env: dict = None, timeout: float = None,
+                usage: dict = None):
     """
-    외부 명령어를 실행하고 표준 출력/에러를 반환합니다.
+    외부 명령어를 실행하고 표준 출력을 반환합니다. 출력은 실행 중에 줄 단위로 로그에 남깁니다.
     명령어 실행 실패 시 예외를 발생시킵니다.
 
     :param command: 실행할 명령어와 인자들을 담은 문자열 리스트 (예: ['ls', '-l'])
     :param cwd: 명령어를 실행할 현재 작업 디렉토리 경로
     :param shell: 쉘을 통해 명령어 실행 여부 (보안상 False 권장, 문자열 명령 사용 시 True)
     :param env: 명령어 실행 시 사용할 환경 변수 딕셔너리 (None 시 현재 환경 사용)
-    :return: 명령어 실행의 표준 출력 (문자열)
+    :param timeout: 최대 실행 시간(초). None이면 SUBPROCESS_TIMEOUT_SECONDS, 넘으면 프로세스 그룹 전체 종료
+    :param usage: 전달하면 종료 코드, CPU 시간, 최대 RSS 등 실행 요약을 채워 넣을 dict (단계 결과에 기록용)
+    :return: 명령어 실행의 표준 출력 (문자열, 마지막 SUBPROCESS_OUTPUT_BYTES 바이트)
     :raises FileNotFoundError: 실행 파일 경로를 찾을 수 없을 때
+    :raises CommandTimeoutError: 타임아웃으로 종료되었을 때 (RuntimeError 하위 클래스)
     :raises RuntimeError: 명령어 실행 중 0이 아닌 종료 코드가 반환되거나 다른 오류 발생 시
     """
-    command_str = " ".join(command) # 로깅을 위해 명령어 문자열 생성
+    command_str = command if isinstance(command, str) else " ".join(command) # 로깅을 위해 명령어 문자열 생성
     print(f"워커: 외부 명령어 실행 시작: {command_str}")
     if cwd:
         print(f"워커: 실행 디렉토리: {cwd}")
 
     try:
-        # subprocess.run: 명령어 실행, 완료까지 대기, 결과 반환
-        # capture_output=True: 표준 출력과 표준 에러를 캡처
-        # text=True: 캡처된 출력/에러를 텍스트로 디코딩 (기본 시스템 인코딩 사용)
-        # check=True: 명령어 실행 결과가 0이 아닌 종료 코드를 반환하면 CalledProcessError 예외 발생
-        # env: 자식 프로세스에 전달할 환경 변수 딕셔너리 (예: PATH, API 키 등)
-        result = subprocess.run(
-            command,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            check=True,
-            shell=shell,
-            env=env
-        )
-
-        print("워커: 명령어 실행 성공.")
-        if result.stdout:
-            print("워커: stdout:\n", result.stdout.strip()) # 공백 제거하고 출력
-        if result.stderr:
-            # 표준 에러에 경고나 정보가 담기는 경우도 있으므로 오류가 아니더라도 출력
-            print("워커: stderr:\n", result.stderr.strip())
-
-        return result.stdout # 표준 출력 반환
-
+        # 공유 실행기: 동시 실행 수 제한, 타임아웃 시 프로세스 그룹 종료, 출력은 마지막 일부만 보관
+        result = subprocess_runner.run(command, cwd=cwd, env=env, shell=shell, timeout=timeout,
+                                       on_output=lambda stream, line: print(f"워커: [{stream}] {line}"))
     except FileNotFoundError:
         print(f"워커: 오류: 명령어 실행 파일 '{command[0]}'를 찾을 수 없습니다.", file=sys.stderr) # 표준 에러로 출력
         raise FileNotFoundError(f"Command not found: {command[0]}. Make sure it's installed and in your PATH.")
-    except subprocess.CalledProcessError as e:
-        # check=True 때문에 0이 아닌 종료 코드 시 이 예외 발생
-        error_output = e.stderr.strip() if e.stderr else "No stderr output."
-        print(f"워커: 명령어 실행 실패 (종료 코드 {e.returncode}):", file=sys.stderr)
-        print("워커: stdout:\n", e.stdout.strip(), file=sys.stderr)
-        print("워커: stderr:\n", error_output, file=sys.stderr)
-        # 더 구체적인 오류 메시지와 함께 RuntimeError 발생
-        raise RuntimeError(f"External command failed with exit code {e.returncode}. Error: {error_output}")
     except Exception as e:
         # 그 외 예상치 못한 예외 처리
         print(f"워커: 예기치 않은 명령어 실행 오류: {e}", file=sys.stderr)
         raise RuntimeError(f"An unexpected error occurred while running command: {e}")
 
+    if usage is not None:
+        usage.update(resource_usage(result))
+    print(f"워커: 명령어 종료 (종료 코드 {result['exit_code']}, {result['wall_seconds']}초, "
+          f"CPU {result.get('cpu_user_seconds', 0)}+{result.get('cpu_system_seconds', 0)}초, "
+          f"최대 RSS {result.get('max_rss_kb', '?')} KB)")
+
+    if result["timed_out"]:
+        print(f"워커: 명령어 실행 시간 초과 ({result['timeout']}초). 프로세스 그룹을 종료했습니다.", file=sys.stderr)
+        raise CommandTimeoutError(result)
+    if result["exit_code"] != 0:
+        error_output = result["stderr"].strip() or "No stderr output."
+        print(f"워커: 명령어 실행 실패 (종료 코드 {result['exit_code']}):", file=sys.stderr)
+        # 더 구체적인 오류 메시지와 함께 RuntimeError 발생
+        raise RuntimeError(f"External command failed with exit code {result['exit_code']}. Error: {error_output}")
+
+    print("워커: 명령어 실행 성공.")
+    return result["stdout"] # 표준 출력 반환
+
 # ... (process_task 함수 및 다른 코드 유지) ...
 
-def process_task(task_payload: dict):
+def process_task(task_payload: dict, progress: dict = None):
     """
     주어진 작업 페이로드를 처리합니다. (메시지 큐에서 받은 메시지 본문)
+
+    :param progress: in_flight_tasks.begin()의 기록 (선택). 완료된 단계 출력을 completed_steps에 기록하여
+                     Spot 회수 알림 시 체크포인트로 저장할 수 있게 합니다.
+    :return: 최종 결과. Spot 회수 알림으로 단계 사이에서 멈추면 status "interrupted"
     """
     task_id = task_payload.get("task_id", "unknown-task")
     print(f"\n>>> 워커: 작업 처리 시작 (Task ID: {task_id})")
@@ -563,9 +547,14 @@ def process_task(task_payload: dict):
 
     processed_results = {"task_id": task_id, "metadata": metadata}
     overall_status = "processing" # 작업 시작 상태
+    # 이전 워커가 회수되기 전에 끝낸 단계 출력 (있으면 해당 단계는 다시 실행하지 않고 복원)
+    saved_steps = task_checkpoints.load(task_id) if task_checkpoints else {}
+    completed_steps = (progress if progress is not None else {}).setdefault("completed_steps", {})
 
     downloaded_file_path = None
     music_data_representation = None # Music21 Stream 객체 등
+    score_ir = None # 분석 단계용 경량 악보 표현 (NumPy 구조화 배열)
+    omr_page_text = None # OMR 입력의 페이지별 텍스트/선행 번역 (PageTextStream)
     extracted_text = None
 
     try:
@@ -633,7 +622,7 @@ def process_task(task_payload: dict):
 
 
                 # --- Music21 객체 다루기 예시 (Music21 Stream 객체가 있다고 가정) ---
-                if isinstance(music_data_representation, stream.Stream):
+                if instance_of(music_data_representation, stream, "Stream"):
                     print("워커: Music21 Stream 객체 처리 시작...")
 
                     # 1. 악보 전체 순회 및 기본 정보 접근
@@ -645,14 +634,12 @@ def process_task(task_payload: dict):
 
                     # 2. 특정 타입의 요소 찾기
                     # .getElementsByClass(): 특정 클래스 타입의 요소들만 가져옴
-                    notes_and_chords = music_data_representation.flat.getElementsByClass(['Note', 'Chord'])
-                    print(f"워커: 추출된 음표 및 화음 개수: {len(notes_and_chords)}")
-
-                    lyrics = music_data_representation.flat.getElementsByClass('Lyric')
-                    print(f"워커: 추출된 가사 요소 개수: {len(lyrics)}")
-
-                    tempos = music_data_representation.flat.getElementsByClass('TempoIndication')
-                    print(f"워커: 추출된 빠르기말 개수: {len(tempos)}")
+                    # 개수 집계는 Stream을 다시 순회하지 않고 경량 악보 표현(score_ir)에서 바로 얻습니다.
+                    if score_ir is None:
+                        score_ir = build_score_ir(music_data_representation)
+                    print(f"워커: 추출된 음표 개수: {len(score_ir)}")
+                    print(f"워커: 추출된 가사 요소 개수: {len(score_ir.lyric_texts)}")
+                    print(f"워커: 추출된 빠르기말 개수: {len(score_ir.tempos)}")
 
                     # 마디(Measure) 단위로 접근
                     # measures = music_data_representation.getElementsByClass('Measure')
@@ -709,7 +696,7 @@ def process_task(task_payload: dict):
 
                     print("워커: Music21 Stream 객체 처리 완료.")
 
-                # elif isinstance(music_data_representation, mido.MidiFile):
+                # elif instance_of(music_data_representation, mido, "MidiFile"):
                 #     print("워커: Mido MidiFile 객체 처리 시작...")
                 #     # Mido 객체 다루는 코드 (MIDI 메시지 순회 등)
                 #     # for msg in music_data_representation.play(): # 메시지 재생
@@ -744,8 +731,20 @@ def process_task(task_payload: dict):
 
         for step in all_tasks:
             step_type = step.get("type")
+            if spot_watcher.interrupted.is_set():
+                # Spot 회수 알림: 남은 단계는 다른 워커가 체크포인트부터 이어서 처리
+                print(f"워커: Spot 회수 알림으로 '{step_type}' 단계부터 처리를 멈춥니다.")
+                overall_status = "interrupted"
+                break
+            if step_type in RESUMABLE_STEP_TYPES and step_type in saved_steps:
+                processed_results.update(saved_steps[step_type])
+                completed_steps[step_type] = saved_steps[step_type]
+                extracted_text = saved_steps[step_type].get("extracted_text_content", extracted_text)
+                print(f"워커: 작업 단계 '{step_type}' 체크포인트에서 복원 (다시 실행하지 않음).")
+                continue
             print(f"워커: 작업 단계 '{step_type}' 실행 시도...")
             step_status = "processing" # 단계별 상태
+            results_before = dict(processed_results)
         
             try:
                 if step_type == "extract_music_data":
@@ -754,27 +753,45 @@ def process_task(task_payload: dict):
                         try:
                             file_extension = os.path.splitext(downloaded_file_path)[1].lower()
                             if file_extension in ['.png', '.jpg', '.jpeg', '.pdf']:
-                                # OMR 처리 (가장 복잡한 부분)
-                                print("워커: 이미지 악보 OMR 처리 (예시)...")
-                                # TODO: OMR 라이브러리/서비스 호출. 결과는 music_data_representation에 저장.
-                                # 예: music_data_representation = call_omr_service(downloaded_file_path)
-                                # OMR 결과에서 텍스트 요소도 함께 추출될 수 있습니다.
-                                music_data_representation = {"notes_data": "mock_omr_result", "text_elements": ["Mock Lyric 1", "Mock Note"]} # Mock 결과
-                                print("워커: OMR 처리 완료 (예시).")
+                                # OMR 처리: 페이지별 프로세스에서 읽기/인식 후 페이지 순서대로 조립
+                                print("워커: 이미지/PDF 악보 페이지 병렬 처리 시작...")
+                                # 번역 단계가 있으면 페이지가 조립되는 즉시 그 페이지 텍스트의 번역을 시작
+                                # (뒤 페이지를 인식하는 동안 앞 페이지 번역이 진행되고, 번역 단계는 결과만 합침)
+                                translate_pages = any(t.get("type") == "translate_to_shakespearean" for t in all_tasks) \
+                                    and shakespeare_llm() is not None
+                                omr_page_text = PageTextStream(process_text=translate_text if translate_pages else None)
+                                music_data_representation = assemble_omr_score(iter_omr_pages(downloaded_file_path),
+                                                                               on_page=omr_page_text)
+                                processed_results["omr_pages"] = {"page_count": music_data_representation["page_count"],
+                                                                  "failed_pages": music_data_representation["failed_pages"],
+                                                                  "text_pages": omr_page_text.snapshot(),
+                                                                  "staff_systems": [len(page.get("omr_layout", {}).get("systems", []))
+                                                                                    for page in music_data_representation["pages"]]}
+                                print(f"워커: OMR 처리 완료. {music_data_representation['page_count']}페이지")
 
                             elif file_extension in ['.musicxml', '.mxl']:
                                 # MusicXML 파싱
                                 print("워커: MusicXML 파싱 시도 (music21 예시)...")
-                                # TODO: music21 사용하여 MusicXML 파싱
-                                music_data_representation = converter.parse(downloaded_file_path) # Music21 객체
+                                # 내용 해시 기반 파싱 캐시 사용 (재시도/재제출 시 재파싱 방지)
+                                music_data_representation, cache_hit = parse_score_cached(downloaded_file_path) # Music21 객체
+                                processed_results["music_data_cache"] = {"hit": cache_hit}
                                 print("워커: MusicXML 파싱 완료 (music21 예시).")
 
                             elif file_extension == '.mid':
                                 # MIDI 파일 읽기
-                                print("워커: MIDI 파일 읽기 시도 (music21/mido 예시)...")
-                                # TODO: music21 또는 mido 사용하여 MIDI 파싱
-                                music_data_representation = mido.MidiFile(downloaded_file_path) # mido 객체
-                                print("워커: MIDI 파일 읽기 완료 (mido 예시).")
+                                # 텍스트만 필요한 작업이면 전체 파싱 대신 텍스트 메타 이벤트만 스캔
+                                needs_notes = any(t.get("type") not in TEXT_ONLY_STEP_TYPES for t in all_tasks)
+                                if needs_notes:
+                                    print("워커: MIDI 파일 읽기 시도 (music21/mido 예시)...")
+                                    music_data_representation = mido.MidiFile(downloaded_file_path) # mido 객체
+                                    print("워커: MIDI 파일 읽기 완료 (mido 예시).")
+                                else:
+                                    print("워커: 텍스트 전용 작업. MIDI 텍스트 이벤트만 스캔...")
+                                    music_data_representation = {
+                                        "format": "midi_text_scan",
+                                        "text_events": scan_midi_text(downloaded_file_path),
+                                    }
+                                    print(f"워커: MIDI 텍스트 이벤트 스캔 완료. {len(music_data_representation['text_events'])}개")
 
                             else:
                                 raise ValueError(f"워커: 지원하지 않는 악보 파일 확장자 ({file_extension})")
@@ -784,6 +801,12 @@ def process_task(task_payload: dict):
                             else:
                                 raise RuntimeError("워커: 악보 데이터 추출 실패.")
 
+                            # 분석 단계들이 공유할 경량 악보 표현을 한 번만 생성
+                            score_ir = build_score_ir(music_data_representation)
+                            if score_ir is not None:
+                                processed_results["score_ir"] = score_ir.summary()
+                                print(f"워커: 경량 악보 표현 생성 완료. 음표 {len(score_ir)}개, {score_ir.nbytes} bytes")
+
                         except Exception as e:
                              print(f"워커: 악보 데이터 추출 오류: {e}")
                              step_status = "failed"
@@ -802,13 +825,14 @@ def process_task(task_payload: dict):
                               # TODO: music_data_representation에서 가사, 지시어 등 텍스트 요소 추출 로직 구현
                               # 예: extracted_text = extract_text_from_music_data_object(music_data_representation)
                               # music21 예시: score.flat.getElementsByClass('Lyric') 등
-                              if isinstance(music_data_representation, stream.Stream): # music21 Stream 객체인 경우
-                                   lyrics = music_data_representation.flat.getElementsByClass('Lyric')
-                                   extracted_text_list = [l.text for l in lyrics]
-                                   # 다른 텍스트 요소(TextExpression 등)도 추출 가능
-                                   extracted_text = "\n".join(extracted_text_list)
-                              elif isinstance(music_data_representation, dict) and "text_elements" in music_data_representation: # OMR mock 결과인 경우
-                                   extracted_text = "\n".join(music_data_representation["text_elements"])
+                              if instance_of(music_data_representation, stream, "Stream"): # music21 Stream 객체인 경우
+                                   # 가사와 TextExpression 등 텍스트 요소를 한 번의 재귀 순회로 추출
+                                   extracted_text, _ = extract_score_text(music_data_representation)
+                              elif isinstance(music_data_representation, dict) and music_data_representation.get("format") == "midi_text_scan":
+                                   extracted_text = format_text_events(music_data_representation["text_events"])
+                              elif isinstance(music_data_representation, dict) and "text_elements" in music_data_representation: # OMR 결과인 경우
+                                   extracted_text = "\n".join(element["content"] if isinstance(element, dict) else element
+                                                              for element in music_data_representation["text_elements"])
                               else:
                                    extracted_text = "악보 데이터 형식에서 텍스트 추출 방법을 모릅니다."
                                    print("워커: 악보 데이터 형식에서 텍스트 추출 방법 모름.")
@@ -847,12 +871,8 @@ def process_task(task_payload: dict):
 
                         Shakespearean Style Translation:"""
 
-                        PROMPT = PromptTemplate(
-                            input_variables=["original_text"],
-                            template=prompt_template
-                        )
-                        llm = ChatOpenAI(model=task_payload.get("model", "gpt-3.5-turbo"), temperature=0.7)
-                        chain = LLMChain(llm=llm, prompt=PROMPT)
+                        # 작업마다 새로 만들지 않고 워커 공유 체인을 사용 (keep-alive 연결 재사용)
+                        chain = llm_pool.get_chain(prompt_template, task_payload.get("model", "gpt-3.5-turbo"), 0.7)
 
                         try:
                             # 실제 구현 시 토큰 제한 고려 분할 처리 필수!
@@ -885,62 +905,37 @@ def process_task(task_payload: dict):
 
 
                 elif step_type == "generate_music_file":
-                    output_format = step.get("output_format", "midi").lower()
+                    # output_formats 목록(예: ["midi", "mp3"]) 또는 기존 단일 output_format 모두 지원
+                    output_formats = step_output_formats(step)
                     if music_data_representation:
-                         print(f"워커: 음악 파일 ({output_format}) 생성 시작...")
-                         generated_file_path = None
-
+                         print(f"워커: 음악 파일 ({', '.join(output_formats)}) 생성 시작...")
                          try:
-                             if output_format == "midi":
-                                 print("워커: MIDI 파일 생성 (music21/mido 예시)...")
-                                 # TODO: music_data_representation (Music21 or mido object) -> MIDI 파일
-                                 generated_file_path = f"/tmp/{task_id}.mid"
-                                 if isinstance(music_data_representation, stream.Stream): # music21
-                                     music_data_representation.write('midi', fp=generated_file_path)
-                                 elif isinstance(music_data_representation, mido.MidiFile): # mido
-                                      music_data_representation.save(generated_file_path)
-                                 else:
-                                     raise TypeError("워커: MIDI 생성을 지원하지 않는 음악 데이터 형식.")
-
-                                 print(f"워커: MIDI 파일 생성 완료: {generated_file_path}")
-
-
-                             elif output_format == "mp3":
-                                  print("워커: MP3 파일 생성 (MIDI -> 오디오 렌더링 예시)...")
-                                  # TODO: MIDI 데이터 (music_data_representation 또는 중간 MIDI 파일) -> 오디오 렌더링 -> MP3 인코딩
-                                  # 이 과정은 신디사이저(fluidsynth) 호출 및 인코딩(ffmpeg) 등 외부 도구 연동이 필요할 수 있습니다.
-                                  # 예: raw_audio_path = synthesize_midi_to_wav(midi_data_source)
-                                  # 예: mp3_file_path = encode_wav_to_mp3(raw_audio_path)
-                                  generated_file_path = f"/tmp/{task_id}.mp3"
-                                  # Mock 파일 생성
-                                  with open(generated_file_path, 'wb') as f: f.write(b"MP3_DATA_MOCK")
-                                  print(f"워커: MP3 파일 생성 완료 (예시): {generated_file_path}")
-
-                             else:
-                                 raise ValueError(f"워커: 지원하지 않는 음악 출력 형식 ({output_format}).")
-
-
-                             if generated_file_path and os.path.exists(generated_file_path):
-                                 # 생성된 파일을 결과 스토리지에 업로드
-                                 result_s3_key = f"results/{task_id}/{os.path.basename(generated_file_path)}"
-                                 print(f"워커: 생성된 결과 파일 S3 업로드 시도: {result_s3_key}")
-                                 # TODO: upload_local_file_to_s3 함수 호출
-                                 upload_local_file_to_s3(generated_file_path, STORAGE_CONFIG["bucket_name"], result_s3_key)
-
-                                 processed_results["generated_music_file"] = {
-                                    "status": "success",
-                                    "format": output_format,
-                                    "s3_key": result_s3_key,
-                                    "s3_url": f"s3://{STORAGE_CONFIG['bucket_name']}/{result_s3_key}" # 예시 URL
-                                 }
-                                 step_status = "success"
-                                 # 임시 파일 삭제
-                                 os.remove(generated_file_path)
-
-
-                             else:
-                                 raise RuntimeError("워커: 음악 파일 생성 실패 또는 경로 오류.")
-
+                             # 모든 형식을 한 번 만든 경량 악보 표현에서 생성 (재파싱 없음)
+                             if score_ir is None:
+                                 score_ir = build_score_ir(music_data_representation)
+                             if score_ir is None:
+                                 raise TypeError("워커: 음악 파일 생성을 지원하지 않는 음악 데이터 형식.")
+
+                             midi_bytes = None
+                             if instance_of(music_data_representation, mido, "MidiFile") and "midi" in output_formats:
+                                 # MIDI 입력은 원본 메시지(컨트롤 체인지 등)를 그대로 유지하여 내보냄
+                                 midi_buffer = io.BytesIO()
+                                 music_data_representation.save(file=midi_buffer)
+                                 midi_bytes = midi_buffer.getvalue()
+
+                             # MIDI 직렬화, 공유 합성 블록의 형식별 인코딩, 업로드를 병렬로 수행
+                             generated = generate_outputs(
+                                 score_ir, output_formats, STORAGE_CONFIG["bucket_name"],
+                                 f"results/{task_id}/{task_id}", s3_client, midi_bytes=midi_bytes,
+                             )
+                             processed_results["generated_music_file"] = generated
+                             for fmt, result in generated["formats"].items():
+                                 print(f"워커: {fmt} 결과: {result['status']} {result.get('s3_key', result.get('error', ''))}")
+                             if generated["render"]:
+                                 print(f"워커: 오디오 합성 실시간 대비 {generated['render']['realtime_factor']:.1f}배 속도")
+
+                             # 일부 형식만 성공해도 결과는 남기고 단계는 실패로 표시하지 않음
+                             step_status = "success" if generated["status"] != "failed" else "failed"
 
                          except Exception as e:
                              print(f"워커: 음악 파일 생성 또는 업로드 오류: {e}")
@@ -966,6 +961,12 @@ def process_task(task_payload: dict):
                 if step_status != "processing":
                      processed_results[f"{step_type}_status"] = step_status
 
+                # 이 단계가 새로 기록한 결과 (Spot 회수 시 체크포인트로 저장)
+                step_outputs = {key: value for key, value in processed_results.items()
+                                if key not in results_before or results_before[key] is not value}
+                if step_type in RESUMABLE_STEP_TYPES and step_succeeded(step_outputs):
+                    completed_steps[step_type] = step_outputs
+
             except Exception as e:
                 print(f"워커: 치명적 오류 발생하여 작업 단계 '{step_type}' 처리 중단: {e}", exc_info=True)
                 # 특정 단계에서 복구 불가능한 오류 발생 시 전체 작업 실패 처리
@@ -976,8 +977,17 @@ def process_task(task_payload: dict):
 
         # --- 3. 최종 상태 업데이트 및 결과 저장 ---
         # 모든 단계 완료 또는 중단 후
-        if overall_status != "failed": # 치명적 오류가 아니었다면
+        if overall_status == "interrupted":
+             # 알림 이후에 끝난 단계까지 저장 (메시지 반환은 워커 루프/회수 알림 처리에서)
+             if task_checkpoints and completed_steps:
+                  task_checkpoints.save(task_id, completed_steps)
+        elif overall_status != "failed": # 치명적 오류가 아니었다면
              overall_status = "completed"
+             # LLM 제공자 차단 등으로 보류된 단계가 있으면 메시지를 지우지 않고 나중에 다시 처리
+             if any(key.endswith("_status") and value == "deferred" for key, value in processed_results.items()):
+                  overall_status = "deferred"
+             if task_checkpoints and saved_steps and overall_status == "completed":
+                  task_checkpoints.delete(task_id) # 이어서 처리한 작업 완료
              # 모든 필수 단계가 성공했는지 확인하는 로직 추가 가능
              # 예: if processed_results.get("generate_music_file", {}).get("status") != "success": overall_status = "completed_with_errors"
 
@@ -1030,49 +1040,21 @@ def process_task(task_payload: dict):
              if "music_data" in processed_results and music_data_representation is not None:
                   try:
                        # 악보 데이터 표현 방식에 따라 다른 추출 로직 적용
-                       if isinstance(music_data_representation, stream.Stream): # music21 Stream 객체인 경우
+                       if instance_of(music_data_representation, stream, "Stream"): # music21 Stream 객체인 경우
                             print("워커: Music21 Stream 객체에서 텍스트 요소 추출 시도...")
-                            all_elements = music_data_representation.flat.elements # 모든 요소를 평면화하여 가져옴
-
-                            # 추출할 수 있는 텍스트 관련 Music21 클래스들
-                            text_classes = [
-                                'Lyric', 'TextExpression', 'NoteExpression',
-                                'Direction', 'PartLyric', 'ScoreGroup' # ScoreGroup 등에도 텍스트 설명이 있을 수 있음
-                                # 필요에 따라 다른 클래스 추가
-                            ]
-
-                            for element in all_elements:
-                                 # issubclass를 사용하여 상속 관계의 클래스도 포함하여 확인
-                                 if any(issubclass(type(element), getattr(__import__('music21'), cls_name)) for cls_name in text_classes):
-                                      # 텍스트 속성이 있는지 확인하고 추출
-                                      text_content = ""
-                                      if hasattr(element, 'text'): # Lyric, TextExpression 등
-                                           text_content = element.text
-                                      elif hasattr(element, 'content'): # ScoreGroup 등
-                                           text_content = element.content
-                                      elif hasattr(element, 'value') and hasattr(element.value, 'content'): # Direction with Words
-                                           text_content = element.value.content
-                                      # TODO: 다른 텍스트 포함 속성 확인 및 추출 로직 추가
-
-                                      if text_content and text_content.strip():
-                                           extracted_text += text_content.strip() + "\n"
-                                           text_elements_with_info.append({
-                                               "type": type(element).__name__, # 요소 클래스 이름
-                                               "content": text_content.strip(),
-                                               "offset": getattr(element, 'offset', None), # 악보 내 시간적 위치
-                                               # "measure_number": element.measureNumber # 마디 번호 (music21 객체 구조에 따라 다름)
-                                           })
-
+                            # 대상 클래스는 한 번만 조회하고, 악보를 한 번 재귀 순회하며 클래스로 걸러냅니다.
+                            # (Lyric은 음표에 붙어 있으므로 음표를 만날 때 함께 수집)
+                            extracted_text, text_elements_with_info = extract_score_text(music_data_representation)
                             print(f"워커: Music21에서 텍스트 추출 완료. 총 {len(text_elements_with_info)}개 요소.")
 
-                       elif isinstance(music_data_representation, mido.MidiFile): # mido MidiFile 객체인 경우
+                       elif instance_of(music_data_representation, mido, "MidiFile"): # mido MidiFile 객체인 경우
                            print("워커: Mido MidiFile 객체에서 텍스트 요소 추출 시도...")
                            # MIDI 파일은 기본적으로 악보 텍스트를 표현하기 위한 형식이 아니지만,
                            # 텍스트 이벤트(TextEvent)나 마커(Marker)를 포함할 수 있습니다.
                            extracted_text_list = []
                            for i, track in enumerate(music_data_representation.tracks):
                                 for msg in track:
-                                     if msg.type in ['text', 'lyrics', 'marker', 'cuepoint', 'copyright']:
+                                     if msg.type in ['text', 'lyrics', 'marker', 'cue_marker', 'copyright']:
                                           extracted_text_list.append(f"Track {i}: [{msg.time}] {msg.text}")
                            extracted_text = "\n".join(extracted_text_list)
                            text_elements_with_info = [{"type": "MIDI Text Event", "content": extracted_text}] # 간단히 목록화
@@ -1080,7 +1062,13 @@ def process_task(task_payload: dict):
                            print(f"워커: Mido에서 텍스트 이벤트 추출 완료. 총 {len(extracted_text_list)}개 이벤트.")
 
 
-                       elif isinstance(music_data_representation, dict) and "text_elements" in music_data_representation: # OMR Mock 또는 JSON 형태 결과
+                       elif isinstance(music_data_representation, dict) and music_data_representation.get("format") == "midi_text_scan":
+                           # 텍스트 전용 작업에서 스트리밍 스캔한 MIDI 텍스트 이벤트 (mido 출력과 같은 형식)
+                           extracted_text = format_text_events(music_data_representation["text_events"])
+                           text_elements_with_info = [{"type": "MIDI Text Event", "content": extracted_text}]
+                           print(f"워커: MIDI 텍스트 스캔 결과 사용. 총 {len(music_data_representation['text_events'])}개 이벤트.")
+
+                       elif isinstance(music_data_representation, dict) and "text_elements" in music_data_representation: # OMR 페이지 조립 또는 JSON 형태 결과
                            print("워커: OMR 결과(JSON)에서 텍스트 요소 추출 시도...")
                            # OMR 결과 JSON 구조에 따라 다르게 파싱해야 합니다.
                            # 예시: OMR 결과 JSON에 'text_elements'라는 키가 있고, 그 안에 텍스트 목록이 있다고 가정
@@ -1124,85 +1112,20 @@ def process_task(task_payload: dict):
 
 # ... (앞부분 임포트 유지) ...
 
-# 셰익스피어 번역 관련 라이브러리 (LangChain, OpenAI) 및 설정 로드
-from langchain_openai import ChatOpenAI # gpt-3.5-turbo에 ChatOpenAI 사용 권장
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
-from langchain.text_splitter import RecursiveCharacterTextSplitter # 긴 텍스트 분할에 더 유연
-# API 호출 재시도 라이브러리
-from tenacity import retry, stop_after_attempt, wait_exponential # pip install tenacity
+# 셰익스피어 번역 단계 본문 (언어 감지, 청크 분할, 반복 구간 제거, 묶음 번역, 캐시, 재시도/속도 제한)은
+# services/shakespeare_translation.py에 있습니다. Lambda 진입점과 OMR 페이지별 선행 번역도 같은 함수를 사용합니다.
+# LLM 인스턴스는 services/llm_pool.py의 llm_pool에서 생성/재사용 (ChatOpenAI + 공유 httpx 클라이언트)
+from .services.shakespeare_translation import (
+    SHAKESPEARE_MODEL, SHAKESPEARE_TEMPERATURE, merge_page_translations, shakespeare_llm, translate_text,
+)
 
 # .env에서 OpenAI API 키 로드는 위에 이미 있습니다.
 # os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
 
-# LangChain LLM 인스턴스 생성 (이 부분은 함수 외부에 생성하여 재사용 가능)
-# 온도(temperature)는 창의성 조절. 0.7 정도면 스타일 변환에 적합
-try:
-    llm_shakespeare = ChatOpenAI(model=os.getenv("OPENAI_MODEL", "gpt-3.5-turbo"), temperature=0.7)
-    # 모델 이름은 환경 변수 등으로 관리하는 것이 좋음
-except Exception as e:
-    print(f"워커: OpenAI LLM 인스턴스 생성 오류: {e}")
-    llm_shakespeare = None # LLM 사용 불가 상태
-
-
-# 프롬프트 템플릿 정의 (셰익스피어 문체 가이드라인 강화)
-# {original_text} 변수에 번역할 텍스트가 들어갑니다.
-# 원본 언어 지정, 결과 형식 지정 등 추가 가이드라인 포함.
-SHAKESPEARE_PROMPT_TEMPLATE = """Translate the following text into English,
-and then rewrite the translated text in the style of William Shakespeare.
-Focus on using vocabulary, phrasing, and sentence structures common in the Elizabethan era.
-Maintain the original meaning and context as accurately as possible.
-
-Original Text (Language: {original_language}):
-"{original_text}"
-
-Shakespearean Style Translation:"""
-
-SHAKESPEARE_PROMPT = PromptTemplate(
-    input_variables=["original_text", "original_language"], # 원본 언어 변수 추가
-    template=SHAKESPEARE_PROMPT_TEMPLATE
-)
-
-# 긴 텍스트 분할 설정
-# 재귀적으로 분할 시도. chunk_size와 chunk_overlap 조정
-text_splitter = RecursiveCharacterTextSplitter(
-    chunk_size=1500, # GPT-3.5-turbo 토큰 제한(약 4000)보다 작게 설정
-    chunk_overlap=100, # 청크 간 겹치는 부분 (문맥 유지를 도움)
-    length_function=len,
-    add_start_index=True, # 분할된 청크의 원본 텍스트 시작 위치 추가
-)
-
 
-# OpenAI API 호출에 대한 재시도 데코레이터
-# 3번 시도하고, 실패 시 지수적으로 대기 시간 증가 (최대 10초 대기)
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-def call_llm_with_retry(prompt_text: str, llm_chain: LLMChain):
-    """LLM 체인을 호출하고 재시도 로직을 적용합니다."""
-    print(f"워커: LLM 호출 시도 (프롬프트 시작: {prompt_text[:100]}...)")
-    response = llm_chain.run(original_text=prompt_text) # 체인 실행
-    print("워커: LLM 호출 성공.")
-    return response
-
-
-# 텍스트 원본 언어 감지 함수 (langdetect 라이브러리 사용 예시)
-# pip install langdetect
-from langdetect import detect
-from langdetect.lang_detect_exception import LangDetectException
-
-def detect_language(text: str) -> str:
-    """텍스트의 원본 언어를 감지합니다."""
-    try:
-        # 텍스트가 너무 짧으면 감지 오류 발생 가능성 높음
-        if len(text) < 10: # 임의의 최소 길이 설정
-             return "unknown"
-        lang_code = detect(text)
-        return lang_code
-    except LangDetectException:
-        print("워커: 언어 감지 오류 발생.")
-        return "unknown"
-    except Exception as e:
-         print(f"워커: 예기치 않은 언어 감지 오류: {e}")
-         return "unknown"
+# 텍스트 원본 언어 감지 (langdetect, pip install langdetect)
+# 프로필은 워커 시작 시 미리 로드하고, 제한된 길이의 표본만 시드 고정으로 분석하며 텍스트 해시별로 캐시합니다.
+from .services.language_detection import language_detector
 
 
 # ... (process_task 함수의 다운로드 및 추출 부분 유지) ...
@@ -1211,81 +1134,29 @@ def detect_language(text: str) -> str:
             # 셰익스피어 문체 번역 (LangChain/GPT 사용)
             extracted_text_content = processed_results.get("extracted_text_content") # 이전 단계에서 추출된 텍스트 사용
 
-            if not llm_shakespeare:
+            if not shakespeare_llm():
                  print("워커: LLM 인스턴스가 없어 셰익스피어 문체 번역 불가. 단계 건너뜁니다.")
                  step_status = "skipped"
                  processed_results["shakespearean_translation"] = {"status": "skipped", "message": "LLM not initialized"}
 
             elif extracted_text_content and extracted_text_content.strip():
                 print("워커: 셰익스피어 문체 번역 시작...")
-                translation_results = [] # 각 청크별 번역 결과를 저장할 리스트
                 step_status = "processing"
 
                 try:
-                    # 1. 원본 텍스트 언어 감지
-                    original_language = detect_language(extracted_text_content)
-                    print(f"워커: 감지된 원본 언어: {original_language}")
-                    processed_results["detected_language"] = original_language
-
-                    # 2. 긴 텍스트를 청크로 분할
-                    # LangChain의 create_documents는 파일 로더처럼 작동하지만, 여기서는 문자열을 직접 분할
-                    # text_splitter.create_documents([extracted_text_content]) # Document 객체 리스트 반환
-                    texts = text_splitter.split_text(extracted_text_content) # 문자열 리스트 반환
-                    print(f"워커: 원본 텍스트가 {len(texts)}개의 청크로 분할되었습니다.")
-
-
-                    # 3. 각 청크별로 LLM 호출 및 번역/변환 수행
-                    llm_chain = LLMChain(llm=llm_shakespeare, prompt=SHAKESPEARE_PROMPT)
-
-                    for i, chunk in enumerate(texts):
-                        print(f"워커: 청크 {i+1}/{len(texts)} 처리 시작...")
-                        try:
-                            # LLM 호출 (재시도 데코레이터 적용)
-                            shakespearean_text = call_llm_with_retry(
-                                prompt_text=chunk, # 청크 텍스트
-                                llm_chain=llm_chain # LLM 체인 인스턴스
-                            )
-
-                            translation_results.append({
-                                "chunk_index": i,
-                                "original_chunk": chunk,
-                                "translated_chunk": shakespearean_text.strip(),
-                                "status": "success"
-                            })
-                            print(f"워커: 청크 {i+1} 처리 완료.")
-
-                        except Exception as e:
-                            print(f"워커: 청크 {i+1} 처리 중 오류 발생: {e}")
-                            translation_results.append({
-                                "chunk_index": i,
-                                "original_chunk": chunk,
-                                "translated_chunk": None,
-                                "status": "failed",
-                                "error": str(e)
-                            })
-                            # 특정 청크 실패 시 전체 번역을 실패로 간주할지, 부분 결과만 사용할지 결정 필요
-
-                    # 4. 번역된 청크 결과 합치기
-                    # 간단히 번역된 청크들을 이어 붙이지만, 문맥상 자연스럽게 합치는 로직은 더 복잡할 수 있음.
-                    # 예시: '\n\n'.join([res['translated_chunk'] for res in translation_results if res['status'] == 'success'])
-                    # 여기서는 결과 목록 자체를 저장
-                    processed_results["shakespearean_translation"] = {
-                       "status": "completed", # 모든 청크 처리가 완료되면 completed
-                       "original_language": original_language,
-                       "chunks_processed": len(texts),
-                       "translation_results_per_chunk": translation_results # 각 청크별 결과 목록
-                       # 전체 합쳐진 번역 결과 문자열은 필요에 따라 추가 생성
-                       # "full_translated_text": "..."
-                    }
-                    print("워커: 셰익스피어 문체 번역 단계 처리 완료.")
-                    # 모든 청크가 성공했는지 확인하여 최종 단계 상태 결정
-                    if all(res['status'] == 'success' for res in translation_results):
-                         step_status = "success"
-                         processed_results["shakespearean_translation"]["status"] = "success"
+                    if omr_page_text is not None and omr_page_text.process_text is not None:
+                        # OMR 입력: 악보 데이터 추출 중 페이지마다 시작한 번역 결과를 페이지 순서대로 합침
+                        # (뒤 페이지를 인식하는 동안 앞 페이지는 이미 번역됨)
+                        translation = merge_page_translations(omr_page_text.results())
+                        print(f"워커: 페이지별 선행 번역 {len(translation['pages'])}페이지 결과를 합쳤습니다.")
                     else:
-                         step_status = "completed_with_errors" # 일부 청크 실패
-                         processed_results["shakespearean_translation"]["status"] = "completed_with_errors"
-
+                        # 언어 감지 -> 청크 분할 -> 반복 구간 제거 -> (묶음) 동시 번역 + 캐시 -> 반복 구간 복원
+                        translation = translate_text(extracted_text_content)
+                    processed_results["detected_language"] = translation["original_language"]
+                    processed_results["shakespearean_translation"] = translation
+                    print("워커: 셰익스피어 문체 번역 단계 처리 완료.")
+                    # success / deferred (제공자 차단으로 보류된 청크, 작업 전체를 나중에 다시 처리) / completed_with_errors
+                    step_status = translation["status"]
 
                 except Exception as e:
                     print(f"워커: 셰익스피어 문체 번역 단계 실행 중 오류 발생: {e}", exc_info=True)
@@ -1308,6 +1179,9 @@ def detect_language(text: str) -> str:
 
 
     finally:
+        if omr_page_text is not None:
+            omr_page_text.close() # 번역 단계 전에 중단된 경우에도 페이지 번역 스레드 정리
+
         # 작업 완료 또는 실패 후 임시 파일 정리
         if downloaded_file_path and os.path.exists(downloaded_file_path) and "/tmp/" in downloaded_file_path:
              try:
@@ -1329,46 +1203,77 @@ def detect_language(text: str) -> str:
 
 def start_sqs_worker():
     """SQS 큐에서 메시지를 받아 작업을 처리하는 워커를 시작합니다."""
-    if not WORKER_SQS_QUEUE_URL:
+    if not WORKER_TASK_QUEUE_URLS:
         print("워커 실행 오류: SQS_QUEUE_URL이 설정되지 않았습니다.")
         return
 
-    print(f"워커: SQS 큐 {WORKER_SQS_QUEUE_URL} 리스닝 시작...")
-
-    while True: # 워커 프로세스가 종료되지 않고 계속 실행
+    # 무거운 라이브러리는 처음 실행하는 단계에서 임포트. WORKER_PREWARM에 있는 단계/모듈만 미리 임포트
+    warmed = prewarm(WORKER_PREWARM)
+    if warmed["modules"] or warmed["missing"]:
+        print(f"워커: 미리 임포트 {warmed['modules']} (설치되지 않음: {warmed['missing']})")
+    if LLM_POOL_WARM_ON_START:
+        # 첫 작업 전에 LLM 클라이언트와 제공자 연결을 미리 준비 (LLM_POOL_WARM, 없으면 번역 기본 모델)
+        llm_pool.warm(parse_warm_spec(LLM_POOL_WARM) or [(SHAKESPEARE_MODEL, SHAKESPEARE_TEMPERATURE)])
+    language_detector.warm() # 첫 작업에서 언어 프로필을 읽느라 느려지지 않도록
+
+    # 우선순위 큐들을 가중치 비율로 폴링하고, 높은 우선순위 작업이 오면 미리 받은 낮은 우선순위 메시지를 반환
+    task_poller = WeightedQueuePoller(sqs_client, WORKER_TASK_QUEUE_URLS)
+    atexit.register(task_poller.release_prefetched) # 종료 시 처리하지 않은 메시지를 바로 다른 워커에게
+    print(f"워커: SQS 큐 리스닝 시작 {task_poller.snapshot()['queues']} (가중치 {task_poller.weights})...")
+
+    # Spot 회수 알림 (2분 전): 미리 받은 메시지와 처리 중인 메시지를 체크포인트 저장 후 바로 큐에 반환
+    spot_watcher.on_notice(lambda notice: task_poller.release_prefetched())
+    spot_watcher.on_notice(lambda notice: in_flight_tasks.requeue_all(sqs_client, task_checkpoints))
+    spot_watcher.start()
+
+    while not spot_watcher.interrupted.is_set(): # 회수 알림을 받을 때까지 계속 실행 (알림 후 새 메시지 수신 중단)
         try:
-            # SQS 큐에서 메시지 최대 1개(MaxNumberOfMessages=1) 가져오기
-            # WaitTimeSeconds=20: Long Polling (메시지가 도착할 때까지 최대 20초 대기)
-            response = sqs_client.receive_message(
-                QueueUrl=WORKER_SQS_QUEUE_URL,
-                MaxNumberOfMessages=1,
-                WaitTimeSeconds=20,
-                VisibilityTimeout=300 # 메시지를 숨기는 시간 (처리 시간보다 길게 설정)
-                                      # 이 시간 안에 메시지 삭제 안 하면 다른 워커가 가져갈 수 있음
-            )
-
-            messages = response.get('Messages', [])
-
-            if not messages:
+            # 다음 메시지 하나 가져오기 (VisibilityTimeout=TASK_QUEUE_VISIBILITY_TIMEOUT 동안 다른 워커에게 숨김)
+            polled = task_poller.next_message()
+
+            if not polled:
                 # print("워커: 대기 중...") # 메시지가 없으면 대기
                 continue # 메시지가 없으면 다시 큐 폴링
 
+            queue_url = polled["queue_url"] # 삭제/보류 시 메시지를 받은 큐 사용
+            messages = [polled["message"]]
+
             for message in messages:
                 message_body = message['Body']
                 receipt_handle = message['ReceiptHandle'] # 메시지 삭제 시 필요
 
-                print(f"\n>>> 워커: 메시지 수신: {message_body[:100]}...") # 메시지 내용 일부 출력
+                print(f"\n>>> 워커: 메시지 수신 ({polled['priority']}): {message_body[:100]}...") # 메시지 내용 일부 출력
 
+                in_flight = None
                 try:
                     # 메시지 본문(JSON 문자열)을 파싱하여 작업 페이로드 딕셔너리로 변환
                     task_payload = json.loads(message_body)
 
-                    # 실제 작업 처리 함수 호출
-                    process_task(task_payload)
+                    # 실제 작업 처리 함수 호출 (회수 알림 시 반환할 수 있도록 처리 중 목록에 등록)
+                    in_flight = in_flight_tasks.begin(queue_url, receipt_handle,
+                                                      task_payload.get("task_id", "unknown-task"))
+                    result = process_task(task_payload, progress=in_flight)
+
+                    if isinstance(result, dict) and result.get("status") == "interrupted":
+                        # 알림 처리에서 아직 반환하지 않았으면 (알림 직후 받은 메시지 등) 여기서 반환
+                        in_flight_tasks.requeue(in_flight, sqs_client, task_checkpoints)
+                        continue
+
+                    if isinstance(result, dict) and result.get("status") == "deferred":
+                        # 보류된 작업은 삭제하지 않고 재시도 가능 시각까지 숨겨 두었다가 다시 처리
+                        retry_at = result["results_summary"].get("shakespearean_translation", {}).get("retry_at") or 0
+                        delay = int(min(max(retry_at - time.time(), 30), 43200)) # SQS 최대 12시간
+                        sqs_client.change_message_visibility(
+                            QueueUrl=queue_url,
+                            ReceiptHandle=receipt_handle,
+                            VisibilityTimeout=delay
+                        )
+                        print(f"워커: 작업 보류, {delay}초 후 다시 처리합니다.")
+                        continue
 
                     # 작업 처리 성공 시 SQS 큐에서 메시지 삭제
                     sqs_client.delete_message(
-                        QueueUrl=WORKER_SQS_QUEUE_URL,
+                        QueueUrl=queue_url,
                         ReceiptHandle=receipt_handle
                     )
                     print(f"워커: 메시지 삭제 성공 (ReceiptHandle: {receipt_handle[:10]}...).")
@@ -1383,6 +1288,9 @@ def start_sqs_worker():
                     # process_task 내부에서 이미 예외를 처리하지만, 혹시 모를 외부 예외 처리
                     # SQS Visibility Timeout이 지나면 메시지는 다시 보이게 되어 재처리될 수 있습니다.
                     # 반복 실패하는 메시지는 DLQ 설정이 필요합니다.
+                finally:
+                    if in_flight is not None:
+                        in_flight_tasks.end(in_flight)
 
         except ClientError as e:
              print(f"워커: SQS 클라이언트 오류 발생: {e}")
@@ -1393,6 +1301,16 @@ def start_sqs_worker():
             # 다른 오류 발생 시 잠시 대기 후 재시도
             time.sleep(5)
 
+    # 회수 알림 후: 알림 처리 중 받은 메시지까지 반환하고 종료 (인스턴스가 회수되기 전에)
+    task_poller.release_prefetched()
+    print(f"워커: Spot 회수 대비 종료 {in_flight_tasks.snapshot()}")
+
+
+# --- Lambda 실행 방식 ---
+# 이 파일은 단계별 초안을 이어 붙인 것이라 모듈로 임포트되지 않습니다 (문법 오류, backend/ 아래의 상대 임포트).
+# Lambda 핸들러는 app/lambda_entry.py의 lambda_handler (app.lambda_entry.lambda_handler)이며,
+# 같은 서비스 모듈을 조합한 임포트 가능한 process_task(app/task_pipeline.py)를 감쌉니다.
+
 
 # 워커 컨테이너의 진입점 (Dockerfile 또는 docker-compose.yml의 command에서 이 함수를 호출)
 # docker-compose.yml에서 command: python -u app/worker.py 로 설정했다면,
@@ -3,9 +3,12 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import JSONResponse
 import uvicorn
+import math
+import os
 import time
 import random
 import logging
+import uuid
 
 # Configure simple logging for the mock service
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -20,12 +23,15 @@ SIMULATE_ERROR_STATUS_CODE = int(os.getenv("SIMULATE_ERROR_STATUS_CODE", 500))
 # Specific error codes could be simulated (e.g., 429 for rate limit)
 SIMULATE_RATE_LIMIT_ENABLED = os.getenv("SIMULATE_RATE_LIMIT_ENABLED", "false").lower() == "true"
 RATE_LIMIT_PER_MINUTE = int(os.getenv("RATE_LIMIT_PER_MINUTE", 60))
+# Retry-After header (seconds) sent with simulated random errors, like a provider brownout; unset = no header
+SIMULATE_RETRY_AFTER_SECONDS = os.getenv("SIMULATE_RETRY_AFTER_SECONDS")
 
 # Basic rate limiting state (for simulation)
 request_timestamps = []
 
 # --- Helper function for rate limiting ---
 def check_rate_limit():
+    """Returns True if the request is allowed, otherwise the seconds until the window has room again."""
     if not SIMULATE_RATE_LIMIT_ENABLED:
         return True
 
@@ -37,7 +43,7 @@ def check_rate_limit():
 
     if len(request_timestamps) >= RATE_LIMIT_PER_MINUTE:
         logger.warning("Simulated rate limit exceeded.")
-        return False
+        return max(request_timestamps[0] - one_minute_ago, 0.0)
     
     request_timestamps.append(now)
     return True
@@ -58,15 +64,19 @@ async def mock_openai_completion(request: Request):
         time.sleep(SIMULATE_DELAY_SECONDS)
 
     # Simulate rate limit
-    if not check_rate_limit():
-         logger.error(f"Simulated rate limit exceeded, returning {429}.")
-         raise HTTPException(status_code=429, detail="Simulated Rate Limit Exceeded")
+    allowed = check_rate_limit()
+    if allowed is not True:
+         retry_after = max(1, math.ceil(allowed))
+         logger.error(f"Simulated rate limit exceeded, returning {429} (Retry-After: {retry_after}s).")
+         raise HTTPException(status_code=429, detail="Simulated Rate Limit Exceeded",
+                             headers={"Retry-After": str(retry_after)})
 
 
     # Simulate random error
     if random.random() < SIMULATE_ERROR_RATE:
         logger.error(f"Simulating random error, returning {SIMULATE_ERROR_STATUS_CODE}.")
-        raise HTTPException(status_code=SIMULATE_ERROR_STATUS_CODE, detail="Simulated Random Error")
+        headers = {"Retry-After": SIMULATE_RETRY_AFTER_SECONDS} if SIMULATE_RETRY_AFTER_SECONDS else None
+        raise HTTPException(status_code=SIMULATE_ERROR_STATUS_CODE, detail="Simulated Random Error", headers=headers)
 
     # Process the request body (assuming it contains the text to translate)
     try:
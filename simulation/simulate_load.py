@@ -7,7 +7,9 @@ import time
 import threading
 import argparse
 import io # For file object
+import json
 import logging
+import random
 
 # Configure simple logging for the simulation script itself
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -139,13 +141,56 @@ def run_simulation(num_requests: int, concurrency: int):
     #     logger.info(f"Min successful request duration: {min(durations):.2f}s")
 
 
+# --- Offline autoscaling simulation (no backend, no AWS) ---
+def poisson_arrivals(duration: float, base_per_minute: float, burst_per_minute: float, burst_start: float,
+                     burst_seconds: float, seed: int = 0) -> list:
+    """Task arrival times for a baseline load with one burst."""
+    rng = random.Random(seed)
+    arrivals, t = [], 0.0
+    while True:
+        in_burst = burst_start <= t < burst_start + burst_seconds
+        t += rng.expovariate((burst_per_minute if in_burst else base_per_minute) / 60)
+        if t >= duration:
+            return arrivals
+        arrivals.append(t)
+
+
+def run_offline_autoscaling(args):
+    """Drive the worker autoscaling controller with simulated queue and capacity (simulated time)."""
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # repository root
+    from backend.app.services.autoscaler import simulate
+
+    arrivals = poisson_arrivals(args.duration, args.base_rate, args.burst_rate, args.burst_start,
+                                args.burst_seconds, args.seed)
+    logger.info(f"Offline autoscaling: {len(arrivals)} tasks over {args.duration:.0f}s "
+                f"(base {args.base_rate}/min, burst {args.burst_rate}/min at {args.burst_start:.0f}s "
+                f"for {args.burst_seconds:.0f}s), service {args.service_seconds}s, boot {args.boot_seconds}s")
+    result = simulate(arrivals, args.service_seconds, args.duration + args.drain_grace,
+                      interval=args.interval, boot_seconds=args.boot_seconds, max_workers=args.max_workers)
+
+    for decision in result["decisions"]:
+        if decision["action"] != "hold":
+            logger.info(f"t={decision['time']:6.0f}s {decision['action']:10s} {decision['current']:2d} -> "
+                        f"{decision['desired']:2d} (visible {decision['visible']}, "
+                        f"oldest {decision['oldest_age_seconds']:.0f}s, {decision['reason']})")
+    latencies = sorted(result["latencies"])
+    peak = max(d["desired"] for d in result["decisions"])
+    static_worker_hours = peak * (args.duration + args.drain_grace) / 3600
+    logger.info(f"Completed {len(latencies)} tasks, remaining {result['remaining']}")
+    if latencies:
+        logger.info(f"Latency p50 {latencies[len(latencies) // 2]:.0f}s, "
+                    f"p95 {latencies[int(len(latencies) * 0.95)]:.0f}s, max {latencies[-1]:.0f}s")
+    logger.info(f"Worker-hours: autoscaled {result['worker_seconds'] / 3600:.1f}, "
+                f"static fleet at peak size {peak}: {static_worker_hours:.1f}")
+    logger.info(f"Controller: {result['controller']}")
+    if args.decisions_out:
+        with open(args.decisions_out, "w") as f:
+            json.dump(result["decisions"], f, indent=1)
+        logger.info(f"Decisions written to {args.decisions_out}")
+
+
 # --- Command line execution ---
 if __name__ == "__main__":
-    # Ensure a test file exists
-    if not os.path.exists(TEST_FILE_PATH):
-        logger.error(f"Error: Test file not found at {TEST_FILE_PATH}. Please create one.")
-        sys.exit(1)
-
     parser = argparse.ArgumentParser(description="Simulate load on the Personal Data Assistant backend.")
     parser.add_argument("--requests", type=int, default=NUM_REQUESTS, help="Total number of requests to send.")
     parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="Number of concurrent requests.")
@@ -153,10 +198,28 @@ if __name__ == "__main__":
     parser.add_argument("--output", type=str, default=OUTPUT_FORMAT, choices=['midi', 'mp3'], help="Requested output format.")
     parser.add_argument("--translate", action="store_true", default=TRANSLATE_SHAKESPEAREAN, help="Request Shakespearean translation.")
     parser.add_argument("--api-url", type=str, default=BACKEND_API_URL, help="Base URL of the backend API.")
+    # Offline autoscaling simulation (simulated time, no backend/AWS needed)
+    parser.add_argument("--offline-autoscale", action="store_true", help="Simulate the worker autoscaler offline.")
+    parser.add_argument("--duration", type=float, default=7200, help="Seconds of simulated arrivals.")
+    parser.add_argument("--drain-grace", type=float, default=1800, help="Simulated seconds after the last arrival.")
+    parser.add_argument("--base-rate", type=float, default=3, help="Baseline tasks per minute.")
+    parser.add_argument("--burst-rate", type=float, default=20, help="Tasks per minute during the burst.")
+    parser.add_argument("--burst-start", type=float, default=1800)
+    parser.add_argument("--burst-seconds", type=float, default=1800)
+    parser.add_argument("--service-seconds", type=float, default=60, help="Processing time per task per worker.")
+    parser.add_argument("--boot-seconds", type=float, default=90, help="Spot worker start-up delay.")
+    parser.add_argument("--interval", type=float, default=30, help="Controller sampling interval.")
+    parser.add_argument("--max-workers", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--decisions-out", type=str, default=None, help="Write all controller decisions as JSON.")
 
 
     args = parser.parse_args()
 
+    if args.offline_autoscale:
+        run_offline_autoscaling(args)
+        sys.exit(0)
+
     # Update configuration from arguments
     NUM_REQUESTS = args.requests
     CONCURRENCY = args.concurrency
@@ -177,7 +240,7 @@ if __name__ == "__main__":
 
     # Ensure updated test file path exists
     if not os.path.exists(TEST_FILE_PATH):
-        logger.error(f"Error: Test file not found at {TEST_FILE_PATH}.")
+        logger.error(f"Error: Test file not found at {TEST_FILE_PATH}. Please create one.")
         sys.exit(1)
 
 